@@ -0,0 +1,168 @@
+"""Compare PDF reader backends on the Anexo I PDF.
+
+Each backend runs in a fresh child process so the reported peak RSS belongs to that
+backend alone (including the JVM for tabula and the worker pool for pdfplumber).
+
+Usage (from B_02_DataTransform/):
+    python -m benchmarks.compare_pdf_readers
+    python -m benchmarks.compare_pdf_readers --backends pdfplumber --workers 4 --output results.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import queue as queue_module
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import pandas
+
+from src import config
+from src.adapters.file_system_adapter import LocalFileSystemAdapter
+from src.application.pipeline import create_pdf_reader
+from src.application.processing import process_extracted_tables
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+RESULT_POLL_SECONDS = 1.0  # How often a waiting parent checks that its child is still alive
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process plus its finished children (the tabula JVM, the
+    pdfplumber worker processes), in MB. Shared by the benchmarks so they report the same measure."""
+    if resource is None:
+        return None
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round((self_rss + children_rss) / divisor, 1)
+
+def collect_child_result(process, queue, timeout: Optional[float] = None) -> Dict:
+    """Waits for the report of a benchmark child process, then joins it.
+
+    A child that exits without reporting (segfault, OOM kill) or outlives `timeout` seconds
+    yields {'error': ...} instead of blocking the parent forever.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    result = None
+    while result is None:
+        try:
+            result = queue.get(timeout=RESULT_POLL_SECONDS)
+        except queue_module.Empty:
+            if not process.is_alive():
+                try:  # It may have reported just before exiting
+                    result = queue.get(timeout=RESULT_POLL_SECONDS)
+                except queue_module.Empty:
+                    result = {'error': f"process exited with code {process.exitcode} without a result"}
+            elif deadline is not None and time.monotonic() > deadline:
+                process.terminate()
+                result = {'error': f"no result after {timeout:.0f}s (terminated)"}
+    process.join()
+    return result
+
+def _run_backend(backend: str, pdf_path: str, workers: int, queue) -> None:
+    """Child process body: extract + process one PDF and report metrics to the parent"""
+    try:
+        config.PDF_READER_MAX_WORKERS = workers
+        reader = create_pdf_reader(backend)
+
+        start = time.perf_counter()
+        tables = reader.extract_tables_from_pdf(pdf_path)
+        extract_seconds = time.perf_counter() - start
+        df = process_extracted_tables(tables, config.COLUMN_RENAME_MAP)
+        total_seconds = time.perf_counter() - start
+
+        queue.put({
+            'backend': backend,
+            'tables': len(tables),
+            'rows': 0 if df is None else len(df),
+            'extract_seconds': round(extract_seconds, 3),
+            'total_seconds': round(total_seconds, 3),
+            'rows_per_second': round((0 if df is None else len(df)) / total_seconds, 1) if total_seconds else None,
+            'peak_rss_mb': peak_rss_mb(),
+            'frame': df,
+        })
+    except Exception as e:
+        queue.put({'backend': backend, 'error': f"{type(e).__name__}: {e}"})
+
+def _normalized_rows(df: pandas.DataFrame) -> pandas.Series:
+    """Row fingerprints that ignore whitespace differences between backends"""
+    as_text = df.astype(object).where(df.notna(), '').astype(str)
+    as_text = as_text.apply(lambda col: col.str.replace(r'\s+', ' ', regex=True).str.strip())
+    return as_text.agg('|'.join, axis=1)
+
+def compare_outputs(reference: pandas.DataFrame, candidate: pandas.DataFrame) -> Dict:
+    """Row-level parity report between two processed frames"""
+    ref_rows = _normalized_rows(reference).value_counts()
+    cand_rows = _normalized_rows(candidate).value_counts()
+    matched = int(ref_rows.combine(cand_rows, min, fill_value=0).sum())
+    return {
+        'same_columns': list(reference.columns) == list(candidate.columns),
+        'reference_rows': len(reference),
+        'candidate_rows': len(candidate),
+        'matched_rows': matched,
+        'row_parity': round(matched / max(len(reference), 1), 4),
+    }
+
+def run(backends: List[str], pdf_path: str, workers: int, timeout: Optional[float] = None) -> Dict:
+    ctx = multiprocessing.get_context('spawn')
+    results: Dict[str, Dict] = {}
+    frames: Dict[str, pandas.DataFrame] = {}
+
+    for backend in backends:
+        logger.info(f"Running backend '{backend}'...")
+        queue = ctx.Queue()
+        process = ctx.Process(target=_run_backend, args=(backend, pdf_path, workers, queue))
+        process.start()
+        result = collect_child_result(process, queue, timeout)
+        result.setdefault('backend', backend)
+
+        frame = result.pop('frame', None)
+        if frame is not None:
+            frames[backend] = frame
+        results[backend] = result
+        logger.info(f"{backend}: {result}")
+
+    report = {'pdf': pdf_path, 'workers': workers, 'backends': results}
+    if 'tabula' in frames:
+        report['parity_vs_tabula'] = {
+            name: compare_outputs(frames['tabula'], frame)
+            for name, frame in frames.items() if name != 'tabula'
+        }
+    return report
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare PDF reader backends on the Anexo I PDF.")
+    parser.add_argument('--backends', nargs='+', default=['tabula', 'pdfplumber'])
+    parser.add_argument('--workers', type=int, default=config.PDF_READER_MAX_WORKERS)
+    parser.add_argument('--output', help="Optional path for the JSON report")
+    parser.add_argument('--timeout', type=float, help="Seconds before a backend run is stopped and reported as failed")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level='INFO', format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = LocalFileSystemAdapter().find_and_extract_target_file(
+            zip_path=config.INPUT_ZIP_PATH,
+            target_filename_part=config.TARGET_FILENAME_PART,
+            extract_to_dir=temp_dir
+        )
+        report = run(args.backends, pdf_path, args.workers, args.timeout)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        logger.info(f"Report written to {args.output}")
+    print(output)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""End-to-end benchmark of the transform pipeline on synthetic lattice PDFs.
+
+For every page count a synthetic PDF is generated offline (cached in the fixtures directory), then
+extract -> process_extracted_tables -> save_dataframe_to_zipped_csv runs in a fresh child process
+so the peak RSS belongs to that run alone. Results are written as JSON; `--compare` checks them
+against a stored baseline and exits with status 1 when a metric regressed beyond the tolerance.
+
+Usage (from B_02_DataTransform/):
+    python -m benchmarks.pipeline_benchmark                              # 10 and 100 pages, tabula
+    python -m benchmarks.pipeline_benchmark --pages 10 100 1000 --backend pdfplumber
+    python -m benchmarks.pipeline_benchmark --output benchmarks/results/baseline.json
+    python -m benchmarks.pipeline_benchmark --compare benchmarks/results/baseline.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from src import config
+from src.adapters.file_system_adapter import LocalFileSystemAdapter
+from src.application.pipeline import create_pdf_reader
+from src.application.processing import process_extracted_tables
+from benchmarks.compare_pdf_readers import collect_child_result, peak_rss_mb
+from benchmarks.synthetic_pdf import generate_lattice_pdf
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FIXTURES_DIR = os.path.join(BENCHMARK_DIR, 'fixtures')
+DEFAULT_OUTPUT_PATH = os.path.join(BENCHMARK_DIR, 'results', 'latest.json')
+
+# Metric name -> True when a higher value is better
+COMPARED_METRICS = {
+    'wall_seconds': False,
+    'peak_rss_mb': False,
+    'rows_per_second': True,
+}
+
+def fixture_path(fixtures_dir: str, pages: int) -> str:
+    """Generate the synthetic PDF for `pages` once and reuse it on later runs"""
+    path = os.path.join(fixtures_dir, f"synthetic_lattice_{pages}p.pdf")
+    if not os.path.exists(path):
+        logger.info(f"Generating {pages}-page synthetic PDF: {path}")
+        generate_lattice_pdf(path, pages)
+    return path
+
+def _run_case(backend: str, pdf_path: str, queue) -> None:
+    """Child process body: run the pipeline stages on one PDF and report metrics to the parent"""
+    try:
+        reader = create_pdf_reader(backend, max_workers=config.PDF_READER_MAX_WORKERS)
+        file_system = LocalFileSystemAdapter(
+            csv_workers=config.CSV_WRITER_WORKERS,
+            csv_chunk_rows=config.CSV_WRITER_CHUNK_ROWS,
+            csv_executor=config.CSV_WRITER_EXECUTOR
+        )
+
+        start = time.perf_counter()
+        tables = reader.extract_tables_from_pdf(pdf_path)
+        extracted = time.perf_counter()
+        df = process_extracted_tables(tables, config.COLUMN_RENAME_MAP, key_column=config.ROW_KEY_COLUMN)
+        processed = time.perf_counter()
+        rows = 0 if df is None else len(df)
+        if df is not None:
+            with tempfile.TemporaryDirectory() as output_dir:
+                file_system.save_dataframe_to_zipped_csv(df, output_dir, 'benchmark.csv', 'benchmark.zip')
+        finished = time.perf_counter()
+
+        wall = finished - start
+        queue.put({
+            'tables': len(tables),
+            'rows': rows,
+            'extract_seconds': round(extracted - start, 3),
+            'process_seconds': round(processed - extracted, 3),
+            'save_seconds': round(finished - processed, 3),
+            'wall_seconds': round(wall, 3),
+            'rows_per_second': round(rows / wall, 1) if wall else None,
+            'peak_rss_mb': peak_rss_mb(),
+        })
+    except Exception as e:
+        queue.put({'error': f"{type(e).__name__}: {e}"})
+
+def run(page_counts: List[int], backend: str, fixtures_dir: str, timeout: Optional[float] = None) -> Dict:
+    ctx = multiprocessing.get_context('spawn')
+    cases: Dict[str, Dict] = {}
+    for pages in page_counts:
+        pdf_path = fixture_path(fixtures_dir, pages)
+        logger.info(f"Running {backend} on {pages} pages...")
+        queue = ctx.Queue()
+        process = ctx.Process(target=_run_case, args=(backend, pdf_path, queue))
+        process.start()
+        result = collect_child_result(process, queue, timeout)
+        result['pages'] = pages
+        cases[f"{backend}:{pages}"] = result
+        logger.info(f"{backend}:{pages}: {result}")
+
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'backend': backend,
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'cases': cases,
+    }
+
+def compare_results(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Regressions of `results` relative to `baseline`, as human-readable messages"""
+    regressions: List[str] = []
+    for case, baseline_case in baseline.get('cases', {}).items():
+        current = results['cases'].get(case)
+        if current is None:
+            continue
+        if 'error' in current:
+            regressions.append(f"{case}: failed ({current['error']})")
+            continue
+        if 'error' in baseline_case:
+            continue
+        if current.get('rows') != baseline_case.get('rows'):
+            regressions.append(f"{case}: row count changed {baseline_case.get('rows')} -> {current.get('rows')}")
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = baseline_case.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change < -tolerance) if higher_is_better else (change > tolerance):
+                regressions.append(f"{case}: {metric} {old} -> {new} ({change:+.1%})")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the transform pipeline on synthetic lattice PDFs.")
+    parser.add_argument('--pages', type=int, nargs='+', default=[10, 100])
+    parser.add_argument('--backend', default=config.PDF_READER_BACKEND)
+    parser.add_argument('--fixtures-dir', default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_PATH, help="Where the JSON results are written")
+    parser.add_argument('--compare', metavar='BASELINE', help="Baseline results file to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="Allowed relative change before flagging")
+    parser.add_argument('--timeout', type=float, help="Seconds before a case is stopped and reported as failed")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level='INFO', format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+
+    results = run(args.pages, args.backend, args.fixtures_dir, args.timeout)
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    logger.info(f"Results written to {args.output}")
+
+    failed = [case for case, result in results['cases'].items() if 'error' in result]
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.tolerance)
+        for message in regressions:
+            logger.error(f"Regression: {message}")
+        if regressions:
+            return 1
+        logger.info(f"No regressions against {args.compare} (tolerance {args.tolerance:.0%}).")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
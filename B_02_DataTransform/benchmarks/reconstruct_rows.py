@@ -0,0 +1,85 @@
+"""Measure row reconstruction throughput on a synthetic tabula-like table.
+
+The fixture mimics the Anexo I layout: a header row repeated every page, procedure names
+wrapped onto continuation rows (empty PROCEDIMENTO cell) and sparse OD/AMB markers.
+
+Usage (from B_02_DataTransform/):
+    python -m benchmarks.reconstruct_rows
+    python -m benchmarks.reconstruct_rows --rows 5000000 --rows-per-page 40 --repeat 3
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy
+import pandas
+
+from src.application.reconstruction import reconstruct_rows
+
+COLUMNS = ['PROCEDIMENTO', 'RN\r(alteração)', 'VIGÊNCIA', 'OD', 'AMB', 'HCO', 'HSO', 'REF', 'PAC', 'DUT',
+           'SUBGRUPO', 'GRUPO', 'CAPÍTULO']
+
+def build_synthetic_rol(rows: int, rows_per_page: int = 30, continuation_ratio: float = 0.2,
+                        seed: int = 0) -> pandas.DataFrame:
+    """Synthetic concatenated tabula output with `rows` rows, headers included"""
+    rng = numpy.random.default_rng(seed)
+    data: Dict[str, numpy.ndarray] = {}
+    for column in COLUMNS:
+        values = numpy.array([f"{column} {i}" for i in range(50)], dtype=object)
+        data[column] = values[rng.integers(0, len(values), rows)]
+    # Marker columns are mostly empty, like the real table
+    for column in ('OD', 'AMB', 'HCO', 'HSO', 'PAC'):
+        data[column] = numpy.where(rng.random(rows) < 0.5, column, None).astype(object)
+
+    procedure = numpy.array([f"PROCEDIMENTO {i}" for i in range(rows)], dtype=object)
+    # Continuation rows carry the wrapped tail of the name in another column and an empty key
+    continuation = rng.random(rows) < continuation_ratio
+    continuation[0] = False
+    procedure[continuation] = None
+    data['PROCEDIMENTO'] = procedure
+
+    df = pandas.DataFrame(data, columns=COLUMNS)
+    # One repeated header row at the start of every page
+    header_positions = numpy.arange(rows_per_page, rows, rows_per_page)
+    df.iloc[header_positions] = numpy.array(COLUMNS, dtype=object)
+    return df
+
+def run(rows: int, rows_per_page: int, repeat: int) -> Dict:
+    build_start = time.perf_counter()
+    df = build_synthetic_rol(rows, rows_per_page)
+    build_seconds = time.perf_counter() - build_start
+
+    timings: List[float] = []
+    output_rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = reconstruct_rows(df, 'PROCEDIMENTO')
+        timings.append(time.perf_counter() - start)
+        output_rows = len(result)
+
+    best = min(timings)
+    return {
+        'input_rows': rows,
+        'output_rows': output_rows,
+        'fixture_seconds': round(build_seconds, 3),
+        'seconds': [round(t, 3) for t in timings],
+        'best_seconds': round(best, 3),
+        'rows_per_second': round(rows / best, 1) if best else None,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark header removal and continuation-row merging.")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--rows-per-page', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level='WARNING', format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+    print(json.dumps(run(args.rows, args.rows_per_page, args.repeat), indent=2))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
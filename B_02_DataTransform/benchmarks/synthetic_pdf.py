@@ -0,0 +1,142 @@
+"""Offline generator for lattice-style PDFs shaped like the Anexo I table.
+
+Writes a minimal PDF by hand (no extra dependencies): every page holds one ruled table whose
+first row repeats the header, followed by procedure rows with sparse OD/AMB markers. Some
+procedure names wrap onto a second line inside the same cell, like the real document.
+"""
+import os
+import random
+from typing import List, Optional, Tuple
+
+COLUMNS: List[Tuple[str, float]] = [
+    # (header label, column width in points)
+    ('PROCEDIMENTO', 260.0),
+    ('RN (alteração)', 70.0),
+    ('VIGÊNCIA', 60.0),
+    ('OD', 30.0),
+    ('AMB', 30.0),
+    ('HCO', 30.0),
+    ('HSO', 30.0),
+    ('REF', 30.0),
+    ('PAC', 30.0),
+    ('DUT', 30.0),
+    ('SUBGRUPO', 110.0),
+]
+MARKER_COLUMNS = {'OD', 'AMB', 'HCO', 'HSO', 'REF', 'PAC'}
+
+PAGE_WIDTH = 842.0   # A4 landscape
+PAGE_HEIGHT = 595.0
+MARGIN = 36.0
+ROW_HEIGHT = 14.0
+FONT_SIZE = 7.0
+LINE_SPACING = 8.5
+
+def _pdf_string(text: str) -> bytes:
+    """Literal PDF string in WinAnsi (cp1252) encoding with the special characters escaped"""
+    raw = text.encode('cp1252')
+    return b'(' + raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+def _row_values(rng: random.Random, row_number: int) -> Tuple[List[List[str]], int]:
+    """Cell lines for one body row and the number of text lines it needs"""
+    name = f"PROCEDIMENTO SINTETICO {row_number:07d}"
+    name_lines = [name]
+    if rng.random() < 0.15:
+        # Wrapped name: the second line stays inside the same ruled cell
+        name_lines.append(f"COM DESCRICAO COMPLEMENTAR {rng.randint(1, 999)}")
+
+    cells: List[List[str]] = []
+    for label, _ in COLUMNS:
+        if label == 'PROCEDIMENTO':
+            cells.append(name_lines)
+        elif label in MARKER_COLUMNS:
+            cells.append([label] if rng.random() < 0.5 else [])
+        elif label == 'RN (alteração)':
+            cells.append([f"{rng.randint(400, 470)}/2021"])
+        elif label == 'VIGÊNCIA':
+            cells.append([f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/20{rng.randint(10, 21)}"])
+        elif label == 'DUT':
+            cells.append([str(rng.randint(1, 150))] if rng.random() < 0.2 else [])
+        else:
+            cells.append([f"GRUPO {rng.randint(1, 40)}"])
+    return cells, len(name_lines)
+
+def _page_content(rows: List[Tuple[List[List[str]], int]]) -> bytes:
+    """Content stream drawing the grid and the text of one page"""
+    ops: List[bytes] = [b'0.5 w']
+    x_edges = [MARGIN]
+    for _, width in COLUMNS:
+        x_edges.append(x_edges[-1] + width)
+
+    y = PAGE_HEIGHT - MARGIN
+    y_edges = [y]
+    text_ops: List[bytes] = []
+    for cells, line_count in rows:
+        height = ROW_HEIGHT + (line_count - 1) * LINE_SPACING
+        for column_index, lines in enumerate(cells):
+            for line_index, line in enumerate(lines):
+                baseline = y - 10.0 - line_index * LINE_SPACING
+                text_ops.append(
+                    b'BT /F1 %.1f Tf %.2f %.2f Td ' % (FONT_SIZE, x_edges[column_index] + 2.0, baseline)
+                    + _pdf_string(line) + b' Tj ET'
+                )
+        y -= height
+        y_edges.append(y)
+
+    # Ruling lines: tabula's lattice mode and pdfplumber's 'lines' strategy both rely on them
+    for y_edge in y_edges:
+        ops.append(b'%.2f %.2f m %.2f %.2f l S' % (x_edges[0], y_edge, x_edges[-1], y_edge))
+    for x_edge in x_edges:
+        ops.append(b'%.2f %.2f m %.2f %.2f l S' % (x_edge, y_edges[0], x_edge, y_edges[-1]))
+    return b'\n'.join(ops + text_ops)
+
+def generate_lattice_pdf(output_path: str, pages: int, seed: int = 0) -> Tuple[str, int]:
+    """Write a synthetic `pages`-page PDF; returns the path and the number of body rows written"""
+    rng = random.Random(seed)
+    usable_height = PAGE_HEIGHT - 2 * MARGIN
+    header = ([[label] for label, _ in COLUMNS], 1)
+
+    page_streams: List[bytes] = []
+    row_number = 0
+    for _ in range(pages):
+        rows = [header]
+        used = ROW_HEIGHT
+        while True:
+            cells, line_count = _row_values(rng, row_number + 1)
+            height = ROW_HEIGHT + (line_count - 1) * LINE_SPACING
+            if used + height > usable_height:
+                break
+            rows.append((cells, line_count))
+            used += height
+            row_number += 1
+        page_streams.append(_page_content(rows))
+
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then a (page, content) pair per page
+    objects: List[Optional[bytes]] = [None, None, None]
+    objects[2] = b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>'
+    page_ids = []
+    for stream in page_streams:
+        page_id = len(objects) + 1
+        content_id = page_id + 1
+        page_ids.append(page_id)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.0f %.0f] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (PAGE_WIDTH, PAGE_HEIGHT, content_id)
+        )
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+    objects[0] = b'<< /Type /Catalog /Pages 2 0 R >>'
+    kids = b' '.join(b'%d 0 R' % page_id for page_id in page_ids)
+    objects[1] = b'<< /Type /Pages /Kids [' + kids + b'] /Count %d >>' % len(page_ids)
+
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    with open(output_path, 'wb') as f:
+        f.write(b'%PDF-1.4\n')
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+        xref_offset = f.tell()
+        f.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b'%010d 00000 n \n' % offset)
+        f.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref_offset))
+    return output_path, row_number
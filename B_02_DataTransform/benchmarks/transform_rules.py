@@ -0,0 +1,110 @@
+"""Compare the compiled transform rules with a naive per-row DataFrame.apply implementation.
+
+Both versions apply config.TRANSFORM_RULES to the same synthetic tabula-like table (see
+benchmarks/reconstruct_rows.py) and the results are checked for equality before timing is reported.
+
+Usage (from B_02_DataTransform/):
+    python -m benchmarks.transform_rules
+    python -m benchmarks.transform_rules --rows 1000000 --batch-rows 100000
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas
+
+from src import config
+from src.application.transforms import compile_transform_rules, normalize_header
+from benchmarks.reconstruct_rows import build_synthetic_rol
+
+def naive_transform(df: pandas.DataFrame, rules: List[Dict]) -> pandas.DataFrame:
+    """Same rules evaluated cell by cell inside a row-wise apply, re-reading the rules for every row"""
+    def transform_row(row: pandas.Series) -> pandas.Series:
+        for rule in rules:
+            name = rule['rule']
+            if name == 'normalize_headers':
+                row.index = [normalize_header(label) for label in row.index]
+            elif name == 'strip':
+                row = row.map(lambda value: value.strip() if isinstance(value, str) else value)
+            elif name == 'boolean':
+                true_values = [value.upper() for value in rule['true_values']]
+                for column in rule['columns']:
+                    if column in row.index:
+                        value = row[column]
+                        row[column] = isinstance(value, str) and value.strip().upper() in true_values
+            elif name == 'date':
+                for column in rule['columns']:
+                    if column in row.index:
+                        try:
+                            row[column] = pandas.Timestamp(datetime.strptime(row[column], rule['format']))
+                        except (TypeError, ValueError):
+                            row[column] = pandas.NaT
+        return row
+
+    result = df.apply(transform_row, axis=1)
+    # Restore the dtypes the vectorized path produces
+    for rule in rules:
+        if rule['rule'] == 'boolean':
+            for column in rule['columns']:
+                if column in result.columns:
+                    result[column] = result[column].astype(bool)
+        elif rule['rule'] == 'date':
+            for column in rule['columns']:
+                if column in result.columns:
+                    result[column] = pandas.to_datetime(result[column])
+    return result
+
+def run(rows: int, batch_rows: int, naive_rows: int) -> Dict:
+    rules = config.TRANSFORM_RULES
+    df = build_synthetic_rol(rows)
+    # Realistic dates so the date rule has something to parse
+    df['VIGÊNCIA'] = [f"{day:02d}/04/2021" for day in (df.index % 28 + 1)]
+
+    start = time.perf_counter()
+    transform = compile_transform_rules(rules)
+    compile_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batches = [transform(df.iloc[i:i + batch_rows]) for i in range(0, len(df), batch_rows)]
+    compiled_seconds = time.perf_counter() - start
+    compiled = pandas.concat(batches)
+
+    # The naive version is timed on a slice and extrapolated; a full run would take minutes
+    sample = df.iloc[:naive_rows]
+    start = time.perf_counter()
+    naive = naive_transform(sample, rules)
+    naive_seconds = time.perf_counter() - start
+    pandas.testing.assert_frame_equal(compiled.iloc[:naive_rows], naive, check_dtype=False)
+
+    naive_rows_per_second = naive_rows / naive_seconds if naive_seconds else None
+    compiled_rows_per_second = rows / compiled_seconds if compiled_seconds else None
+    return {
+        'rows': rows,
+        'batch_rows': batch_rows,
+        'compile_seconds': round(compile_seconds, 6),
+        'compiled_seconds': round(compiled_seconds, 3),
+        'compiled_rows_per_second': round(compiled_rows_per_second, 1) if compiled_rows_per_second else None,
+        'naive_sample_rows': naive_rows,
+        'naive_seconds': round(naive_seconds, 3),
+        'naive_rows_per_second': round(naive_rows_per_second, 1) if naive_rows_per_second else None,
+        'speedup': round(compiled_rows_per_second / naive_rows_per_second, 1)
+        if compiled_rows_per_second and naive_rows_per_second else None,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark compiled transform rules against a per-row apply.")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--batch-rows', type=int, default=config.PROCESSING_SPILL_BATCH_ROWS)
+    parser.add_argument('--naive-rows', type=int, default=20_000, help="Rows used to time the per-row version")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level='WARNING', format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+    print(json.dumps(run(args.rows, args.batch_rows, min(args.naive_rows, args.rows)), indent=2))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
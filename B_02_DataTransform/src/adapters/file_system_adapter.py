@@ -1,13 +1,48 @@
 import os
+import time
+import shutil
+import fnmatch
 import zipfile
 import logging
 import pandas
-from typing import Optional
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import PurePosixPath
+from typing import Iterable, List, Optional, Set, Tuple
 from ..application.ports import IFileSystemAdapter
+from ..application.profiling import PipelineProfiler, NULL_PROFILER
 
 logger = logging.getLogger(__name__)
 
+def _format_csv_chunk(chunk: pandas.DataFrame, include_header: bool) -> bytes:
+    """Worker entry point: serialize one row chunk exactly as DataFrame.to_csv would"""
+    return chunk.to_csv(index=False, header=include_header).encode('utf-8')
+
+def _csv_zip_entry(csv_filename_in_zip: str) -> zipfile.ZipInfo:
+    """Entry metadata zipf.write() would derive from a freshly written CSV file"""
+    zinfo = zipfile.ZipInfo(csv_filename_in_zip, date_time=time.localtime(time.time())[:6])
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.external_attr = 0o100644 << 16
+    return zinfo
+
 class LocalFileSystemAdapter(IFileSystemAdapter):
+    def __init__(
+        self,
+        profiler: PipelineProfiler = NULL_PROFILER,
+        csv_workers: int = 1,
+        csv_chunk_rows: int = 100_000,
+        csv_executor: str = 'process'
+    ):
+        # Optional stage timer for the CSV serialization and compression steps
+        self._profiler = profiler
+        # Frames longer than one chunk are formatted by this many workers (1 = single-threaded writer)
+        self._csv_workers = max(1, csv_workers)
+        self._csv_chunk_rows = max(1, csv_chunk_rows)
+        # 'process' sidesteps the GIL for formatting; 'thread' avoids pickling chunks to the workers
+        if csv_executor not in ('process', 'thread'):
+            raise ValueError(f"Unknown CSV executor: '{csv_executor}'")
+        self._csv_executor = csv_executor
+
     def find_and_extract_target_file(
         self,
         zip_path: str,
@@ -66,6 +101,108 @@ class LocalFileSystemAdapter(IFileSystemAdapter):
             logger.error(f"An unexpected error occurred during zip extraction from '{zip_path}': {e}", exc_info=True)
             raise
 
+    def find_and_extract_matching_files(
+        self,
+        zip_paths: List[str],
+        filename_pattern: str,
+        extract_to_dir: str
+    ) -> List[Tuple[str, str, str]]:
+        extracted: List[Tuple[str, str, str]] = []
+        used_dirs: Set[str] = set()
+
+        for zip_path in zip_paths:
+            # A missing or corrupted archive is logged and skipped so the rest of the batch still runs
+            if not os.path.exists(zip_path):
+                logger.error(f"Input ZIP file not found, skipping: {zip_path}")
+                continue
+
+            # Each archive gets its own subfolder so equal file names in different archives don't collide;
+            # archives with the same name in different directories get numbered folders
+            zip_stem = os.path.splitext(os.path.basename(zip_path))[0]
+            folder, n = zip_stem, 1
+            while folder in used_dirs:
+                n += 1
+                folder = f"{zip_stem}_{n}"
+            used_dirs.add(folder)
+            zip_extract_dir = os.path.join(extract_to_dir, folder)
+
+            try:
+                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                    matches = [
+                        name for name in zip_ref.namelist()
+                        if not name.endswith('/') and fnmatch.fnmatch(os.path.basename(name), filename_pattern)
+                    ]
+                    if not matches:
+                        logger.warning(f"No files matching '{filename_pattern}' in ZIP archive: {zip_path}")
+                        continue
+
+                    for name in matches:
+                        # Keep the member's folders: equal file names in different folders must not overwrite each other
+                        parts = PurePosixPath(name).parts
+                        if PurePosixPath(name).is_absolute() or '..' in parts:
+                            logger.warning(f"Skipping unsafe member path '{name}' in '{zip_path}'")
+                            continue
+                        desired_file_path = os.path.join(zip_extract_dir, *parts)
+                        os.makedirs(os.path.dirname(desired_file_path), exist_ok=True)
+                        with zip_ref.open(name) as src, open(desired_file_path, 'wb') as dst:
+                            shutil.copyfileobj(src, dst)
+                        extracted.append((zip_path, name, desired_file_path))
+                        logger.info(f"Extracted '{name}' from '{zip_path}' to '{desired_file_path}'")
+
+            except zipfile.BadZipFile as e:
+                logger.error(f"Failed to open or read ZIP file '{zip_path}', skipping: {e}")
+            except OSError as e:
+                logger.error(f"File system error while extracting from '{zip_path}', skipping: {e}")
+
+        logger.info(f"Extracted {len(extracted)} files matching '{filename_pattern}' from {len(zip_paths)} archives.")
+        return extracted
+
+    def load_dataframe_from_zipped_csv(
+        self,
+        zip_path: str,
+        csv_filename_in_zip: str
+    ) -> Optional[pandas.DataFrame]:
+        if not os.path.exists(zip_path):
+            logger.info(f"No previous output found at: {zip_path}")
+            return None
+
+        try:
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                with zip_ref.open(csv_filename_in_zip) as csv_file:
+                    # Read everything as text, the same way the PDF tables are extracted.
+                    # Wrapped cells keep tabula's unquoted '\r', so only '\n' may end a row
+                    df = pandas.read_csv(
+                        csv_file,
+                        dtype=str,
+                        keep_default_na=False,
+                        na_values=[''],
+                        lineterminator='\n',
+                        encoding='utf-8'
+                    )
+            logger.info(f"Loaded {len(df)} rows from '{csv_filename_in_zip}' in {zip_path}")
+            return df
+        except (zipfile.BadZipFile, KeyError) as e:
+            logger.error(f"Failed to read '{csv_filename_in_zip}' from ZIP file '{zip_path}': {e}")
+            raise
+
+    def save_dataframe_to_csv(
+        self,
+        df: pandas.DataFrame,
+        output_dir: str,
+        csv_filename: str
+    ) -> str:
+        # Create output directory if needed
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+        except OSError as e:
+            logger.error(f"Failed to create output directory '{output_dir}': {e}")
+            raise IOError(f"Failed to create output directory '{output_dir}': {e}") from e
+
+        csv_path = os.path.join(output_dir, csv_filename)
+        df.to_csv(csv_path, index=False, encoding='utf-8')
+        logger.info(f"DataFrame saved to CSV: {csv_path}")
+        return csv_path
+
     def save_dataframe_to_zipped_csv(
         self,
         df: Optional[pandas.DataFrame],
@@ -97,14 +234,26 @@ class LocalFileSystemAdapter(IFileSystemAdapter):
         temp_csv_path = os.path.join(output_dir, f"~temp_{csv_filename_in_zip}.csv")
 
         try:
+            if self._csv_workers > 1 and len(df) > self._csv_chunk_rows:
+                # Large frame: format chunks in parallel and stream them straight into the ZIP entry
+                with self._profiler.stage('csv_write_compress') as stage:
+                    self._write_zipped_csv_parallel(df, final_zip_path, csv_filename_in_zip)
+                    stage.rows = len(df)
+                logger.info(f"Successfully created final output: {final_zip_path}")
+                return
+
             # Save DataFrame to temporary CSV
-            df.to_csv(temp_csv_path, index=False, encoding='utf-8')
+            with self._profiler.stage('csv_write') as stage:
+                df.to_csv(temp_csv_path, index=False, encoding='utf-8')
+                stage.rows = len(df)
             logger.info(f"DataFrame temporarily saved to CSV: {temp_csv_path}")
 
             # Create zip file and add CSV
-            with zipfile.ZipFile(final_zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                zipf.write(temp_csv_path, arcname=csv_filename_in_zip)
-                logger.info(f"Added '{csv_filename_in_zip}' to ZIP archive: {final_zip_path}")
+            with self._profiler.stage('zip_compress') as stage:
+                with zipfile.ZipFile(final_zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                    zipf.write(temp_csv_path, arcname=csv_filename_in_zip)
+                    logger.info(f"Added '{csv_filename_in_zip}' to ZIP archive: {final_zip_path}")
+                stage.rows = len(df)
 
             logger.info(f"Successfully created final output: {final_zip_path}")
 
@@ -125,4 +274,106 @@ class LocalFileSystemAdapter(IFileSystemAdapter):
                     os.remove(temp_csv_path)
                     logger.debug(f"Removed temporary CSV file: {temp_csv_path}")
                 except OSError as rm_err:
-                     logger.warning(f"Could not remove temporary csv file '{temp_csv_path}': {rm_err}")
\ No newline at end of file
+                     logger.warning(f"Could not remove temporary csv file '{temp_csv_path}': {rm_err}")
+
+    def save_batches_to_zipped_csv(
+        self,
+        batches: Iterable[pandas.DataFrame],
+        output_dir: str,
+        csv_filename_in_zip: str,
+        zip_filename: str
+    ) -> int:
+        # Create output directory if needed
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+        except OSError as e:
+            logger.error(f"Failed to create output directory '{output_dir}': {e}")
+            raise IOError(f"Failed to create output directory '{output_dir}': {e}") from e
+
+        final_zip_path = os.path.join(output_dir, zip_filename)
+        rows_written = 0
+        try:
+            with self._profiler.stage('csv_stream') as stage:
+                with zipfile.ZipFile(final_zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                    # The total size is unknown up front, so always allow ZIP64 sizes
+                    with zipf.open(_csv_zip_entry(csv_filename_in_zip), 'w', force_zip64=True) as entry:
+                        for batch in batches:
+                            if batch.empty:
+                                continue
+                            entry.write(_format_csv_chunk(batch, rows_written == 0))
+                            rows_written += len(batch)
+                stage.rows = rows_written
+        except Exception as e:
+            # Clean up on error
+            logger.error(f"Failed to stream batches to zipped CSV: {e}", exc_info=True)
+            if os.path.exists(final_zip_path):
+                try:
+                    os.remove(final_zip_path)
+                    logger.info(f"Removed potentially incomplete zip file due to error: {final_zip_path}")
+                except OSError as rm_err:
+                    logger.warning(f"Could not remove incomplete zip file '{final_zip_path}': {rm_err}")
+            raise
+
+        if rows_written == 0:
+            logger.warning("No rows in the streamed batches, skipping save.")
+            os.remove(final_zip_path)
+            return 0
+
+        logger.info(f"Streamed {rows_written} rows to '{csv_filename_in_zip}' in ZIP archive: {final_zip_path}")
+        return rows_written
+
+    def _create_csv_executor(self) -> Executor:
+        if self._csv_executor == 'thread':
+            return ThreadPoolExecutor(max_workers=self._csv_workers)
+        return ProcessPoolExecutor(max_workers=self._csv_workers)
+
+    def _write_zipped_csv_parallel(
+        self,
+        df: pandas.DataFrame,
+        final_zip_path: str,
+        csv_filename_in_zip: str
+    ) -> None:
+        """Format row chunks on a worker pool while the main thread deflates them in order.
+
+        Deflate runs as a single stream at zipfile's default level, so the compressed entry is
+        byte-identical to zipping the output of df.to_csv(); zlib releases the GIL, so compression
+        overlaps with chunk formatting instead of waiting for the whole CSV.
+        """
+        starts = range(0, len(df), self._csv_chunk_rows)
+        logger.info(
+            f"Writing {len(df)} rows as {len(starts)} chunks of {self._csv_chunk_rows} rows "
+            f"with {self._csv_workers} {self._csv_executor} workers."
+        )
+
+        zinfo = _csv_zip_entry(csv_filename_in_zip)
+
+        # Keep a bounded window of chunks in flight so memory doesn't grow with the frame size
+        max_in_flight = self._csv_workers * 2
+        with self._create_csv_executor() as executor:
+            pending = deque()
+            chunk_iter = iter(starts)
+
+            def submit_next() -> bool:
+                start = next(chunk_iter, None)
+                if start is None:
+                    return False
+                chunk = df.iloc[start:start + self._csv_chunk_rows]
+                pending.append(executor.submit(_format_csv_chunk, chunk, start == 0))
+                return True
+
+            while len(pending) < max_in_flight and submit_next():
+                pass
+
+            first_chunk = pending[0].result()
+            # zipfile only switches to ZIP64 headers for entries it expects to exceed 2 GiB;
+            # estimate the size from the first chunk so small outputs keep the classic header
+            estimated_size = len(first_chunk) * len(starts)
+            force_zip64 = estimated_size * 1.05 > zipfile.ZIP64_LIMIT
+
+            with zipfile.ZipFile(final_zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                with zipf.open(zinfo, 'w', force_zip64=force_zip64) as entry:
+                    while pending:
+                        # Results are consumed in submission order, so chunks land in row order
+                        entry.write(pending.popleft().result())
+                        submit_next()
+            logger.info(f"Added '{csv_filename_in_zip}' to ZIP archive: {final_zip_path}")
@@ -1,12 +1,18 @@
 import pandas
 import tabula
 import logging
-from typing import List
+from typing import List, Optional
 from ..application.ports import IPdfReader
 
 logger = logging.getLogger(__name__)
 
 class TabulaPdfReader(IPdfReader):
+    # tabula reads the whole document in one JVM call, so there is no per-page progress:
+    # reports_pages stays False and set_page_listener raises NotImplementedError
+    def __init__(self, java_options: Optional[List[str]] = None):
+        # Extra JVM flags (e.g. ['-Xmx1024m'] to cap the heap of batch workers)
+        self._java_options = java_options
+
     def extract_tables_from_pdf(self, pdf_path: str) -> List[pandas.DataFrame]:
         # Log the start of PDF extraction process
         logger.info(f"Attempting PDF table extraction using tabula-py from: {pdf_path}")
@@ -16,11 +22,15 @@ class TabulaPdfReader(IPdfReader):
             # - pages='all': Process all pages
             # - lattice=True: Use lattice mode for cleaner table detection
             # - pandas_options={'dtype': str}: Keep all data as strings to preserve formatting
+            read_options = {}
+            if self._java_options:
+                read_options['java_options'] = self._java_options
             tables = tabula.read_pdf(
                 pdf_path,
                 pages='all',
                 lattice=True,
-                pandas_options={'dtype': str}
+                pandas_options={'dtype': str},
+                **read_options
             )
 
             # Handle different return scenarios from tabula:
@@ -0,0 +1,144 @@
+import os
+import time
+import logging
+import pandas
+import pdfplumber
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+from ..application.ports import IPdfReader
+
+logger = logging.getLogger(__name__)
+
+# (page number, seconds, tables found, rows found) reported for every processed page
+PageStats = Tuple[int, float, int, int]
+
+# Lattice-style detection: cell boundaries come from the ruling lines drawn in the PDF,
+# which mirrors tabula's lattice=True mode
+LATTICE_TABLE_SETTINGS = {
+    'vertical_strategy': 'lines',
+    'horizontal_strategy': 'lines',
+}
+
+def _rows_to_dataframe(rows: List[List[Optional[str]]], line_break: str) -> Optional[pandas.DataFrame]:
+    """Convert raw pdfplumber rows into a DataFrame shaped like tabula's lattice output"""
+    if not rows or len(rows) < 2:
+        return None
+
+    def normalize(cell: Optional[str]) -> Optional[str]:
+        # Tabula returns NaN for empty cells and joins wrapped text with '\r'
+        if cell is None or cell == '':
+            return None
+        return cell.replace('\n', line_break)
+
+    header = [normalize(cell) or f"Unnamed: {i}" for i, cell in enumerate(rows[0])]
+    body = [[normalize(cell) for cell in row] for row in rows[1:]]
+    return pandas.DataFrame(body, columns=header, dtype=str)
+
+def _extract_page_range(
+    pdf_path: str,
+    first_page: int,
+    last_page: int,
+    table_settings: Dict,
+    line_break: str
+) -> Tuple[List[pandas.DataFrame], List[PageStats]]:
+    """Worker entry point: extract tables from pages [first_page, last_page) of one PDF"""
+    tables: List[pandas.DataFrame] = []
+    page_stats: List[PageStats] = []
+    # Each worker opens its own handle - pdfplumber objects cannot be shared across processes
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_index in range(first_page, last_page):
+            start = time.perf_counter()
+            page = pdf.pages[page_index]
+            page_tables = [
+                df for df in (_rows_to_dataframe(rows, line_break) for rows in page.extract_tables(table_settings))
+                if df is not None
+            ]
+            # Release cached layout objects so memory stays flat on long documents
+            page.flush_cache()
+            tables.extend(page_tables)
+            page_stats.append((
+                page_index + 1,
+                time.perf_counter() - start,
+                len(page_tables),
+                sum(len(df) for df in page_tables)
+            ))
+    return tables, page_stats
+
+class PdfplumberPdfReader(IPdfReader):
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        pages_per_task: int = 8,
+        table_settings: Optional[Dict] = None,
+        line_break: str = '\r'
+    ):
+        # Number of worker processes (None = one per CPU, 1 = run in the current process)
+        self._max_workers = max_workers or os.cpu_count() or 1
+        # Pages handed to a worker at once; larger chunks amortize the cost of reopening the PDF
+        self._pages_per_task = max(1, pages_per_task)
+        self._table_settings = table_settings or LATTICE_TABLE_SETTINGS
+        self._line_break = line_break
+        self._page_listener = None
+
+    @property
+    def reports_pages(self) -> bool:
+        return True
+
+    def _report_pages(self, page_stats: List[PageStats]) -> None:
+        if self._page_listener is None:
+            return
+        for page_number, seconds, table_count, row_count in page_stats:
+            self._page_listener(page_number, seconds, table_count, row_count)
+
+    def extract_tables_from_pdf(self, pdf_path: str) -> List[pandas.DataFrame]:
+        # Log the start of PDF extraction process
+        logger.info(f"Attempting PDF table extraction using pdfplumber from: {pdf_path}")
+
+        try:
+            with pdfplumber.open(pdf_path) as pdf:
+                page_count = len(pdf.pages)
+            logger.info(f"PDF has {page_count} pages.")
+
+            if page_count == 0:
+                logger.warning(f"No pages found in {pdf_path}.")
+                return []
+
+            # Split the document into contiguous page ranges
+            page_ranges = [
+                (start, min(start + self._pages_per_task, page_count))
+                for start in range(0, page_count, self._pages_per_task)
+            ]
+            workers = min(self._max_workers, len(page_ranges))
+
+            chunks: List[Optional[List[pandas.DataFrame]]] = [None] * len(page_ranges)
+            if workers <= 1:
+                logger.debug("Extracting pages sequentially in the current process.")
+                for index, (first, last) in enumerate(page_ranges):
+                    chunks[index], page_stats = _extract_page_range(
+                        pdf_path, first, last, self._table_settings, self._line_break
+                    )
+                    self._report_pages(page_stats)
+            else:
+                logger.info(f"Extracting {len(page_ranges)} page ranges across {workers} processes.")
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = {
+                        executor.submit(
+                            _extract_page_range, pdf_path, first, last,
+                            self._table_settings, self._line_break
+                        ): index
+                        for index, (first, last) in enumerate(page_ranges)
+                    }
+                    # Report each range as soon as it finishes; tables are kept by range index
+                    # so they still come back in document order
+                    for future in as_completed(futures):
+                        chunks[futures[future]], page_stats = future.result()
+                        self._report_pages(page_stats)
+
+            tables = [df for chunk_tables in chunks for df in chunk_tables]
+            logger.info(f"Found {len(tables)} tables in PDF.")
+            return tables
+
+        except Exception as e:
+            # Log any errors during PDF processing
+            logger.error(f"pdfplumber PDF extraction failed for '{pdf_path}': {e}", exc_info=True)
+            raise
@@ -0,0 +1,216 @@
+import os
+import sys
+import time
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import pandas
+
+from .. import config
+from . import processing
+from .ports import IFileSystemAdapter
+from .pipeline import create_pdf_reader, create_transform, save_processed_data
+from ..adapters.file_system_adapter import LocalFileSystemAdapter
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Columns of the combined batch index (one row per document)
+INDEX_COLUMNS = ['source_zip', 'document', 'status', 'tables', 'rows', 'output_zip', 'seconds', 'error']
+
+def resolve_worker_count(
+    max_total_memory_mb: int,     # Memory budget shared by all workers
+    worker_memory_mb: int,        # Memory reserved for a single worker (JVM heap for tabula)
+    max_workers: Optional[int] = None  # Optional hard cap (defaults to the CPU count)
+) -> int:
+    """Number of concurrent document workers that fits inside the memory budget"""
+    cpu_cap = max_workers or os.cpu_count() or 1
+    memory_cap = max(1, max_total_memory_mb // max(1, worker_memory_mb))
+    return max(1, min(cpu_cap, memory_cap))
+
+def output_name_for(zip_path: str, pdf_path: str) -> str:
+    """Per-document output name; the ZIP name is kept so historical versions don't overwrite each other"""
+    zip_stem = os.path.splitext(os.path.basename(zip_path))[0]
+    pdf_stem = os.path.splitext(os.path.basename(pdf_path))[0]
+    return f"{zip_stem}_{pdf_stem}"
+
+def assign_output_names(documents: List[Tuple[str, str, str]]) -> List[str]:
+    """Output name of every (zip path, member, extracted path) document, unique across the batch.
+    Documents whose names collide (equal file names in different folders or equally named archives)
+    are numbered in discovery order: 'Rol_Anexo_I', 'Rol_Anexo_I_2', ..."""
+    names: List[str] = []
+    used = set()
+    for zip_path, member, _ in documents:
+        base = name = output_name_for(zip_path, member)
+        n = 1
+        while name in used:
+            n += 1
+            name = f"{base}_{n}"
+        used.add(name)
+        names.append(name)
+    return names
+
+def limit_worker_memory(memory_mb: int) -> None:
+    """Pool initializer: caps the worker's data segment at `memory_mb`, so a runaway document fails
+    with MemoryError in its own worker instead of exhausting the machine. Only used for readers that
+    run in the worker itself (pdfplumber); tabula's JVM is capped with -Xmx and would inherit the limit."""
+    if resource is None:
+        logger.warning("Per-worker memory limit unavailable on this platform")
+        return
+    limit = memory_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_DATA)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_DATA, (limit, hard))
+
+def process_document(
+    zip_path: str,             # Archive the document came from (reported in the index)
+    document: str,             # Member name inside the archive (reported in the index)
+    pdf_path: str,             # Extracted PDF to convert
+    name: str,                 # Unique output name (see assign_output_names)
+    output_dir: str,           # Directory for the per-document zipped CSV
+    backend: str,              # PDF reader backend name
+    worker_memory_mb: int      # Memory reserved for this worker
+) -> Dict:
+    """Convert one PDF into its own zipped CSV; never raises so one bad document can't stop the batch"""
+    start = time.perf_counter()
+    result = {
+        'source_zip': zip_path,
+        'document': document,
+        'status': 'failed',
+        'tables': 0,
+        'rows': 0,
+        'output_zip': None,
+        'error': None,
+    }
+    try:
+        # Parallelism comes from the document pool, so each reader runs single-process
+        # and tabula's JVM heap is capped to this worker's share of the memory budget
+        pdf_reader = create_pdf_reader(
+            backend,
+            max_workers=1,
+            java_options=[f"-Xmx{worker_memory_mb}m"]
+        )
+        file_system: IFileSystemAdapter = LocalFileSystemAdapter()
+
+        raw_tables = pdf_reader.extract_tables_from_pdf(pdf_path)
+        result['tables'] = len(raw_tables)
+        with tempfile.TemporaryDirectory() as spill_dir:
+            # Each worker keeps its Python-side combine within its share of the memory budget
+            processed_data = processing.process_extracted_tables(
+                tables=raw_tables,
+                column_rename_map=config.COLUMN_RENAME_MAP,
+                key_column=config.ROW_KEY_COLUMN,
+                memory_limit_mb=worker_memory_mb,
+                spill_dir=spill_dir,
+                spill_batch_rows=config.PROCESSING_SPILL_BATCH_ROWS,
+                transform=create_transform()
+            )
+            del raw_tables
+
+            if processed_data is None:
+                result['status'] = 'empty'
+            else:
+                zip_filename = f"{name}.zip"
+                result['rows'] = save_processed_data(
+                    file_system,
+                    processed_data,
+                    output_dir=output_dir,
+                    csv_filename_in_zip=f"{name}.csv",
+                    zip_filename=zip_filename
+                )
+                result['output_zip'] = zip_filename
+                result['status'] = 'ok'
+
+    except Exception as e:
+        logger.error(f"Failed to convert '{pdf_path}': {e}", exc_info=True)
+        result['error'] = f"{type(e).__name__}: {e}"
+
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+def run_batch_pipeline(
+    zip_paths: Optional[List[str]] = None,
+    filename_pattern: Optional[str] = None,
+    output_dir: Optional[str] = None
+) -> List[Dict]:
+    """Convert every matching PDF found across one or more ZIP archives"""
+    zip_paths = zip_paths or config.BATCH_INPUT_ZIP_PATHS
+    filename_pattern = filename_pattern or config.BATCH_FILENAME_PATTERN
+    output_dir = output_dir or config.BATCH_OUTPUT_DIR
+    logger.info(f"Starting batch transformation of '{filename_pattern}' across {len(zip_paths)} archives.")
+
+    file_system: IFileSystemAdapter = LocalFileSystemAdapter()
+    results: List[Dict] = []
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Step 1: Discover and extract every matching PDF
+        documents = file_system.find_and_extract_matching_files(
+            zip_paths=zip_paths,
+            filename_pattern=filename_pattern,
+            extract_to_dir=temp_dir
+        )
+        if not documents:
+            logger.error("Batch failed: no matching documents found in the input archives.")
+            sys.exit(1)
+
+        # Step 2: Convert documents on a memory-bounded worker pool
+        workers = resolve_worker_count(config.BATCH_MAX_TOTAL_MEMORY_MB, config.BATCH_WORKER_MEMORY_MB)
+        workers = min(workers, len(documents))
+        logger.info(
+            f"Converting {len(documents)} documents with {workers} workers "
+            f"({config.BATCH_WORKER_MEMORY_MB} MB each, {config.BATCH_MAX_TOTAL_MEMORY_MB} MB total)."
+        )
+        task_args = [
+            (zip_path, member, pdf_path, name, output_dir, config.PDF_READER_BACKEND, config.BATCH_WORKER_MEMORY_MB)
+            for (zip_path, member, pdf_path), name in zip(documents, assign_output_names(documents))
+        ]
+
+        if workers == 1:
+            results = [process_document(*args) for args in task_args]
+        else:
+            # tabula's JVM heap is capped with -Xmx; readers running inside the worker get an OS limit
+            initializer = None if config.PDF_READER_BACKEND == 'tabula' else limit_worker_memory
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=initializer, initargs=(config.BATCH_WORKER_MEMORY_MB,)
+            ) as executor:
+                futures = {executor.submit(process_document, *args): args for args in task_args}
+                for future in as_completed(futures):
+                    zip_path, member, pdf_path = futures[future][:3]
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        # Worker crashed (e.g. killed for exceeding memory) - record it and keep going
+                        logger.error(f"Worker crashed while converting '{pdf_path}': {e}")
+                        results.append({
+                            'source_zip': zip_path,
+                            'document': member,
+                            'status': 'failed',
+                            'tables': 0,
+                            'rows': 0,
+                            'output_zip': None,
+                            'seconds': None,
+                            'error': f"{type(e).__name__}: {e}",
+                        })
+            # Keep the index in discovery order regardless of completion order
+            order = {(zip_path, member): i for i, (zip_path, member, _) in enumerate(documents)}
+            results.sort(key=lambda r: order[(r['source_zip'], r['document'])])
+
+    # Step 3: Write the combined index
+    index_df = pandas.DataFrame(results, columns=INDEX_COLUMNS)
+    file_system.save_dataframe_to_csv(index_df, output_dir, config.BATCH_INDEX_FILENAME)
+
+    succeeded = sum(1 for r in results if r['status'] == 'ok')
+    failed = sum(1 for r in results if r['status'] == 'failed')
+    logger.info(f"Batch Summary: {succeeded} converted, {failed} failed, {len(results) - succeeded - failed} empty.")
+
+    if succeeded == 0:
+        logger.error("Batch failed: no document was converted successfully.")
+        sys.exit(1)
+    return results
@@ -0,0 +1,101 @@
+import io
+import pandas
+import logging
+from dataclasses import dataclass
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+CHANGE_TYPE_COLUMN = 'change_type'  # Column added to the delta output ('added', 'removed', 'changed')
+_KEY_HASH = '__key_hash'
+_ROW_HASH = '__row_hash'
+
+@dataclass
+class RolDiff:
+    """Rows that differ between two versions of the processed Rol table"""
+    added: pandas.DataFrame    # Rows only present in the new version
+    removed: pandas.DataFrame  # Rows only present in the previous version
+    changed: pandas.DataFrame  # New version of rows whose key exists in both but whose values differ
+
+    @property
+    def is_empty(self) -> bool:
+        return self.added.empty and self.removed.empty and self.changed.empty
+
+    def to_delta_frame(self) -> pandas.DataFrame:
+        """Single frame with a leading change_type column, suitable for one compact delta file"""
+        parts = []
+        for change_type, frame in (('added', self.added), ('removed', self.removed), ('changed', self.changed)):
+            if not frame.empty:
+                parts.append(frame.assign(**{CHANGE_TYPE_COLUMN: change_type}))
+        if not parts:
+            return pandas.DataFrame(columns=[CHANGE_TYPE_COLUMN] + list(self.added.columns))
+        delta = pandas.concat(parts, ignore_index=True)
+        return delta[[CHANGE_TYPE_COLUMN] + [c for c in delta.columns if c != CHANGE_TYPE_COLUMN]]
+
+def _as_written(df: pandas.DataFrame) -> pandas.DataFrame:
+    """The frame as it reads back from the CSV output. Typed columns from the transform rules are
+    formatted by DataFrame.to_csv (a midnight datetime is written '2021-04-01', not str()'s
+    '2021-04-01 00:00:00'), so they go through the same write and read as the output file."""
+    if all(dtype == object for dtype in df.dtypes):
+        return df
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    buffer.seek(0)
+    # Same options as LocalFileSystemAdapter.load_dataframe_from_zipped_csv
+    written = pandas.read_csv(buffer, dtype=str, keep_default_na=False, na_values=[''], lineterminator='\n')
+    written.columns = df.columns
+    written.index = df.index
+    return written
+
+def _as_text(df: pandas.DataFrame, columns: List[str]) -> pandas.DataFrame:
+    """String view of the frame so values written to and read back from CSV compare equal"""
+    text = _as_written(df).reindex(columns=columns).astype(object)
+    return text.where(text.notna(), '').astype(str)
+
+def _hashed(df: pandas.DataFrame, key_columns: List[str], columns: List[str]) -> pandas.DataFrame:
+    text = _as_text(df, columns)
+    # Repeated keys are told apart by their occurrence number, so duplicates still pair up deterministically
+    occurrence = text.groupby(key_columns, sort=False).cumcount().astype(str).rename('__occurrence')
+    keys = pandas.concat([text[key_columns], occurrence], axis=1)
+    return pandas.DataFrame({
+        _KEY_HASH: pandas.util.hash_pandas_object(keys, index=False).to_numpy(),
+        _ROW_HASH: pandas.util.hash_pandas_object(text, index=False).to_numpy(),
+    }, index=df.index)
+
+def compute_rol_diff(
+    new_df: pandas.DataFrame,       # Freshly processed table
+    previous_df: pandas.DataFrame,  # Table from the previous output
+    key_columns: List[str]          # Columns identifying a procedure
+) -> RolDiff:
+    """Hash-join two versions of the table by key and classify added, removed and changed rows"""
+    missing = [c for c in key_columns if c not in new_df.columns or c not in previous_df.columns]
+    if missing:
+        raise ValueError(f"Diff key columns not found in both tables: {missing}")
+
+    # Compare over the union of columns so a column added or dropped between versions counts as a change
+    columns = list(new_df.columns) + [c for c in previous_df.columns if c not in new_df.columns]
+    new_hashes = _hashed(new_df, key_columns, columns)
+    previous_hashes = _hashed(previous_df, key_columns, columns)
+
+    joined = new_hashes.reset_index().merge(
+        previous_hashes.reset_index(),
+        on=_KEY_HASH,
+        how='outer',
+        suffixes=('_new', '_previous'),
+        indicator=True
+    )
+    added_index = joined.loc[joined['_merge'] == 'left_only', 'index_new']
+    removed_index = joined.loc[joined['_merge'] == 'right_only', 'index_previous']
+    both = joined[joined['_merge'] == 'both']
+    changed_index = both.loc[both[f'{_ROW_HASH}_new'] != both[f'{_ROW_HASH}_previous'], 'index_new']
+
+    diff = RolDiff(
+        added=new_df.loc[added_index.astype(new_df.index.dtype)].reset_index(drop=True),
+        removed=previous_df.loc[removed_index.astype(previous_df.index.dtype)].reset_index(drop=True),
+        changed=new_df.loc[changed_index.astype(new_df.index.dtype)].reset_index(drop=True),
+    )
+    logger.info(
+        f"Diff against previous output: {len(diff.added)} added, "
+        f"{len(diff.removed)} removed, {len(diff.changed)} changed."
+    )
+    return diff
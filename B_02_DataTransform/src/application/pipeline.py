@@ -1,23 +1,127 @@
+import os
 import tempfile
 import logging
 import sys
 import zipfile
+from typing import List, Optional
 
 from .. import config
 from . import processing
+from . import diff
 from .ports import IFileSystemAdapter, IPdfReader
+from .profiling import PipelineProfiler, NULL_PROFILER
+from .transforms import CompiledTransform, compile_transform_rules
 from ..adapters.file_system_adapter import LocalFileSystemAdapter
-from ..adapters.pdf_reader_adapter import TabulaPdfReader
 
 logger = logging.getLogger(__name__)
 
-def run_pipeline():
+def create_pdf_reader(
+    backend: str,
+    max_workers: Optional[int] = None,
+    java_options: Optional[List[str]] = None
+) -> IPdfReader:
+    """Build the configured PDF reader (imports are lazy so unused backends need not be installed)"""
+    if backend == 'tabula':
+        from ..adapters.pdf_reader_adapter import TabulaPdfReader
+        return TabulaPdfReader(java_options=java_options)
+    if backend == 'pdfplumber':
+        from ..adapters.pdfplumber_reader_adapter import PdfplumberPdfReader
+        return PdfplumberPdfReader(max_workers=max_workers or config.PDF_READER_MAX_WORKERS)
+    raise ValueError(f"Unknown PDF reader backend: '{backend}'")
+
+def create_transform() -> Optional[CompiledTransform]:
+    """Compile the configured transform rules (None when they are disabled)"""
+    if not config.TRANSFORM_RULES_ENABLED:
+        return None
+    return compile_transform_rules(config.TRANSFORM_RULES)
+
+def remove_stale_delta() -> None:
+    """Delete the delta left by an earlier run, so it is never mistaken for this run's changes"""
+    delta_path = os.path.join(config.OUTPUT_DIR, config.DIFF_OUTPUT_ZIP_FILENAME)
+    if os.path.exists(delta_path):
+        os.remove(delta_path)
+        logger.info(f"Removed the previous delta: {delta_path}")
+
+def write_delta(file_system: IFileSystemAdapter, processed_data) -> None:
+    """Diff the new table against the previous full output and save the delta file.
+    Whenever no delta is written, the previous run's delta is removed."""
+    logger.info("Step 3b: Computing diff against the previous output.")
+    previous_data = file_system.load_dataframe_from_zipped_csv(
+        zip_path=os.path.join(config.OUTPUT_DIR, config.FINAL_ZIP_FILENAME),
+        csv_filename_in_zip=config.OUTPUT_CSV_FILENAME
+    )
+    if previous_data is None:
+        logger.info("No previous output to diff against; the full output is the baseline.")
+        remove_stale_delta()
+        return
+
+    try:
+        rol_diff = diff.compute_rol_diff(processed_data, previous_data, config.DIFF_KEY_COLUMNS)
+    except ValueError as e:
+        # A diff problem must not block the full export
+        logger.warning(f"Skipping diff: {e}")
+        remove_stale_delta()
+        return
+
+    if rol_diff.is_empty:
+        logger.info("No changes since the previous output; no delta written.")
+        remove_stale_delta()
+        return
+
+    file_system.save_dataframe_to_zipped_csv(
+        df=rol_diff.to_delta_frame(),
+        output_dir=config.OUTPUT_DIR,
+        csv_filename_in_zip=config.DIFF_OUTPUT_CSV_FILENAME,
+        zip_filename=config.DIFF_OUTPUT_ZIP_FILENAME
+    )
+
+def save_processed_data(
+    file_system: IFileSystemAdapter,
+    processed_data,               # DataFrame or processing.OutOfCoreTable
+    output_dir: str,
+    csv_filename_in_zip: str,
+    zip_filename: str
+) -> int:
+    """Write in-memory or spilled results to a zipped CSV; returns the number of rows written"""
+    if isinstance(processed_data, processing.OutOfCoreTable):
+        try:
+            return file_system.save_batches_to_zipped_csv(
+                batches=processed_data.iter_batches(),
+                output_dir=output_dir,
+                csv_filename_in_zip=csv_filename_in_zip,
+                zip_filename=zip_filename
+            )
+        finally:
+            processed_data.close()
+
+    file_system.save_dataframe_to_zipped_csv(
+        df=processed_data,
+        output_dir=output_dir,
+        csv_filename_in_zip=csv_filename_in_zip,
+        zip_filename=zip_filename
+    )
+    return len(processed_data)
+
+def run_pipeline(profiler: PipelineProfiler = NULL_PROFILER):
     # Start the data processing pipeline
     logger.info("Starting data transformation pipeline orchestration.")
 
     # Initialize adapters for file operations and PDF reading
-    file_system: IFileSystemAdapter = LocalFileSystemAdapter()
-    pdf_reader: IPdfReader = TabulaPdfReader()
+    file_system: IFileSystemAdapter = LocalFileSystemAdapter(
+        profiler=profiler,
+        csv_workers=config.CSV_WRITER_WORKERS,
+        csv_chunk_rows=config.CSV_WRITER_CHUNK_ROWS,
+        csv_executor=config.CSV_WRITER_EXECUTOR
+    )
+    pdf_reader: IPdfReader = create_pdf_reader(config.PDF_READER_BACKEND)
+    logger.info(f"Using PDF reader backend: {config.PDF_READER_BACKEND}")
+    if pdf_reader.reports_pages:
+        pdf_reader.set_page_listener(profiler.record_page)
+    elif profiler is not NULL_PROFILER:
+        logger.warning(
+            f"The '{config.PDF_READER_BACKEND}' reader does not report pages; "
+            "use PDF_READER_BACKEND = 'pdfplumber' for per-page timings"
+        )
 
     # Create temporary directory for intermediate files
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -25,38 +129,66 @@ def run_pipeline():
         try:
             # Step 1: Extract PDF from source ZIP file
             logger.info("Step 1: Extracting PDF from source ZIP.")
-            extracted_pdf_path = file_system.find_and_extract_target_file(
-                zip_path=config.INPUT_ZIP_PATH,
-                target_filename_part=config.TARGET_FILENAME_PART,
-                extract_to_dir=temp_dir
-            )
+            with profiler.stage('extract_pdf_from_zip'):
+                extracted_pdf_path = file_system.find_and_extract_target_file(
+                    zip_path=config.INPUT_ZIP_PATH,
+                    target_filename_part=config.TARGET_FILENAME_PART,
+                    extract_to_dir=temp_dir
+                )
             logger.info(f"PDF extracted to: {extracted_pdf_path}")
 
             # Step 2: Extract tables from the PDF
             logger.info("Step 2: Extracting tables from PDF.")
-            raw_tables = pdf_reader.extract_tables_from_pdf(extracted_pdf_path)
+            with profiler.stage('extract_tables') as stage:
+                raw_tables = pdf_reader.extract_tables_from_pdf(extracted_pdf_path)
+                stage.tables = len(raw_tables)
+                stage.rows = sum(len(df) for df in raw_tables)
             logger.info(f"Extracted {len(raw_tables)} raw tables.")
 
             # Step 3: Process the extracted tables
             logger.info("Step 3: Processing extracted tables.")
-            processed_data = processing.process_extracted_tables(
-                tables=raw_tables,
-                column_rename_map=config.COLUMN_RENAME_MAP
-            )
+            with profiler.stage('process') as stage:
+                processed_data = processing.process_extracted_tables(
+                    tables=raw_tables,
+                    column_rename_map=config.COLUMN_RENAME_MAP,
+                    profiler=profiler,
+                    key_column=config.ROW_KEY_COLUMN,
+                    memory_limit_mb=config.PROCESSING_MEMORY_LIMIT_MB,
+                    spill_dir=temp_dir,
+                    spill_batch_rows=config.PROCESSING_SPILL_BATCH_ROWS,
+                    transform=create_transform()
+                )
+                stage.tables = len(raw_tables)
+                if isinstance(processed_data, processing.OutOfCoreTable):
+                    stage.rows = processed_data.spilled_rows
+                else:
+                    stage.rows = 0 if processed_data is None else len(processed_data)
+            # The raw tables are no longer needed; let them go before the output is written
+            del raw_tables
             
             # Check if processing returned valid data
             if processed_data is None:
                  logger.warning("Processing resulted in no data. Skipping save step.")
             else:
                  logger.info("Processing complete.")
+                 # Step 3b: Write only the rows that changed since the previous output
+                 if config.DIFF_ENABLED and isinstance(processed_data, processing.OutOfCoreTable):
+                     logger.warning("Diff is not available when the table is combined on disk; skipping delta.")
+                     remove_stale_delta()
+                 elif config.DIFF_ENABLED:
+                     with profiler.stage('diff') as stage:
+                         write_delta(file_system, processed_data)
+                         stage.rows = len(processed_data)
                  # Step 4: Save processed data to zipped CSV
                  logger.info("Step 4: Saving processed data to zipped CSV.")
-                 file_system.save_dataframe_to_zipped_csv(
-                     df=processed_data,
-                     output_dir=config.OUTPUT_DIR,
-                     csv_filename_in_zip=config.OUTPUT_CSV_FILENAME,
-                     zip_filename=config.FINAL_ZIP_FILENAME
-                 )
+                 with profiler.stage('save') as stage:
+                     stage.rows = save_processed_data(
+                         file_system,
+                         processed_data,
+                         output_dir=config.OUTPUT_DIR,
+                         csv_filename_in_zip=config.OUTPUT_CSV_FILENAME,
+                         zip_filename=config.FINAL_ZIP_FILENAME
+                     )
                  logger.info("Save operation complete.")
 
             logger.info("Data transformation pipeline finished successfully.")
@@ -1,6 +1,6 @@
 import abc  # For creating abstract base classes
 import pandas  # For DataFrame type hints
-from typing import List, Optional  # For type annotations
+from typing import Callable, Iterable, List, Optional, Tuple  # For type annotations
 
 # Abstract base class defining file system operations interface
 class IFileSystemAdapter(abc.ABC):
@@ -15,6 +15,16 @@ class IFileSystemAdapter(abc.ABC):
         """Find a file in ZIP archive and extract it to specified directory"""
         pass
 
+    @abc.abstractmethod
+    def find_and_extract_matching_files(
+        self,
+        zip_paths: List[str],      # ZIP archives to search
+        filename_pattern: str,     # Glob pattern matched against member file names
+        extract_to_dir: str        # Directory to extract the files to (one subfolder per ZIP, member folders kept)
+    ) -> List[Tuple[str, str, str]]:  # Returns (source ZIP path, member name, extracted file path) triples
+        """Find every matching file across several ZIP archives and extract them"""
+        pass
+
     @abc.abstractmethod
     def save_dataframe_to_zipped_csv(
         self,
@@ -26,6 +36,36 @@ class IFileSystemAdapter(abc.ABC):
         """Save DataFrame to CSV and compress it into a ZIP file"""
         pass
 
+    @abc.abstractmethod
+    def save_batches_to_zipped_csv(
+        self,
+        batches: Iterable[pandas.DataFrame],  # Frames with identical columns, written in order
+        output_dir: str,                      # Directory to save the ZIP file
+        csv_filename_in_zip: str,             # Name for CSV inside the ZIP
+        zip_filename: str                     # Name for the output ZIP file
+    ) -> int:                                 # Returns the number of rows written
+        """Stream DataFrame batches into a single zipped CSV without holding the whole table"""
+        pass
+
+    @abc.abstractmethod
+    def load_dataframe_from_zipped_csv(
+        self,
+        zip_path: str,              # Path to a ZIP produced by save_dataframe_to_zipped_csv
+        csv_filename_in_zip: str    # Name of the CSV inside the ZIP
+    ) -> Optional[pandas.DataFrame]:  # Returns None when the ZIP doesn't exist
+        """Read a previously saved zipped CSV back into a DataFrame (all columns as strings)"""
+        pass
+
+    @abc.abstractmethod
+    def save_dataframe_to_csv(
+        self,
+        df: pandas.DataFrame,  # DataFrame to save
+        output_dir: str,       # Directory to save the CSV file
+        csv_filename: str      # Name of the CSV file
+    ) -> str:                  # Returns path to the written file
+        """Save DataFrame to a plain (uncompressed) CSV file"""
+        pass
+
 # Abstract base class defining PDF reading operations interface
 class IPdfReader(abc.ABC):
     
@@ -35,4 +75,23 @@ class IPdfReader(abc.ABC):
         pdf_path: str  # Path to the input PDF file
     ) -> List[pandas.DataFrame]:  # Returns list of extracted DataFrames
         """Extract all tables from a PDF file and return as DataFrames"""
-        pass
\ No newline at end of file
+        pass
+
+    def set_page_listener(
+        self,
+        listener: Optional[Callable[[int, float, int, int], None]]  # (page, seconds, tables, rows)
+    ) -> None:
+        """Register a per-page progress callback, called as each page range finishes.
+
+        Only readers whose `reports_pages` is True support it; tabula reads the whole
+        document in one call and has no per-page data to report, so it raises instead
+        of accepting a listener that would never fire.
+        """
+        if not self.reports_pages:
+            raise NotImplementedError(f"{type(self).__name__} does not report per-page progress")
+        self._page_listener = listener
+
+    @property
+    def reports_pages(self) -> bool:
+        """Whether the reader calls the page listener; tabula reads the whole document in one call"""
+        return False
\ No newline at end of file
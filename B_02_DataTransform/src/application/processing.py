@@ -1,13 +1,71 @@
+import os
 import pandas
 import logging
-from typing import List, Dict, Optional
+import tempfile
+from typing import Iterator, List, Dict, Optional, Union
+
+from .profiling import PipelineProfiler, NULL_PROFILER
+from .reconstruction import reconstruct_rows, reconstruct_batches
+from .spill import SpilledTables, arrow_available
+from .transforms import CompiledTransform
 
 logger = logging.getLogger(__name__)
 
+class OutOfCoreTable:
+    """Processed table kept on disk; renaming and row reconstruction happen while streaming batches"""
+
+    def __init__(
+        self,
+        store: SpilledTables,
+        column_rename_map: Dict[str, str],
+        key_column: Optional[str],
+        batch_rows: int,
+        transform: Optional[CompiledTransform] = None
+    ):
+        self._store = store
+        self._key_column = key_column if key_column in store.columns else None
+        self._batch_rows = batch_rows
+        self._transform = transform
+        # Headers after the transform rules, found by running them on an empty frame
+        transformed_columns = list(store.columns)
+        if transform is not None:
+            transformed_columns = list(transform(pandas.DataFrame(columns=store.columns)).columns)
+        # Resolved once here instead of for every batch
+        self._rename_actual = {k: v for k, v in column_rename_map.items() if k in transformed_columns}
+        self.columns = [self._rename_actual.get(column, column) for column in transformed_columns]
+        self.spilled_rows = store.num_rows  # Row count before continuation rows are merged
+
+    def iter_batches(self) -> Iterator[pandas.DataFrame]:
+        batches = self._store.iter_batches(self._batch_rows)
+        if self._key_column:
+            batches = reconstruct_batches(batches, self._key_column)
+        for batch in batches:
+            if self._transform is not None:
+                batch = self._transform(batch)
+            yield batch.rename(columns=self._rename_actual)
+
+    def close(self) -> None:
+        """Remove the spill files"""
+        self._store.cleanup()
+
+def estimate_memory_mb(tables: List[pandas.DataFrame]) -> float:
+    """In-memory size of the tables including the Python string objects"""
+    total_bytes = sum(
+        int(df.memory_usage(index=True, deep=True).sum())
+        for df in tables if isinstance(df, pandas.DataFrame)
+    )
+    return total_bytes / (1024 * 1024)
+
 def process_extracted_tables(
     tables: List[pandas.DataFrame],  # List of DataFrames to process
-    column_rename_map: Dict[str, str]  # Dictionary for renaming columns
-) -> Optional[pandas.DataFrame]:  # Returns processed DataFrame or None
+    column_rename_map: Dict[str, str],  # Dictionary for renaming columns
+    profiler: PipelineProfiler = NULL_PROFILER,  # Optional stage timer
+    key_column: Optional[str] = None,  # Column used to detect repeated headers and wrapped rows (None = skip)
+    memory_limit_mb: Optional[float] = None,  # Above this estimate the tables are combined on disk (None = never)
+    spill_dir: Optional[str] = None,  # Where spilled tables are written (a temporary directory if None)
+    spill_batch_rows: int = 100_000,  # Rows per batch when streaming a spilled table
+    transform: Optional[CompiledTransform] = None  # Compiled rules applied before renaming (None = skip)
+) -> Optional[Union[pandas.DataFrame, OutOfCoreTable]]:  # Returns processed data or None
     """Process and combine multiple DataFrames from PDF tables"""
     
     # Log start of processing
@@ -16,22 +74,57 @@ def process_extracted_tables(
         logger.warning("Received an empty list of tables to process.")
         return None
 
+    # Concatenating needs the tables plus a full copy in memory; past the ceiling, combine on disk instead
+    store: Optional[SpilledTables] = None
+    if memory_limit_mb is not None:
+        estimated_mb = estimate_memory_mb(tables) * 2
+        if estimated_mb > memory_limit_mb:
+            if arrow_available():
+                logger.info(
+                    f"Estimated combine size {estimated_mb:.0f} MB exceeds {memory_limit_mb} MB; "
+                    f"spilling cleaned tables to disk."
+                )
+                store_dir = (
+                    os.path.join(spill_dir, 'spilled_tables') if spill_dir
+                    else tempfile.mkdtemp(prefix='spilled_tables_')
+                )
+                store = SpilledTables(store_dir)
+            else:
+                logger.warning(
+                    f"Estimated combine size {estimated_mb:.0f} MB exceeds {memory_limit_mb} MB "
+                    f"but pyarrow is not installed; combining in memory."
+                )
+
     # Step 1: Clean each table
     processed_tables: List[pandas.DataFrame] = []
-    for i, df in enumerate(tables):
-        # Check if item is actually a DataFrame
-        if not isinstance(df, pandas.DataFrame):
-            logger.warning(f"Item at index {i} is not a DataFrame ({type(df)}), skipping.")
-            continue
+    with profiler.stage('clean') as stage:
+        for i, df in enumerate(tables):
+            # Check if item is actually a DataFrame
+            if not isinstance(df, pandas.DataFrame):
+                logger.warning(f"Item at index {i} is not a DataFrame ({type(df)}), skipping.")
+                continue
+
+            # Remove completely empty rows and columns
+            df_cleaned = df.dropna(axis=1, how='all').dropna(axis=0, how='all')
 
-        # Remove completely empty rows and columns
-        df_cleaned = df.dropna(axis=1, how='all').dropna(axis=0, how='all')
+            # Keep only non-empty DataFrames
+            if df_cleaned.empty:
+                logger.debug(f"Table at index {i} was empty after cleaning, discarding.")
+            elif store is not None:
+                # Out-of-core mode: only one cleaned table is held in memory at a time
+                store.append(df_cleaned)
+            else:
+                processed_tables.append(df_cleaned)
+        stage.tables = len(tables)
+        stage.rows = store.num_rows if store is not None else sum(len(df) for df in processed_tables)
 
-        # Keep only non-empty DataFrames
-        if not df_cleaned.empty:
-            processed_tables.append(df_cleaned)
-        else:
-            logger.debug(f"Table at index {i} was empty after cleaning, discarding.")
+    if store is not None:
+        if store.num_rows == 0:
+            logger.warning("No valid tables remaining after cleaning.")
+            store.cleanup()
+            return None
+        logger.info(f"Spilled {store.num_rows} rows across {len(store.columns)} columns to disk.")
+        return OutOfCoreTable(store, column_rename_map, key_column, spill_batch_rows, transform)
 
     logger.info(f"Retained {len(processed_tables)} non-empty tables after cleaning.")
 
@@ -43,9 +136,24 @@ def process_extracted_tables(
     # Step 2: Combine and transform tables
     try:
         # Combine all cleaned tables into one DataFrame
-        combined_df = pandas.concat(processed_tables, ignore_index=True)
+        with profiler.stage('concat') as stage:
+            combined_df = pandas.concat(processed_tables, ignore_index=True)
+            stage.tables = len(processed_tables)
+            stage.rows = len(combined_df)
         logger.info(f"Combined DataFrame shape before renaming: {combined_df.shape}")
 
+        # Drop page headers and rejoin rows that tabula split across lines or pages
+        if key_column:
+            with profiler.stage('reconstruct') as stage:
+                stage.rows = len(combined_df)
+                combined_df = reconstruct_rows(combined_df, key_column)
+
+        # Configured value and header rules (compiled once by the caller)
+        if transform is not None:
+            with profiler.stage('transform') as stage:
+                stage.rows = len(combined_df)
+                combined_df = transform(combined_df)
+
         # Only rename columns that actually exist in the DataFrame
         rename_actual = {k: v for k, v in column_rename_map.items() if k in combined_df.columns}
         if rename_actual:
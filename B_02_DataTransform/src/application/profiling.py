@@ -0,0 +1,233 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional
+
+try:
+    import resource  # Unix only - used for the process peak RSS
+except ImportError:
+    resource = None
+
+try:
+    import psutil  # Gives the current RSS, sampled for per-stage peaks (listed in requirements.txt)
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+RSS_SAMPLE_SECONDS = 0.05  # Interval of the background RSS sampler behind each stage's rss_peak_mb
+
+def _current_rss_mb() -> Optional[float]:
+    """Current resident set size in MB (None when psutil is not installed)"""
+    if psutil is None:
+        return None
+    return round(psutil.Process().memory_info().rss / (1024 * 1024), 1)
+
+def _max_rss_mb() -> Optional[float]:
+    """Peak resident set size of the process so far in MB (None on platforms without `resource`)"""
+    if resource is None:
+        return None
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(max_rss / divisor, 1)
+
+class StageRecord:
+    """Measurements for one pipeline stage; callers fill in `tables`/`rows` for throughput figures"""
+
+    def __init__(self, name: str, parent: Optional[str]):
+        self.name = name
+        self.parent = parent
+        self.seconds = 0.0
+        self.tables: Optional[int] = None
+        self.rows: Optional[int] = None
+        self.tracemalloc_peak_mb: Optional[float] = None
+        self.rss_start_mb: Optional[float] = None
+        self.rss_end_mb: Optional[float] = None
+        self.rss_peak_mb: Optional[float] = None  # Highest RSS sampled while this stage ran
+        self._peak_bytes = 0
+
+    def to_dict(self) -> Dict:
+        record = {
+            'name': self.name,
+            'parent': self.parent,
+            'seconds': round(self.seconds, 4),
+            'tables': self.tables,
+            'rows': self.rows,
+            'tables_per_second': None,
+            'rows_per_second': None,
+            'tracemalloc_peak_mb': self.tracemalloc_peak_mb,
+            'rss_start_mb': self.rss_start_mb,
+            'rss_end_mb': self.rss_end_mb,
+            'rss_peak_mb': self.rss_peak_mb,
+        }
+        if self.seconds > 0:
+            if self.tables is not None:
+                record['tables_per_second'] = round(self.tables / self.seconds, 2)
+            if self.rows is not None:
+                record['rows_per_second'] = round(self.rows / self.seconds, 2)
+        return record
+
+class PipelineProfiler:
+    """Collects per-stage and per-page timings plus memory figures and writes them as a JSON report"""
+
+    def __init__(self, trace_memory: bool = True):
+        # tracemalloc gives exact Python allocation peaks but slows allocation-heavy code down
+        self._trace_memory = trace_memory
+        self._stages: List[StageRecord] = []
+        self._stack: List[StageRecord] = []
+        self._pages: List[Dict] = []
+        self._started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self._started_tracemalloc = False
+        self._rss_lock = threading.Lock()
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampler = threading.Event()
+
+    def _observe_rss(self, rss_mb: Optional[float]) -> None:
+        """Raises the RSS peak of every running stage to `rss_mb`"""
+        if rss_mb is None:
+            return
+        with self._rss_lock:
+            for record in self._stack:
+                if record.rss_peak_mb is None or rss_mb > record.rss_peak_mb:
+                    record.rss_peak_mb = rss_mb
+
+    def _sample_rss(self) -> None:
+        while not self._stop_sampler.wait(RSS_SAMPLE_SECONDS):
+            self._observe_rss(_current_rss_mb())
+
+    def _stop_rss_sampler(self) -> None:
+        if self._sampler is not None:
+            self._stop_sampler.set()
+            self._sampler.join()
+            self._sampler = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        """Time a block of work; stages can be nested (e.g. 'save' > 'csv_write')"""
+        if self._trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if psutil is not None and self._sampler is None:
+            self._stop_sampler.clear()
+            self._sampler = threading.Thread(target=self._sample_rss, name='profiler-rss', daemon=True)
+            self._sampler.start()
+
+        parent = self._stack[-1] if self._stack else None
+        record = StageRecord(name, parent.name if parent else None)
+        if self._trace_memory:
+            # The peak counter is global, so bank the parent's peak before resetting it for the child
+            if parent is not None:
+                parent._peak_bytes = max(parent._peak_bytes, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        record.rss_start_mb = _current_rss_mb()
+
+        self._stages.append(record)
+        with self._rss_lock:
+            self._stack.append(record)
+        self._observe_rss(record.rss_start_mb)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            record.rss_end_mb = _current_rss_mb()
+            self._observe_rss(record.rss_end_mb)
+            with self._rss_lock:
+                self._stack.pop()
+            if self._trace_memory:
+                record._peak_bytes = max(record._peak_bytes, tracemalloc.get_traced_memory()[1])
+                record.tracemalloc_peak_mb = round(record._peak_bytes / (1024 * 1024), 2)
+                if parent is not None:
+                    parent._peak_bytes = max(parent._peak_bytes, record._peak_bytes)
+            logger.info(f"Stage '{name}' finished in {record.seconds:.3f}s")
+
+    def record_page(self, page_number: int, seconds: float, tables: int, rows: int) -> None:
+        """Page listener for PDF readers that report per-page progress"""
+        self._pages.append({
+            'page': page_number,
+            'seconds': round(seconds, 4),
+            'tables': tables,
+            'rows': rows,
+        })
+        logger.debug(f"Page {page_number}: {tables} tables, {rows} rows in {seconds:.3f}s")
+
+    def report(self) -> Dict:
+        total_seconds = time.perf_counter() - self._start
+        total_rows = sum(p['rows'] for p in self._pages)
+        return {
+            'started_at': self._started_at.isoformat(),
+            'total_seconds': round(total_seconds, 4),
+            'max_rss_mb': _max_rss_mb(),  # Peak of the whole process; stages report their own rss_peak_mb
+            'stages': [record.to_dict() for record in self._stages],
+            'pages': sorted(self._pages, key=lambda p: p['page']),
+            'page_summary': {
+                'pages': len(self._pages),
+                'tables': sum(p['tables'] for p in self._pages),
+                'rows': total_rows,
+                'slowest_page': max(self._pages, key=lambda p: p['seconds'])['page'] if self._pages else None,
+            },
+        }
+
+    def write_report(self, report_path: str) -> None:
+        """Write the JSON report (creates the parent directory if needed)"""
+        self._stop_rss_sampler()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        os.makedirs(os.path.dirname(report_path) or '.', exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        logger.info(f"Profiling report written to: {report_path}")
+
+class NullProfiler(PipelineProfiler):
+    """Drop-in profiler that records nothing, used when profiling is disabled"""
+
+    def __init__(self):
+        super().__init__(trace_memory=False)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        yield StageRecord(name, None)
+
+    def record_page(self, page_number: int, seconds: float, tables: int, rows: int) -> None:
+        pass
+
+NULL_PROFILER = NullProfiler()
+
+def run_with_code_profiler(func: Callable[[], None], backend: str, output_path: str) -> None:
+    """Run `func` under cProfile or pyinstrument and dump the result to `output_path`"""
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+
+    if backend == 'cprofile':
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(func)
+        finally:
+            # Load with: python -m pstats <file>  or snakeviz <file>
+            profiler.dump_stats(output_path)
+            logger.info(f"cProfile stats written to: {output_path}")
+    elif backend == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError as e:
+            raise ImportError("pyinstrument is not installed (pip install pyinstrument)") from e
+        profiler = Profiler()
+        profiler.start()
+        try:
+            func()
+        finally:
+            profiler.stop()
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html())
+            logger.info(f"pyinstrument report written to: {output_path}")
+    else:
+        raise ValueError(f"Unknown code profiler backend: '{backend}'")
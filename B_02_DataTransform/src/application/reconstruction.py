@@ -0,0 +1,121 @@
+import numpy
+import pandas
+import logging
+from typing import Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+def _normalized_text(series: pandas.Series) -> pandas.Series:
+    """Cell text with line breaks and repeated whitespace collapsed, compared case-insensitively"""
+    return series.astype(str).str.replace(r'\s+', ' ', regex=True).str.strip().str.upper()
+
+def _normalized_label(label) -> str:
+    return ' '.join(str(label).split()).upper()
+
+def find_repeated_headers(df: pandas.DataFrame, key_column: str) -> numpy.ndarray:
+    """Boolean mask of rows that repeat the column labels (tabula emits one per page)"""
+    key = df[key_column]
+    # Cheap pass first: only rows whose key cell spells the key label can be headers
+    candidates = key.notna().to_numpy()
+    candidates[candidates] = (
+        _normalized_text(key[candidates]) == _normalized_label(key_column)
+    ).to_numpy()
+    if not candidates.any():
+        return candidates
+
+    # Every other filled cell of a candidate must match its own column label
+    header = candidates.copy()
+    candidate_rows = df[candidates]
+    for column in df.columns:
+        if column == key_column:
+            continue
+        cells = candidate_rows[column]
+        filled = cells.notna().to_numpy()
+        matches = numpy.ones(len(cells), dtype=bool)
+        matches[filled] = (_normalized_text(cells[filled]) == _normalized_label(column)).to_numpy()
+        header[candidates] &= matches
+    return header
+
+def merge_continuation_rows(df: pandas.DataFrame, key_column: str, joiner: str = ' ') -> pandas.DataFrame:
+    """Join rows with an empty key column onto the row above them, column by column"""
+    df = df.reset_index(drop=True)
+    key = df[key_column]
+    continuation = (key.isna() | (key.astype(str).str.strip() == '')).to_numpy()
+    if not continuation.any():
+        return df.reset_index(drop=True)
+
+    # Every non-continuation row opens a new group; continuation rows inherit the group above
+    group = numpy.cumsum(~continuation)
+    group_sizes = numpy.bincount(group)
+    in_merged_group = group_sizes[group] > 1
+    leader = numpy.ones(len(df), dtype=bool)
+    leader[1:] = group[1:] != group[:-1]
+
+    result = df[leader].copy()
+    merged_leaders = in_merged_group[leader]
+    if not merged_leaders.any():
+        return result.reset_index(drop=True)
+    merged_groups = group[leader][merged_leaders]
+    merged_rows = df[in_merged_group]
+    merged_group_ids = group[in_merged_group]
+
+    # Only rows that belong to multi-row groups are joined. Rows of a group are contiguous, so the
+    # join is one numpy.add.reduceat pass over object arrays; the joiner is prefixed to every value
+    # except a group's first, so no separator has to be trimmed afterwards
+    for column in df.columns:
+        cells = merged_rows[column]
+        present = cells.notna().to_numpy()
+        text = cells[present].astype(str).str.strip()
+        # Blank cells would only add stray separators to the joined text
+        filled = (text != '').to_numpy()
+        if result[column].dtype != object:
+            result[column] = result[column].astype(object)
+
+        values = text[filled].to_numpy(dtype=object)
+        value_groups = merged_group_ids[present][filled]
+        joined = pandas.Series(numpy.nan, index=merged_groups, dtype=object)
+        if len(values):
+            starts = numpy.flatnonzero(numpy.r_[True, value_groups[1:] != value_groups[:-1]])
+            separators = numpy.full(len(values), joiner, dtype=object)
+            separators[starts] = ''
+            joined[value_groups[starts]] = numpy.add.reduceat(separators + values, starts)
+        result.loc[result.index[merged_leaders], column] = joined.to_numpy()
+
+    return result.reset_index(drop=True)
+
+def reconstruct_rows(df: pandas.DataFrame, key_column: str, joiner: str = ' ') -> pandas.DataFrame:
+    """Remove repeated header rows and merge wrapped continuation rows back into one row per key"""
+    if key_column not in df.columns:
+        logger.warning(f"Key column '{key_column}' not found, skipping row reconstruction.")
+        return df
+
+    header = find_repeated_headers(df, key_column)
+    without_headers = df[~header]
+    reconstructed = merge_continuation_rows(without_headers, key_column, joiner)
+
+    logger.info(
+        f"Row reconstruction: removed {int(header.sum())} repeated header rows, "
+        f"merged {len(without_headers) - len(reconstructed)} continuation rows."
+    )
+    return reconstructed
+
+def reconstruct_batches(
+    batches: Iterable[pandas.DataFrame],
+    key_column: str,
+    joiner: str = ' '
+) -> Iterator[pandas.DataFrame]:
+    """Streaming reconstruct_rows: the last row of each batch is held back because the next
+    batch may start with its continuation rows"""
+    carry: Optional[pandas.DataFrame] = None
+    for batch in batches:
+        if carry is not None:
+            batch = pandas.concat([carry, batch], ignore_index=True)
+        rebuilt = reconstruct_rows(batch, key_column, joiner)
+        if rebuilt.empty:
+            carry = None
+            continue
+        carry = rebuilt.iloc[-1:]
+        if len(rebuilt) > 1:
+            yield rebuilt.iloc[:-1]
+    if carry is not None:
+        yield carry
@@ -0,0 +1,95 @@
+import os
+import shutil
+import logging
+import pandas
+from typing import Iterator, List, Optional
+
+try:
+    import pyarrow  # Optional - only needed for the out-of-core combine
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+def arrow_available() -> bool:
+    return pyarrow is not None
+
+class SpilledTables:
+    """Append-only store of cleaned tables kept on disk as Arrow IPC files, read back in row batches"""
+
+    def __init__(self, spill_dir: str):
+        if pyarrow is None:
+            raise ImportError("pyarrow is not installed (pip install pyarrow)")
+        os.makedirs(spill_dir, exist_ok=True)
+        self._spill_dir = spill_dir
+        # Consecutive tables with the same columns share one IPC file, so table order is preserved
+        self._segments: List[str] = []
+        self._writer = None
+        self._sink = None
+        self._schema = None
+        self.columns: List[str] = []  # Union of all columns, in order of first appearance
+        self.num_rows = 0
+
+    def append(self, df: pandas.DataFrame) -> None:
+        # Arrow needs a single type per column; the cells are PDF text, so everything is stored as strings
+        table = pyarrow.Table.from_pydict({
+            str(column): pyarrow.array(
+                df[column].astype(str).where(df[column].notna(), None),
+                type=pyarrow.string(),
+                from_pandas=True
+            )
+            for column in df.columns
+        })
+        if self._writer is None or not table.schema.equals(self._schema):
+            self._close_writer()
+            path = os.path.join(self._spill_dir, f"segment_{len(self._segments):05d}.arrow")
+            self._sink = pyarrow.OSFile(path, 'wb')
+            self._writer = pyarrow.ipc.new_file(self._sink, table.schema)
+            self._schema = table.schema
+            self._segments.append(path)
+
+        self._writer.write_table(table)
+        self.columns.extend(name for name in table.column_names if name not in self.columns)
+        self.num_rows += table.num_rows
+
+    def _close_writer(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+            self._writer = None
+            self._sink = None
+
+    def iter_batches(self, batch_rows: int) -> Iterator[pandas.DataFrame]:
+        """Yield frames of about `batch_rows` rows over the union of columns, in append order"""
+        self._close_writer()
+        pending: List[pandas.DataFrame] = []
+        pending_rows = 0
+        for path in self._segments:
+            with pyarrow.memory_map(path, 'r') as source:
+                reader = pyarrow.ipc.open_file(source)
+                record_batches = []
+                for i in range(reader.num_record_batches):
+                    record_batch = reader.get_batch(i)
+                    record_batches.append(record_batch)
+                    pending_rows += record_batch.num_rows
+                    if pending_rows >= batch_rows:
+                        # Convert many small record batches at once; per-table conversion is slow
+                        pending.append(self._to_frame(record_batches))
+                        record_batches = []
+                        yield pandas.concat(pending, ignore_index=True)
+                        pending, pending_rows = [], 0
+                if record_batches:
+                    pending.append(self._to_frame(record_batches))
+        if pending:
+            yield pandas.concat(pending, ignore_index=True)
+
+    def _to_frame(self, record_batches: List) -> pandas.DataFrame:
+        frame = pyarrow.Table.from_batches(record_batches).to_pandas()
+        return frame.reindex(columns=self.columns)
+
+    def cleanup(self) -> None:
+        """Delete the spill files"""
+        self._close_writer()
+        shutil.rmtree(self._spill_dir, ignore_errors=True)
+        self._segments = []
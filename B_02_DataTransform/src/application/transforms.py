@@ -0,0 +1,104 @@
+import logging
+import unicodedata
+import pandas
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ColumnOperation = Callable[[pandas.DataFrame], pandas.DataFrame]
+
+def normalize_header(label) -> str:
+    """Header without accents or line breaks ('VIGÊNCIA' -> 'VIGENCIA', 'RN\\r(alteração)' -> 'RN (alteracao)')"""
+    decomposed = unicodedata.normalize('NFKD', str(label))
+    without_accents = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(without_accents.split())
+
+class CompiledTransform:
+    """Rules resolved into a fixed list of column operations, reused for every table or batch"""
+
+    def __init__(self, operations: List[ColumnOperation], descriptions: List[str]):
+        self._operations = operations
+        self.descriptions = descriptions
+
+    def __call__(self, df: pandas.DataFrame) -> pandas.DataFrame:
+        for operation in self._operations:
+            df = operation(df)
+        return df
+
+def _normalize_headers_operation() -> ColumnOperation:
+    # Header labels repeat across tables and batches, so each one is normalized only once
+    cache: Dict[str, str] = {}
+
+    def operation(df: pandas.DataFrame) -> pandas.DataFrame:
+        renamed = {}
+        for column in df.columns:
+            if column not in cache:
+                cache[column] = normalize_header(column)
+            renamed[column] = cache[column]
+        return df.rename(columns=renamed)
+    return operation
+
+def _strip_operation(columns: Optional[List[str]]) -> ColumnOperation:
+    def operation(df: pandas.DataFrame) -> pandas.DataFrame:
+        targets = columns if columns is not None else list(df.columns)
+        updates = {}
+        for column in targets:
+            if column in df.columns and df[column].dtype == object:
+                # Only string cells are stripped; NaN and non-text values pass through
+                cells = df[column]
+                stripped = cells.str.strip()
+                updates[column] = stripped.where(stripped.notna(), cells)
+        return df.assign(**updates) if updates else df
+    return operation
+
+def _boolean_operation(columns: List[str], true_values: List[str]) -> ColumnOperation:
+    normalized_true = [value.upper() for value in true_values]
+
+    def operation(df: pandas.DataFrame) -> pandas.DataFrame:
+        updates = {
+            column: df[column].astype(str).str.strip().str.upper().isin(normalized_true) & df[column].notna()
+            for column in columns if column in df.columns
+        }
+        return df.assign(**updates) if updates else df
+    return operation
+
+def _date_operation(columns: List[str], date_format: str) -> ColumnOperation:
+    def operation(df: pandas.DataFrame) -> pandas.DataFrame:
+        # Unparseable cells become NaT instead of failing the whole table
+        updates = {
+            column: pandas.to_datetime(df[column], format=date_format, errors='coerce')
+            for column in columns if column in df.columns
+        }
+        return df.assign(**updates) if updates else df
+    return operation
+
+def compile_transform_rules(rules: List[Dict]) -> CompiledTransform:
+    """Validate the configured rules and turn them into vectorized column operations.
+
+    Supported rules (applied in order; columns refer to the headers at that point):
+      {'rule': 'normalize_headers'}
+      {'rule': 'strip', 'columns': [...]}                          (columns optional, default all)
+      {'rule': 'boolean', 'columns': [...], 'true_values': [...]}  (other cells become False)
+      {'rule': 'date', 'columns': [...], 'format': '%d/%m/%Y'}
+    """
+    operations: List[ColumnOperation] = []
+    descriptions: List[str] = []
+    for index, rule in enumerate(rules):
+        name = rule.get('rule')
+        try:
+            if name == 'normalize_headers':
+                operations.append(_normalize_headers_operation())
+            elif name == 'strip':
+                operations.append(_strip_operation(rule.get('columns')))
+            elif name == 'boolean':
+                operations.append(_boolean_operation(list(rule['columns']), list(rule['true_values'])))
+            elif name == 'date':
+                operations.append(_date_operation(list(rule['columns']), rule['format']))
+            else:
+                raise ValueError(f"Unknown transform rule '{name}' at position {index}")
+        except KeyError as e:
+            raise ValueError(f"Transform rule '{name}' at position {index} is missing {e}") from e
+        descriptions.append(f"{name}({', '.join(f'{k}={v}' for k, v in rule.items() if k != 'rule')})")
+
+    logger.info(f"Compiled {len(operations)} transform rules: {descriptions}")
+    return CompiledTransform(operations, descriptions)
@@ -13,12 +13,65 @@ INPUT_ZIP_PATH = os.path.abspath(os.path.join(PROJECT_ROOT, INPUT_ZIP_RELATIVE_P
 # Target file to extract from ZIP (looks for files containing this string)
 TARGET_FILENAME_PART = 'Anexo_I'
 
+# PDF table extraction backend:
+# - 'tabula': tabula-py lattice mode (requires a Java runtime)
+# - 'pdfplumber': pure Python/C lattice detection, pages processed in parallel
+PDF_READER_BACKEND = 'tabula'
+PDF_READER_MAX_WORKERS = os.cpu_count() or 1  # Worker processes used by the pdfplumber backend
+
 # Output directory configuration
 OUTPUT_DIR_RELATIVE_PATH = 'csvFile'  # Relative output directory name
 OUTPUT_DIR = os.path.join(PROJECT_ROOT, OUTPUT_DIR_RELATIVE_PATH)  # Full output path
 OUTPUT_CSV_FILENAME = 'csvFile.csv'  # Name for CSV file inside ZIP
 FINAL_ZIP_FILENAME = 'Teste_William.zip'  # Name for final output ZIP file
 
+# CSV writer configuration (frames longer than one chunk are formatted in parallel and streamed into the ZIP)
+CSV_WRITER_WORKERS = os.cpu_count() or 1  # Chunk formatting workers (1 = write the whole CSV in one go)
+CSV_WRITER_CHUNK_ROWS = 100_000  # Rows formatted per task; also bounds the memory held per in-flight chunk
+CSV_WRITER_EXECUTOR = 'process'  # 'process' (parallel formatting) or 'thread' (no pickling of chunks)
+
+# Incremental diff against the previous output (written next to the full output)
+DIFF_ENABLED = True  # Compare the new table with the previous FINAL_ZIP_FILENAME before overwriting it
+DIFF_KEY_COLUMNS = ['PROCEDIMENTO']  # Columns identifying a procedure across Rol versions
+DIFF_OUTPUT_ZIP_FILENAME = 'Teste_William_delta.zip'  # ZIP holding only added/removed/changed rows
+DIFF_OUTPUT_CSV_FILENAME = 'delta.csv'  # Name of the delta CSV inside the ZIP
+
+# Profiling configuration (python -m src.main --profile [--profile-dump cprofile|pyinstrument])
+PROFILE_REPORT_PATH = os.path.join(OUTPUT_DIR, 'profile_report.json')  # JSON report with stage/page timings
+PROFILE_TRACE_MEMORY = False  # Track per-stage Python allocation peaks with tracemalloc (slows extraction several times)
+PROFILE_DUMP_DIR = os.path.join(OUTPUT_DIR, 'profiles')  # Where cProfile/pyinstrument dumps are written
+
+# Batch mode configuration (python -m src.main --batch)
+BATCH_INPUT_ZIP_PATHS = [INPUT_ZIP_PATH]  # Archives searched for documents (e.g. several historical Rol versions)
+BATCH_FILENAME_PATTERN = '*Anexo_*.pdf'  # Glob pattern matched against file names inside the archives
+BATCH_OUTPUT_DIR = os.path.join(OUTPUT_DIR, 'batch')  # One zipped CSV per document is written here
+BATCH_INDEX_FILENAME = 'index.csv'  # Combined index listing every document and its outcome
+BATCH_MAX_TOTAL_MEMORY_MB = 4096  # Memory budget shared by all batch workers
+BATCH_WORKER_MEMORY_MB = 1024  # Memory reserved per worker (tabula JVM -Xmx; data-segment limit for other backends)
+
+# Row reconstruction: repeated page headers are dropped and rows with an empty key cell are joined
+# onto the row above. Off by default because it changes the output rows; 'PROCEDIMENTO' enables it
+ROW_KEY_COLUMN = None
+
+# Out-of-core combine: when the tables (plus the combined copy) are estimated to exceed this many MB,
+# cleaned tables are spilled to Arrow IPC files and streamed to the output in batches (requires pyarrow,
+# listed in requirements.txt).
+# The delta output is skipped in that mode. None keeps everything in memory.
+PROCESSING_MEMORY_LIMIT_MB = 2048
+PROCESSING_SPILL_BATCH_ROWS = 100_000  # Rows per batch read back from the spill files
+
+# Transform rules, compiled once into vectorized column operations and applied to the combined table
+# (or to every batch in out-of-core mode) before COLUMN_RENAME_MAP. Columns refer to the headers after
+# any earlier rule, e.g. 'VIGENCIA' once 'normalize_headers' has run. Disabled by default because the
+# rules change the published CSV format.
+TRANSFORM_RULES_ENABLED = False
+TRANSFORM_RULES = [
+    {'rule': 'normalize_headers'},  # 'VIGÊNCIA' -> 'VIGENCIA', 'RN\r(alteração)' -> 'RN (alteracao)'
+    {'rule': 'strip'},  # Trim surrounding whitespace in every text column
+    {'rule': 'boolean', 'columns': ['OD', 'AMB'], 'true_values': ['OD', 'AMB']},  # Marker -> True/False
+    {'rule': 'date', 'columns': ['VIGENCIA'], 'format': '%d/%m/%Y'},
+]
+
 # Mapping for renaming columns in the processed data
 COLUMN_RENAME_MAP = {
     'OD': 'Seg. Odontológica',  # Rename 'OD' column to 'Seg. Odontológica'
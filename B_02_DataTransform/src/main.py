@@ -1,7 +1,13 @@
+import argparse
 import logging
+import os
 import sys
+from datetime import datetime
 
 from .application import pipeline  # Import the main processing pipeline
+from .application import batch  # Import the multi-document batch pipeline
+from .application import profiling  # Import stage timers and code profiler helpers
+from . import config
 
 # Logging configuration constants
 LOG_LEVEL = "INFO"  # Default logging level (INFO, DEBUG, WARNING, etc.)
@@ -28,12 +34,54 @@ except Exception as e:
     print(f"FATAL: Failed to configure logging: {e}", file=sys.stderr)
     sys.exit(2)
 
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Extract tables from ANS PDF annexes into zipped CSVs.")
+    parser.add_argument(
+        '--batch', action='store_true',
+        help="Convert every matching PDF across the configured archives instead of the single target file."
+    )
+    parser.add_argument(
+        'zip_paths', nargs='*',
+        help="Archives to search in batch mode (defaults to BATCH_INPUT_ZIP_PATHS in config.py)."
+    )
+    parser.add_argument(
+        '--profile', action='store_true',
+        help="Record per-stage/per-page timings and memory and write them to PROFILE_REPORT_PATH."
+    )
+    parser.add_argument(
+        '--profile-dump', choices=['cprofile', 'pyinstrument'],
+        help="Also run the pipeline under a code profiler and dump the result to PROFILE_DUMP_DIR."
+    )
+    return parser.parse_args(argv)
+
+def run_single_document(args: argparse.Namespace) -> None:
+    """Run the single-document pipeline, optionally with the profiling hooks enabled"""
+    profiler = profiling.PipelineProfiler(trace_memory=config.PROFILE_TRACE_MEMORY) if args.profile else profiling.NULL_PROFILER
+    try:
+        if args.profile_dump:
+            extension = 'prof' if args.profile_dump == 'cprofile' else 'html'
+            dump_path = os.path.join(
+                config.PROFILE_DUMP_DIR,
+                f"pipeline_{datetime.now():%Y%m%d_%H%M%S}.{extension}"
+            )
+            profiling.run_with_code_profiler(lambda: pipeline.run_pipeline(profiler), args.profile_dump, dump_path)
+        else:
+            pipeline.run_pipeline(profiler)
+    finally:
+        # Written even when the pipeline exits early, so failed runs can be inspected too
+        if args.profile:
+            profiler.write_report(config.PROFILE_REPORT_PATH)
+
 if __name__ == "__main__":
     # Main application entry point
+    args = parse_args()
     logger.info("Application entry point reached. Starting pipeline...")
     try:
-        # Execute the main processing pipeline
-        pipeline.run_pipeline()
+        # Execute the batch or the single-document processing pipeline
+        if args.batch:
+            batch.run_batch_pipeline(zip_paths=args.zip_paths or None)
+        else:
+            run_single_document(args)
         logger.info("Application finished successfully.")
         sys.exit(0)  # Exit with code 0 for success
     except SystemExit as e:
@@ -242,4 +242,74 @@ def test_save_zip_creation_fails(
         call(final_zip_path),
         call(temp_csv_path)
     ], any_order=True)
-    assert mock_remove.call_count == 2
\ No newline at end of file
+    assert mock_remove.call_count == 2
+
+
+def test_find_and_extract_matching_files(fs_adapter, tmp_path):
+    first_zip = tmp_path / "first.zip"
+    with zipfile.ZipFile(first_zip, 'w') as zf:
+        zf.writestr("folder/Anexo_I.pdf", b"one")
+        zf.writestr("notes.txt", b"skip")
+    bad_zip = tmp_path / "bad.zip"
+    bad_zip.write_text("not a zip")
+    extract_dir = tmp_path / "extracted"
+
+    result = fs_adapter.find_and_extract_matching_files(
+        [str(first_zip), str(bad_zip), str(tmp_path / "missing.zip")], "*.pdf", str(extract_dir)
+    )
+
+    expected_path = os.path.join(str(extract_dir), "first", "folder", "Anexo_I.pdf")
+    assert result == [(str(first_zip), "folder/Anexo_I.pdf", expected_path)]
+    with open(expected_path, 'rb') as f:
+        assert f.read() == b"one"
+
+
+def test_find_and_extract_matching_files_keeps_equal_names_apart(fs_adapter, tmp_path):
+    """Equal file names in different folders, and equally named archives, must not overwrite each other."""
+    zips = []
+    for directory in ("2021", "2024"):
+        (tmp_path / directory).mkdir()
+        zip_path = tmp_path / directory / "Anexos.zip"
+        with zipfile.ZipFile(zip_path, 'w') as zf:
+            zf.writestr("a/Anexo_I.pdf", f"{directory} a".encode())
+            zf.writestr("b/Anexo_I.pdf", f"{directory} b".encode())
+            zf.writestr("../evil.pdf", b"outside")
+        zips.append(str(zip_path))
+
+    result = fs_adapter.find_and_extract_matching_files(zips, "*.pdf", str(tmp_path / "extracted"))
+
+    assert [member for _, member, _ in result] == ["a/Anexo_I.pdf", "b/Anexo_I.pdf"] * 2
+    contents = []
+    for _, _, path in result:
+        with open(path, 'rb') as f:
+            contents.append(f.read())
+    assert contents == [b"2021 a", b"2021 b", b"2024 a", b"2024 b"]
+    assert not os.path.exists(tmp_path / "evil.pdf")
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_csv_writer_matches_single_writer(tmp_path, executor):
+    df = pd.DataFrame({
+        'PROCEDIMENTO': [f"PROC {i}\rLINHA" for i in range(250)],
+        'OD': ['OD' if i % 3 else None for i in range(250)],
+        'VALOR': [i * 1.5 for i in range(250)],
+    })
+    LocalFileSystemAdapter().save_dataframe_to_zipped_csv(df, str(tmp_path / "single"), "data.csv", "out.zip")
+    parallel = LocalFileSystemAdapter(csv_workers=2, csv_chunk_rows=40, csv_executor=executor)
+    parallel.save_dataframe_to_zipped_csv(df, str(tmp_path / "parallel"), "data.csv", "out.zip")
+
+    with zipfile.ZipFile(tmp_path / "single" / "out.zip") as single_zip, \
+         zipfile.ZipFile(tmp_path / "parallel" / "out.zip") as parallel_zip:
+        single_info = single_zip.getinfo("data.csv")
+        parallel_info = parallel_zip.getinfo("data.csv")
+        # Same content and, since deflate runs as one stream, the same compressed bytes
+        assert parallel_info.CRC == single_info.CRC
+        assert parallel_info.file_size == single_info.file_size
+        assert parallel_info.compress_size == single_info.compress_size
+        assert parallel_zip.read("data.csv") == single_zip.read("data.csv")
+    assert not os.path.exists(tmp_path / "parallel" / "~temp_data.csv.csv")
+
+
+def test_unknown_csv_executor_raises():
+    with pytest.raises(ValueError, match="Unknown CSV executor"):
+        LocalFileSystemAdapter(csv_executor='gpu')
@@ -94,4 +94,25 @@ def test_extract_tables_returns_unexpected_type(mock_read_pdf: MagicMock, pdf_re
 
     assert isinstance(result, list)
     assert len(result) == 0
-    mock_read_pdf.assert_called_once()
\ No newline at end of file
+    mock_read_pdf.assert_called_once()
+
+
+@patch('src.adapters.pdf_reader_adapter.tabula.read_pdf')
+def test_extract_tables_passes_java_options(mock_read_pdf: MagicMock, mock_dataframe: pd.DataFrame):
+    mock_read_pdf.return_value = [mock_dataframe]
+    reader = TabulaPdfReader(java_options=['-Xmx512m'])
+
+    reader.extract_tables_from_pdf("dummy/path/to.pdf")
+
+    mock_read_pdf.assert_called_once_with(
+        "dummy/path/to.pdf",
+        pages='all',
+        lattice=True,
+        pandas_options={'dtype': str},
+        java_options=['-Xmx512m']
+    )
+
+def test_set_page_listener_not_supported(pdf_reader: TabulaPdfReader):
+    assert pdf_reader.reports_pages is False
+    with pytest.raises(NotImplementedError):
+        pdf_reader.set_page_listener(MagicMock())
@@ -0,0 +1,93 @@
+import pytest
+import pandas as pd
+from unittest.mock import patch, MagicMock
+
+from src.adapters.pdfplumber_reader_adapter import PdfplumberPdfReader, LATTICE_TABLE_SETTINGS
+
+def make_pdf(pages_tables):
+    # Build a fake pdfplumber document whose pages return the given raw tables
+    pdf = MagicMock()
+    pages = []
+    for tables in pages_tables:
+        page = MagicMock()
+        page.extract_tables.return_value = tables
+        pages.append(page)
+    pdf.pages = pages
+    pdf.__enter__.return_value = pdf
+    return pdf
+
+@pytest.fixture
+def raw_table():
+    return [
+        ['PROCEDIMENTO', 'RN\n(alteração)', 'OD'],
+        ['CONSULTA', '', 'OD'],
+        ['EXAME\nDE SANGUE', None, ''],
+    ]
+
+@patch('src.adapters.pdfplumber_reader_adapter.pdfplumber.open')
+def test_extract_tables_sequential(mock_open: MagicMock, raw_table):
+    mock_open.return_value = make_pdf([[raw_table], [], [raw_table]])
+    reader = PdfplumberPdfReader(max_workers=1, pages_per_task=2)
+
+    result = reader.extract_tables_from_pdf("dummy.pdf")
+
+    assert len(result) == 2
+    df = result[0]
+    assert list(df.columns) == ['PROCEDIMENTO', 'RN\r(alteração)', 'OD']
+    assert df.iloc[0].tolist() == ['CONSULTA', None, 'OD']
+    assert df.iloc[1].tolist() == ['EXAME\rDE SANGUE', None, None]
+    page = mock_open.return_value.pages[0]
+    page.extract_tables.assert_called_once_with(LATTICE_TABLE_SETTINGS)
+
+@patch('src.adapters.pdfplumber_reader_adapter.pdfplumber.open')
+def test_extract_tables_skips_header_only_tables(mock_open: MagicMock):
+    mock_open.return_value = make_pdf([[[['A', 'B']], []]])
+    reader = PdfplumberPdfReader(max_workers=1)
+
+    assert reader.extract_tables_from_pdf("dummy.pdf") == []
+
+@patch('src.adapters.pdfplumber_reader_adapter.pdfplumber.open')
+def test_extract_tables_empty_pdf(mock_open: MagicMock):
+    mock_open.return_value = make_pdf([])
+    reader = PdfplumberPdfReader(max_workers=4)
+
+    assert reader.extract_tables_from_pdf("dummy.pdf") == []
+
+@patch('src.adapters.pdfplumber_reader_adapter.as_completed')
+@patch('src.adapters.pdfplumber_reader_adapter.ProcessPoolExecutor')
+@patch('src.adapters.pdfplumber_reader_adapter.pdfplumber.open')
+def test_extract_tables_parallel_keeps_page_order(
+    mock_open: MagicMock, mock_executor_cls: MagicMock, mock_as_completed: MagicMock
+):
+    mock_open.return_value = make_pdf([[]] * 5)
+    first = pd.DataFrame({'A': ['1']})
+    second = pd.DataFrame({'A': ['2']})
+    executor = mock_executor_cls.return_value.__enter__.return_value
+    futures = [MagicMock(), MagicMock(), MagicMock()]
+    futures[0].result.return_value = ([first], [(1, 0.5, 1, 1), (2, 0.1, 0, 0)])
+    futures[1].result.return_value = ([], [(3, 0.1, 0, 0), (4, 0.1, 0, 0)])
+    futures[2].result.return_value = ([second], [(5, 0.2, 1, 1)])
+    executor.submit.side_effect = futures
+    # The last range finishes first
+    mock_as_completed.side_effect = lambda pending: [futures[2], futures[0], futures[1]]
+    reader = PdfplumberPdfReader(max_workers=4, pages_per_task=2)
+    listener = MagicMock()
+    reader.set_page_listener(listener)
+
+    result = reader.extract_tables_from_pdf("dummy.pdf")
+
+    # Pages are reported as their range completes, tables stay in document order
+    assert [c.args[0] for c in listener.call_args_list] == [5, 1, 2, 3, 4]
+    listener.assert_any_call(5, 0.2, 1, 1)
+    mock_executor_cls.assert_called_once_with(max_workers=3)
+    submitted_ranges = [c.args[2:4] for c in executor.submit.call_args_list]
+    assert submitted_ranges == [(0, 2), (2, 4), (4, 5)]
+    assert result == [first, second]
+
+@patch('src.adapters.pdfplumber_reader_adapter.pdfplumber.open')
+def test_extract_tables_raises_exception(mock_open: MagicMock):
+    mock_open.side_effect = Exception("Broken PDF")
+    reader = PdfplumberPdfReader(max_workers=1)
+
+    with pytest.raises(Exception, match="Broken PDF"):
+        reader.extract_tables_from_pdf("dummy.pdf")
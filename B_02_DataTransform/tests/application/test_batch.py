@@ -0,0 +1,111 @@
+import pytest
+import pandas as pd
+import zipfile
+import os
+from unittest.mock import patch, MagicMock
+
+from src.application import batch
+
+@pytest.fixture
+def input_zips(tmp_path):
+    # Two archives that both contain a document with the same name plus an unrelated file
+    paths = []
+    for name in ("Rol_2021.zip", "Rol_2024.zip"):
+        zip_path = tmp_path / name
+        with zipfile.ZipFile(zip_path, 'w') as zf:
+            zf.writestr("docs/Anexo_I.pdf", b"%PDF-fake")
+            zf.writestr("Anexo_II.pdf", b"%PDF-fake")
+            zf.writestr("readme.txt", b"ignore me")
+        paths.append(str(zip_path))
+    return paths
+
+@pytest.fixture
+def batch_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch.config, 'BATCH_MAX_TOTAL_MEMORY_MB', 1024)
+    monkeypatch.setattr(batch.config, 'BATCH_WORKER_MEMORY_MB', 1024)
+    monkeypatch.setattr(batch.config, 'PDF_READER_BACKEND', 'tabula')
+    return str(tmp_path / "out")
+
+@pytest.mark.parametrize("total_mb, worker_mb, max_workers, expected", [
+    (4096, 1024, 8, 4),
+    (4096, 1024, 2, 2),
+    (512, 1024, 8, 1),
+    (0, 0, 4, 1),
+])
+def test_resolve_worker_count(total_mb, worker_mb, max_workers, expected):
+    assert batch.resolve_worker_count(total_mb, worker_mb, max_workers) == expected
+
+@patch('src.application.batch.create_pdf_reader')
+def test_run_batch_pipeline_isolates_failures(mock_create_reader, input_zips, batch_config):
+    good_table = pd.DataFrame({'PROCEDIMENTO': ['A'], 'OD': ['OD']})
+
+    def extract(pdf_path):
+        if 'Rol_2024' in pdf_path and pdf_path.endswith('Anexo_II.pdf'):
+            raise RuntimeError("corrupted PDF")
+        return [good_table]
+
+    reader = MagicMock()
+    reader.extract_tables_from_pdf.side_effect = extract
+    mock_create_reader.return_value = reader
+
+    results = batch.run_batch_pipeline(input_zips, '*Anexo_*.pdf', batch_config)
+
+    assert [r['status'] for r in results] == ['ok', 'ok', 'ok', 'failed']
+    assert results[3]['error'] == "RuntimeError: corrupted PDF"
+    mock_create_reader.assert_called_with('tabula', max_workers=1, java_options=['-Xmx1024m'])
+
+    outputs = sorted(os.listdir(batch_config))
+    assert outputs == [
+        'Rol_2021_Anexo_I.zip', 'Rol_2021_Anexo_II.zip', 'Rol_2024_Anexo_I.zip', 'index.csv'
+    ]
+    index = pd.read_csv(os.path.join(batch_config, 'index.csv'))
+    assert list(index.columns) == batch.INDEX_COLUMNS
+    assert index['rows'].tolist() == [1, 1, 1, 0]
+
+@patch('src.application.batch.create_pdf_reader')
+def test_run_batch_pipeline_exits_when_nothing_converted(mock_create_reader, input_zips, batch_config):
+    mock_create_reader.return_value.extract_tables_from_pdf.side_effect = RuntimeError("boom")
+
+    with pytest.raises(SystemExit) as exc_info:
+        batch.run_batch_pipeline(input_zips, '*Anexo_*.pdf', batch_config)
+
+    assert exc_info.value.code == 1
+    assert os.path.exists(os.path.join(batch_config, 'index.csv'))
+
+def test_run_batch_pipeline_exits_when_no_documents(input_zips, batch_config):
+    with pytest.raises(SystemExit) as exc_info:
+        batch.run_batch_pipeline(input_zips, '*.xlsx', batch_config)
+
+    assert exc_info.value.code == 1
+
+def test_assign_output_names_numbers_collisions():
+    documents = [
+        ("in/Rol.zip", "a/Anexo_I.pdf", "/tmp/Rol/a/Anexo_I.pdf"),
+        ("in/Rol.zip", "b/Anexo_I.pdf", "/tmp/Rol/b/Anexo_I.pdf"),
+        ("old/Rol.zip", "a/Anexo_I.pdf", "/tmp/Rol_2/a/Anexo_I.pdf"),
+        ("in/Rol.zip", "Anexo_II.pdf", "/tmp/Rol/Anexo_II.pdf"),
+    ]
+    assert batch.assign_output_names(documents) == ['Rol_Anexo_I', 'Rol_Anexo_I_2', 'Rol_Anexo_I_3', 'Rol_Anexo_II']
+
+@patch('src.application.batch.create_pdf_reader')
+def test_run_batch_pipeline_keeps_equal_file_names_apart(mock_create_reader, tmp_path, batch_config):
+    zip_path = tmp_path / "Rol.zip"
+    with zipfile.ZipFile(zip_path, 'w') as zf:
+        zf.writestr("a/Anexo_I.pdf", b"%PDF-fake")
+        zf.writestr("b/Anexo_I.pdf", b"%PDF-fake")
+    mock_create_reader.return_value.extract_tables_from_pdf.return_value = [pd.DataFrame({'PROCEDIMENTO': ['A']})]
+
+    results = batch.run_batch_pipeline([str(zip_path)], '*.pdf', batch_config)
+
+    assert [(r['document'], r['output_zip']) for r in results] == [
+        ('a/Anexo_I.pdf', 'Rol_Anexo_I.zip'), ('b/Anexo_I.pdf', 'Rol_Anexo_I_2.zip')
+    ]
+
+def test_limit_worker_memory_caps_data_segment(mocker):
+    mock_resource = mocker.patch.object(batch, 'resource')
+    mock_resource.RLIM_INFINITY = -1
+    mock_resource.getrlimit.return_value = (-1, -1)
+
+    batch.limit_worker_memory(512)
+
+    mock_resource.setrlimit.assert_called_once_with(mock_resource.RLIMIT_DATA, (512 * 1024 * 1024, -1))
@@ -0,0 +1,118 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from src import config
+from src.application.diff import compute_rol_diff, CHANGE_TYPE_COLUMN
+from src.application.pipeline import write_delta
+from src.application.processing import process_extracted_tables
+from src.application.transforms import compile_transform_rules
+from src.adapters.file_system_adapter import LocalFileSystemAdapter
+
+@pytest.fixture
+def previous_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        'PROCEDIMENTO': ['CONSULTA', 'EXAME', 'CIRURGIA', 'DUPLICADO', 'DUPLICADO'],
+        'OD': [None, 'OD', None, None, None],
+        'AMB': ['AMB', 'AMB', None, 'AMB', 'AMB'],
+    })
+
+@pytest.fixture
+def new_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        'PROCEDIMENTO': ['CONSULTA', 'EXAME', 'TERAPIA', 'DUPLICADO', 'DUPLICADO'],
+        'OD': [None, None, None, None, 'OD'],
+        'AMB': ['AMB', 'AMB', 'AMB', 'AMB', 'AMB'],
+    })
+
+def test_compute_rol_diff_classifies_rows(new_df, previous_df):
+    diff = compute_rol_diff(new_df, previous_df, ['PROCEDIMENTO'])
+
+    assert diff.added['PROCEDIMENTO'].tolist() == ['TERAPIA']
+    assert diff.removed['PROCEDIMENTO'].tolist() == ['CIRURGIA']
+    # Second occurrence of a repeated key is compared with the second previous occurrence
+    assert diff.changed['PROCEDIMENTO'].tolist() == ['EXAME', 'DUPLICADO']
+    assert diff.changed['OD'].tolist()[1] == 'OD'
+
+def test_delta_frame_has_change_type_first(new_df, previous_df):
+    delta = compute_rol_diff(new_df, previous_df, ['PROCEDIMENTO']).to_delta_frame()
+
+    assert delta.columns[0] == CHANGE_TYPE_COLUMN
+    assert delta[CHANGE_TYPE_COLUMN].tolist() == ['added', 'removed', 'changed', 'changed']
+
+def test_identical_tables_produce_empty_diff(new_df):
+    diff = compute_rol_diff(new_df, new_df.copy(), ['PROCEDIMENTO'])
+
+    assert diff.is_empty
+    assert list(diff.to_delta_frame().columns) == [CHANGE_TYPE_COLUMN, 'PROCEDIMENTO', 'OD', 'AMB']
+
+def test_values_survive_csv_round_trip(tmp_path, new_df):
+    # The previous output is read back from the zipped CSV, so NaN/empty and wrapped text must compare equal
+    new_df.loc[0, 'PROCEDIMENTO'] = 'CONSULTA\rCOM QUEBRA'
+    new_df['VIGENCIA'] = [np.nan, '01/04/2021', np.nan, np.nan, np.nan]
+    adapter = LocalFileSystemAdapter()
+    adapter.save_dataframe_to_zipped_csv(new_df, str(tmp_path), 'data.csv', 'out.zip')
+
+    reloaded = adapter.load_dataframe_from_zipped_csv(str(tmp_path / 'out.zip'), 'data.csv')
+
+    assert compute_rol_diff(new_df, reloaded, ['PROCEDIMENTO']).is_empty
+
+def test_rules_enabled_rerun_produces_empty_diff(tmp_path):
+    # Dates and booleans from the transform rules must compare equal to what the CSV holds
+    raw = pd.DataFrame({
+        'PROCEDIMENTO': ['CONSULTA', 'EXAME'],
+        'VIGÊNCIA': ['01/04/2021', 'inválida'],
+        'OD': ['OD', np.nan],
+        'AMB': ['AMB', 'AMB'],
+    })
+    transform = compile_transform_rules(config.TRANSFORM_RULES)
+    processed = process_extracted_tables([raw], config.COLUMN_RENAME_MAP, transform=transform)
+    adapter = LocalFileSystemAdapter()
+    adapter.save_dataframe_to_zipped_csv(processed, str(tmp_path), 'data.csv', 'out.zip')
+    previous = adapter.load_dataframe_from_zipped_csv(str(tmp_path / 'out.zip'), 'data.csv')
+
+    rerun = process_extracted_tables([raw.copy()], config.COLUMN_RENAME_MAP, transform=transform)
+
+    assert previous['VIGENCIA'].tolist()[0] == '2021-04-01'
+    assert compute_rol_diff(rerun, previous, ['PROCEDIMENTO']).is_empty
+
+def test_missing_key_column_raises(new_df, previous_df):
+    with pytest.raises(ValueError, match="Diff key columns not found"):
+        compute_rol_diff(new_df, previous_df.drop(columns=['PROCEDIMENTO']), ['PROCEDIMENTO'])
+
+def test_load_missing_previous_output_returns_none(tmp_path):
+    assert LocalFileSystemAdapter().load_dataframe_from_zipped_csv(str(tmp_path / 'none.zip'), 'data.csv') is None
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'OUTPUT_DIR', str(tmp_path))
+    return tmp_path
+
+def test_write_delta_removes_stale_delta_when_unchanged(output_dir, new_df):
+    adapter = LocalFileSystemAdapter()
+    adapter.save_dataframe_to_zipped_csv(new_df, str(output_dir), config.OUTPUT_CSV_FILENAME, config.FINAL_ZIP_FILENAME)
+    (output_dir / config.DIFF_OUTPUT_ZIP_FILENAME).write_bytes(b'previous run')
+
+    write_delta(adapter, new_df.copy())
+
+    assert not (output_dir / config.DIFF_OUTPUT_ZIP_FILENAME).exists()
+
+def test_write_delta_removes_stale_delta_when_diff_fails(output_dir, new_df):
+    adapter = LocalFileSystemAdapter()
+    adapter.save_dataframe_to_zipped_csv(new_df, str(output_dir), config.OUTPUT_CSV_FILENAME, config.FINAL_ZIP_FILENAME)
+    (output_dir / config.DIFF_OUTPUT_ZIP_FILENAME).write_bytes(b'previous run')
+
+    write_delta(adapter, new_df.drop(columns=['PROCEDIMENTO']))
+
+    assert not (output_dir / config.DIFF_OUTPUT_ZIP_FILENAME).exists()
+
+def test_write_delta_replaces_previous_delta(output_dir, new_df, previous_df):
+    adapter = LocalFileSystemAdapter()
+    adapter.save_dataframe_to_zipped_csv(previous_df, str(output_dir), config.OUTPUT_CSV_FILENAME, config.FINAL_ZIP_FILENAME)
+
+    write_delta(adapter, new_df)
+
+    delta = adapter.load_dataframe_from_zipped_csv(
+        str(output_dir / config.DIFF_OUTPUT_ZIP_FILENAME), config.DIFF_OUTPUT_CSV_FILENAME
+    )
+    assert delta[CHANGE_TYPE_COLUMN].tolist() == ['added', 'removed', 'changed', 'changed']
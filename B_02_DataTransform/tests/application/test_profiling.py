@@ -0,0 +1,75 @@
+import os
+import json
+import time
+import pytest
+import pandas as pd
+
+from src.application.profiling import PipelineProfiler, NULL_PROFILER, RSS_SAMPLE_SECONDS
+from src.application.processing import process_extracted_tables
+
+def test_nested_stages_record_timings_and_memory():
+    profiler = PipelineProfiler(trace_memory=True)
+
+    with profiler.stage('outer') as outer:
+        with profiler.stage('inner') as inner:
+            data = [bytearray(1024 * 1024) for _ in range(4)]
+            inner.rows = 100
+        del data
+        outer.tables = 2
+
+    stages = {s['name']: s for s in profiler.report()['stages']}
+    assert stages['inner']['parent'] == 'outer'
+    assert stages['inner']['tracemalloc_peak_mb'] >= 4
+    # The parent's peak includes whatever its children allocated
+    assert stages['outer']['tracemalloc_peak_mb'] >= stages['inner']['tracemalloc_peak_mb']
+    assert stages['inner']['rows_per_second'] > 0
+    assert stages['outer']['tables_per_second'] > 0
+
+def test_page_records_and_json_report(tmp_path):
+    profiler = PipelineProfiler(trace_memory=False)
+    profiler.record_page(2, 0.5, 1, 20)
+    profiler.record_page(1, 0.1, 1, 10)
+    report_path = tmp_path / "reports" / "profile.json"
+
+    profiler.write_report(str(report_path))
+
+    report = json.loads(report_path.read_text())
+    assert [p['page'] for p in report['pages']] == [1, 2]
+    assert report['page_summary'] == {'pages': 2, 'tables': 2, 'rows': 30, 'slowest_page': 2}
+
+def test_processing_reports_clean_and_concat_stages():
+    profiler = PipelineProfiler(trace_memory=False)
+    tables = [pd.DataFrame({'A': ['1', '2']}), pd.DataFrame({'A': [None]})]
+
+    process_extracted_tables(tables, {}, profiler=profiler)
+
+    stages = {s['name']: s for s in profiler.report()['stages']}
+    assert stages['clean']['tables'] == 2
+    assert stages['clean']['rows'] == 2
+    assert stages['concat']['rows'] == 2
+
+def test_null_profiler_records_nothing():
+    with NULL_PROFILER.stage('ignored') as stage:
+        stage.rows = 10
+    NULL_PROFILER.record_page(1, 0.1, 1, 1)
+
+    assert NULL_PROFILER.report()['stages'] == []
+    assert NULL_PROFILER.report()['pages'] == []
+
+def test_stage_rss_peak_is_sampled_per_stage():
+    pytest.importorskip('psutil')
+    profiler = PipelineProfiler(trace_memory=False)
+
+    with profiler.stage('allocate'):
+        data = bytearray(64 * 1024 * 1024)
+        data[::4096] = b'x' * len(data[::4096])  # Touch every page so it counts towards RSS
+        time.sleep(3 * RSS_SAMPLE_SECONDS)
+        del data
+    with profiler.stage('idle'):
+        pass
+    profiler.write_report(os.devnull)
+
+    stages = {s['name']: s for s in profiler.report()['stages']}
+    assert stages['allocate']['rss_peak_mb'] >= stages['allocate']['rss_start_mb'] + 32
+    # The second stage only sees its own samples, not the earlier peak
+    assert stages['idle']['rss_peak_mb'] < stages['allocate']['rss_peak_mb']
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from src.application.reconstruction import find_repeated_headers, merge_continuation_rows, reconstruct_rows
+from src.application.processing import process_extracted_tables
+
+def make_frame(rows):
+    return pd.DataFrame(rows, columns=['PROCEDIMENTO', 'OD', 'AMB'])
+
+def test_repeated_headers_are_detected_ignoring_case_and_line_breaks():
+    df = make_frame([
+        ['CONSULTA', 'OD', None],
+        ['Procedimento', 'OD', 'AMB'],
+        ['PROCEDIMENTO', None, 'AMB'],
+        ['PROCEDIMENTO', 'OD', 'X'],  # Key matches but another cell does not - real data
+    ])
+    df.loc[1, 'PROCEDIMENTO'] = 'PROCEDI\rMENTO'
+
+    assert find_repeated_headers(df, 'PROCEDIMENTO').tolist() == [False, False, True, False]
+    df.loc[1, 'PROCEDIMENTO'] = 'PROCEDIMENTO'
+    assert find_repeated_headers(df, 'PROCEDIMENTO').tolist() == [False, True, True, False]
+
+def test_continuation_rows_are_joined_onto_previous_row():
+    df = make_frame([
+        ['CONSULTA', 'OD', 'AMB'],
+        ['CIRURGIA DE', None, 'AMB'],
+        [None, 'OD', None],
+        ['  ', None, None],
+        [np.nan, None, 'PARTE FINAL'],
+        ['EXAME', None, None],
+    ])
+
+    result = merge_continuation_rows(df, 'PROCEDIMENTO')
+
+    assert result['PROCEDIMENTO'].tolist() == ['CONSULTA', 'CIRURGIA DE', 'EXAME']
+    assert result.loc[1, 'OD'] == 'OD'
+    assert result.loc[1, 'AMB'] == 'AMB PARTE FINAL'
+    assert result.loc[0].tolist() == ['CONSULTA', 'OD', 'AMB']
+
+def test_leading_continuation_rows_are_kept():
+    df = make_frame([[None, 'OD', None], [None, None, 'AMB'], ['EXAME', None, None]])
+
+    result = merge_continuation_rows(df, 'PROCEDIMENTO')
+
+    assert len(result) == 2
+    assert result.loc[0, 'OD'] == 'OD' and result.loc[0, 'AMB'] == 'AMB'
+
+def test_reconstruct_rows_without_key_column_returns_input():
+    df = make_frame([['CONSULTA', None, None]])
+    assert reconstruct_rows(df, 'MISSING') is df
+
+def test_process_extracted_tables_reconstructs_across_pages():
+    page1 = make_frame([['CONSULTA', 'OD', 'AMB'], ['CIRURGIA', None, None]])
+    page2 = make_frame([['PROCEDIMENTO', 'OD', 'AMB'], [None, None, 'AMB'], ['EXAME', 'OD', None]])
+
+    result = process_extracted_tables([page1, page2], {'OD': 'Dental'}, key_column='PROCEDIMENTO')
+
+    assert result['PROCEDIMENTO'].tolist() == ['CONSULTA', 'CIRURGIA', 'EXAME']
+    assert result.loc[1, 'AMB'] == 'AMB'
+    assert 'Dental' in result.columns
@@ -0,0 +1,82 @@
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.application.spill import SpilledTables
+from src.application.processing import process_extracted_tables, OutOfCoreTable
+from src.application.reconstruction import reconstruct_rows, reconstruct_batches
+from src.application.pipeline import save_processed_data
+from src.adapters.file_system_adapter import LocalFileSystemAdapter
+
+@pytest.fixture
+def tables():
+    return [
+        pd.DataFrame({'PROCEDIMENTO': ['CONSULTA', 'CIRURGIA'], 'OD': ['OD', np.nan], 'AMB': [np.nan, 'AMB']}),
+        pd.DataFrame({'PROCEDIMENTO': ['PROCEDIMENTO', np.nan, 'EXAME'], 'OD': ['OD', 'OD', np.nan],
+                      'AMB': ['AMB', np.nan, np.nan]}),
+        # Extra column appears only in a later table
+        pd.DataFrame({'PROCEDIMENTO': ['TERAPIA'], 'OD': [np.nan], 'AMB': ['AMB'], 'DUT': ['12']}),
+    ]
+
+def test_spilled_tables_round_trip_in_batches(tmp_path, tables):
+    store = SpilledTables(str(tmp_path / "spill"))
+    for df in tables:
+        store.append(df)
+
+    batches = list(store.iter_batches(batch_rows=4))
+
+    assert store.columns == ['PROCEDIMENTO', 'OD', 'AMB', 'DUT']
+    assert [len(batch) for batch in batches] == [5, 1]
+    combined = pd.concat(batches, ignore_index=True)
+    assert combined['PROCEDIMENTO'].tolist()[:2] == ['CONSULTA', 'CIRURGIA']
+    assert combined['DUT'].isna().sum() == 5
+    store.cleanup()
+    assert not (tmp_path / "spill").exists()
+
+def test_reconstruct_batches_carries_rows_across_batch_boundaries():
+    df = pd.DataFrame({'PROCEDIMENTO': ['A', None, 'B', None, None, 'C', None], 'X': list('1234567')})
+    batches = [df.iloc[0:2], df.iloc[2:4], df.iloc[4:5], df.iloc[5:7]]
+
+    streamed = pd.concat(reconstruct_batches(batches, 'PROCEDIMENTO'), ignore_index=True)
+
+    pd.testing.assert_frame_equal(streamed, reconstruct_rows(df, 'PROCEDIMENTO'))
+
+def test_memory_ceiling_switches_to_out_of_core(tmp_path, tables):
+    result = process_extracted_tables(
+        tables, {'OD': 'Dental'}, key_column='PROCEDIMENTO',
+        memory_limit_mb=0, spill_dir=str(tmp_path), spill_batch_rows=2
+    )
+
+    assert isinstance(result, OutOfCoreTable)
+    assert result.spilled_rows == 6
+    assert result.columns == ['PROCEDIMENTO', 'Dental', 'AMB', 'DUT']
+
+def test_out_of_core_output_matches_in_memory_output(tmp_path, tables):
+    adapter = LocalFileSystemAdapter()
+    in_memory = process_extracted_tables(tables, {'OD': 'Dental'}, key_column='PROCEDIMENTO')
+    spilled = process_extracted_tables(
+        tables, {'OD': 'Dental'}, key_column='PROCEDIMENTO',
+        memory_limit_mb=0, spill_dir=str(tmp_path / "spill"), spill_batch_rows=2
+    )
+
+    save_processed_data(adapter, in_memory, str(tmp_path / "memory"), 'data.csv', 'out.zip')
+    rows = save_processed_data(adapter, spilled, str(tmp_path / "disk"), 'data.csv', 'out.zip')
+
+    assert rows == len(in_memory) == 4
+    with zipfile.ZipFile(tmp_path / "memory" / "out.zip") as a, zipfile.ZipFile(tmp_path / "disk" / "out.zip") as b:
+        assert a.read('data.csv') == b.read('data.csv')
+    # Spill files are removed once the output is written
+    assert not (tmp_path / "spill" / "spilled_tables").exists()
+
+def test_no_ceiling_keeps_tables_in_memory(tables):
+    assert isinstance(process_extracted_tables(tables, {}, memory_limit_mb=None), pd.DataFrame)
+
+def test_save_batches_with_no_rows_writes_nothing(tmp_path):
+    rows = LocalFileSystemAdapter().save_batches_to_zipped_csv(
+        iter([pd.DataFrame(columns=['A'])]), str(tmp_path), 'data.csv', 'out.zip'
+    )
+
+    assert rows == 0
+    assert not (tmp_path / "out.zip").exists()
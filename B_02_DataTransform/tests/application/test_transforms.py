@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import config
+from src.application.transforms import compile_transform_rules, normalize_header
+from src.application.processing import process_extracted_tables
+
+@pytest.fixture
+def table():
+    return pd.DataFrame({
+        'PROCEDIMENTO': ['  CONSULTA ', 'EXAME'],
+        'VIGÊNCIA': ['01/04/2021', 'inválida'],
+        'OD': ['OD', np.nan],
+        'AMB': [' amb', 'X'],
+        'RN\r(alteração)': ['439/2018', np.nan],
+    })
+
+def test_normalize_header_removes_accents_and_line_breaks():
+    assert normalize_header('VIGÊNCIA') == 'VIGENCIA'
+    assert normalize_header('RN\r(alteração)') == 'RN (alteracao)'
+
+def test_configured_rules_applied_in_order(table):
+    transform = compile_transform_rules(config.TRANSFORM_RULES)
+
+    result = transform(table)
+
+    assert list(result.columns) == ['PROCEDIMENTO', 'VIGENCIA', 'OD', 'AMB', 'RN (alteracao)']
+    assert result['PROCEDIMENTO'].tolist() == ['CONSULTA', 'EXAME']
+    assert result['OD'].tolist() == [True, False]
+    assert result['AMB'].tolist() == [True, False]
+    assert result['VIGENCIA'].iloc[0] == pd.Timestamp(2021, 4, 1)
+    assert pd.isna(result['VIGENCIA'].iloc[1])
+    assert pd.isna(result['RN (alteracao)'].iloc[1])
+
+def test_missing_columns_are_skipped():
+    transform = compile_transform_rules([{'rule': 'date', 'columns': ['VIGENCIA'], 'format': '%d/%m/%Y'}])
+    df = pd.DataFrame({'A': ['x']})
+    pd.testing.assert_frame_equal(transform(df), df)
+
+@pytest.mark.parametrize("rules, message", [
+    ([{'rule': 'uppercase'}], "Unknown transform rule 'uppercase'"),
+    ([{'rule': 'boolean', 'columns': ['OD']}], "missing 'true_values'"),
+])
+def test_invalid_rules_raise(rules, message):
+    with pytest.raises(ValueError, match=message):
+        compile_transform_rules(rules)
+
+def test_transform_runs_before_rename(table):
+    transform = compile_transform_rules([{'rule': 'normalize_headers'}])
+
+    result = process_extracted_tables([table], {'VIGENCIA': 'Vigencia'}, transform=transform)
+
+    assert 'Vigencia' in result.columns
+
+def test_transform_applied_to_every_out_of_core_batch(tmp_path, table):
+    transform = compile_transform_rules(config.TRANSFORM_RULES)
+    spilled = process_extracted_tables(
+        [table, table], {'OD': 'Dental'}, memory_limit_mb=0,
+        spill_dir=str(tmp_path), spill_batch_rows=2, transform=transform
+    )
+
+    batches = list(spilled.iter_batches())
+    spilled.close()
+
+    assert spilled.columns == ['PROCEDIMENTO', 'VIGENCIA', 'Dental', 'AMB', 'RN (alteracao)']
+    assert all(list(batch.columns) == spilled.columns for batch in batches)
+    assert pd.concat(batches)['Dental'].tolist() == [True, False, True, False]
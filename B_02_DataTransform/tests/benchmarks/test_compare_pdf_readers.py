@@ -0,0 +1,25 @@
+import multiprocessing
+import os
+import resource
+
+import benchmarks.compare_pdf_readers as compare_pdf_readers
+from benchmarks.compare_pdf_readers import collect_child_result
+
+def test_collect_child_result_reports_crashed_child():
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=os._exit, args=(3,))  # Dies without reporting, like a segfault or OOM kill
+    process.start()
+
+    result = collect_child_result(process, queue)
+
+    assert result == {'error': "process exited with code 3 without a result"}
+
+def test_peak_rss_counts_child_processes(mocker):
+    """The JVM and worker processes are children; their peak has to be part of the reported one"""
+    usage = {resource.RUSAGE_SELF: 100 * 1024, resource.RUSAGE_CHILDREN: 300 * 1024}
+    mocker.patch.object(compare_pdf_readers.resource, 'getrusage',
+                        side_effect=lambda who: mocker.Mock(ru_maxrss=usage[who]))
+    mocker.patch.object(compare_pdf_readers.sys, 'platform', 'linux')
+
+    assert compare_pdf_readers.peak_rss_mb() == 400.0
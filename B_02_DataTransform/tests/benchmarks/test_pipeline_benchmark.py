@@ -0,0 +1,43 @@
+import pytest
+
+from benchmarks.synthetic_pdf import generate_lattice_pdf, COLUMNS
+from benchmarks.pipeline_benchmark import compare_results
+from src.adapters.pdfplumber_reader_adapter import PdfplumberPdfReader
+
+def test_synthetic_pdf_is_readable_as_lattice_tables(tmp_path):
+    pdf_path, rows = generate_lattice_pdf(str(tmp_path / "synthetic.pdf"), pages=2)
+
+    tables = PdfplumberPdfReader(max_workers=1).extract_tables_from_pdf(pdf_path)
+
+    assert len(tables) == 2
+    assert sum(len(df) for df in tables) == rows
+    assert list(tables[0].columns) == [label for label, _ in COLUMNS]
+
+def test_synthetic_pdf_is_deterministic(tmp_path):
+    first = generate_lattice_pdf(str(tmp_path / "a.pdf"), pages=1, seed=7)[0]
+    second = generate_lattice_pdf(str(tmp_path / "b.pdf"), pages=1, seed=7)[0]
+
+    with open(first, 'rb') as a, open(second, 'rb') as b:
+        assert a.read() == b.read()
+
+@pytest.fixture
+def baseline():
+    return {'cases': {'tabula:10': {'rows': 300, 'wall_seconds': 10.0, 'peak_rss_mb': 200.0, 'rows_per_second': 30.0}}}
+
+def test_compare_results_within_tolerance(baseline):
+    results = {'cases': {'tabula:10': {'rows': 300, 'wall_seconds': 11.0, 'peak_rss_mb': 210.0, 'rows_per_second': 27.3}}}
+    assert compare_results(results, baseline, tolerance=0.15) == []
+
+def test_compare_results_flags_regressions(baseline):
+    results = {'cases': {'tabula:10': {'rows': 299, 'wall_seconds': 13.0, 'peak_rss_mb': 200.0, 'rows_per_second': 23.0}}}
+
+    regressions = compare_results(results, baseline, tolerance=0.15)
+
+    assert len(regressions) == 3
+    assert any('row count' in message for message in regressions)
+    assert any('wall_seconds' in message for message in regressions)
+    assert any('rows_per_second' in message for message in regressions)
+
+def test_compare_results_flags_failed_case(baseline):
+    results = {'cases': {'tabula:10': {'error': 'JavaNotFoundError'}}}
+    assert compare_results(results, baseline, tolerance=0.15) == ["tabula:10: failed (JavaNotFoundError)"]
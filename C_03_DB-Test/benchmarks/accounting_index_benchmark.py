@@ -0,0 +1,202 @@
+"""Compare accounting load, expense-summary refresh and analysis-query times with and without the covering index.
+
+Each scenario starts from truncated tables, loads the same synthetic quarters through
+MySqlAccountingRepository, refreshes accounting_expense_summary for every quarter (the aggregation
+the covering index serves) and then runs sql/analysis.queries.sql (best of --query-repeat):
+
+  no_index        idx_accounting_quarter_account absent
+  index_per_row   index present and maintained row by row during LOAD DATA
+  index_deferred  index present, built in one sorted pass after LOAD DATA (the loader's default)
+
+Uses the database configured in .env. WARNING: `accounting` and `operators` are truncated
+(pass --yes to confirm) and the index is left in place at the end.
+
+Usage (from C_03_DB-Test/):
+    python -m benchmarks.accounting_index_benchmark --yes
+    python -m benchmarks.accounting_index_benchmark --yes --quarters 8 --rows-per-quarter 500000
+"""
+import argparse
+import csv
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src import config
+from src.infrastructure.database import MySQLConnectionManager, MySqlAccountingRepository
+from src.infrastructure.database.mysql_accounting_repository import SECONDARY_INDEXES
+
+logger = logging.getLogger(__name__)
+
+QUERIES_PATH = Path(__file__).resolve().parent.parent / "sql" / "analysis.queries.sql"
+INDEX_NAME = 'idx_accounting_quarter_account'
+SCENARIOS = {
+    # name -> (index present, build deferred)
+    'no_index': (False, True),
+    'index_per_row': (True, False),
+    'index_deferred': (True, True),
+}
+
+def quarter_dates(quarters: int, last_year: int = 2024) -> List[date]:
+    """The last `quarters` quarter-end dates up to Q4 of `last_year`, oldest first"""
+    ends = [(3, 31), (6, 30), (9, 30), (12, 31)]
+    dates = [date(year, month, day) for year in range(last_year - quarters // 4 - 1, last_year + 1) for month, day in ends]
+    return dates[-quarters:]
+
+def write_synthetic_quarter(path: Path, reference_date: date, rows: int, operators: List[int], seed: int) -> None:
+    """Accounting CSV in the ANS layout (';' separated, Brazilian decimals), ~1/4 of rows in '411%' accounts"""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=';', quoting=csv.QUOTE_ALL)
+        writer.writerow(["DATA", "REG_ANS", "CD_CONTA_CONTABIL", "DESCRICAO", "VL_SALDO_INICIAL", "VL_SALDO_FINAL"])
+        for _ in range(rows):
+            account = rng.choice(["411", "311", "121", "212"]) + str(rng.randint(10000, 99999))
+            initial, final = rng.uniform(-1e6, 1e7), rng.uniform(-1e6, 1e7)
+            writer.writerow([
+                reference_date.strftime('%d/%m/%Y'),
+                rng.choice(operators),
+                account,
+                f"CONTA {account}",
+                f"{initial:.2f}".replace('.', ','),
+                f"{final:.2f}".replace('.', ','),
+            ])
+
+def _execute(conn_manager: MySQLConnectionManager, statements: List[str], params_list=None) -> None:
+    conn = conn_manager.get_connection()
+    cursor = conn.cursor()
+    try:
+        for statement in statements:
+            if params_list is not None:
+                cursor.executemany(statement, params_list)
+            else:
+                cursor.execute(statement)
+            if cursor.with_rows:
+                cursor.fetchall()
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+def _index_exists(conn_manager: MySQLConnectionManager) -> bool:
+    conn = conn_manager.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'accounting' AND INDEX_NAME = %s
+        """, (INDEX_NAME,))
+        return cursor.fetchone()[0] > 0
+    finally:
+        cursor.close()
+        conn.close()
+
+def set_index(conn_manager: MySQLConnectionManager, present: bool) -> None:
+    exists = _index_exists(conn_manager)
+    if present and not exists:
+        _execute(conn_manager, [f"ALTER TABLE accounting ADD INDEX {INDEX_NAME} {SECONDARY_INDEXES[INDEX_NAME]}"])
+    elif not present and exists:
+        _execute(conn_manager, [f"ALTER TABLE accounting DROP INDEX {INDEX_NAME}"])
+
+def load_operators(conn_manager: MySQLConnectionManager, operators: List[int]) -> None:
+    _execute(conn_manager, [
+        "SET SESSION foreign_key_checks = 0", "TRUNCATE TABLE operators", "SET SESSION foreign_key_checks = 1"
+    ])
+    _execute(
+        conn_manager,
+        ["INSERT INTO operators (Registro_ANS, Razao_Social) VALUES (%s, %s)"],
+        [(reg_ans, f"Operadora {reg_ans}") for reg_ans in operators]
+    )
+
+def analysis_statements() -> List[str]:
+    """Statements of sql/analysis.queries.sql, skipping comment-only fragments"""
+    statements = []
+    for fragment in QUERIES_PATH.read_text(encoding='utf-8').split(';'):
+        code = '\n'.join(line for line in fragment.splitlines() if not line.strip().startswith('--'))
+        if code.strip():
+            statements.append(fragment.strip())
+    return statements
+
+def run_scenario(conn_manager: MySQLConnectionManager, csv_files: Dict[date, Path], index_present: bool,
+                 defer_index_build: bool, query_repeat: int) -> Dict:
+    repo = MySqlAccountingRepository(conn_manager, defer_index_build=defer_index_build)
+    repo.clear_all()
+    set_index(conn_manager, index_present)
+
+    start = time.perf_counter()
+    repo.begin_bulk_load()
+    rows = sum(repo.load_from_csv(path, reference_date) for reference_date, path in csv_files.items())
+    repo.end_bulk_load()
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for reference_date in csv_files:
+        repo.refresh_quarter_summary(reference_date)
+    summary_seconds = time.perf_counter() - start
+
+    statements = analysis_statements()
+    query_times = []
+    for _ in range(query_repeat):
+        start = time.perf_counter()
+        _execute(conn_manager, statements)
+        query_times.append(time.perf_counter() - start)
+
+    return {
+        'rows': rows,
+        'load_seconds': round(load_seconds, 3),
+        'load_rows_per_second': round(rows / load_seconds, 1) if load_seconds else None,
+        'summary_refresh_seconds': round(summary_seconds, 3),
+        'queries_seconds': round(min(query_times), 4),
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time accounting loads, summary refreshes and analysis queries with and without the covering index.")
+    parser.add_argument('--quarters', type=int, default=4)
+    parser.add_argument('--rows-per-quarter', type=int, default=200_000)
+    parser.add_argument('--operators', type=int, default=1_000)
+    parser.add_argument('--query-repeat', type=int, default=3)
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--output', help="Also write the JSON results to this file")
+    parser.add_argument('--yes', action='store_true', help="Confirm that accounting/operators may be truncated")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level='WARNING', format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+    if not args.yes:
+        print("This benchmark truncates the accounting and operators tables; re-run with --yes.", file=sys.stderr)
+        return 2
+
+    conn_manager = MySQLConnectionManager(config.DB_CONFIG, pool_size=config.DB_CONFIG['pool_size'])
+    operators = list(range(300_000, 300_000 + args.operators))
+    load_operators(conn_manager, operators)
+
+    results: Dict = {
+        'quarters': args.quarters,
+        'rows_per_quarter': args.rows_per_quarter,
+        'scenarios': {},
+    }
+    with tempfile.TemporaryDirectory() as csv_dir:
+        csv_files = {}
+        for i, reference_date in enumerate(quarter_dates(args.quarters)):
+            path = Path(csv_dir) / f"{(reference_date.month - 1) // 3 + 1}T{reference_date.year}.csv"
+            write_synthetic_quarter(path, reference_date, args.rows_per_quarter, operators, seed=i)
+            csv_files[reference_date] = path
+
+        for name in args.scenarios:
+            index_present, defer_index_build = SCENARIOS[name]
+            results['scenarios'][name] = run_scenario(
+                conn_manager, csv_files, index_present, defer_index_build, args.query_repeat
+            )
+            logger.warning(f"{name}: {results['scenarios'][name]}")
+
+    set_index(conn_manager, True)  # Leave the schema as sql/schema.sql defines it
+    print(json.dumps(results, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Measure the load throughput gained by running LOAD DATA in tuned bulk sessions.
+
+Every scenario runs LoadAnsDataUseCase over the same synthetic operators CSV and accounting
+quarters (truncate, operators, accounting, expense summaries) and must leave identical data:
+
+  default_session     connections keep the server's session settings
+  bulk_session        MySQLConnectionManager.bulk_session(): unique/foreign key checks off,
+                      larger sort/read/bulk-insert buffers
+  bulk_session_nolog  bulk_session plus sql_log_bin=0 (only with --skip-binlog; needs
+                      SYSTEM_VARIABLES_ADMIN or SUPER, otherwise identical to bulk_session)
+
+Each scenario runs --repeat times and reports its fastest run. Uses the database configured
+in .env. WARNING: all loader tables are truncated (pass --yes to confirm).
+
+Usage (from C_03_DB-Test/):
+    python -m benchmarks.bulk_session_benchmark --yes
+    python -m benchmarks.bulk_session_benchmark --yes --quarters 8 --rows-per-quarter 500000 --repeat 3
+"""
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src import config
+from src.application.dto import LoadConfig
+from src.application.use_cases import LoadAnsDataUseCase
+from src.infrastructure import (
+    OsFileSystem,
+    MySQLConnectionManager,
+    MySqlOperatorRepository,
+    MySqlAccountingRepository,
+)
+from benchmarks.accounting_index_benchmark import quarter_dates, write_synthetic_quarter
+from benchmarks.prenormalize_benchmark import table_checksum, write_synthetic_operators
+
+logger = logging.getLogger(__name__)
+
+# name -> (bulk_session, skip_binlog)
+SCENARIOS = {
+    'default_session': (False, False),
+    'bulk_session': (True, False),
+    'bulk_session_nolog': (True, True),
+}
+
+def run_scenario(name: str, load_config: LoadConfig, repeat: int) -> Dict:
+    bulk_session, skip_binlog = SCENARIOS[name]
+    db_config = dict(config.DB_CONFIG, pool_name=f"bench_{name}")
+    conn_manager = MySQLConnectionManager(
+        db_config, pool_size=db_config['pool_size'], bulk_session=bulk_session, skip_binlog=skip_binlog
+    )
+    use_case = LoadAnsDataUseCase(
+        operator_repo=MySqlOperatorRepository(conn_manager),
+        accounting_repo=MySqlAccountingRepository(conn_manager),
+        file_system=OsFileSystem(),
+    )
+    runs = []
+    succeeded = True
+    for _ in range(repeat):
+        start = time.perf_counter()
+        succeeded = use_case.execute(load_config) and succeeded
+        runs.append(round(time.perf_counter() - start, 3))
+    checksum = table_checksum(conn_manager)
+    rows = int(checksum['accounting'][0])
+    seconds = min(runs)
+    return {
+        'succeeded': succeeded,
+        'rows': rows,
+        'runs': runs,
+        'seconds': seconds,
+        'rows_per_second': round(rows / seconds, 1) if seconds else None,
+        'checksum': checksum,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time the full load with default and with bulk-tuned sessions.")
+    parser.add_argument('--quarters', type=int, default=4)
+    parser.add_argument('--rows-per-quarter', type=int, default=200_000)
+    parser.add_argument('--operators', type=int, default=1_000)
+    parser.add_argument('--load-workers', type=int, default=config.LOAD_PARALLEL_WORKERS)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--skip-binlog', action='store_true', help="Also run the bulk_session_nolog scenario")
+    parser.add_argument('--output', help="Also write the JSON results to this file")
+    parser.add_argument('--yes', action='store_true', help="Confirm that the loader tables may be truncated")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level='WARNING', format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+    if not args.yes:
+        print("This benchmark truncates the loader tables; re-run with --yes.", file=sys.stderr)
+        return 2
+
+    scenarios = ['default_session', 'bulk_session'] + (['bulk_session_nolog'] if args.skip_binlog else [])
+    results: Dict = {
+        'quarters': args.quarters,
+        'rows_per_quarter': args.rows_per_quarter,
+        'load_workers': args.load_workers,
+        'scenarios': {},
+    }
+    with tempfile.TemporaryDirectory() as data_dir:
+        base = Path(data_dir)
+        csvs_dir = base / "csvs"
+        csvs_dir.mkdir()
+        operators = list(range(300_000, 300_000 + args.operators))
+        write_synthetic_operators(base / "operators.csv", operators)
+        for i, reference_date in enumerate(quarter_dates(args.quarters)):
+            path = csvs_dir / f"{(reference_date.month - 1) // 3 + 1}T{reference_date.year}.csv"
+            write_synthetic_quarter(path, reference_date, args.rows_per_quarter, operators, seed=i)
+        load_config = LoadConfig(
+            operators_csv_path=base / "operators.csv",
+            accounting_csvs_dir=csvs_dir,
+            parallel_workers=args.load_workers,
+        )
+        for name in scenarios:
+            results['scenarios'][name] = run_scenario(name, load_config, args.repeat)
+            logger.warning(f"{name}: {results['scenarios'][name]['seconds']}s")
+
+    baseline = results['scenarios']['default_session']
+    results['results_match'] = all(
+        scenario['checksum'] == baseline['checksum'] for scenario in results['scenarios'].values()
+    )
+    for name in scenarios[1:]:
+        seconds = results['scenarios'][name]['seconds']
+        results['scenarios'][name]['speedup'] = round(baseline['seconds'] / seconds, 2) if seconds else None
+    print(json.dumps(results, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 0 if results['results_match'] else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
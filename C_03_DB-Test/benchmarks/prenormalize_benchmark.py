@@ -0,0 +1,154 @@
+"""Compare the end-to-end load with cleaning done in MySQL against pandas pre-normalization.
+
+Both scenarios run LoadAnsDataUseCase over the same synthetic operators CSV and accounting
+quarters (truncate, operators, accounting, expense summaries) and must leave identical data:
+
+  sql            raw CSVs, per-row REGEXP/REPLACE/CAST/STR_TO_DATE in the LOAD DATA templates
+  prenormalized  CsvPreNormalizer cleans each CSV in --normalize-workers processes first,
+                 LOAD DATA only maps columns
+
+Uses the database configured in .env. WARNING: all loader tables are truncated (pass --yes
+to confirm).
+
+Usage (from C_03_DB-Test/):
+    python -m benchmarks.prenormalize_benchmark --yes
+    python -m benchmarks.prenormalize_benchmark --yes --quarters 8 --rows-per-quarter 500000 --load-workers 3
+"""
+import argparse
+import csv
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src import config
+from src.application.dto import LoadConfig
+from src.application.use_cases import LoadAnsDataUseCase
+from src.infrastructure import (
+    OsFileSystem,
+    MySQLConnectionManager,
+    MySqlOperatorRepository,
+    MySqlAccountingRepository,
+    CsvPreNormalizer,
+)
+from src.infrastructure.database.csv_prenormalizer import OPERATOR_COLUMNS
+from benchmarks.accounting_index_benchmark import quarter_dates, write_synthetic_quarter
+
+logger = logging.getLogger(__name__)
+
+def write_synthetic_operators(path: Path, operators: List[int], seed: int = 0) -> None:
+    """Operators CSV in the ANS layout, with the '.0' float suffixes and blank dates the loader cleans"""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=';', quoting=csv.QUOTE_ALL)
+        writer.writerow(OPERATOR_COLUMNS)
+        for reg_ans in operators:
+            writer.writerow([
+                reg_ans, f"{rng.randint(10**13, 10**14 - 1)}", f"Operadora {reg_ans}", "", "Medicina de Grupo",
+                "Rua A", str(rng.randint(1, 999)), "", "Centro", "Sao Paulo", "SP",
+                f"{rng.randint(10**7, 10**8 - 1)}.0", f"{rng.randint(11, 99)}.0", f"{rng.randint(10**7, 10**8 - 1)}.0",
+                "", "contato@example.com", "Fulano", "Diretor", f"{rng.randint(1, 6)}.0",
+                rng.choice(["2001-05-14", "2015-11-30", "", "0000-00-00"]),
+            ])
+
+def table_checksum(conn_manager: MySQLConnectionManager) -> Dict:
+    """Row counts and sums that must match between scenarios"""
+    conn = conn_manager.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT COUNT(*), COUNT(vl_saldo_inicial), SUM(vl_saldo_inicial), SUM(vl_saldo_final),
+                   SUM(CRC32(CONCAT_WS('|', reg_ans, cd_conta_contabil, descricao)))
+            FROM accounting
+        """)
+        accounting = cursor.fetchone()
+        cursor.execute("""
+            SELECT COUNT(*), COUNT(Data_Registro_ANS), SUM(CRC32(CONCAT_WS('|', CEP, DDD, Telefone, Regiao_de_Comercializacao)))
+            FROM operators
+        """)
+        operators = cursor.fetchone()
+        return {'accounting': [str(value) for value in accounting], 'operators': [str(value) for value in operators]}
+    finally:
+        cursor.close()
+        conn.close()
+
+def run_scenario(conn_manager: MySQLConnectionManager, load_config: LoadConfig,
+                 normalizer: Optional[CsvPreNormalizer]) -> Dict:
+    use_case = LoadAnsDataUseCase(
+        operator_repo=MySqlOperatorRepository(conn_manager, normalizer=normalizer),
+        accounting_repo=MySqlAccountingRepository(conn_manager, normalizer=normalizer),
+        file_system=OsFileSystem(),
+    )
+    start = time.perf_counter()
+    succeeded = use_case.execute(load_config)
+    seconds = time.perf_counter() - start
+    checksum = table_checksum(conn_manager)
+    rows = int(checksum['accounting'][0])
+    return {
+        'succeeded': succeeded,
+        'rows': rows,
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(rows / seconds, 1) if seconds else None,
+        'checksum': checksum,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time the full load with SQL-side cleaning and with pandas pre-normalization.")
+    parser.add_argument('--quarters', type=int, default=4)
+    parser.add_argument('--rows-per-quarter', type=int, default=200_000)
+    parser.add_argument('--operators', type=int, default=1_000)
+    parser.add_argument('--load-workers', type=int, default=config.LOAD_PARALLEL_WORKERS)
+    parser.add_argument('--normalize-workers', type=int, default=config.CSV_PRENORMALIZE_WORKERS)
+    parser.add_argument('--output', help="Also write the JSON results to this file")
+    parser.add_argument('--yes', action='store_true', help="Confirm that the loader tables may be truncated")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level='WARNING', format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+    if not args.yes:
+        print("This benchmark truncates the loader tables; re-run with --yes.", file=sys.stderr)
+        return 2
+
+    conn_manager = MySQLConnectionManager(config.DB_CONFIG, pool_size=config.DB_CONFIG['pool_size'])
+    results: Dict = {
+        'quarters': args.quarters,
+        'rows_per_quarter': args.rows_per_quarter,
+        'load_workers': args.load_workers,
+        'normalize_workers': args.normalize_workers,
+        'scenarios': {},
+    }
+    with tempfile.TemporaryDirectory() as data_dir:
+        base = Path(data_dir)
+        csvs_dir = base / "csvs"
+        csvs_dir.mkdir()
+        operators = list(range(300_000, 300_000 + args.operators))
+        write_synthetic_operators(base / "operators.csv", operators)
+        for i, reference_date in enumerate(quarter_dates(args.quarters)):
+            path = csvs_dir / f"{(reference_date.month - 1) // 3 + 1}T{reference_date.year}.csv"
+            write_synthetic_quarter(path, reference_date, args.rows_per_quarter, operators, seed=i)
+        load_config = LoadConfig(
+            operators_csv_path=base / "operators.csv",
+            accounting_csvs_dir=csvs_dir,
+            parallel_workers=args.load_workers,
+        )
+
+        results['scenarios']['sql'] = run_scenario(conn_manager, load_config, None)
+        normalizer = CsvPreNormalizer(max_workers=args.normalize_workers, work_dir=base / "normalized")
+        try:
+            results['scenarios']['prenormalized'] = run_scenario(conn_manager, load_config, normalizer)
+        finally:
+            normalizer.close()
+
+    sql, prenormalized = results['scenarios']['sql'], results['scenarios']['prenormalized']
+    results['results_match'] = sql['checksum'] == prenormalized['checksum']
+    results['speedup'] = round(sql['seconds'] / prenormalized['seconds'], 2) if prenormalized['seconds'] else None
+    print(json.dumps(results, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 0 if results['results_match'] else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
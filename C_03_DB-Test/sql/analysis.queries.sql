@@ -1,51 +1,52 @@
+-- As consultas leem accounting_expense_summary (totais por trimestre, operadora e prefixo de conta),
+-- mantida pelo loader a cada trimestre carregado, em vez de agregar a tabela accounting inteira.
+
 -- Query 1: Top 10 Operadoras com Maiores Despesas (Saldo Final)
 
-SET @ultimo_trimestre = (SELECT MAX(trimestre_referencia) FROM accounting);
+SET @ultimo_trimestre = (
+    SELECT MAX(trimestre_referencia) FROM accounting_expense_summary WHERE prefixo_conta = '411'
+);
 
 SELECT
     op.Razao_Social AS OperatorName,
-    FORMAT(SUM(acc.vl_saldo_final), 2, 'de_DE') AS TotalExpense_LastQuarter
+    FORMAT(SUM(s.vl_saldo_final_total), 2, 'de_DE') AS TotalExpense_LastQuarter
 FROM
-    accounting acc
+    accounting_expense_summary s
 JOIN
-    operators op ON acc.reg_ans = op.Registro_ANS
+    operators op ON s.reg_ans = op.Registro_ANS
 WHERE
-    acc.cd_conta_contabil LIKE '411%'
-    AND acc.trimestre_referencia = @ultimo_trimestre
-    AND acc.vl_saldo_final IS NOT NULL
+    s.prefixo_conta = '411'
+    AND s.trimestre_referencia = @ultimo_trimestre
 GROUP BY
     op.Registro_ANS, op.Razao_Social
 ORDER BY
-    SUM(acc.vl_saldo_final) DESC
+    SUM(s.vl_saldo_final_total) DESC
 LIMIT 10;
 
 -- Query 2: Top 10 Operadoras com Maiores Despesas No Ultimo Ano
-
-DROP TEMPORARY TABLE IF EXISTS last_4_quarters;
-CREATE TEMPORARY TABLE last_4_quarters AS (
-    SELECT DISTINCT trimestre_referencia
-    FROM accounting
-    ORDER BY trimestre_referencia DESC
-    LIMIT 4
-);
+-- Independente da Query 1: os 4 ultimos trimestres carregados entram pela lista, mesmo que haja
+-- um trimestre faltando entre eles (o LIMIT fica numa tabela derivada, que o MySQL aceita em IN).
 
 SELECT
     op.Razao_Social AS OperatorName,
-    FORMAT(SUM(acc.vl_saldo_final), 2, 'de_DE') AS TotalExpense_LastYear
+    FORMAT(SUM(s.vl_saldo_final_total), 2, 'de_DE') AS TotalExpense_LastYear
 FROM
-    accounting acc
+    accounting_expense_summary s
 JOIN
-    operators op ON acc.reg_ans = op.Registro_ANS
-JOIN
-    last_4_quarters l4q ON acc.trimestre_referencia = l4q.trimestre_referencia
+    operators op ON s.reg_ans = op.Registro_ANS
 WHERE
-    acc.cd_conta_contabil LIKE '411%'
-    AND acc.vl_saldo_final IS NOT NULL
+    s.prefixo_conta = '411'
+    AND s.trimestre_referencia IN (
+        SELECT trimestre_referencia FROM (
+            SELECT DISTINCT trimestre_referencia
+            FROM accounting_expense_summary
+            WHERE prefixo_conta = '411'
+            ORDER BY trimestre_referencia DESC
+            LIMIT 4
+        ) AS last_4_quarters
+    )
 GROUP BY
     op.Registro_ANS, op.Razao_Social
 ORDER BY
-    SUM(acc.vl_saldo_final) DESC
+    SUM(s.vl_saldo_final_total) DESC
 LIMIT 10;
-
-DROP TEMPORARY TABLE IF EXISTS last_4_quarters;
-
@@ -19,21 +19,74 @@ CREATE TABLE operators (
     Representante VARCHAR(255) NULL,
     Cargo_Representante VARCHAR(100) NULL,
     Regiao_de_Comercializacao VARCHAR(100) NULL,
-    Data_Registro_ANS DATE NULL
+    Data_Registro_ANS DATE NULL,
+    -- MD5 das colunas de dados, gravado pela carga em modo upsert para so reescrever linhas alteradas.
+    -- Fica NULL na carga com TRUNCATE; o upsert seguinte trata essas linhas como alteradas.
+    row_hash CHAR(32) NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Tabela accounting
+-- Particionada por trimestre (LIST COLUMNS): cada trimestre carregado ganha sua propria particao
+-- (p20240331, ...), adicionada pelo loader e preenchida com EXCHANGE PARTITION a partir de uma
+-- tabela de staging. Consultas filtradas por trimestre_referencia so leem as particoes necessarias,
+-- e um trimestre antigo e removido instantaneamente com:
+--   ALTER TABLE accounting DROP PARTITION p20220331;
+-- O MySQL nao permite FOREIGN KEY em tabelas particionadas, por isso accounting.reg_ans nao
+-- referencia operators; as consultas de analise fazem JOIN com operators e ignoram registros sem operadora.
+-- Apos cada carga o loader conta as linhas de accounting sem operadora e registra o total em log.
 CREATE TABLE accounting (
-    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    id BIGINT AUTO_INCREMENT,
     trimestre_referencia DATE NOT NULL,
     reg_ans INT NOT NULL,
     cd_conta_contabil VARCHAR(50) NOT NULL,
     descricao VARCHAR(500) NOT NULL,
     vl_saldo_inicial DECIMAL(18, 2) NULL,
-    vl_saldo_final DECIMAL(18, 2) NULL
+    vl_saldo_final DECIMAL(18, 2) NULL,
+    PRIMARY KEY (id, trimestre_referencia),  -- A chave primaria precisa conter a coluna de particionamento
+    -- Indice de cobertura das consultas de analise (trimestre, prefixo '411%', operadora, valor somado).
+    -- O loader o remove da tabela de staging e o reconstroi em uma unica passada ordenada apos o LOAD DATA.
+    INDEX idx_accounting_quarter_account (trimestre_referencia, cd_conta_contabil, reg_ans, vl_saldo_final)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+PARTITION BY LIST COLUMNS (trimestre_referencia) (
+    PARTITION p_placeholder VALUES IN ('1000-01-01')  -- LIST exige ao menos uma particao; nunca recebe dados
+);
+
+-- Tabela load_state: trimestres carregados e hash dos arquivos de origem (carga incremental)
+CREATE TABLE load_state (
+    trimestre_referencia DATE PRIMARY KEY,
+    source_files VARCHAR(500) NOT NULL,
+    source_hash CHAR(64) NOT NULL,
+    row_count BIGINT NOT NULL,
+    loaded_at DATETIME NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Tabela accounting_expense_summary: totais de vl_saldo_final por trimestre, operadora e prefixo de conta
+-- (3 digitos, ex. '411'). Recalculada pelo loader para cada trimestre carregado; as consultas de
+-- analise leem esta tabela em vez de agregar accounting inteira.
+CREATE TABLE accounting_expense_summary (
+    trimestre_referencia DATE NOT NULL,
+    prefixo_conta VARCHAR(3) NOT NULL,
+    reg_ans INT NOT NULL,
+    vl_saldo_final_total DECIMAL(24, 2) NULL,
+    qtd_registros INT NOT NULL,
+    PRIMARY KEY (prefixo_conta, trimestre_referencia, reg_ans)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
-ALTER TABLE accounting
-ADD CONSTRAINT fk_accounting_operadoras
-FOREIGN KEY (reg_ans) REFERENCES operators(Registro_ANS)
-ON DELETE RESTRICT ON UPDATE CASCADE;
\ No newline at end of file
+-- Tabela load_audit: uma linha por arquivo carregado. A contagem de linhas e os checksums por coluna
+-- (CRC-32 dos valores brutos) sao calculados enquanto o arquivo e enviado ao LOAD DATA e comparados com
+-- as linhas inseridas e os avisos informados pelo servidor, sem reler a tabela. discrepancy descreve a
+-- diferenca quando os numeros nao batem.
+CREATE TABLE load_audit (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    table_name VARCHAR(64) NOT NULL,
+    source_name VARCHAR(500) NOT NULL,
+    trimestre_referencia DATE NULL,
+    source_rows BIGINT NOT NULL,
+    source_bytes BIGINT NOT NULL,
+    loaded_rows BIGINT NOT NULL,
+    warning_count INT NOT NULL,
+    column_checksums JSON NOT NULL,
+    discrepancy VARCHAR(500) NULL,
+    loaded_at DATETIME NOT NULL,
+    INDEX idx_load_audit_quarter (trimestre_referencia)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -2,4 +2,4 @@ from .ports import *
 from .use_cases import *
 from .dto import *
 
-__all__ = ports.__all__ + use_cases.__all__ + ["DownloadConfig", "LoadConfig"]
\ No newline at end of file
+__all__ = ports.__all__ + use_cases.__all__ + ["DownloadConfig", "LoadConfig", "RemoteFileInfo", "ManifestEntry"]
\ No newline at end of file
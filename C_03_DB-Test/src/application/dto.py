@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 
 # Configuration for downloading files (immutable)
 @dataclass(frozen=True)
@@ -14,9 +14,32 @@ class DownloadConfig:
     csvs_dir: Path           # Directory for extracted CSV files
     operators_dir: Path      # Directory for operator-related files
     operators_csv_path: Path # Path to the operators CSV file
+    max_concurrent_downloads: int = 1  # Year listings / ZIP downloads in flight at once (1 = serial)
+    extract_zips: bool = True  # False when the loader streams the CSVs straight from the ZIPs
 
 # Configuration for loading data (immutable)
 @dataclass(frozen=True)
 class LoadConfig:
     operators_csv_path: Path      # Path to the operators CSV file
-    accounting_csvs_dir: Path     # Directory containing accounting CSV files
\ No newline at end of file
+    accounting_csvs_dir: Path     # Directory containing accounting CSV files
+    parallel_workers: int = 1     # Accounting files loaded at once, each on its own pooled connection
+    incremental: bool = False     # Reload only quarters whose source files changed (needs a load-state repository)
+    accounting_zips_dir: Optional[Path] = None  # Set: stream the CSVs from the ZIPs here instead of accounting_csvs_dir
+    operators_upsert: bool = False  # Merge the operators CSV into the table instead of truncating and reloading it
+    shadow_tables: bool = False   # Full reloads fill shadow tables that replace the live ones at the end (needs a ShadowTables)
+
+# Remote file metadata reported by a HEAD request (servers may omit any of it)
+@dataclass(frozen=True)
+class RemoteFileInfo:
+    size: Optional[int]           # Content-Length in bytes
+    etag: Optional[str]           # ETag header
+    last_modified: Optional[str]  # Last-Modified header
+
+# What a previous run downloaded from one URL and extracted from it (immutable)
+@dataclass(frozen=True)
+class ManifestEntry:
+    size: Optional[int]           # Remote size when it was downloaded
+    etag: Optional[str]           # Remote ETag when it was downloaded
+    last_modified: Optional[str]  # Remote Last-Modified when it was downloaded
+    sha256: str                   # Hash of the downloaded ZIP
+    extracted_sizes: Dict[str, int] = field(default_factory=dict)   # Extracted file name -> size in bytes
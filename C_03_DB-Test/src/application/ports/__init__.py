@@ -4,6 +4,9 @@ from .html_parser import HtmlParser
 from .zip_extractor import ZipExtractor
 from .operator_repository import OperatorRepository
 from .accounting_repository import AccountingRepository
+from .download_manifest import DownloadManifest
+from .load_state_repository import LoadStateRepository
+from .shadow_tables import ShadowTables
 
 __all__ = [
     "FileSystem",
@@ -12,4 +15,7 @@ __all__ = [
     "ZipExtractor",
     "OperatorRepository",
     "AccountingRepository",
+    "DownloadManifest",
+    "LoadStateRepository",
+    "ShadowTables",
 ]
\ No newline at end of file
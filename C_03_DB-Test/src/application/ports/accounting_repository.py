@@ -18,4 +18,72 @@ class AccountingRepository(abc.ABC):
         """
         Loads accounting statements from a CSV file into the repository
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abc.abstractmethod
+    def load_from_zip_member(self, zip_path: Path, member: str, reference_date: date) -> int:
+        """
+        Loads accounting statements from a CSV stored in a ZIP archive, without extracting it to disk
+        """
+        pass
+
+    @abc.abstractmethod
+    def delete_quarter(self, reference_date: date) -> int:
+        """
+        Deletes every accounting statement (and expense total) of one reference quarter;
+        returns the number of statements removed
+        """
+        pass
+
+    @abc.abstractmethod
+    def begin_bulk_load(self) -> None:
+        """
+        Prepares an emptied repository for a series of loads (e.g. defers index maintenance)
+        """
+        pass
+
+    @abc.abstractmethod
+    def end_bulk_load(self) -> None:
+        """
+        Finishes a series of loads started with begin_bulk_load (e.g. rebuilds indexes)
+        """
+        pass
+
+    @abc.abstractmethod
+    def begin_quarter_load(self, reference_date: date, replace: bool = False) -> None:
+        """
+        Starts loading the files of one quarter as a unit; loads of that quarter made by the calling
+        thread until end_quarter_load or abort_quarter_load go into it. With `replace` the loaded rows
+        take the place of the quarter's existing rows when the load ends, instead of joining them
+        """
+        pass
+
+    @abc.abstractmethod
+    def end_quarter_load(self, reference_date: date) -> None:
+        """
+        Makes the rows loaded since begin_quarter_load visible, together with the quarter's existing rows
+        or, in replace mode, in their place (readers see either the old or the new rows, never neither)
+        """
+        pass
+
+    @abc.abstractmethod
+    def abort_quarter_load(self, reference_date: date) -> None:
+        """
+        Discards a quarter load whose files did not all load, where the repository can (e.g. an unswapped staging table);
+        a replace-mode load leaves the quarter's existing rows untouched
+        """
+        pass
+
+    @abc.abstractmethod
+    def count_orphaned_statements(self) -> int:
+        """
+        Counts the accounting statements whose operator (reg_ans) is not in the operators table
+        """
+        pass
+
+    @abc.abstractmethod
+    def refresh_quarter_summary(self, reference_date: date) -> int:
+        """
+        Recomputes the precomputed expense totals of one quarter; returns the number of summary rows
+        """
+        pass
@@ -0,0 +1,22 @@
+import abc
+from typing import Optional
+
+from src.application.dto import ManifestEntry
+
+class DownloadManifest(abc.ABC):
+    """Abstract interface for the record of what previous runs downloaded and extracted"""
+
+    @abc.abstractmethod
+    def get(self, url: str) -> Optional[ManifestEntry]:
+        """Returns the entry recorded for the URL, or None if it was never downloaded"""
+        pass
+
+    @abc.abstractmethod
+    def put(self, url: str, entry: ManifestEntry) -> None:
+        """Records (or replaces) the entry for the URL; must be safe to call from several threads"""
+        pass
+
+    @abc.abstractmethod
+    def save(self) -> None:
+        """Persists the recorded entries so the next run can see them"""
+        pass
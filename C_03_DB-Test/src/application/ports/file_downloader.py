@@ -1,5 +1,8 @@
 import abc  # For creating abstract base classes
 from pathlib import Path  # For type-safe file path handling
+from typing import Optional
+
+from src.application.dto import RemoteFileInfo
 
 # Abstract base class defining the file downloader interface
 class FileDownloader(abc.ABC):
@@ -10,4 +13,23 @@ class FileDownloader(abc.ABC):
                 save_path: Path,   # Where to save the downloaded file (as Path object)
                 timeout: int = 60  # Timeout in seconds (default 60)
                ) -> bool:          # Returns True if successful, False otherwise
-        pass
\ No newline at end of file
+        pass
+
+    @abc.abstractmethod
+    def fetch_info(self,
+                   url: str,          # The URL of the file to inspect
+                   timeout: int = 30  # Timeout in seconds (default 30)
+                  ) -> Optional[RemoteFileInfo]:  # Returns None if the server can't be asked
+        """
+        Fetches the remote file's size, ETag and Last-Modified without downloading it
+        """
+        pass
+
+    @abc.abstractmethod
+    def downloaded_info(self,
+                        url: str  # A URL previously passed to download()
+                       ) -> Optional[RemoteFileInfo]:  # Returns None if it was not downloaded successfully
+        """
+        Returns the size, ETag and Last-Modified sent with the content the last download of the URL saved
+        """
+        pass
@@ -30,4 +30,14 @@ class FileSystem(abc.ABC):
     @abc.abstractmethod
     def get_filename(self, path: Path) -> str:
         """Extract just the filename portion from a path (e.g. 'file.txt' from '/path/to/file.txt')"""
-        pass
\ No newline at end of file
+        pass
+
+    @abc.abstractmethod
+    def get_file_size(self, path: Path) -> int:
+        """Size of the file in bytes"""
+        pass
+
+    @abc.abstractmethod
+    def compute_sha256(self, path: Path) -> str:
+        """Hex SHA-256 digest of the file's contents"""
+        pass
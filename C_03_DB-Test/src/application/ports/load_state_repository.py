@@ -0,0 +1,26 @@
+import abc
+from datetime import date
+from typing import Dict
+
+class LoadStateRepository(abc.ABC):
+    """Abstract interface recording which quarters are loaded and from which version of their source files"""
+
+    @abc.abstractmethod
+    def get_loaded_quarters(self) -> Dict[date, str]:
+        """Returns {trimestre_referencia: source hash} for every fully loaded quarter"""
+        pass
+
+    @abc.abstractmethod
+    def forget_quarter(self, reference_date: date) -> None:
+        """Removes the quarter's record, so an interrupted reload is retried on the next run"""
+        pass
+
+    @abc.abstractmethod
+    def mark_loaded(self, reference_date: date, source_files: str, source_hash: str, row_count: int) -> None:
+        """Records that the quarter was fully loaded from the given source files"""
+        pass
+
+    @abc.abstractmethod
+    def clear_all(self) -> None:
+        """Removes every record (used when all data is reloaded from scratch)"""
+        pass
@@ -17,4 +17,13 @@ class OperatorRepository(abc.ABC):
         """
         Loads Operator records from a CSV file into the repository
         """
+        pass
+
+    @abc.abstractmethod
+    def upsert_from_csv(self, csv_path: Path) -> int:
+        """
+        Makes the repository match the CSV without clearing it first: new and changed
+        Operators are written, Operators absent from the CSV are removed.
+        Returns the number of Operators in the CSV.
+        """
         pass
\ No newline at end of file
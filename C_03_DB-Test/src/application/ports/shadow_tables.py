@@ -0,0 +1,21 @@
+import abc
+
+class ShadowTables(abc.ABC):
+    """Abstract interface for blue/green reloads: a full reload fills empty shadow copies of the
+    tables while readers keep using the live ones, then the copies replace them all at once"""
+
+    @abc.abstractmethod
+    def begin(self) -> None:
+        """Creates empty shadow tables and directs the repositories' writes to them"""
+        pass
+
+    @abc.abstractmethod
+    def publish(self) -> None:
+        """Validates the shadow tables and swaps them in for the live tables atomically.
+        Raises RuntimeError, leaving the live tables untouched, if validation or the swap fails"""
+        pass
+
+    @abc.abstractmethod
+    def discard(self) -> None:
+        """Drops the shadow tables and directs the repositories' writes back to the live tables"""
+        pass
@@ -1,5 +1,6 @@
 import abc  # For creating abstract base classes
 from pathlib import Path  # For type-safe path handling
+from typing import List
 
 class ZipExtractor(abc.ABC):
     """Abstract interface for ZIP archive extraction operations"""
@@ -12,4 +13,13 @@ class ZipExtractor(abc.ABC):
         """
         Extracts all contents from a ZIP archive to the specified directory
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abc.abstractmethod
+    def list_members(self,
+                     zip_path: Path  # Path to the ZIP file to inspect
+                    ) -> List[str]:  # Returns member file names (directories excluded)
+        """
+        Lists the files stored in a ZIP archive that `extract` extracts, without extracting them
+        """
+        pass
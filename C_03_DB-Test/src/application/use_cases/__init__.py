@@ -1,4 +1,5 @@
 from .download_ans_data import DownloadAnsDataUseCase
 from .load_ans_data import LoadAnsDataUseCase
+from .pipelined_ans_data import PipelinedAnsDataUseCase
 
-__all__ = ["DownloadAnsDataUseCase", "LoadAnsDataUseCase"]
\ No newline at end of file
+__all__ = ["DownloadAnsDataUseCase", "LoadAnsDataUseCase", "PipelinedAnsDataUseCase"]
\ No newline at end of file
@@ -1,5 +1,8 @@
 import logging
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import List, Optional
 from urllib.parse import urljoin
 import requests
 
@@ -8,8 +11,9 @@ from src.application.ports import (
     FileDownloader,
     HtmlParser,
     ZipExtractor,
+    DownloadManifest,
 )
-from src.application.dto import DownloadConfig
+from src.application.dto import DownloadConfig, ManifestEntry, RemoteFileInfo
 
 logger = logging.getLogger(__name__)
 
@@ -22,22 +26,26 @@ class DownloadAnsDataUseCase:
         file_downloader: FileDownloader,
         html_parser: HtmlParser,
         zip_extractor: ZipExtractor,
+        http_session: Optional[requests.Session] = None,
+        download_manifest: Optional[DownloadManifest] = None,
     ):
         """Initialize with required dependencies"""
         self._fs = file_system          # Handles file system operations
         self._downloader = file_downloader  # Downloads files from URLs
         self._parser = html_parser      # Parses HTML to find download links
         self._extractor = zip_extractor  # Extracts ZIP archives
+        self._session = http_session    # Shared pooled session for directory listings (None = requests.get)
+        self._manifest = download_manifest  # Record of previous downloads (None = always download and extract)
 
     def execute(self, config: DownloadConfig) -> bool:
         """Main execution method that runs the complete workflow"""
         logger.info("--- Starting Data Download Use Case ---")
         try:
             # 1. Prepare directories
-            self._create_directories(config)
+            self.create_directories(config)
 
             # 2. Download operators CSV (non-critical)
-            op_success = self._download_operators_csv(config)
+            op_success = self.download_operators_csv(config)
             if not op_success:
                 logger.warning("Operators CSV download failed. Continuing with accounting data...")
 
@@ -51,7 +59,7 @@ class DownloadAnsDataUseCase:
             logger.exception(f"Unexpected error during download process: {e}")
             return False
 
-    def _create_directories(self, config: DownloadConfig) -> None:
+    def create_directories(self, config: DownloadConfig) -> None:
         """Creates all required directories if they don't exist"""
         logger.info("Creating necessary data directories...")
         dirs_to_create = [
@@ -65,7 +73,7 @@ class DownloadAnsDataUseCase:
             self._fs.create_directories(dir_path)
         logger.info("Data directories created (or already exist).")
 
-    def _download_operators_csv(self, config: DownloadConfig) -> bool:
+    def download_operators_csv(self, config: DownloadConfig) -> bool:
         """Downloads the operators CSV file"""
         logger.info("--- Starting Operators CSV Download ---")
         success = self._downloader.download(
@@ -79,33 +87,47 @@ class DownloadAnsDataUseCase:
         logger.info("--- Finished Operators CSV Download ---")
         return success
 
-    def _get_accounting_zip_urls(self, config: DownloadConfig) -> List[str]:
+    def _get_year_zip_urls(self, config: DownloadConfig, year: str) -> List[str]:
+        """Finds the ZIP file URLs listed in one year's directory"""
+        # Build URL for the year's directory
+        year_directory_url = urljoin(config.base_accounting_url, f"{year}/")
+        logger.debug(f"Checking URL for year {year}: {year_directory_url}")
+
+        try:
+            # Fetch HTML content
+            http_get = self._session.get if self._session is not None else requests.get
+            response = http_get(year_directory_url, timeout=30)
+            response.raise_for_status()
+
+            # Find ZIP file links in HTML
+            return self._parser.find_links_ending_with(
+                year_directory_url,  # Base URL for relative links
+                response.text,       # HTML content
+                ".zip"              # Target file extension
+            )
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to fetch or parse {year_directory_url}: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error finding ZIP links at {year_directory_url}: {e}")
+        return []
+
+    def get_accounting_zip_urls(self, config: DownloadConfig) -> List[str]:
         """Finds all accounting ZIP file URLs for specified years"""
         all_zip_urls = []
         logger.info("Fetching accounting ZIP file URLs...")
-        
-        for year in config.years_to_download:
-            # Build URL for each year's directory
-            year_directory_url = urljoin(config.base_accounting_url, f"{year}/")
-            logger.debug(f"Checking URL for year {year}: {year_directory_url}")
-            
-            try:
-                # Fetch HTML content
-                response = requests.get(year_directory_url, timeout=30)
-                response.raise_for_status()
-                
-                # Find ZIP file links in HTML
-                year_zip_urls = self._parser.find_links_ending_with(
-                    year_directory_url,  # Base URL for relative links
-                    response.text,       # HTML content
-                    ".zip"              # Target file extension
-                )
-                all_zip_urls.extend(year_zip_urls)
-                
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Failed to fetch or parse {year_directory_url}: {e}")
-            except Exception as e:
-                logger.error(f"Unexpected error finding ZIP links at {year_directory_url}: {e}")
+
+        workers = max(1, min(config.max_concurrent_downloads, len(config.years_to_download)))
+        if workers > 1:
+            # Listings are fetched concurrently; map() keeps the results in year order
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='year-listing') as executor:
+                for year_zip_urls in executor.map(
+                    lambda year: self._get_year_zip_urls(config, year), config.years_to_download
+                ):
+                    all_zip_urls.extend(year_zip_urls)
+        else:
+            for year in config.years_to_download:
+                all_zip_urls.extend(self._get_year_zip_urls(config, year))
 
         if not all_zip_urls:
             logger.warning("No accounting ZIP URLs found for the specified years.")
@@ -113,12 +135,136 @@ class DownloadAnsDataUseCase:
             logger.info(f"Found {len(all_zip_urls)} total accounting ZIP URLs.")
         return all_zip_urls
 
+    def _extracted_files_intact(self, entry: ManifestEntry, config: DownloadConfig) -> bool:
+        """True when every file recorded for the entry is still on disk with its recorded size"""
+        if not config.extract_zips:
+            return True  # Nothing is extracted when the loader streams from the ZIPs
+        if not entry.extracted_sizes:
+            return False
+        for name, size in entry.extracted_sizes.items():
+            csv_path = config.csvs_dir / name
+            if not self._fs.path_exists(csv_path) or self._fs.get_file_size(csv_path) != size:
+                return False
+        return True
+
+    @staticmethod
+    def _same_remote_version(entry: ManifestEntry, remote: RemoteFileInfo) -> bool:
+        """Compares the server's current metadata with what was recorded at download time"""
+        if entry.size is not None and remote.size is not None and entry.size != remote.size:
+            return False
+        if entry.etag and remote.etag:
+            return entry.etag == remote.etag
+        if entry.last_modified and remote.last_modified:
+            return entry.last_modified == remote.last_modified
+        return False  # Nothing reliable to compare - download to be safe
+
+    def is_unchanged(self, zip_url: str, zip_save_path: Path, config: DownloadConfig) -> bool:
+        """True when the ZIP and its CSVs from a previous run are still current (checked with a HEAD request),
+        so both the download and the extraction can be skipped"""
+        if self._manifest is None:
+            return False
+        entry = self._manifest.get(zip_url)
+        if entry is None or not self._fs.path_exists(zip_save_path):
+            return False
+        if not self._extracted_files_intact(entry, config):
+            return False
+        remote = self._downloader.fetch_info(zip_url)
+        return remote is not None and self._same_remote_version(entry, remote)
+
+    def is_same_content(self, zip_url: str, zip_save_path: Path, config: DownloadConfig) -> bool:
+        """After a download: True when the ZIP has the recorded hash and its CSVs are intact,
+        so the extraction can be skipped (e.g. the server changed its headers but not the file)"""
+        if self._manifest is None:
+            return False
+        entry = self._manifest.get(zip_url)
+        if entry is None or not self._extracted_files_intact(entry, config):
+            return False
+        if self._fs.compute_sha256(zip_save_path) != entry.sha256:
+            return False
+        remote = self._downloader.downloaded_info(zip_url)
+        if remote is not None:
+            # Keep the new headers so the next run can skip the download too
+            self._manifest.put(zip_url, replace(
+                entry, size=remote.size, etag=remote.etag, last_modified=remote.last_modified
+            ))
+        return True
+
+    def record_extraction(self, zip_url: str, zip_save_path: Path, config: DownloadConfig) -> None:
+        """Records the downloaded ZIP and the CSVs extracted from it in the manifest"""
+        if self._manifest is None:
+            return
+        # The headers of the GET that saved the ZIP: no extra request, and no chance of a newer version's metadata
+        remote = self._downloader.downloaded_info(zip_url) or RemoteFileInfo(size=None, etag=None, last_modified=None)
+        members = self._extractor.list_members(zip_save_path) if config.extract_zips else []
+        self._manifest.put(zip_url, ManifestEntry(
+            size=remote.size,
+            etag=remote.etag,
+            last_modified=remote.last_modified,
+            sha256=self._fs.compute_sha256(zip_save_path),
+            extracted_sizes={name: self._fs.get_file_size(config.csvs_dir / name) for name in members},
+        ))
+
+    def previous_extraction(self, zip_url: str, config: DownloadConfig) -> List[str]:
+        """Names of the CSVs a previous run extracted from the ZIP, when they are all still on disk with
+        their recorded sizes; empty when there is no such record or when the loader streams from the ZIPs"""
+        if self._manifest is None or not config.extract_zips:
+            return []
+        entry = self._manifest.get(zip_url)
+        if entry is None or not self._extracted_files_intact(entry, config):
+            return []
+        return sorted(entry.extracted_sizes)
+
+    def save_manifest(self) -> None:
+        """Persists the manifest (no-op when downloads are not tracked)"""
+        if self._manifest is not None:
+            self._manifest.save()
+
+    def _download_and_extract_zip(self, zip_url: str, config: DownloadConfig) -> str:
+        """Downloads and extracts one accounting ZIP.
+        Returns 'skipped', 'unchanged', 'download_failed', 'extract_failed', 'reused', 'extracted'
+        or 'downloaded' (streaming mode: the loader reads the ZIP itself)."""
+        try:
+            # Extract filename from URL
+            filename = zip_url.split('/')[-1]
+            if not filename.lower().endswith('.zip'):
+                logger.warning(f"Skipping URL with unexpected format: {zip_url}")
+                return 'skipped'
+
+            # Skip quarters that have not changed since the last run
+            zip_save_path = config.zips_dir / filename
+            if self.is_unchanged(zip_url, zip_save_path, config):
+                logger.info(f"{filename} unchanged since last run - skipping download and extraction")
+                return 'unchanged'
+
+            # Download the ZIP file
+            if not self._downloader.download(zip_url, zip_save_path):
+                return 'download_failed'
+
+            # Same bytes as last time - the extracted CSVs are still current
+            if self.is_same_content(zip_url, zip_save_path, config):
+                logger.info(f"{filename} content unchanged - skipping extraction")
+                return 'reused'
+
+            if not config.extract_zips:
+                self.record_extraction(zip_url, zip_save_path, config)
+                return 'downloaded'
+
+            # Extract the downloaded ZIP
+            if self._extractor.extract(zip_save_path, config.csvs_dir):
+                self.record_extraction(zip_url, zip_save_path, config)
+                return 'extracted'
+            return 'extract_failed'
+
+        except Exception as e:
+            logger.error(f"Error processing accounting URL {zip_url}: {e}")
+            return 'download_failed'
+
     def _download_and_extract_accounting_data(self, config: DownloadConfig) -> bool:
         """Downloads and extracts all accounting ZIP files"""
         logger.info("--- Starting Accounting Statements Download & Extraction ---")
         
         # 1. Find all ZIP file URLs
-        zip_urls = self._get_accounting_zip_urls(config)
+        zip_urls = self.get_accounting_zip_urls(config)
         if not zip_urls:
             return False
 
@@ -127,37 +273,45 @@ class DownloadAnsDataUseCase:
         failed_downloads = 0
         success_extractions = 0
         failed_extractions = 0
+        unchanged = 0
+        streamed = 0
 
-        logger.info(f"Attempting to download {len(zip_urls)} ZIP files...")
-        for zip_url in zip_urls:
-            try:
-                # Extract filename from URL
-                filename = zip_url.split('/')[-1]
-                if not filename.lower().endswith('.zip'):
-                    logger.warning(f"Skipping URL with unexpected format: {zip_url}")
-                    continue
-
-                # Download the ZIP file
-                zip_save_path = config.zips_dir / filename
-                if self._downloader.download(zip_url, zip_save_path):
-                    success_downloads += 1
-                    
-                    # Extract the downloaded ZIP
-                    if self._extractor.extract(zip_save_path, config.csvs_dir):
-                        success_extractions += 1
-                    else:
-                        failed_extractions += 1
-                else:
-                    failed_downloads += 1
-                    
-            except Exception as e:
-                logger.error(f"Error processing accounting URL {zip_url}: {e}")
+        workers = max(1, min(config.max_concurrent_downloads, len(zip_urls)))
+        logger.info(f"Attempting to download {len(zip_urls)} ZIP files ({workers} at a time)...")
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='zip-download') as executor:
+                outcomes = list(executor.map(lambda url: self._download_and_extract_zip(url, config), zip_urls))
+        else:
+            outcomes = [self._download_and_extract_zip(zip_url, config) for zip_url in zip_urls]
+
+        for outcome in outcomes:
+            if outcome == 'download_failed':
                 failed_downloads += 1
+            elif outcome == 'unchanged':
+                unchanged += 1
+            elif outcome == 'downloaded':
+                success_downloads += 1
+                streamed += 1
+            elif outcome == 'reused':
+                success_downloads += 1
+                unchanged += 1
+            elif outcome in ('extracted', 'extract_failed'):
+                success_downloads += 1
+                if outcome == 'extracted':
+                    success_extractions += 1
+                else:
+                    failed_extractions += 1
+        self.save_manifest()
 
         # 3. Report results
         logger.info(f"Download Summary: {success_downloads} succeeded, {failed_downloads} failed.")
-        logger.info(f"Extraction Summary: {success_extractions} succeeded, {failed_extractions} failed.")
+        if config.extract_zips:
+            logger.info(f"Extraction Summary: {success_extractions} succeeded, {failed_extractions} failed.")
+        else:
+            logger.info("Extraction skipped: the loader streams the CSVs from the ZIPs.")
+        if self._manifest is not None:
+            logger.info(f"Unchanged since last run: {unchanged} (extraction skipped).")
         logger.info("--- Finished Accounting Statements Download & Extraction ---")
 
-        # Consider successful if at least one extraction worked
-        return success_extractions > 0
\ No newline at end of file
+        # Consider successful if at least one extraction worked or the CSVs on disk are still current
+        return success_extractions + streamed + unchanged > 0
\ No newline at end of file
@@ -1,17 +1,53 @@
+import hashlib
 import logging
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
-from typing import Optional
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 
 from src.application.ports import (
     FileSystem,
     OperatorRepository,
     AccountingRepository,
+    LoadStateRepository,
+    ShadowTables,
+    ZipExtractor,
 )
 from src.application.dto import LoadConfig
 
 logger = logging.getLogger(__name__)
 
+def parse_reference_date_from_filename(filename: str) -> Optional[date]:
+    """Extracts quarter/year from filename and returns as date (last day of quarter)"""
+    # Match patterns like "1T2023" or "2023_1T"
+    match = re.search(r'(\d)T(\d{4})|(\d{4})_(\d)T', filename, re.IGNORECASE)
+    if not match:
+        logger.warning(f"Invalid filename format: {filename}")
+        return None
+
+    # Extract quarter and year from either pattern
+    if match.group(1) and match.group(2):
+        quarter, year = int(match.group(1)), int(match.group(2))
+    else:
+        year, quarter = int(match.group(3)), int(match.group(4))
+
+    # Validate quarter
+    if not 1 <= quarter <= 4:
+        logger.warning(f"Invalid quarter {quarter} in {filename}")
+        return None
+
+    # Calculate last day of quarter
+    month = quarter * 3
+    day = 31 if month in [3, 12] else 30
+    
+    try:
+        return date(year, month, day)
+    except ValueError:
+        logger.error(f"Invalid date {year}-{month}-{day} from {filename}")
+        return None
+
 class LoadAnsDataUseCase:
     """Orchestrates loading of operator and accounting data into repositories"""
     
@@ -20,27 +56,57 @@ class LoadAnsDataUseCase:
         operator_repo: OperatorRepository,  # For operator data storage
         accounting_repo: AccountingRepository,  # For accounting data storage
         file_system: FileSystem,  # For file operations
+        load_state_repo: Optional[LoadStateRepository] = None,  # Loaded quarters and source hashes
+        zip_extractor: Optional[ZipExtractor] = None,  # Lists ZIP members when streaming from the ZIPs
+        shadow_tables: Optional[ShadowTables] = None,  # Blue/green full reloads
     ):
         """Initialize with required data repositories and file system"""
         self._operator_repo = operator_repo
         self._accounting_repo = accounting_repo
         self._fs = file_system
+        self._load_state = load_state_repo
+        self._extractor = zip_extractor
+        self._shadow = shadow_tables
 
     def execute(self, config: LoadConfig) -> bool:
         """Main execution method that runs the complete loading workflow"""
         logger.info("--- Starting Data Loading Use Case ---")
         try:
-            # 1. Clear existing data
-            self._clear_database_tables()
+            # 1. Clear existing data (incremental mode keeps the accounting history)
+            incremental = config.incremental and self._load_state is not None
+            if config.incremental and not incremental:
+                logger.warning("Incremental load requested without a load-state repository - doing a full reload")
+            shadow = self.prepare_tables(config, full_reload=not incremental)
+            published = False
+            try:
+                # 2. Load operators (required)
+                operators_loaded_count = self.load_operators(config)
+                if operators_loaded_count <= 0:
+                     logger.error("Operator loading failed - aborting accounting load")
+                     return False
 
-            # 2. Load operators (required)
-            operators_loaded_count = self._load_operators(config)
-            if operators_loaded_count <= 0:
-                 logger.error("Operator loading failed - aborting accounting load")
-                 return False
+                # 3. Load accounting statements
+                # A full reload starts from an empty table, so index maintenance can wait until the end
+                if not incremental:
+                    self.begin_bulk_load()
+                try:
+                    accounting_loaded_count, failed_units = self._load_accounting_statements(config, incremental)
+                finally:
+                    if not incremental:
+                        self.end_bulk_load()
+                self.report_orphaned_statements()
 
-            # 3. Load accounting statements
-            accounting_loaded_count = self._load_accounting_statements(config)
+                # 4. Blue/green reload: replace the live tables, which readers used until now.
+                # A partial reload is never published; the live tables keep the complete previous data
+                if shadow:
+                    if failed_units:
+                        logger.error(f"Shadow tables not published: {len(failed_units)} accounting units failed to load")
+                        return False
+                    self.publish_shadow_tables()
+                    published = True
+            finally:
+                if shadow and not published:
+                    self.discard_shadow_tables()
 
             logger.info(f"Total accounting statements loaded: {accounting_loaded_count}")
             logger.info("--- Finished Data Loading Use Case ---")
@@ -50,19 +116,57 @@ class LoadAnsDataUseCase:
             logger.exception(f"Unexpected error during data loading: {e}")
             return False
 
-    def _clear_database_tables(self) -> None:
-        """Clears all existing data from both repositories"""
+    def prepare_tables(self, config: LoadConfig, full_reload: bool = True) -> bool:
+        """Clears the tables the load replaces or, for a full reload with shadow tables, starts
+        loading into empty shadow copies while readers keep the live tables.
+        Returns True when the load goes to shadow tables, which must then be published or discarded."""
+        if config.shadow_tables and full_reload:
+            if self._shadow is not None:
+                self._shadow.begin()
+                if self._load_state is not None:
+                    self._load_state.clear_all()  # Describes the tables being rebuilt from now on
+                return True
+            logger.warning("Shadow tables requested without a shadow-table adapter - clearing the live tables")
+        elif config.shadow_tables:
+            logger.info("Incremental load keeps unchanged quarters readable - shadow tables not used")
+        self._clear_database_tables(include_accounting=full_reload, include_operators=not config.operators_upsert)
+        return False
+
+    def publish_shadow_tables(self) -> None:
+        """Replaces the live tables with the shadow tables loaded since `prepare_tables`"""
+        self._shadow.publish()
+
+    def discard_shadow_tables(self) -> None:
+        """Drops an unpublished reload; the live tables keep the previous data"""
+        try:
+            self._shadow.discard()
+        except Exception as e:
+            logger.error(f"Failed to discard the shadow tables: {e}")
+        if self._load_state is not None:
+            try:
+                self._load_state.clear_all()  # It recorded quarters that never went live: reload them all next time
+            except Exception as e:
+                logger.error(f"Failed to clear the load state: {e}")
+
+    def _clear_database_tables(self, include_accounting: bool = True, include_operators: bool = True) -> None:
+        """Clears existing data; accounting (and its load state) only when include_accounting is set,
+        operators only when include_operators is set (an operators upsert keeps the table)"""
         logger.warning("Clearing existing data from database tables...")
         try:
-            self._accounting_repo.clear_all()
-            logger.info("Cleared accounting data")
-            self._operator_repo.clear_all()
-            logger.info("Cleared operator data")
+            if include_accounting:
+                self._accounting_repo.clear_all()
+                logger.info("Cleared accounting data")
+                if self._load_state is not None:
+                    self._load_state.clear_all()
+            # Operators are small and reloaded from the latest CSV unless they are upserted
+            if include_operators:
+                self._operator_repo.clear_all()
+                logger.info("Cleared operator data")
         except Exception as e:
             logger.error(f"Table cleanup failed: {e}")
             raise
 
-    def _load_operators(self, config: LoadConfig) -> int:
+    def load_operators(self, config: LoadConfig) -> int:
         """Loads operator data from CSV file"""
         logger.info(f"Loading operators from: {config.operators_csv_path}")
         
@@ -73,28 +177,47 @@ class LoadAnsDataUseCase:
 
         try:
             # Load and return record count
-            count = self._operator_repo.load_from_csv(config.operators_csv_path)
+            if config.operators_upsert:
+                count = self._operator_repo.upsert_from_csv(config.operators_csv_path)
+            else:
+                count = self._operator_repo.load_from_csv(config.operators_csv_path)
             logger.info(f"Loaded {count} operator records")
             return count
         except Exception as e:
             logger.error(f"Operator load failed: {e}")
             return -1
 
-    def _load_accounting_statements(self, config: LoadConfig) -> int:
-        """Loads accounting data from all CSV files in directory"""
+    def _list_accounting_sources(self, config: LoadConfig) -> List[Tuple[Path, str]]:
+        """(path, name) of every accounting CSV; when streaming, (ZIP path, member name) of every CSV in the ZIPs"""
+        if config.accounting_zips_dir is not None:
+            if self._extractor is not None:
+                logger.info(f"Streaming accounting CSVs from the ZIPs in: {config.accounting_zips_dir}")
+                return [
+                    (zip_path, member)
+                    for zip_path in self._fs.list_files(config.accounting_zips_dir, '*.zip')
+                    for member in self._extractor.list_members(zip_path)
+                    if member.lower().endswith('.csv')
+                ]
+            logger.warning("Streaming from ZIPs requested without a ZIP extractor - reading extracted CSVs")
+
         logger.info(f"Loading accounting data from: {config.accounting_csvs_dir}")
-        
+        return [(file_path, self._fs.get_filename(file_path))
+                for file_path in self._fs.list_files(config.accounting_csvs_dir, '*.csv')]
+
+    def _load_accounting_statements(self, config: LoadConfig, incremental: bool = False) -> Tuple[int, List[str]]:
+        """Loads accounting data from all CSV files in directory (or in the ZIPs when streaming).
+        Returns the rows loaded and the labels of the units (quarters) that failed to load."""
         # Find all CSV files
-        csv_files = self._fs.list_files(config.accounting_csvs_dir, '*.csv')
+        csv_files = self._list_accounting_sources(config)
         if not csv_files:
             logger.warning("No accounting CSV files found")
-            return 0
+            return 0, []
 
         logger.info(f"Found {len(csv_files)} accounting files")
-        total_loaded = 0
-        
-        for file_path in csv_files:
-            filename = self._fs.get_filename(file_path)
+
+        # Resolve every file's quarter up front so invalid names are skipped before any load starts
+        load_tasks: List[Tuple[Path, str, date]] = []
+        for file_path, filename in csv_files:
             logger.debug(f"Processing: {filename}")
 
             # Extract quarter/year from filename
@@ -102,42 +225,192 @@ class LoadAnsDataUseCase:
             if not reference_date:
                 logger.error(f"Skipping {filename}: invalid date format")
                 continue
+            load_tasks.append((file_path, filename, reference_date))
+
+        # Every quarter is loaded as one unit; with a load-state repository it is also recorded
+        if self._load_state is not None:
+            units = self._quarter_load_units(load_tasks, incremental)
+        else:
+            units = [
+                (self._files_label(files), lambda args=(reference_date, files): self.load_quarter_files(*args))
+                for reference_date, files in self._group_by_quarter(load_tasks).items()
+            ]
+
+        start_time = time.perf_counter()
+        workers = max(1, min(config.parallel_workers, len(units)))
+        if workers > 1:
+            total_loaded, failed_files = self._load_files_in_parallel(units, workers)
+        else:
+            total_loaded, failed_files = self._load_files_sequentially(units)
+        elapsed = time.perf_counter() - start_time
+
+        rate = f"{total_loaded / elapsed:.0f} rows/s" if elapsed > 0 else "n/a"
+        logger.info(
+            f"Accounting load summary: {total_loaded} rows from {len(units) - len(failed_files)}/"
+            f"{len(units)} quarters in {elapsed:.2f}s ({rate}, {workers} workers)"
+        )
+        if failed_files:
+            logger.error(f"Files that failed to load: {', '.join(failed_files)}")
+
+        # Quarter reload units refresh their own totals; plain file loads refresh once every file is in
+        if self._load_state is None:
+            self.refresh_expense_summaries(sorted({reference_date for _, _, reference_date in load_tasks}))
+
+        return total_loaded, failed_files
+
+    def _quarter_load_units(
+        self,
+        load_tasks: List[Tuple[Path, str, date]],
+        incremental: bool
+    ) -> List[Tuple[str, Callable[[], int]]]:
+        """Returns a reload unit for every quarter that must be (re)loaded.
+        In incremental mode quarters whose source hash matches the load state are left untouched."""
+        loaded_quarters = self._load_state.get_loaded_quarters() if incremental else {}
+        units: List[Tuple[str, Callable[[], int]]] = []
+        unchanged: List[str] = []
+        for reference_date, files in self._group_by_quarter(load_tasks).items():
+            source_hash = self._source_hash([file_path for file_path, _ in files])
+            label = self._files_label(files)
+            if loaded_quarters.get(reference_date) == source_hash:
+                unchanged.append(label)
+                continue
+            units.append((label, lambda args=(reference_date, files, source_hash): self._reload_quarter(*args)))
 
+        if incremental:
+            logger.info(
+                f"Incremental load: {len(units)} quarters to (re)load, {len(unchanged)} unchanged"
+                + (f" ({', '.join(unchanged)})" if unchanged else "")
+            )
+        return units
+
+    @staticmethod
+    def _group_by_quarter(load_tasks: List[Tuple[Path, str, date]]) -> Dict[date, List[Tuple[Path, str]]]:
+        """{quarter: [(path, name), ...]} in quarter order, each quarter's files sorted by name"""
+        quarters: Dict[date, List[Tuple[Path, str]]] = {}
+        for file_path, filename, reference_date in load_tasks:
+            quarters.setdefault(reference_date, []).append((file_path, filename))
+        return {
+            reference_date: sorted(quarters[reference_date], key=lambda item: item[1])
+            for reference_date in sorted(quarters)
+        }
+
+    @staticmethod
+    def _files_label(files: List[Tuple[Path, str]]) -> str:
+        return ', '.join(filename for _, filename in files)
+
+    def _source_hash(self, file_paths: List[Path]) -> str:
+        """SHA-256 of a quarter's source; a quarter split across several files hashes their hashes"""
+        hashes = [self._fs.compute_sha256(file_path) for file_path in file_paths]
+        if len(hashes) == 1:
+            return hashes[0]
+        return hashlib.sha256(''.join(hashes).encode('ascii')).hexdigest()
+
+    def _reload_quarter(self, reference_date: date, files: List[Tuple[Path, str]], source_hash: str) -> int:
+        """Replaces one quarter's rows with the contents of its source files and records the new state.
+        The old rows stay readable until the new ones are swapped in, and stay in place if a file fails."""
+        # Forget the quarter first: if anything below fails, the next run reloads it again
+        self._load_state.forget_quarter(reference_date)
+        count = self.load_quarter_files(reference_date, files, replace=True)
+        self._accounting_repo.refresh_quarter_summary(reference_date)
+        self._load_state.mark_loaded(reference_date, self._files_label(files), source_hash, count)
+        return count
+
+    def load_quarter_files(self, reference_date: date, files: List[Tuple[Path, str]], replace: bool = False) -> int:
+        """Loads every file of one quarter as a unit: on a partitioned table they share one staging
+        table that is swapped in once, and a failing file leaves the quarter's previous rows in place.
+        With `replace` the files take the place of the quarter's previous rows instead of adding to them.
+        A ZIP path loads its member `name`. Raises the first load error."""
+        self._accounting_repo.begin_quarter_load(reference_date, replace=replace)
+        try:
+            count = sum(self._load_accounting_file(file_path, filename, reference_date) for file_path, filename in files)
+        except Exception:
+            self._accounting_repo.abort_quarter_load(reference_date)
+            raise
+        self._accounting_repo.end_quarter_load(reference_date)
+        return count
+
+    def begin_bulk_load(self) -> None:
+        """Defers the accounting index maintenance of a full reload until `end_bulk_load`"""
+        self._accounting_repo.begin_bulk_load()
+
+    def end_bulk_load(self) -> None:
+        """Builds the indexes deferred by `begin_bulk_load`"""
+        self._accounting_repo.end_bulk_load()
+
+    def record_loaded_quarter(self, reference_date: date, files: List[Tuple[Path, str]], row_count: int) -> None:
+        """Records a quarter loaded outside `execute` in the load state, so the next incremental run
+        skips it while its source files are unchanged (no-op without a load-state repository)"""
+        if self._load_state is None:
+            return
+        source_hash = self._source_hash([file_path for file_path, _ in files])
+        self._load_state.mark_loaded(reference_date, self._files_label(files), source_hash, row_count)
+
+    def report_orphaned_statements(self) -> int:
+        """Logs how many accounting rows reference an operator missing from the operators table
+        (nothing enforces it in the database); returns the count, or -1 when the check failed"""
+        try:
+            orphaned = self._accounting_repo.count_orphaned_statements()
+        except Exception as e:
+            logger.error(f"Could not check accounting rows against operators: {e}")
+            return -1
+        if orphaned:
+            logger.warning(f"{orphaned} accounting rows reference operators missing from the operators table")
+        return orphaned
+
+    def refresh_expense_summaries(self, quarters: List[date]) -> int:
+        """Recomputes the precomputed expense totals of each quarter; returns how many were refreshed"""
+        refreshed = 0
+        for reference_date in quarters:
             try:
-                # Load with reference date
-                count = self._accounting_repo.load_from_csv(file_path, reference_date)
-                logger.info(f"Loaded {count} records from {filename}")
-                total_loaded += count
+                self._accounting_repo.refresh_quarter_summary(reference_date)
+                refreshed += 1
             except Exception as e:
-                logger.error(f"Failed to load {filename}: {e}")
-
-        return total_loaded
+                # The detail rows are loaded; stale totals are reported but do not fail the load
+                logger.error(f"Failed to refresh expense summary for quarter {reference_date}: {e}")
+        return refreshed
 
-    def _parse_reference_date_from_filename(self, filename: str) -> Optional[date]:
-        """Extracts quarter/year from filename and returns as date (last day of quarter)"""
-        # Match patterns like "1T2023" or "2023_1T"
-        match = re.search(r'(\d)T(\d{4})|(\d{4})_(\d)T', filename, re.IGNORECASE)
-        if not match:
-            logger.warning(f"Invalid filename format: {filename}")
-            return None
-
-        # Extract quarter and year from either pattern
-        if match.group(1) and match.group(2):
-            quarter, year = int(match.group(1)), int(match.group(2))
+    def _load_accounting_file(self, file_path: Path, filename: str, reference_date: date) -> int:
+        """Loads one accounting CSV and logs its row count; a ZIP path loads its member `filename`"""
+        if file_path.suffix.lower() == '.zip':
+            count = self._accounting_repo.load_from_zip_member(file_path, filename, reference_date)
         else:
-            year, quarter = int(match.group(3)), int(match.group(4))
+            count = self._accounting_repo.load_from_csv(file_path, reference_date)
+        logger.info(f"Loaded {count} records from {filename}")
+        return count
+
+    def _load_files_sequentially(self, units: List[Tuple[str, Callable[[], int]]]) -> Tuple[int, List[str]]:
+        """Runs the loads one at a time; a failed load is logged and skipped"""
+        total_loaded = 0
+        failed_files: List[str] = []
+        for label, load in units:
+            try:
+                total_loaded += load()
+            except Exception as e:
+                logger.error(f"Failed to load {label}: {e}")
+                failed_files.append(label)
+        return total_loaded, failed_files
 
-        # Validate quarter
-        if not 1 <= quarter <= 4:
-            logger.warning(f"Invalid quarter {quarter} in {filename}")
-            return None
+    def _load_files_in_parallel(
+        self,
+        units: List[Tuple[str, Callable[[], int]]],
+        workers: int
+    ) -> Tuple[int, List[str]]:
+        """Runs several loads at once; each LOAD DATA takes its own pooled connection"""
+        logger.info(f"Loading {len(units)} units with {workers} parallel workers")
+        total_loaded = 0
+        failed_files: List[str] = []
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='accounting-load') as executor:
+            futures = {executor.submit(load): label for label, load in units}
+            for future in as_completed(futures):
+                label = futures[future]
+                try:
+                    total_loaded += future.result()
+                except Exception as e:
+                    # One bad file must not cancel the others
+                    logger.error(f"Failed to load {label}: {e}")
+                    failed_files.append(label)
+        return total_loaded, sorted(failed_files)
 
-        # Calculate last day of quarter
-        month = quarter * 3
-        day = 31 if month in [3, 12] else 30
-        
-        try:
-            return date(year, month, day)
-        except ValueError:
-            logger.error(f"Invalid date {year}-{month}-{day} from {filename}")
-            return None
\ No newline at end of file
+    def _parse_reference_date_from_filename(self, filename: str) -> Optional[date]:
+        """Extracts quarter/year from filename and returns as date (last day of quarter)"""
+        return parse_reference_date_from_filename(filename)
\ No newline at end of file
@@ -0,0 +1,318 @@
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import requests
+
+from src.application.ports import (
+    FileSystem,
+    FileDownloader,
+    HtmlParser,
+    ZipExtractor,
+    OperatorRepository,
+    AccountingRepository,
+    DownloadManifest,
+    LoadStateRepository,
+    ShadowTables,
+)
+from src.application.dto import DownloadConfig, LoadConfig
+from src.application.use_cases.download_ans_data import DownloadAnsDataUseCase
+from src.application.use_cases.load_ans_data import LoadAnsDataUseCase, parse_reference_date_from_filename
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()  # Queue sentinel telling a stage that its upstream has finished
+
+@dataclass
+class PipelineSummary:
+    """Counters shared by the pipeline stages (updated under the lock)"""
+    downloaded: int = 0
+    failed_downloads: int = 0
+    extracted: int = 0
+    failed_extractions: int = 0
+    unchanged: int = 0
+    reused_after_failure: int = 0  # Failed ZIPs whose CSVs from a previous run were loaded instead
+    missing: List[str] = field(default_factory=list)  # Failed ZIPs with no usable CSVs: their quarters are not loaded
+    loaded_files: int = 0
+    failed_loads: List[str] = field(default_factory=list)
+    loaded_rows: int = 0
+    loaded_quarters: Set[date] = field(default_factory=set)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+class PipelinedAnsDataUseCase:
+    """Runs download -> extract -> load as overlapping stages connected by bounded queues.
+
+    Operators are still downloaded and loaded first (accounting rows reference them). After that,
+    each accounting ZIP moves through the stages on its own, so the first quarter is loading while
+    later quarters are still downloading. Full queues block the upstream stage (backpressure), so
+    at most `queue_size` items wait between two stages.
+
+    The accounting table is emptied up front, so a ZIP that fails to download or extract is replaced by
+    the CSVs a previous run extracted from it (checked against the download manifest). Every loaded
+    quarter is recorded in the load state, so a later incremental run only reloads what changed.
+    """
+
+    def __init__(
+        self,
+        file_system: FileSystem,
+        file_downloader: FileDownloader,
+        html_parser: HtmlParser,
+        zip_extractor: ZipExtractor,
+        operator_repo: OperatorRepository,
+        accounting_repo: AccountingRepository,
+        queue_size: int = 2,  # Items allowed to wait between two stages
+        http_session: Optional[requests.Session] = None,
+        download_manifest: Optional[DownloadManifest] = None,
+        load_state_repo: Optional[LoadStateRepository] = None,
+        shadow_tables: Optional[ShadowTables] = None,
+    ):
+        """Initialize with the same ports as the phased download and load use cases"""
+        self._downloader = file_downloader
+        self._extractor = zip_extractor
+        self._queue_size = max(1, queue_size)
+        # Shared steps (directories, URL discovery, table cleanup, per-file load) reuse the phased use cases
+        self._download = DownloadAnsDataUseCase(
+            file_system=file_system,
+            file_downloader=file_downloader,
+            html_parser=html_parser,
+            zip_extractor=zip_extractor,
+            http_session=http_session,
+            download_manifest=download_manifest,
+        )
+        self._load = LoadAnsDataUseCase(
+            operator_repo=operator_repo,
+            accounting_repo=accounting_repo,
+            file_system=file_system,
+            load_state_repo=load_state_repo,  # Cleared by the full reload below, then refilled quarter by quarter
+            zip_extractor=zip_extractor,
+            shadow_tables=shadow_tables,
+        )
+
+    def execute(self, download_config: DownloadConfig, load_config: LoadConfig) -> bool:
+        """Main execution method; True when at least one accounting file was loaded"""
+        logger.info("--- Starting Pipelined Download/Load Use Case ---")
+        if load_config.incremental:
+            logger.warning("Pipelined mode always reloads every quarter - LOAD_MODE=incremental is ignored")
+        try:
+            # 1. Prerequisites that every accounting file depends on
+            self._download.create_directories(download_config)
+            if not self._download.download_operators_csv(download_config):
+                logger.warning("Operators CSV download failed. Loading any existing copy...")
+            shadow = self._load.prepare_tables(load_config)
+            published = False
+            try:
+                if self._load.load_operators(load_config) <= 0:
+                    logger.error("Operator loading failed - aborting accounting pipeline")
+                    return False
+
+                # 2. Stream the accounting ZIPs through the stages
+                zip_urls = self._download.get_accounting_zip_urls(download_config)
+                if not zip_urls:
+                    return False
+                self._load.begin_bulk_load()
+                try:
+                    summary = self._run_stages(zip_urls, download_config, load_config)
+                finally:
+                    self._load.end_bulk_load()
+                self._load.refresh_expense_summaries(sorted(summary.loaded_quarters))
+                self._load.report_orphaned_statements()
+                # Blue/green reload: replace the live tables in one step, unless the reload is partial
+                if shadow:
+                    if summary.missing or summary.failed_loads:
+                        logger.error(
+                            f"Shadow tables not published: {len(summary.missing)} ZIPs had no usable CSVs "
+                            f"and {len(summary.failed_loads)} quarters failed to load"
+                        )
+                        return False
+                    self._load.publish_shadow_tables()
+                    published = True
+            finally:
+                if shadow and not published:
+                    self._load.discard_shadow_tables()
+            self._download.save_manifest()
+
+            logger.info(
+                f"Pipeline Summary: {summary.downloaded} downloaded ({summary.failed_downloads} failed), "
+                f"{summary.extracted} extracted ({summary.failed_extractions} failed, {summary.unchanged} unchanged), "
+                f"{summary.reused_after_failure} failed ZIPs replaced by previous CSVs, "
+                f"{summary.loaded_files} files loaded ({len(summary.failed_loads)} failed), "
+                f"{summary.loaded_rows} rows."
+            )
+            if summary.missing:
+                logger.error(f"ZIPs not loaded (no previous CSVs to fall back on): {', '.join(sorted(summary.missing))}")
+            if summary.failed_loads:
+                logger.error(f"Files that failed to load: {', '.join(sorted(summary.failed_loads))}")
+            logger.info("--- Finished Pipelined Download/Load Use Case ---")
+            return summary.loaded_files > 0
+
+        except Exception as e:
+            logger.exception(f"Unexpected error during pipelined processing: {e}")
+            return False
+
+    def _run_stages(
+        self,
+        zip_urls: List[str],
+        download_config: DownloadConfig,
+        load_config: LoadConfig
+    ) -> PipelineSummary:
+        summary = PipelineSummary()
+        zips_queue: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        csvs_queue: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        load_workers = max(1, load_config.parallel_workers)
+        start_time = time.perf_counter()
+
+        threads = [
+            threading.Thread(
+                target=self._download_stage, args=(zip_urls, download_config, zips_queue, summary),
+                name='pipeline-download'
+            ),
+            threading.Thread(
+                target=self._extract_stage, args=(download_config, zips_queue, csvs_queue, load_workers, summary),
+                name='pipeline-extract'
+            ),
+        ] + [
+            threading.Thread(target=self._load_stage, args=(csvs_queue, summary), name=f'pipeline-load-{i}')
+            for i in range(load_workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        elapsed = time.perf_counter() - start_time
+        rate = f"{summary.loaded_rows / elapsed:.0f} rows/s" if elapsed > 0 else "n/a"
+        logger.info(f"Pipeline stages finished in {elapsed:.2f}s ({rate})")
+        return summary
+
+    def _download_stage(
+        self,
+        zip_urls: List[str],
+        config: DownloadConfig,
+        zips_queue: queue.Queue,
+        summary: PipelineSummary
+    ) -> None:
+        """Producer: downloads each ZIP and hands it to the extract stage, failed downloads included"""
+        try:
+            for zip_url in zip_urls:
+                filename = zip_url.split('/')[-1]
+                if not filename.lower().endswith('.zip'):
+                    logger.warning(f"Skipping URL with unexpected format: {zip_url}")
+                    continue
+                zip_save_path = config.zips_dir / filename
+                # Unchanged quarters skip download and extraction, but their CSVs are still loaded
+                if self._download.is_unchanged(zip_url, zip_save_path, config):
+                    logger.info(f"{filename} unchanged since last run - skipping download and extraction")
+                    with summary.lock:
+                        summary.unchanged += 1
+                    zips_queue.put((zip_url, zip_save_path, 'unchanged'))
+                    continue
+                try:
+                    downloaded = self._downloader.download(zip_url, zip_save_path)
+                except Exception as e:
+                    logger.error(f"Error downloading accounting URL {zip_url}: {e}")
+                    downloaded = False
+                with summary.lock:
+                    if downloaded:
+                        summary.downloaded += 1
+                    else:
+                        summary.failed_downloads += 1
+                # Blocks while the extract stage is behind
+                zips_queue.put((zip_url, zip_save_path, 'downloaded' if downloaded else 'download_failed'))
+        finally:
+            zips_queue.put(_STOP)
+
+    def _extract_stage(
+        self,
+        config: DownloadConfig,
+        zips_queue: queue.Queue,
+        csvs_queue: queue.Queue,
+        load_workers: int,
+        summary: PipelineSummary
+    ) -> None:
+        """Extracts each ZIP and queues the CSVs it contained for loading, one item per quarter.
+        With extraction off, the CSVs are queued as (ZIP path, member) and streamed by the loader.
+        A ZIP that failed to download or extract falls back to the CSVs a previous run extracted from it."""
+        try:
+            while True:
+                item = zips_queue.get()
+                if item is _STOP:
+                    break
+                zip_url, zip_path, status = item
+                members: List[str] = []
+                try:
+                    if status == 'downloaded' and self._download.is_same_content(zip_url, zip_path, config):
+                        logger.info(f"{zip_path.name} content unchanged - skipping extraction")
+                        status = 'unchanged'
+                        with summary.lock:
+                            summary.unchanged += 1
+                    if status == 'downloaded':
+                        extracted = self._extractor.extract(zip_path, config.csvs_dir) if config.extract_zips else True
+                        if extracted:
+                            self._download.record_extraction(zip_url, zip_path, config)
+                        status = 'extracted' if extracted else 'extract_failed'
+                    if status in ('unchanged', 'extracted'):
+                        members = self._extractor.list_members(zip_path)
+                except Exception as e:
+                    logger.error(f"Error extracting {zip_path}: {e}")
+                    status = 'extract_failed'
+                if status in ('extracted', 'extract_failed'):
+                    with summary.lock:
+                        if status == 'extracted':
+                            summary.extracted += 1
+                        else:
+                            summary.failed_extractions += 1
+                if status in ('download_failed', 'extract_failed'):
+                    # The accounting table was emptied: load the previous run's CSVs rather than lose the quarter
+                    members = self._download.previous_extraction(zip_url, config)
+                    with summary.lock:
+                        if members:
+                            summary.reused_after_failure += 1
+                        else:
+                            summary.missing.append(zip_path.name)
+                    if members:
+                        logger.warning(f"{zip_path.name} failed - loading the CSVs extracted from it by a previous run")
+
+                quarters: Dict[date, List[Tuple[Path, str]]] = {}
+                for member in members:
+                    if not member.lower().endswith('.csv'):
+                        continue
+                    filename = Path(member).name
+                    reference_date = parse_reference_date_from_filename(filename)
+                    if not reference_date:
+                        logger.error(f"Skipping {filename}: invalid date format")
+                        continue
+                    source = (config.csvs_dir / member, filename) if config.extract_zips else (zip_path, member)
+                    quarters.setdefault(reference_date, []).append(source)
+                # A quarter's files are loaded together, so its partition is swapped in once
+                for reference_date, files in sorted(quarters.items()):
+                    csvs_queue.put((reference_date, sorted(files, key=lambda source: source[1])))
+        finally:
+            # One sentinel per loader so every worker shuts down
+            for _ in range(load_workers):
+                csvs_queue.put(_STOP)
+
+    def _load_stage(self, csvs_queue: queue.Queue, summary: PipelineSummary) -> None:
+        """Consumer: loads each quarter's CSVs as soon as they are extracted"""
+        while True:
+            item = csvs_queue.get()
+            if item is _STOP:
+                break
+            reference_date, files = item  # type: Tuple[date, List[Tuple[Path, str]]]
+            label = ', '.join(Path(name).name for _, name in files)
+            try:
+                count = self._load.load_quarter_files(reference_date, files)
+                self._load.record_loaded_quarter(reference_date, files, count)
+                with summary.lock:
+                    summary.loaded_files += len(files)
+                    summary.loaded_rows += count
+                    summary.loaded_quarters.add(reference_date)
+            except Exception as e:
+                # One bad quarter must not stop the pipeline
+                logger.error(f"Failed to load {label}: {e}")
+                with summary.lock:
+                    summary.failed_loads.append(label)
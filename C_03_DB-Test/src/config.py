@@ -77,6 +77,75 @@ if missing_db_vars:
     logger.error(f"Missing database credentials: {', '.join(missing_db_vars)}")
     raise ValueError("Incomplete database configuration")
 
+# Seconds get_connection waits for a free pooled connection before failing
+DB_POOL_CHECKOUT_TIMEOUT = float(os.getenv('DB_POOL_CHECKOUT_TIMEOUT', 30))
+
+# Bulk sessions: LOAD DATA and TRUNCATE run with unique/foreign key checks off and larger session buffers,
+# restored afterwards. DB_BULK_SKIP_BINLOG also sets sql_log_bin=0 (needs the privilege; replicas miss the rows)
+DB_BULK_SESSION = os.getenv('DB_BULK_SESSION', 'true').strip().lower() in ('1', 'true', 'yes')
+DB_BULK_SKIP_BINLOG = os.getenv('DB_BULK_SKIP_BINLOG', 'false').strip().lower() in ('1', 'true', 'yes')
+
+# Parallel accounting load: one pooled connection per worker, so never more workers than the pool holds
+LOAD_PARALLEL_WORKERS = min(
+    int(os.getenv('LOAD_PARALLEL_WORKERS', DB_CONFIG['pool_size'])),
+    DB_CONFIG['pool_size']
+)
+
+# Load mode: 'full' truncates and reloads every quarter; 'incremental' reloads only the quarters
+# whose source CSV hash differs from the one recorded in the load_state table
+LOAD_MODE = os.getenv('LOAD_MODE', 'full').strip().lower()
+if LOAD_MODE not in ('full', 'incremental'):
+    logger.error(f"Invalid LOAD_MODE: {LOAD_MODE}")
+    raise ValueError("LOAD_MODE must be 'full' or 'incremental'")
+
+# Operators load mode: 'reload' truncates the table and loads the CSV; 'upsert' merges the CSV into
+# it (only changed rows are written, vanished operators deleted), so the table is never empty
+OPERATORS_LOAD_MODE = os.getenv('OPERATORS_LOAD_MODE', 'reload').strip().lower()
+if OPERATORS_LOAD_MODE not in ('reload', 'upsert'):
+    logger.error(f"Invalid OPERATORS_LOAD_MODE: {OPERATORS_LOAD_MODE}")
+    raise ValueError("OPERATORS_LOAD_MODE must be 'reload' or 'upsert'")
+
+# Blue/green full reloads: load into operators_new/accounting_new/... while readers keep the live tables,
+# then swap them in with one atomic RENAME TABLE. A shadow table with fewer rows than
+# SHADOW_MIN_ROW_RATIO of the live one (or none at all) is discarded instead of published
+LOAD_SHADOW_TABLES = os.getenv('LOAD_SHADOW_TABLES', 'false').strip().lower() in ('1', 'true', 'yes')
+SHADOW_MIN_ROW_RATIO = float(os.getenv('SHADOW_MIN_ROW_RATIO', 0.5))
+
+# Execution mode: 'phased' downloads everything before loading; 'pipelined' overlaps
+# download -> extract -> load per ZIP through bounded queues of PIPELINE_QUEUE_SIZE items
+PIPELINE_MODE = os.getenv('PIPELINE_MODE', 'phased').strip().lower()
+if PIPELINE_MODE not in ('phased', 'pipelined'):
+    logger.error(f"Invalid PIPELINE_MODE: {PIPELINE_MODE}")
+    raise ValueError("PIPELINE_MODE must be 'phased' or 'pipelined'")
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', 2))
+
+# Concurrent HTTP: year listings and ZIP downloads in flight at once, sharing one pooled session
+MAX_CONCURRENT_DOWNLOADS = max(1, int(os.getenv('MAX_CONCURRENT_DOWNLOADS', 4)))
+
+# Download manifest: size/ETag/Last-Modified/SHA-256 of every ZIP and the sizes of its extracted CSVs.
+# With SKIP_UNCHANGED_DOWNLOADS on, quarters whose HEAD metadata still matches are neither downloaded nor extracted
+SKIP_UNCHANGED_DOWNLOADS = os.getenv('SKIP_UNCHANGED_DOWNLOADS', 'true').strip().lower() in ('1', 'true', 'yes')
+DOWNLOAD_MANIFEST_PATH = Path(os.getenv('DOWNLOAD_MANIFEST_PATH', DATA_DIR / "download_manifest.json"))
+
+# ZIP extraction: only members whose file name matches EXTRACT_MEMBER_PATTERN (empty: everything) are
+# extracted, by EXTRACT_WORKERS processes; members whose size and CRC-32 match the file on disk are skipped
+EXTRACT_MEMBER_PATTERN = os.getenv('EXTRACT_MEMBER_PATTERN', '*.csv').strip() or None
+EXTRACT_WORKERS = max(1, int(os.getenv('EXTRACT_WORKERS', 1)))
+
+# Streaming load: ZIPs are not extracted; each CSV member is decompressed straight into LOAD DATA
+# through a named pipe (or a temporary file where named pipes are unavailable)
+STREAM_FROM_ZIPS = os.getenv('STREAM_FROM_ZIPS', 'false').strip().lower() in ('1', 'true', 'yes')
+
+# CSV pre-normalization: clean decimals, '.0' suffixes and dates with pandas in CSV_PRENORMALIZE_WORKERS
+# processes and LOAD DATA the result with a plain column mapping, instead of per-row SQL expressions
+CSV_PRENORMALIZE = os.getenv('CSV_PRENORMALIZE', 'false').strip().lower() in ('1', 'true', 'yes')
+CSV_PRENORMALIZE_WORKERS = max(1, int(os.getenv('CSV_PRENORMALIZE_WORKERS', LOAD_PARALLEL_WORKERS)))
+NORMALIZED_CSVS_DIR = DATA_DIR / "normalized"  # Temporary normalized copies, deleted after each load
+
+# Load audit: count rows and checksum columns of each CSV while it streams into LOAD DATA, compare them with
+# the rows inserted and the warnings reported, and record the result in load_audit (no table re-scan)
+LOAD_AUDIT = os.getenv('LOAD_AUDIT', 'true').strip().lower() in ('1', 'true', 'yes')
+
 MYSQL_CSV_ENCODING = 'utf8mb4'  # Supports full Unicode including emojis
 logger.info(f"Database connection configured for: {DB_CONFIG['host']}:{DB_CONFIG['port']}")
 
@@ -93,9 +162,16 @@ DOWNLOAD_CONFIG = DownloadConfig(
     csvs_dir=CSVS_DIR,
     operators_dir=OPERATORS_DIR,
     operators_csv_path=OPERATORS_CSV_PATH,
+    max_concurrent_downloads=MAX_CONCURRENT_DOWNLOADS,
+    extract_zips=not STREAM_FROM_ZIPS,
 )
 
 LOAD_CONFIG = LoadConfig(
     operators_csv_path=OPERATORS_CSV_PATH,
     accounting_csvs_dir=CSVS_DIR,
+    parallel_workers=LOAD_PARALLEL_WORKERS,
+    incremental=LOAD_MODE == 'incremental',
+    accounting_zips_dir=ZIPS_DIR if STREAM_FROM_ZIPS else None,
+    operators_upsert=OPERATORS_LOAD_MODE == 'upsert',
+    shadow_tables=LOAD_SHADOW_TABLES,
 )
\ No newline at end of file
@@ -1,18 +1,30 @@
-from .filesystem import OsFileSystem
-from .web import RequestsDownloader, Bs4HtmlParser
-from .archive import ZipfileExtractor
+from .filesystem import OsFileSystem, JsonDownloadManifest, FileTap
+from .web import RequestsDownloader, Bs4HtmlParser, create_pooled_session
+from .archive import ZipfileExtractor, ZipMemberStream
 from .database import ( 
     MySQLConnectionManager,
     MySqlOperatorRepository,
     MySqlAccountingRepository,
+    MySqlLoadStateRepository,
+    MySqlLoadAuditRepository,
+    MySqlShadowTables,
+    CsvPreNormalizer,
 )
 
 __all__ = [
     "OsFileSystem",
+    "JsonDownloadManifest",
+    "FileTap",
     "RequestsDownloader",
     "Bs4HtmlParser",
+    "create_pooled_session",
     "ZipfileExtractor",
+    "ZipMemberStream",
     "MySQLConnectionManager",
     "MySqlOperatorRepository",
     "MySqlAccountingRepository",
+    "MySqlLoadStateRepository",
+    "MySqlLoadAuditRepository",
+    "MySqlShadowTables",
+    "CsvPreNormalizer",
 ]
\ No newline at end of file
@@ -1,3 +1,4 @@
 from .zipfile_extractor import ZipfileExtractor
+from .zip_member_stream import ZipMemberStream
 
-__all__ = ["ZipfileExtractor"]
\ No newline at end of file
+__all__ = ["ZipfileExtractor", "ZipMemberStream"]
\ No newline at end of file
@@ -0,0 +1,43 @@
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, Optional
+
+from src.infrastructure.filesystem.fifo_stream import FifoStream
+
+class ZipMemberStream(FifoStream):
+    """Exposes one ZIP member as a readable path without extracting it to disk.
+
+    On POSIX the path is a named pipe (FIFO): a writer thread decompresses the member into it
+    while the reader (LOAD DATA LOCAL INFILE, the pre-normalizer) consumes it, so the CSV never
+    lands on disk. Where os.mkfifo is unavailable the member is extracted to a temporary file
+    that is removed on exit. Readers must call raise_if_failed() before committing what they
+    read: a decompression error ends the stream early, which looks like a short file.
+
+        stream = ZipMemberStream(zip_path, "1T2024.csv")
+        with stream as csv_path:
+            ... LOAD DATA LOCAL INFILE csv_path ...
+            stream.raise_if_failed()
+    """
+
+    _temp_prefix = 'zip_stream'
+
+    def __init__(
+        self,
+        zip_path: Path,
+        member: str,
+        work_dir: Optional[Path] = None,
+        use_fifo: Optional[bool] = None,
+        observer: Optional[Callable[[bytes], None]] = None,
+    ):
+        super().__init__(Path(member).name, work_dir=work_dir, use_fifo=use_fifo, observer=observer)
+        self._zip_path = zip_path
+        self._member = member
+
+    @contextmanager
+    def _open_source(self) -> Iterator[BinaryIO]:
+        with zipfile.ZipFile(self._zip_path) as archive, archive.open(self._member) as source:
+            yield source
+
+    def _describe(self) -> str:
+        return f"{self._member} from {self._zip_path.name}"
@@ -1,9 +1,17 @@
 from .mysql_connection_manager import MySQLConnectionManager
 from .mysql_operator_repository import MySqlOperatorRepository
 from .mysql_accounting_repository import MySqlAccountingRepository
+from .mysql_load_state_repository import MySqlLoadStateRepository
+from .mysql_load_audit_repository import MySqlLoadAuditRepository
+from .mysql_shadow_tables import MySqlShadowTables
+from .csv_prenormalizer import CsvPreNormalizer
 
 __all__ = [
     "MySQLConnectionManager",
     "MySqlOperatorRepository",
     "MySqlAccountingRepository",
+    "MySqlLoadStateRepository",
+    "MySqlLoadAuditRepository",
+    "MySqlShadowTables",
+    "CsvPreNormalizer",
 ]
\ No newline at end of file
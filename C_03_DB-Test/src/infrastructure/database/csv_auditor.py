@@ -0,0 +1,90 @@
+import codecs
+import csv
+import itertools
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+SOURCE_CSV_ENCODING = 'utf-8'  # The raw files are read as utf8mb4 by the MySQL templates
+VALUE_SEPARATOR = '\x1f'       # Ends every value hashed into a column checksum, so 'ab','c' != 'a','bc'
+
+@dataclass(frozen=True)
+class SourceProfile:
+    """What a CSV held, as seen while it was streamed to LOAD DATA"""
+    rows: int                    # Data records (after the header), as LOAD DATA ... IGNORE 1 ROWS counts them
+    bytes: int                   # Raw size of the stream
+    column_checksums: Dict[str, int] = field(default_factory=dict)  # Header name -> CRC-32 of the column's raw values
+
+class CsvAuditor:
+    """Counts the records of a ';' separated, '"' quoted CSV and checksums each column, fed chunk by chunk.
+
+    Meant as a FifoStream observer: it sees the bytes on their way to LOAD DATA, so the source
+    is profiled without a second read. Records may span lines inside quotes and chunks may end
+    anywhere; the checksums are order-dependent CRC-32s of the raw cell text in file order.
+    """
+
+    def __init__(self, delimiter: str = ';', header_rows: int = 1):
+        self._delimiter = delimiter
+        self._header_rows = header_rows
+        self._decoder = codecs.getincrementaldecoder(SOURCE_CSV_ENCODING)(errors='replace')
+        self._pending = ''        # Text after the last newline seen
+        self._open_record = ''    # Complete lines of a record whose quotes are still open
+        self._records_seen = 0
+        self._bytes = 0
+        self._columns: List[str] = []
+        self._checksums: List[int] = []
+
+    def feed(self, chunk: bytes) -> None:
+        self._bytes += len(chunk)
+        text = self._pending + self._decoder.decode(chunk)
+        lines = text.split('\n')
+        self._pending = lines.pop()  # No newline yet: completed by a later chunk or by profile()
+        self._consume(self._records(lines))
+
+    def profile(self) -> SourceProfile:
+        """Profile of everything fed so far; call once the stream is complete"""
+        tail = self._pending + self._decoder.decode(b'', final=True)
+        self._pending = ''
+        records = self._records([tail]) if tail else []
+        if self._open_record:  # Unbalanced quotes at EOF: LOAD DATA still reads it as one record
+            records.append(self._open_record)
+            self._open_record = ''
+        self._consume(records)
+        return SourceProfile(
+            rows=max(0, self._records_seen - self._header_rows),
+            bytes=self._bytes,
+            column_checksums=dict(zip(self._columns, self._checksums)),
+        )
+
+    def _records(self, lines: List[str]) -> List[str]:
+        """Joins lines into records: a quoted field may contain newlines"""
+        records = []
+        for line in lines:
+            if self._open_record:
+                line = self._open_record + '\n' + line
+            if line.count('"') % 2:
+                self._open_record = line
+            else:
+                self._open_record = ''
+                records.append(line)
+        return records
+
+    def _consume(self, records: List[str]) -> None:
+        if not records:
+            return
+        rows = list(csv.reader(records, delimiter=self._delimiter, quotechar='"'))
+        headers_left = self._header_rows - self._records_seen
+        self._records_seen += len(rows)
+        if headers_left > 0:
+            if not self._columns:
+                self._columns = [name.strip() or f'column_{i + 1}' for i, name in enumerate(rows[0])]
+                self._checksums = [0] * len(self._columns)
+            rows = rows[headers_left:]
+        if not rows or not self._columns:
+            return
+        # Transposed in C; short rows hash as empty values, extra trailing values are ignored (as LOAD DATA does)
+        columns = list(itertools.zip_longest(*rows, fillvalue=''))
+        for i in range(len(self._checksums)):
+            values = columns[i] if i < len(columns) else ('',) * len(rows)
+            data = (VALUE_SEPARATOR.join(values) + VALUE_SEPARATOR).encode(SOURCE_CSV_ENCODING)
+            self._checksums[i] = zlib.crc32(data, self._checksums[i])
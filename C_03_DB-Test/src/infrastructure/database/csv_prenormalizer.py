@@ -0,0 +1,158 @@
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas
+
+logger = logging.getLogger(__name__)
+
+SOURCE_CSV_ENCODING = 'utf-8'  # The raw files are read as utf8mb4 by the MySQL templates
+NULL_MARKER = '\\N'            # LOAD DATA reads an unquoted \N as NULL
+# Column order of the normalized files; the LOAD DATA templates map them one to one
+ACCOUNTING_COLUMNS = [
+    'trimestre_referencia', 'reg_ans', 'cd_conta_contabil', 'descricao', 'vl_saldo_inicial', 'vl_saldo_final',
+]
+OPERATOR_COLUMNS = [
+    'Registro_ANS', 'CNPJ', 'Razao_Social', 'Nome_Fantasia', 'Modalidade',
+    'Logradouro', 'Numero', 'Complemento', 'Bairro', 'Cidade', 'UF', 'CEP',
+    'DDD', 'Telefone', 'Fax', 'Endereco_eletronico', 'Representante',
+    'Cargo_Representante', 'Regiao_de_Comercializacao', 'Data_Registro_ANS',
+]
+# Spreadsheet exports turn numeric-looking text into floats ('11.0'); value is the column width
+OPERATOR_FLOAT_SUFFIX_COLUMNS = {'CEP': 9, 'DDD': 3, 'Telefone': 50, 'Fax': 50, 'Regiao_de_Comercializacao': 100}
+_DECIMAL_PATTERN = r'-?[0-9.,]+'
+
+def _read_chunks(csv_path: Path, column_count: int, chunk_rows: int):
+    """Raw ANS CSV (';' separated, '"' quoted) as text-only chunks of exactly `column_count` columns"""
+    reader = pandas.read_csv(
+        csv_path, sep=';', quotechar='"', header=0, dtype=str, keep_default_na=False,
+        encoding=SOURCE_CSV_ENCODING, encoding_errors='replace', chunksize=chunk_rows,
+    )
+    for chunk in reader:
+        # Short files get empty columns, extra trailing columns are ignored (as LOAD DATA does)
+        chunk = chunk.iloc[:, :column_count]
+        chunk.columns = range(chunk.shape[1])
+        yield chunk.reindex(columns=range(column_count), fill_value='')
+
+def _brazilian_decimal(cells: pandas.Series) -> pandas.Series:
+    """'1.234,56' -> '1234.56'; anything that is not a number becomes NULL (NaN)"""
+    trimmed = cells.str.strip(' ')
+    plain = trimmed.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+    valid = trimmed.str.fullmatch(_DECIMAL_PATTERN) & pandas.to_numeric(plain, errors='coerce').notna()
+    return plain.where(valid)
+
+def _strip_float_suffix(cells: pandas.Series, width: int) -> pandas.Series:
+    return cells.where(~cells.str.endswith('.0'), cells.str[:-2]).str[:width]
+
+def _write_chunk(frame: pandas.DataFrame, target: Path, first: bool) -> None:
+    # LOAD DATA's default escape character is '\'; doubling it keeps source backslashes literal
+    frame = frame.apply(lambda cells: cells.str.replace('\\', '\\\\', regex=False) if cells.dtype == object else cells)
+    frame.to_csv(target, mode='w' if first else 'a', header=first, index=False, na_rep=NULL_MARKER, lineterminator='\n')
+
+def normalize_accounting_csv(source: Path, target: Path, reference_date: date, chunk_rows: int = 200_000) -> int:
+    """Writes `source` to `target` with the cleaning the raw LOAD DATA template does per row:
+    quarter date set, text trimmed and cut to the column width, Brazilian decimals converted.
+    Returns the number of rows written."""
+    rows = 0
+    first = True
+    for chunk in _read_chunks(source, 6, chunk_rows):
+        frame = pandas.DataFrame({
+            'trimestre_referencia': reference_date.isoformat(),
+            'reg_ans': chunk[1].str.strip(' '),
+            'cd_conta_contabil': chunk[2].str.strip(' ').str[:50],
+            'descricao': chunk[3].str.strip(' ').str[:500],
+            'vl_saldo_inicial': _brazilian_decimal(chunk[4]),
+            'vl_saldo_final': _brazilian_decimal(chunk[5]),
+        }, columns=ACCOUNTING_COLUMNS)
+        _write_chunk(frame, target, first)
+        first = False
+        rows += len(frame)
+    if first:
+        _write_chunk(pandas.DataFrame(columns=ACCOUNTING_COLUMNS), target, True)
+    return rows
+
+def normalize_operators_csv(source: Path, target: Path, chunk_rows: int = 200_000) -> int:
+    """Writes `source` to `target` with '.0' suffixes stripped and registration dates validated
+    (blank, '0000-00-00', 'NULL' or unparseable dates become NULL). Returns the number of rows written."""
+    rows = 0
+    first = True
+    for chunk in _read_chunks(source, len(OPERATOR_COLUMNS), chunk_rows):
+        chunk.columns = OPERATOR_COLUMNS
+        for column, width in OPERATOR_FLOAT_SUFFIX_COLUMNS.items():
+            chunk[column] = _strip_float_suffix(chunk[column], width)
+        registered = pandas.to_datetime(
+            chunk['Data_Registro_ANS'].str.strip(' '), format='%Y-%m-%d', errors='coerce'
+        )
+        chunk['Data_Registro_ANS'] = registered.dt.strftime('%Y-%m-%d')  # NaT stays NaN -> NULL
+        _write_chunk(chunk, target, first)
+        first = False
+        rows += len(chunk)
+    if first:
+        _write_chunk(pandas.DataFrame(columns=OPERATOR_COLUMNS), target, True)
+    return rows
+
+class CsvPreNormalizer:
+    """Cleans ANS CSVs with vectorized pandas in worker processes before LOAD DATA.
+
+    The raw templates convert decimals, strip '.0' suffixes and parse dates row by row inside
+    MySQL, on one thread per statement. With a normalizer the repositories load its output
+    instead, using templates that only map columns. Loads running in parallel threads each
+    normalize their file in a separate process. `max_workers=0` normalizes in the calling process.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, work_dir: Optional[Path] = None, chunk_rows: int = 200_000):
+        self._max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self._work_dir = work_dir
+        self._chunk_rows = chunk_rows
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _run(self, function: Callable, *args) -> int:
+        if self._max_workers <= 0:
+            return function(*args)
+        with self._lock:
+            if self._executor is None:
+                # 'spawn': forking a process that already runs loader threads can copy held locks
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._max_workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            executor = self._executor
+        return executor.submit(function, *args).result()
+
+    def _normalize(self, function: Callable, csv_path: Path, *args) -> Path:
+        if self._work_dir is not None:
+            self._work_dir.mkdir(parents=True, exist_ok=True)
+        handle, target_name = tempfile.mkstemp(prefix=f"{csv_path.stem}_", suffix='.normalized.csv', dir=self._work_dir)
+        os.close(handle)
+        target = Path(target_name)
+        start_time = time.time()
+        try:
+            rows = self._run(function, csv_path, target, *args, self._chunk_rows)
+        except Exception as e:
+            target.unlink(missing_ok=True)
+            logger.error(f"Pre-normalization of {csv_path.name} failed: {e}")
+            raise RuntimeError(f"Failed to pre-normalize {csv_path.name}") from e
+        logger.info(f"Pre-normalized {csv_path.name}: {rows} rows in {time.time() - start_time:.2f}s")
+        return target
+
+    def normalize_accounting(self, csv_path: Path, reference_date: date) -> Path:
+        """Normalized copy of an accounting CSV (a temporary file the caller deletes)"""
+        return self._normalize(normalize_accounting_csv, csv_path, reference_date)
+
+    def normalize_operators(self, csv_path: Path) -> Path:
+        """Normalized copy of the operators CSV (a temporary file the caller deletes)"""
+        return self._normalize(normalize_operators_csv, csv_path)
+
+    def close(self) -> None:
+        """Shuts the worker processes down"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
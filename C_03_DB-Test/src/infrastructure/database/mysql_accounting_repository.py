@@ -1,22 +1,69 @@
 import logging
+import threading
 import time
+import uuid
+from contextlib import closing
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import date
 from mysql.connector import Error
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
 from src.application.ports.accounting_repository import AccountingRepository
+from src.infrastructure.archive import ZipMemberStream
 if TYPE_CHECKING:
     from .mysql_connection_manager import MySQLConnectionManager
+    from .csv_prenormalizer import CsvPreNormalizer
+    from .mysql_load_audit_repository import MySqlLoadAuditRepository
 
 logger = logging.getLogger(__name__)
 MYSQL_CSV_ENCODING = 'utf8mb4'  # MySQL encoding that supports full Unicode
+ER_SAME_NAME_PARTITION = 1517    # ADD PARTITION raced with another loader for the same quarter
+# Every column except the auto-increment id, used when rows are copied between tables
+ACCOUNTING_DATA_COLUMNS = (
+    "trimestre_referencia, reg_ans, cd_conta_contabil, descricao, vl_saldo_inicial, vl_saldo_final"
+)
+# Secondary indexes the loader builds after the data is in (must match sql/schema.sql).
+# Covers the analysis queries: quarter filter, '411%' account prefix, operator and the summed value.
+SUMMARY_ACCOUNT_PREFIX_LENGTH = 3  # accounting_expense_summary totals per 3-digit account prefix ('411', ...)
+SECONDARY_INDEXES = {
+    'idx_accounting_quarter_account': "(trimestre_referencia, cd_conta_contabil, reg_ans, vl_saldo_final)",
+}
+
+# A quarter load in progress through a staging table (see begin_quarter_load)
+@dataclass(frozen=True)
+class _QuarterStage:
+    table: str                    # Unpartitioned staging table receiving the quarter's files
+    partition: Optional[str]      # Partition it is exchanged with; None when `accounting` is not partitioned
+    deferred_indexes: List[str]   # Secondary indexes built on the staging table before the exchange
+    lock: threading.Lock          # The quarter's lock, held until the stage is swapped in or dropped
+    replace: bool = False         # The staged rows replace the quarter's existing rows instead of joining them
 
 class MySqlAccountingRepository(AccountingRepository):
     """MySQL implementation of AccountingRepository for bulk loading accounting data."""
     
-    def __init__(self, connection_manager: 'MySQLConnectionManager'):
+    def __init__(
+        self,
+        connection_manager: 'MySQLConnectionManager',
+        defer_index_build: bool = True,
+        normalizer: Optional['CsvPreNormalizer'] = None,  # Cleans each CSV in a worker process before LOAD DATA
+        audit_repo: Optional['MySqlLoadAuditRepository'] = None,  # Profiles each CSV as it streams, records load_audit
+    ):
         self._conn_manager = connection_manager
+        self._normalizer = normalizer
+        self._audit_repo = audit_repo
+        self._partitioned = None  # Whether `accounting` is partitioned by quarter (detected on first use)
+        # Tables written by loads, deletes and summary refreshes; see set_table_suffix()
+        self._table = 'accounting'
+        self._summary_table = 'accounting_expense_summary'
+        self._operators_table = 'operators'  # Checked by count_orphaned_statements (there is no foreign key)
+        # Build secondary indexes in one sorted pass after LOAD DATA instead of row by row during it
+        self._defer_index_build = defer_index_build
+        self._deferred_indexes: List[str] = []  # Indexes dropped by begin_bulk_load (unpartitioned table)
+        # One lock per quarter serializes its staging/exchange; each thread tracks its own quarter loads
+        self._quarter_locks: Dict[date, threading.Lock] = {}
+        self._quarter_locks_guard = threading.Lock()
+        self._local = threading.local()
         
         # SQL template for LOAD DATA command with:
         # - Field mapping
@@ -24,7 +71,7 @@ class MySqlAccountingRepository(AccountingRepository):
         # - Decimal number handling (Brazilian format)
         self._load_sql_template = """
             LOAD DATA LOCAL INFILE '{csv_path}'
-            INTO TABLE accounting
+            INTO TABLE {table_name}
             CHARACTER SET {encoding}
             FIELDS TERMINATED BY ';'
             OPTIONALLY ENCLOSED BY '"'
@@ -46,95 +93,497 @@ class MySqlAccountingRepository(AccountingRepository):
                                   CAST(REPLACE(REPLACE(TRIM(@VL_SALDO_FINAL), '.', ''), ',', '.') AS DECIMAL(18,2)),
                                   NULL);
         """
+        if normalizer is not None:
+            # Pre-normalized files (see csv_prenormalizer) already hold the final column values
+            self._load_sql_template = """
+                LOAD DATA LOCAL INFILE '{csv_path}'
+                INTO TABLE {table_name}
+                CHARACTER SET {encoding}
+                FIELDS TERMINATED BY ','
+                OPTIONALLY ENCLOSED BY '"'
+                LINES TERMINATED BY '\\n'
+                IGNORE 1 ROWS
+                (trimestre_referencia, reg_ans, cd_conta_contabil, descricao, vl_saldo_inicial, vl_saldo_final);
+            """
+
+    def set_table_suffix(self, suffix: str = '') -> None:
+        """Points every write at `accounting{suffix}` and `accounting_expense_summary{suffix}`
+        (the shadow copies of a blue/green reload); '' goes back to the live tables."""
+        self._table = f'accounting{suffix}'
+        self._summary_table = f'accounting_expense_summary{suffix}'
+        self._operators_table = f'operators{suffix}'
 
     def clear_all(self) -> None:
         """Truncates the accounting table, temporarily disabling foreign key checks."""
-        logger.warning("Attempting to clear 'accounting' table.")
+        logger.warning(f"Attempting to clear '{self._table}' table.")
+        try:
+            # FK checks off to allow TRUNCATE on tables with FK constraints; the session restores the original value
+            with self._conn_manager.bulk_session({'foreign_key_checks': 0}) as conn, closing(conn.cursor()) as cursor:
+                cursor.execute(f"TRUNCATE TABLE {self._table};")
+                cursor.execute(f"TRUNCATE TABLE {self._summary_table};")
+                conn.commit()
+            logger.info(f"'{self._table}' table cleared successfully.")
+
+        except Error as e:
+            logger.error(f"Database error while clearing accounting table: {e}")
+            raise RuntimeError("Failed to clear accounting table") from e
+
+    def _existing_secondary_indexes(self, cursor, table: str) -> List[str]:
+        """Names of the managed secondary indexes currently defined on `table`."""
+        cursor.execute("""
+            SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """, (table,))
+        existing = {row[0] for row in cursor.fetchall()}
+        return [name for name in SECONDARY_INDEXES if name in existing]
+
+    def _drop_indexes(self, cursor, table: str, index_names: List[str]) -> None:
+        if index_names:
+            cursor.execute(f"ALTER TABLE {table} " + ", ".join(f"DROP INDEX {name}" for name in index_names))
+
+    def _build_indexes(self, cursor, table: str, index_names: List[str]) -> None:
+        """Adds all the indexes in a single ALTER TABLE, so InnoDB sorts and builds them in one pass."""
+        if index_names:
+            start_time = time.time()
+            cursor.execute(
+                f"ALTER TABLE {table} "
+                + ", ".join(f"ADD INDEX {name} {SECONDARY_INDEXES[name]}" for name in index_names)
+            )
+            logger.info(f"Built indexes {', '.join(index_names)} on {table} in {time.time() - start_time:.2f}s")
+
+    def begin_bulk_load(self) -> None:
+        """Drops the secondary indexes of an unpartitioned `accounting` before a full reload.
+        Partitioned tables defer index builds per staging table instead, so nothing is done here."""
+        if not self._defer_index_build:
+            return
         conn = None
         cursor = None
-        fk_check_original_value = 1  # Default MySQL FK check state (enabled)
+        try:
+            conn = self._conn_manager.get_connection()
+            cursor = conn.cursor()
+            if self._is_partitioned(cursor):
+                return
+            self._deferred_indexes = self._existing_secondary_indexes(cursor, self._table)
+            self._drop_indexes(cursor, self._table, self._deferred_indexes)
+            if self._deferred_indexes:
+                logger.info(f"Dropped {', '.join(self._deferred_indexes)} until the bulk load finishes")
+        except Error as e:
+            logger.error(f"Database error preparing bulk load: {e}")
+            raise RuntimeError("Failed to prepare accounting bulk load") from e
+        finally:
+            if cursor: cursor.close()
+            if conn and conn.is_connected():
+                conn.close()
 
+    def end_bulk_load(self) -> None:
+        """Rebuilds the indexes dropped by begin_bulk_load."""
+        if not self._deferred_indexes:
+            return
+        conn = None
+        cursor = None
         try:
             conn = self._conn_manager.get_connection()
             cursor = conn.cursor()
+            self._build_indexes(cursor, self._table, self._deferred_indexes)
+            self._deferred_indexes = []
+        except Error as e:
+            logger.error(f"Database error rebuilding accounting indexes: {e}")
+            raise RuntimeError("Failed to rebuild accounting indexes") from e
+        finally:
+            if cursor: cursor.close()
+            if conn and conn.is_connected():
+                conn.close()
+
+    @staticmethod
+    def _partition_name(reference_date: date) -> str:
+        return f"p{reference_date:%Y%m%d}"
+
+    def _is_partitioned(self, cursor) -> bool:
+        """True when the schema partitions `accounting` by quarter (see sql/schema.sql).
+        Shadow copies are created LIKE the live table, so the answer holds for them too."""
+        if self._partitioned is None:
+            cursor.execute("""
+                SELECT PARTITION_METHOD FROM information_schema.PARTITIONS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+                LIMIT 1
+            """, (self._table,))
+            row = cursor.fetchone()
+            self._partitioned = bool(row and row[0])
+            logger.info(f"'accounting' is {'partitioned by quarter' if self._partitioned else 'not partitioned'}")
+        return self._partitioned
+
+    def _partition_exists(self, cursor, partition: str) -> bool:
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME = %s
+        """, (self._table, partition))
+        return cursor.fetchone()[0] > 0
 
-            # Disable FK checks to allow TRUNCATE on tables with FK constraints
-            logger.debug("Disabling foreign key checks for accounting TRUNCATE.")
-            cursor.execute("SET SESSION foreign_key_checks = 0;")
+    def _ensure_partition(self, cursor, reference_date: date) -> str:
+        """Adds the quarter's LIST partition if it is not there yet and returns its name."""
+        partition = self._partition_name(reference_date)
+        if not self._partition_exists(cursor, partition):
+            try:
+                cursor.execute(
+                    f"ALTER TABLE {self._table} ADD PARTITION "
+                    f"(PARTITION {partition} VALUES IN ('{reference_date:%Y-%m-%d}'))"
+                )
+                logger.info(f"Added partition {partition} to '{self._table}'")
+            except Error as e:
+                if e.errno != ER_SAME_NAME_PARTITION:
+                    raise
+        return partition
 
-            cursor.execute("TRUNCATE TABLE accounting;")
+    def delete_quarter(self, reference_date: date, batch_size: int = 50000) -> int:
+        """Deletes one quarter's rows: drops its partition when the table is partitioned,
+        otherwise deletes in batches so no single transaction has to hold a whole quarter.
+
+        Returns:
+            int: Number of deleted rows
+        Raises:
+            RuntimeError: If the delete fails
+        """
+        conn = None
+        cursor = None
+        deleted = 0
+        try:
+            conn = self._conn_manager.get_connection()
+            cursor = conn.cursor()
+            if self._is_partitioned(cursor):
+                partition = self._partition_name(reference_date)
+                if self._partition_exists(cursor, partition):
+                    cursor.execute(f"SELECT COUNT(*) FROM {self._table} PARTITION ({partition})")
+                    deleted = cursor.fetchone()[0]
+                    cursor.execute(f"ALTER TABLE {self._table} DROP PARTITION {partition}")
+            else:
+                while True:
+                    cursor.execute(
+                        f"DELETE FROM {self._table} WHERE trimestre_referencia = %s LIMIT %s",
+                        (reference_date, batch_size)
+                    )
+                    batch_deleted = cursor.rowcount
+                    conn.commit()
+                    deleted += batch_deleted
+                    if batch_deleted < batch_size:
+                        break
+            cursor.execute(
+                f"DELETE FROM {self._summary_table} WHERE trimestre_referencia = %s", (reference_date,)
+            )
             conn.commit()
-            logger.info("'accounting' table cleared successfully.")
+            logger.info(f"Deleted {deleted} accounting rows for quarter {reference_date}")
+            return deleted
 
         except Error as e:
-            logger.error(f"Database error while clearing accounting table: {e}")
+            logger.error(f"Database error deleting quarter {reference_date}: {e}")
             if conn: conn.rollback()
-            raise RuntimeError("Failed to clear accounting table") from e
+            raise RuntimeError(f"Failed to delete accounting quarter {reference_date}") from e
         finally:
-            # Critical: Always re-enable FK checks and clean up resources
-            if cursor:
-                try:
-                    logger.debug(f"Re-enabling foreign key checks (original value: {fk_check_original_value}).")
-                    cursor.execute(f"SET SESSION foreign_key_checks = {fk_check_original_value};")
-                    conn.commit()
-                except Error as fk_err:
-                    logger.error(f"Failed to re-enable foreign key checks: {fk_err}")
-                finally:
-                    cursor.close()
+            if cursor: cursor.close()
             if conn and conn.is_connected():
                 conn.close()
-                logger.debug("Connection returned to pool after clear_all.")
+                logger.debug("Connection returned to pool.")
 
     def load_from_csv(self, csv_path: Path, reference_date: date) -> int:
         """Bulk loads accounting data from CSV using MySQL's LOAD DATA INFILE.
+
+        On a partitioned table the file is loaded into a staging table that is then swapped in
+        with EXCHANGE PARTITION, so queries see the quarter appear all at once. Inside a
+        begin_quarter_load() it joins that quarter's staging table instead.
         
         Returns:
             int: Number of affected rows
         Raises:
             RuntimeError: If loading fails
         """
-        table_name = f"accounting ({csv_path.name})"
+        return self._within_quarter_load(
+            reference_date, lambda: self._load_source(csv_path, csv_path.name, reference_date)
+        )
+
+    def load_from_zip_member(self, zip_path: Path, member: str, reference_date: date) -> int:
+        """Bulk loads one CSV stored in a ZIP, streaming it into LOAD DATA without extracting it.
+
+        Returns:
+            int: Number of affected rows
+        Raises:
+            RuntimeError: If streaming or loading fails
+        """
+        def load() -> int:
+            stream = ZipMemberStream(zip_path, member)
+            with stream as stream_path:
+                return self._load_source(
+                    stream_path, f"{zip_path.name}:{member}", reference_date, verify_source=stream.raise_if_failed
+                )
+        return self._within_quarter_load(reference_date, load)
+
+    def _active_stages(self) -> Dict[date, _QuarterStage]:
+        """Quarter loads started by the calling thread"""
+        if not hasattr(self._local, 'stages'):
+            self._local.stages = {}
+        return self._local.stages
+
+    def _quarter_lock(self, reference_date: date) -> threading.Lock:
+        with self._quarter_locks_guard:
+            return self._quarter_locks.setdefault(reference_date, threading.Lock())
+
+    def _within_quarter_load(self, reference_date: date, load: Callable[[], int]) -> int:
+        """Runs a single load inside the caller's quarter load, or in a quarter load of its own"""
+        if reference_date in self._active_stages():
+            return load()
+        self.begin_quarter_load(reference_date)
+        try:
+            count = load()
+        except Exception:
+            self.abort_quarter_load(reference_date)
+            raise
+        self.end_quarter_load(reference_date)
+        return count
+
+    def begin_quarter_load(self, reference_date: date, replace: bool = False) -> None:
+        """On a partitioned table, creates an empty staging table that receives every file of the
+        quarter loaded by this thread until end_quarter_load() swaps it in with one EXCHANGE
+        PARTITION. Loads of the same quarter from other threads wait until then, so they never
+        exchange the partition under each other. An unpartitioned table is loaded directly, unless
+        `replace` is set: then the files are staged too, and end_quarter_load() swaps them in with
+        a DELETE and INSERT in one transaction.
+
+        Raises:
+            RuntimeError: If the staging table cannot be created
+        """
+        if reference_date in self._active_stages():
+            raise RuntimeError(f"Quarter {reference_date} is already being loaded by this thread")
+        lock = self._quarter_lock(reference_date)
+        lock.acquire()
+        staging = None
+        try:
+            with closing(self._conn_manager.get_connection()) as conn, closing(conn.cursor()) as cursor:
+                partitioned = self._is_partitioned(cursor)
+                if not partitioned and not replace:
+                    return
+                partition = self._ensure_partition(cursor, reference_date) if partitioned else None
+                # Unique per load, so concurrent runs (or a crashed one's leftover) never share it
+                staging = f"accounting_stage_{reference_date:%Y%m%d}_{uuid.uuid4().hex[:8]}"
+                cursor.execute(f"CREATE TABLE {staging} LIKE {self._table}")
+                if partitioned:
+                    cursor.execute(f"ALTER TABLE {staging} REMOVE PARTITIONING")
+                # The staging table starts empty: drop its secondary indexes and build them after the loads
+                deferred_indexes = self._existing_secondary_indexes(cursor, staging) if self._defer_index_build else []
+                self._drop_indexes(cursor, staging, deferred_indexes)
+            self._active_stages()[reference_date] = _QuarterStage(staging, partition, deferred_indexes, lock, replace)
+        except Error as e:
+            logger.error(f"Database error preparing the load of quarter {reference_date}: {e}")
+            raise RuntimeError(f"Failed to prepare the load of quarter {reference_date}") from e
+        finally:
+            if reference_date not in self._active_stages():
+                # Unpartitioned table (nothing to stage), or the staging table could not be prepared
+                if staging:
+                    self._drop_staging(staging)
+                lock.release()
+
+    def end_quarter_load(self, reference_date: date) -> None:
+        """Swaps the quarter's staging table in with one EXCHANGE PARTITION. Rows already in the
+        partition (e.g. from another ZIP of the quarter) are copied into it first, once per quarter
+        load rather than once per file; in replace mode they are not, so the exchange replaces them.
+        On an unpartitioned table a replace-mode stage is swapped in with a DELETE and INSERT in one transaction.
+
+        Raises:
+            RuntimeError: If the exchange fails (the partition keeps its previous rows)
+        """
+        stage = self._active_stages().pop(reference_date, None)
+        if stage is None:
+            return
+        try:
+            with self._conn_manager.bulk_session() as conn, closing(conn.cursor()) as cursor:
+                if stage.partition is None:
+                    # Readers keep the old rows until the commit, and a failure rolls back to them
+                    # The stage is only copied from, so its deferred indexes are never built
+                    cursor.execute(f"DELETE FROM {self._table} WHERE trimestre_referencia = %s", (reference_date,))
+                    cursor.execute(
+                        f"INSERT INTO {self._table} ({ACCOUNTING_DATA_COLUMNS}) "
+                        f"SELECT {ACCOUNTING_DATA_COLUMNS} FROM {stage.table}"
+                    )
+                    conn.commit()
+                    logger.info(f"Replaced the rows of quarter {reference_date} with {stage.table}")
+                    return
+
+                if not stage.replace:
+                    cursor.execute(f"SELECT 1 FROM {self._table} PARTITION ({stage.partition}) LIMIT 1")
+                    if cursor.fetchone():
+                        cursor.execute(
+                            f"INSERT INTO {stage.table} ({ACCOUNTING_DATA_COLUMNS}) "
+                            f"SELECT {ACCOUNTING_DATA_COLUMNS} FROM {self._table} PARTITION ({stage.partition})"
+                        )
+                        conn.commit()
+
+                # EXCHANGE PARTITION needs identical index definitions on both tables
+                self._build_indexes(cursor, stage.table, stage.deferred_indexes)
+
+                # Every staged row carries this quarter's date (set by LOAD DATA), so validation can be skipped
+                cursor.execute(
+                    f"ALTER TABLE {self._table} EXCHANGE PARTITION {stage.partition} "
+                    f"WITH TABLE {stage.table} WITHOUT VALIDATION"
+                )
+            logger.info(f"Swapped {stage.table} into partition {stage.partition}")
+        except Error as e:
+            logger.error(f"Database error swapping in quarter {reference_date}: {e}")
+            raise RuntimeError(f"Failed to swap in accounting quarter {reference_date}") from e
+        finally:
+            self._drop_staging(stage.table)  # After the exchange it holds the partition's previous contents
+            stage.lock.release()
+
+    def abort_quarter_load(self, reference_date: date) -> None:
+        """Drops the quarter's staging table; the partition keeps its previous rows"""
+        stage = self._active_stages().pop(reference_date, None)
+        if stage is None:
+            return
+        try:
+            self._drop_staging(stage.table)
+            logger.warning(f"Discarded the staged rows of quarter {reference_date}")
+        finally:
+            stage.lock.release()
+
+    def _drop_staging(self, staging: str) -> None:
+        try:
+            with closing(self._conn_manager.get_connection()) as conn, closing(conn.cursor()) as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        except (Error, ConnectionError) as e:
+            logger.error(f"Could not drop staging table {staging}: {e}")
+
+    def _load_source(
+        self,
+        csv_path: Path,
+        source_name: str,
+        reference_date: date,
+        verify_source: Optional[Callable[[], None]] = None  # Raises if the file was read incompletely
+    ) -> int:
+        if self._audit_repo is not None:
+            return self._audit_repo.audit_load(
+                'accounting', csv_path, source_name, reference_date,
+                lambda path, verify: self._load_file(path, source_name, reference_date, verify),
+                verify_source
+            )
+        return self._load_file(csv_path, source_name, reference_date, verify_source)[0]
+
+    def _load_file(
+        self,
+        csv_path: Path,
+        source_name: str,
+        reference_date: date,
+        verify_source: Optional[Callable[[], None]] = None
+    ) -> Tuple[int, int]:
+        """LOAD DATA of one file; returns (rows inserted, LOAD DATA warning count)."""
+        table_name = f"accounting ({source_name})"
         logger.info(f"Loading {table_name} for reference date {reference_date}")
         start_time = time.time()
-        
-        # Prepare paths and SQL with proper escaping
-        abs_csv_path = csv_path.resolve()
-        escaped_csv_path = str(abs_csv_path).replace('\\', '\\\\')
-        formatted_date = reference_date.strftime('%Y-%m-%d')
-
-        formatted_sql = self._load_sql_template.format(
-            csv_path=escaped_csv_path,
-            encoding=MYSQL_CSV_ENCODING,
-            trimestre_ref_sql=formatted_date
-        )
 
-        conn = None
-        cursor = None
+        normalized_path = None
         try:
-            conn = self._conn_manager.get_connection()
-            cursor = conn.cursor()
+            # Normalize before taking a pooled connection; the normalized copy is what LOAD DATA reads
+            normalized_path = self._normalizer.normalize_accounting(csv_path, reference_date) if self._normalizer else None
+            if normalized_path and verify_source:
+                verify_source()  # The normalizer consumed the stream
 
-            logger.info(f"Executing LOAD DATA for '{table_name}'...")
-            cursor.execute(formatted_sql)
-            affected_rows = cursor.rowcount
-            conn.commit()
+            # Prepare paths with proper escaping
+            abs_csv_path = (normalized_path or csv_path).resolve()
+            escaped_csv_path = str(abs_csv_path).replace('\\', '\\\\')
+            formatted_date = reference_date.strftime('%Y-%m-%d')
 
-            logger.info(f"LOAD DATA completed in {time.time() - start_time:.2f}s. Rows: {affected_rows}")
-            
-            if affected_rows == 0:
-                self._log_load_data_warnings(cursor, table_name)
+            # Bulk session: checks skipped and buffers raised; rolled back and restored if the load fails
+            # A partitioned table is loaded through the quarter's staging table (see begin_quarter_load)
+            stage = self._active_stages().get(reference_date)
+            target_table = stage.table if stage else self._table
+            with self._conn_manager.bulk_session() as conn, closing(conn.cursor()) as cursor:
+                logger.info(f"Executing LOAD DATA for '{table_name}' into {target_table}...")
+                cursor.execute(self._load_sql_template.format(
+                    csv_path=escaped_csv_path,
+                    table_name=target_table,
+                    encoding=MYSQL_CSV_ENCODING,
+                    trimestre_ref_sql=formatted_date
+                ))
+                affected_rows = cursor.rowcount
+                warning_count = cursor.warning_count
+                if verify_source:
+                    verify_source()  # A stream that broke off must not be committed (or swapped in) as a short file
+                conn.commit()
+                if affected_rows == 0:
+                    self._log_load_data_warnings(cursor, table_name)
 
-            return affected_rows
+            logger.info(f"LOAD DATA completed in {time.time() - start_time:.2f}s. Rows: {affected_rows}")
+            return affected_rows, warning_count
 
         except Error as err:
             logger.error(f"Database error during LOAD DATA: {err}")
+            raise RuntimeError(f"Failed to load {source_name}") from err
+        finally:
+            if normalized_path:
+                normalized_path.unlink(missing_ok=True)
+
+    def refresh_quarter_summary(self, reference_date: date) -> int:
+        """Recomputes the quarter's rows of accounting_expense_summary (totals per operator and account prefix).
+
+        Returns:
+            int: Number of summary rows written
+        Raises:
+            RuntimeError: If the refresh fails
+        """
+        conn = None
+        cursor = None
+        try:
+            start_time = time.time()
+            conn = self._conn_manager.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                f"DELETE FROM {self._summary_table} WHERE trimestre_referencia = %s", (reference_date,)
+            )
+            cursor.execute(f"""
+                INSERT INTO {self._summary_table}
+                    (trimestre_referencia, prefixo_conta, reg_ans, vl_saldo_final_total, qtd_registros)
+                SELECT
+                    trimestre_referencia,
+                    LEFT(cd_conta_contabil, {SUMMARY_ACCOUNT_PREFIX_LENGTH}),
+                    reg_ans,
+                    SUM(vl_saldo_final),
+                    COUNT(*)
+                FROM {self._table}
+                WHERE trimestre_referencia = %s AND vl_saldo_final IS NOT NULL
+                GROUP BY trimestre_referencia, LEFT(cd_conta_contabil, {SUMMARY_ACCOUNT_PREFIX_LENGTH}), reg_ans
+            """, (reference_date,))
+            summary_rows = cursor.rowcount
+            conn.commit()
+            logger.info(
+                f"Refreshed expense summary for quarter {reference_date}: {summary_rows} rows "
+                f"in {time.time() - start_time:.2f}s"
+            )
+            return summary_rows
+
+        except Error as e:
+            logger.error(f"Database error refreshing expense summary for {reference_date}: {e}")
             if conn: conn.rollback()
-            raise RuntimeError(f"Failed to load {csv_path.name}") from err
+            raise RuntimeError(f"Failed to refresh expense summary for {reference_date}") from e
         finally:
             if cursor: cursor.close()
             if conn and conn.is_connected():
                 conn.close()
-                logger.debug("Connection returned to pool.")
+
+    def count_orphaned_statements(self) -> int:
+        """Counts the accounting rows whose reg_ans has no operator. MySQL allows no foreign key on a
+        partitioned table, so this check replaces the one the constraint used to make on every insert.
+
+        Returns:
+            int: Number of accounting rows without an operator
+        Raises:
+            RuntimeError: If the check fails
+        """
+        try:
+            with closing(self._conn_manager.get_connection()) as conn, closing(conn.cursor()) as cursor:
+                cursor.execute(f"""
+                    SELECT COUNT(*) FROM {self._table} a
+                    LEFT JOIN {self._operators_table} o ON o.Registro_ANS = a.reg_ans
+                    WHERE o.Registro_ANS IS NULL
+                """)
+                return int(cursor.fetchone()[0])
+        except Error as e:
+            logger.error(f"Database error checking '{self._table}' for rows without an operator: {e}")
+            raise RuntimeError("Failed to check accounting rows against operators") from e
 
     def _log_load_data_warnings(self, cursor, table_name: str):
         """Logs MySQL warnings when LOAD DATA completes but affects 0 rows."""
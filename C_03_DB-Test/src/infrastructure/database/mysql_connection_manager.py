@@ -1,17 +1,106 @@
 import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, InterfaceError, OperationalError, PoolError, errorcode
 
 logger = logging.getLogger(__name__)
 
+# Session settings for LOAD DATA and other bulk writes (see bulk_session).
+# unique_checks=0 only relaxes secondary UNIQUE indexes; primary keys are still enforced.
+# The buffers help the INSERT ... SELECT copies and sorts around the loads; InnoDB's LOAD DATA gains
+# mostly from the skipped checks.
+BULK_SESSION_SETTINGS = {
+    'unique_checks': 0,
+    'foreign_key_checks': 0,
+    'bulk_insert_buffer_size': 256 * 1024 * 1024,
+    'sort_buffer_size': 64 * 1024 * 1024,
+    'read_buffer_size': 8 * 1024 * 1024,
+}
+
+# Server gone away / lost connection: the pooled connection is stale, so another one is tried
+STALE_CONNECTION_ERRNOS = (errorcode.CR_SERVER_GONE_ERROR, errorcode.CR_SERVER_LOST)
+
+# Snapshot of the pool's usage since it was created (see MySQLConnectionManager.metrics)
+@dataclass(frozen=True)
+class PoolMetrics:
+    pool_size: int                # Connections in the pool
+    in_use: int                   # Connections checked out right now
+    peak_in_use: int              # Most connections ever checked out at once
+    checkouts: int                # Successful get_connection calls
+    failed_checkouts: int         # Timed out or failed get_connection calls
+    checkouts_per_second: float   # Successful checkouts per second of pool lifetime
+    avg_wait_ms: float            # Mean time get_connection waited for a free connection
+    max_wait_ms: float            # Longest such wait
+    avg_hold_ms: float            # Mean time a connection stayed checked out
+
+class _PooledConnection:
+    """Checked-out connection that gives its pool slot back (once) when closed.
+    Everything else is delegated to the connector's pooled connection."""
+
+    def __init__(self, manager: 'MySQLConnectionManager', conn):
+        self._manager = manager
+        self._conn = conn
+        self._checked_out_at = time.perf_counter()
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._manager._release(self._conn, time.perf_counter() - self._checked_out_at)
+
 class MySQLConnectionManager:
-    """Manages a pool of MySQL database connections for efficient reuse."""
+    """Manages a pool of MySQL database connections for efficient reuse.
+
+    Checkouts wait up to `checkout_timeout` seconds for a free connection instead of failing
+    as soon as all are in use. The connector pings each connection it hands out and reconnects
+    stale ones; a connection that cannot be reconnected (or whose server went away) is retried once. metrics() reports
+    waits, peak usage and failures for sizing DB_POOL_SIZE.
+    """
     
-    def __init__(self, db_config: dict, pool_size: int = 2):
+    def __init__(
+        self,
+        db_config: dict,
+        pool_size: int = 2,
+        bulk_session: bool = True,
+        skip_binlog: bool = False,
+        checkout_timeout: float = 30.0,
+    ):
         """Initialize connection pool with given configuration.
+
+        bulk_session=False makes bulk_session() hand out connections with the server's defaults.
+        skip_binlog=True also sets sql_log_bin=0 in bulk sessions (needs SYSTEM_VARIABLES_ADMIN or
+        SUPER; bulk-loaded rows then never reach replicas or point-in-time recovery).
         """
         self._config = db_config
         self._pool = None  # Will hold the connection pool
+        self._pool_size = pool_size
+        self._checkout_timeout = checkout_timeout
+        self._slots = threading.BoundedSemaphore(pool_size)  # One per pooled connection
+        self._closed = False
+        self._close_lock = threading.Lock()  # Orders releases against close_pool()
+        # Usage counters, guarded by _metrics_lock
+        self._metrics_lock = threading.Lock()
+        self._created_at = time.perf_counter()
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._checkouts = 0
+        self._failed_checkouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._releases = 0
+        self._total_hold = 0.0
+        self._bulk_settings: Dict[str, object] = dict(BULK_SESSION_SETTINGS) if bulk_session else {}
+        if bulk_session and skip_binlog:
+            self._bulk_settings['sql_log_bin'] = 0
         
         try:
             # Prepare pool configuration with defaults
@@ -43,20 +132,189 @@ class MySQLConnectionManager:
             raise  # Re-raise for caller to handle
 
     def get_connection(self) -> mysql.connector.connection.MySQLConnection:
-        """Get a connection from the pool.
+        """Get a connection from the pool, waiting up to checkout_timeout seconds for a free one.
+
+        Raises:
+            ConnectionError: If the pool is closed, no connection frees up in time, or connecting fails
         """
-        if not self._pool:
+        if not self._pool or self._closed:
             logger.error("Connection pool not available")
             raise ConnectionError("MySQL connection pool not initialized")
-            
+
+        start_time = time.perf_counter()
+        if not self._slots.acquire(timeout=self._checkout_timeout):
+            self._record_failure()
+            logger.error(f"No pooled connection freed up within {self._checkout_timeout}s (all {self._pool_size} in use)")
+            raise ConnectionError(
+                f"Timed out after {self._checkout_timeout}s waiting for one of {self._pool_size} pooled connections"
+            )
         try:
-            conn = self._pool.get_connection()
-            logger.debug("Acquired connection from pool")
-            return conn
+            try:
+                conn = self._pool.get_connection()
+            except (InterfaceError, OperationalError) as e:
+                if isinstance(e, OperationalError) and e.errno not in STALE_CONNECTION_ERRNOS:
+                    raise
+                # A stale connection failed to reconnect and went back to the pool; try once more
+                logger.warning(f"Discarding stale pooled connection: {e}")
+                conn = self._pool.get_connection()
         except Error as e:
+            self._slots.release()
+            self._record_failure()
             logger.error(f"Failed to get connection: {e}")
             raise ConnectionError(f"Connection pool error: {e}") from e
 
-    def close_pool(self):
-        logger.warning("Closing connection pool (not normally required)")
-        # Note: The pool will automatically clean up when garbage collected
\ No newline at end of file
+        wait = time.perf_counter() - start_time
+        with self._metrics_lock:
+            self._checkouts += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        logger.debug(f"Acquired connection from pool after {wait * 1000:.1f}ms")
+        return _PooledConnection(self, conn)
+
+    def _record_failure(self) -> None:
+        with self._metrics_lock:
+            self._failed_checkouts += 1
+
+    def _release(self, conn, held: float) -> None:
+        """Called by a closed _PooledConnection: returns the connection to the pool and frees its slot.
+        Once the pool is closed the connection is disconnected instead."""
+        try:
+            with self._close_lock:
+                if self._closed:
+                    conn.disconnect()
+                else:
+                    conn.close()  # Back into the connector's pool (session reset)
+        finally:
+            with self._metrics_lock:
+                self._in_use -= 1
+                self._releases += 1
+                self._total_hold += held
+            self._slots.release()
+
+    def metrics(self) -> PoolMetrics:
+        """Usage of the pool since it was created"""
+        with self._metrics_lock:
+            lifetime = time.perf_counter() - self._created_at
+            return PoolMetrics(
+                pool_size=self._pool_size,
+                in_use=self._in_use,
+                peak_in_use=self._peak_in_use,
+                checkouts=self._checkouts,
+                failed_checkouts=self._failed_checkouts,
+                checkouts_per_second=round(self._checkouts / lifetime, 2) if lifetime > 0 else 0.0,
+                avg_wait_ms=round(self._total_wait / self._checkouts * 1000, 2) if self._checkouts else 0.0,
+                max_wait_ms=round(self._max_wait * 1000, 2),
+                avg_hold_ms=round(self._total_hold / self._releases * 1000, 2) if self._releases else 0.0,
+            )
+
+    def log_metrics(self) -> PoolMetrics:
+        """Logs the pool metrics with a sizing hint for DB_POOL_SIZE and returns them"""
+        metrics = self.metrics()
+        logger.info(
+            f"Connection pool: {metrics.checkouts} checkouts ({metrics.checkouts_per_second}/s), "
+            f"{metrics.failed_checkouts} failed, peak {metrics.peak_in_use}/{metrics.pool_size} in use, "
+            f"wait avg {metrics.avg_wait_ms}ms max {metrics.max_wait_ms}ms, hold avg {metrics.avg_hold_ms}ms"
+        )
+        if metrics.failed_checkouts or metrics.max_wait_ms > 1000:
+            logger.warning("Connections were scarce: consider a larger DB_POOL_SIZE")
+        elif metrics.checkouts and metrics.peak_in_use < metrics.pool_size:
+            logger.info(f"At most {metrics.peak_in_use} connections were used; DB_POOL_SIZE could be lowered")
+        return metrics
+
+    @contextmanager
+    def bulk_session(self, settings: Optional[Dict[str, object]] = None) -> Iterator[mysql.connector.connection.MySQLConnection]:
+        """Pooled connection with session variables tuned for bulk loads (BULK_SESSION_SETTINGS by default).
+
+        The original values are read first and restored before the connection goes back to the
+        pool, also when the block raises; uncommitted work is rolled back in that case. A
+        variable the server refuses (e.g. sql_log_bin without the privilege) is left unchanged.
+
+            with conn_manager.bulk_session() as conn, closing(conn.cursor()) as cursor:
+                cursor.execute("LOAD DATA ...")
+                conn.commit()
+        """
+        settings = self._bulk_settings if settings is None else settings
+        conn = self.get_connection()
+        original: Dict[str, object] = {}
+        try:
+            if settings:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute("SELECT " + ", ".join(f"@@SESSION.{name}" for name in settings))
+                    current = dict(zip(settings, cursor.fetchone()))
+                    for name, value in settings.items():
+                        try:
+                            cursor.execute(f"SET SESSION {name} = %s", (value,))
+                            original[name] = current[name]
+                        except Error as e:
+                            logger.info(f"Bulk session: {name} left at {current[name]} ({e})")
+                finally:
+                    cursor.close()
+            yield conn
+        except BaseException:
+            try:
+                conn.rollback()
+            except Error as rollback_err:
+                logger.error(f"Rollback failed in bulk session: {rollback_err}")
+            raise
+        finally:
+            try:
+                self._restore_session(conn, original)
+            finally:
+                conn.close()
+
+    def _restore_session(self, conn, original: Dict[str, object]) -> None:
+        if not original:
+            return
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            for name, value in reversed(list(original.items())):
+                cursor.execute(f"SET SESSION {name} = %s", (value,))
+            logger.debug(f"Bulk session settings restored: {original}")
+        except Error as e:
+            # Never hand a connection with checks disabled back to the pool
+            logger.error(f"Failed to restore session settings {original}: {e}; resetting the session")
+            try:
+                conn.reset_session()
+            except Error as reset_err:
+                logger.error(f"Session reset failed: {reset_err}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def _disconnect_idle_connections(self) -> int:
+        """Takes every idle connection out of the connector's pool and disconnects it.
+        MySQLConnectionPool has no public way to close its connections, so they are checked out
+        until the pool reports it is exhausted; at most pool_size attempts are made, because a
+        connection that fails to reconnect goes back into the pool."""
+        disconnected = 0
+        for _ in range(self._pool_size):
+            try:
+                conn = self._pool.get_connection()
+            except PoolError:
+                break  # No idle connection left
+            except Error:
+                continue  # Stale and could not reconnect: already disconnected
+            try:
+                conn.disconnect()
+                disconnected += 1
+            except Error as e:
+                logger.debug(f"Disconnecting an idle connection failed: {e}")
+        return disconnected
+
+    def close_pool(self) -> None:
+        """Disconnects the idle connections and refuses new checkouts.
+        Connections still checked out are disconnected when they are closed."""
+        if not self._pool or self._closed:
+            return
+        with self._close_lock:
+            self._closed = True
+            closed = self._disconnect_idle_connections()
+        in_use = self.metrics().in_use
+        logger.info(
+            f"Connection pool closed: {closed} idle connections disconnected"
+            + (f", {in_use} still in use will be disconnected when released" if in_use else "")
+        )
\ No newline at end of file
@@ -0,0 +1,116 @@
+import json
+import logging
+from datetime import date
+from pathlib import Path
+from mysql.connector import Error
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+from src.infrastructure.filesystem import FileTap
+from .csv_auditor import CsvAuditor, SourceProfile
+if TYPE_CHECKING:
+    from .mysql_connection_manager import MySQLConnectionManager
+
+logger = logging.getLogger(__name__)
+
+class MySqlLoadAuditRepository:
+    """Records one `load_audit` row per loaded file: the source profile taken while the file was
+    streamed to LOAD DATA next to what the server reported (rows inserted, warnings), so a short
+    or lossy load is flagged without counting the table afterwards."""
+
+    def __init__(self, connection_manager: 'MySQLConnectionManager'):
+        self._conn_manager = connection_manager
+
+    def audit_load(
+        self,
+        table_name: str,
+        csv_path: Path,
+        source_name: str,
+        reference_date: Optional[date],
+        load: Callable[[Path, Callable[[], None]], Tuple[int, int]],
+        verify_source: Optional[Callable[[], None]] = None,
+    ) -> int:
+        """Runs `load(path, verify)` on `csv_path` tapped through a CsvAuditor, then records the audit.
+
+        `load` performs the LOAD DATA from `path`, calls verify() before committing and returns
+        (rows inserted, LOAD DATA warning count). verify() also runs `verify_source`. A failed audit
+        write is logged but does not fail the load, which is already committed.
+
+        Returns:
+            int: Number of rows inserted
+        """
+        auditor = CsvAuditor()
+        tap = FileTap(csv_path, observer=auditor.feed)
+
+        def verify() -> None:
+            tap.raise_if_failed()
+            if verify_source:
+                verify_source()
+
+        with tap as tapped_path:
+            loaded_rows, warning_count = load(tapped_path, verify)
+        try:
+            self.record(table_name, source_name, reference_date, auditor.profile(), loaded_rows, warning_count)
+        except RuntimeError:
+            pass  # Logged by record()
+        return loaded_rows
+
+    @staticmethod
+    def find_discrepancy(profile: SourceProfile, loaded_rows: int, warning_count: int) -> Optional[str]:
+        """Describes why the server-side numbers disagree with the source, or None if they agree"""
+        problems = []
+        if loaded_rows != profile.rows:
+            problems.append(f"source has {profile.rows} rows, LOAD DATA inserted {loaded_rows}")
+        if warning_count:
+            problems.append(f"LOAD DATA reported {warning_count} warnings")
+        return "; ".join(problems) or None
+
+    def record(
+        self,
+        table_name: str,
+        source_name: str,
+        reference_date: Optional[date],
+        profile: SourceProfile,
+        loaded_rows: int,
+        warning_count: int,
+    ) -> Optional[str]:
+        """Stores the audit row and logs a warning on a discrepancy.
+        Returns the discrepancy (None if the load matches its source).
+
+        Raises:
+            RuntimeError: If the row cannot be written
+        """
+        discrepancy = self.find_discrepancy(profile, loaded_rows, warning_count)
+        if discrepancy:
+            logger.warning(f"Load audit of {table_name} ({source_name}): {discrepancy}")
+        else:
+            logger.info(f"Load audit of {table_name} ({source_name}): {loaded_rows} rows match the source")
+
+        conn = None
+        cursor = None
+        try:
+            conn = self._conn_manager.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO load_audit (
+                    table_name, source_name, trimestre_referencia, source_rows, source_bytes,
+                    loaded_rows, warning_count, column_checksums, discrepancy, loaded_at
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
+                """,
+                (
+                    table_name, source_name[:500], reference_date, profile.rows, profile.bytes,
+                    loaded_rows, warning_count, json.dumps(profile.column_checksums),
+                    discrepancy[:500] if discrepancy else None,
+                )
+            )
+            conn.commit()
+            return discrepancy
+        except Error as e:
+            logger.error(f"Database error recording load audit of {source_name}: {e}")
+            if conn: conn.rollback()
+            raise RuntimeError(f"Failed to record load audit of {source_name}") from e
+        finally:
+            if cursor: cursor.close()
+            if conn and conn.is_connected():
+                conn.close()
@@ -0,0 +1,81 @@
+import logging
+from datetime import date
+from mysql.connector import Error
+from typing import TYPE_CHECKING, Dict
+
+from src.application.ports.load_state_repository import LoadStateRepository
+if TYPE_CHECKING:
+    from .mysql_connection_manager import MySQLConnectionManager
+
+logger = logging.getLogger(__name__)
+
+class MySqlLoadStateRepository(LoadStateRepository):
+    """MySQL implementation of LoadStateRepository backed by the `load_state` table."""
+
+    def __init__(self, connection_manager: 'MySQLConnectionManager'):
+        self._conn_manager = connection_manager
+
+    def _execute(self, sql: str, params: tuple, action: str) -> None:
+        """Runs one write statement on a pooled connection and commits it."""
+        conn = None
+        cursor = None
+        try:
+            conn = self._conn_manager.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            conn.commit()
+        except Error as e:
+            logger.error(f"Database error while trying to {action}: {e}")
+            if conn: conn.rollback()
+            raise RuntimeError(f"Failed to {action}") from e
+        finally:
+            if cursor: cursor.close()
+            if conn and conn.is_connected():
+                conn.close()
+
+    def get_loaded_quarters(self) -> Dict[date, str]:
+        """Returns {trimestre_referencia: source_hash} for every recorded quarter."""
+        conn = None
+        cursor = None
+        try:
+            conn = self._conn_manager.get_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT trimestre_referencia, source_hash FROM load_state")
+            loaded = {reference_date: source_hash for reference_date, source_hash in cursor.fetchall()}
+            logger.info(f"Load state: {len(loaded)} quarters already loaded")
+            return loaded
+        except Error as e:
+            logger.error(f"Database error reading load state: {e}")
+            raise RuntimeError("Failed to read load state") from e
+        finally:
+            if cursor: cursor.close()
+            if conn and conn.is_connected():
+                conn.close()
+
+    def forget_quarter(self, reference_date: date) -> None:
+        self._execute(
+            "DELETE FROM load_state WHERE trimestre_referencia = %s",
+            (reference_date,),
+            f"forget load state of {reference_date}"
+        )
+
+    def mark_loaded(self, reference_date: date, source_files: str, source_hash: str, row_count: int) -> None:
+        self._execute(
+            """
+            INSERT INTO load_state (trimestre_referencia, source_files, source_hash, row_count, loaded_at)
+            VALUES (%s, %s, %s, %s, NOW())
+            ON DUPLICATE KEY UPDATE
+                source_files = VALUES(source_files),
+                source_hash = VALUES(source_hash),
+                row_count = VALUES(row_count),
+                loaded_at = VALUES(loaded_at)
+            """,
+            (reference_date, source_files[:500], source_hash, row_count),
+            f"record load state of {reference_date}"
+        )
+        logger.debug(f"Recorded quarter {reference_date} as loaded ({row_count} rows)")
+
+    def clear_all(self) -> None:
+        """Empties the load state (the accounting table is being reloaded from scratch)."""
+        logger.warning("Clearing 'load_state' table.")
+        self._execute("DELETE FROM load_state", (), "clear load state")
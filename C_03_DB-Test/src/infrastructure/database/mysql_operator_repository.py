@@ -1,21 +1,45 @@
 import logging
 import time
+import uuid
+from contextlib import closing
 from pathlib import Path
 from mysql.connector import Error
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
 
 from src.application.ports.operator_repository import OperatorRepository
 if TYPE_CHECKING:
     from .mysql_connection_manager import MySQLConnectionManager
+    from .csv_prenormalizer import CsvPreNormalizer
+    from .mysql_load_audit_repository import MySqlLoadAuditRepository
 
 logger = logging.getLogger(__name__)
 MYSQL_CSV_ENCODING = 'utf8mb4'  # Supports full Unicode including emojis
+OPERATORS_STAGE_PREFIX = 'operators_stage'  # Upsert mode loads the CSV into operators_stage_<random>, then merges it
+# Data columns compared and copied by the upsert (everything but the key and row_hash)
+OPERATOR_DATA_COLUMNS = [
+    'CNPJ', 'Razao_Social', 'Nome_Fantasia', 'Modalidade', 'Logradouro', 'Numero', 'Complemento',
+    'Bairro', 'Cidade', 'UF', 'CEP', 'DDD', 'Telefone', 'Fax', 'Endereco_eletronico', 'Representante',
+    'Cargo_Representante', 'Regiao_de_Comercializacao', 'Data_Registro_ANS',
+]
+# MD5 of the data columns; CHAR(0) stands for NULL so NULL and '' hash differently
+OPERATOR_ROW_HASH_SQL = "MD5(CONCAT_WS(CHAR(31), " + ", ".join(
+    f"IFNULL({column}, CHAR(0))" for column in OPERATOR_DATA_COLUMNS
+) + "))"
 
 class MySqlOperatorRepository(OperatorRepository):
     """MySQL implementation for bulk loading operator/healthcare provider data."""
     
-    def __init__(self, connection_manager: 'MySQLConnectionManager'):
+    def __init__(
+        self,
+        connection_manager: 'MySQLConnectionManager',
+        normalizer: Optional['CsvPreNormalizer'] = None,  # Cleans the CSV in a worker process before LOAD DATA
+        audit_repo: Optional['MySqlLoadAuditRepository'] = None,  # Profiles the CSV as it streams, records load_audit
+    ):
         self._conn_manager = connection_manager
+        self._normalizer = normalizer
+        self._audit_repo = audit_repo
+        self._table = 'operators'  # Table written by loads; see set_table_suffix()
+        self._accounting_table = 'accounting'  # Still referencing operators the upsert must not delete
         
         # SQL template for LOAD DATA command with:
         # - Special handling for Brazilian ANS registry data
@@ -23,7 +47,7 @@ class MySqlOperatorRepository(OperatorRepository):
         # - Proper date parsing for registration dates
         self._load_sql = """
             LOAD DATA LOCAL INFILE '{csv_path}'
-            INTO TABLE operators
+            INTO TABLE {table_name}
             CHARACTER SET {encoding}
             FIELDS TERMINATED BY ';'
             OPTIONALLY ENCLOSED BY '"'
@@ -51,87 +75,210 @@ class MySqlOperatorRepository(OperatorRepository):
                                     STR_TO_DATE(TRIM(@Data_Registro_ANS), '%Y-%m-%d')
                                   );
         """
+        if normalizer is not None:
+            # Pre-normalized files (see csv_prenormalizer) already hold the final column values
+            self._load_sql = """
+                LOAD DATA LOCAL INFILE '{csv_path}'
+                INTO TABLE {table_name}
+                CHARACTER SET {encoding}
+                FIELDS TERMINATED BY ','
+                OPTIONALLY ENCLOSED BY '"'
+                LINES TERMINATED BY '\\n'
+                IGNORE 1 ROWS
+                (
+                    Registro_ANS, CNPJ, Razao_Social, Nome_Fantasia, Modalidade,
+                    Logradouro, Numero, Complemento, Bairro, Cidade, UF, CEP,
+                    DDD, Telefone, Fax, Endereco_eletronico, Representante,
+                    Cargo_Representante, Regiao_de_Comercializacao, Data_Registro_ANS
+                );
+            """
+
+    def set_table_suffix(self, suffix: str = '') -> None:
+        """Points every write at `operators{suffix}` (the shadow copy of a blue/green reload), and the
+        upsert's reference check at `accounting{suffix}`; '' goes back to the live tables."""
+        self._table = f'operators{suffix}'
+        self._accounting_table = f'accounting{suffix}'
 
     def clear_all(self) -> None:
         """Truncates the operators table, temporarily disabling foreign key checks."""
-        logger.warning("Clearing 'operators' table (all data will be lost)")
-        conn = None
-        cursor = None
-        fk_check_original_value = 1  # Default MySQL FK check state
-
+        logger.warning(f"Clearing '{self._table}' table (all data will be lost)")
         try:
-            conn = self._conn_manager.get_connection()
-            cursor = conn.cursor()
-
-            # Disable FK checks to allow TRUNCATE even with referential constraints
-            logger.debug("Temporarily disabling foreign key checks")
-            cursor.execute("SET SESSION foreign_key_checks = 0;")
-
-            cursor.execute("TRUNCATE TABLE operators;")
-            conn.commit()
+            # FK checks off to allow TRUNCATE even with referential constraints; restored to the original value
+            with self._conn_manager.bulk_session({'foreign_key_checks': 0}) as conn, closing(conn.cursor()) as cursor:
+                cursor.execute(f"TRUNCATE TABLE {self._table};")
+                conn.commit()
             logger.info("Successfully cleared operators table")
 
         except Error as e:
             logger.error(f"Database error clearing operators: {e}")
-            if conn: conn.rollback()
             raise RuntimeError("Failed to clear operators table") from e
-        finally:
-            # Critical: Always restore FK checks and clean up resources
-            if cursor:
-                try:
-                    logger.debug(f"Restoring foreign key checks to {fk_check_original_value}")
-                    cursor.execute(f"SET SESSION foreign_key_checks = {fk_check_original_value};")
-                    conn.commit()
-                except Error as fk_err:
-                    logger.error(f"Failed to restore FK checks: {fk_err}")
-                finally:
-                    cursor.close()
-            if conn and conn.is_connected():
-                conn.close()
-                logger.debug("Connection returned to pool")
 
     def load_from_csv(self, csv_path: Path) -> int:
         """Bulk loads operator data from CSV using MySQL's optimized LOAD DATA.
         """
-        logger.info(f"Loading operators from: {csv_path.name}")
-        start_time = time.time()
-        
-        # Prepare path with proper escaping for MySQL
-        abs_csv_path = csv_path.resolve()
-        escaped_csv_path = str(abs_csv_path).replace('\\', '\\\\')
+        return self._load(csv_path, self._table)
+
+    def upsert_from_csv(self, csv_path: Path) -> int:
+        """Brings `operators` in line with the CSV without truncating it.
 
-        formatted_sql = self._load_sql.format(
-            csv_path=escaped_csv_path,
-            encoding=MYSQL_CSV_ENCODING
-        )
+        The CSV is loaded into a staging table of its own (operators_stage_<random>); rows that are
+        new or whose row hash changed are written with INSERT ... ON DUPLICATE KEY UPDATE, and
+        operators missing from the CSV are deleted, all in one transaction. Unchanged rows are not rewritten. Missing operators that
+        accounting rows still reference are kept (and counted in the log), so no row is orphaned.
+
+        Returns:
+            int: Number of operators in the CSV
+        Raises:
+            RuntimeError: If staging or merging fails, or the CSV holds no operators
+        """
+        # Unique per upsert, so concurrent runs (or a manual load) never drop each other's stage
+        stage = f"{OPERATORS_STAGE_PREFIX}_{uuid.uuid4().hex[:8]}"
+        try:
+            self._execute_ddl(f"CREATE TABLE {stage} LIKE {self._table}")
+        except Error as e:
+            logger.error(f"Database error creating {stage}: {e}")
+            raise RuntimeError("Failed to create the operators staging table") from e
+        try:
+            staged_rows = self._load(csv_path, stage)
+            if staged_rows <= 0:
+                # Never mistake an empty or unreadable file for "every operator vanished"
+                raise RuntimeError(f"No operators staged from {csv_path.name}; keeping the current operators")
+            self._merge_stage(stage)
+            return staged_rows
+        finally:
+            try:
+                self._execute_ddl(f"DROP TABLE IF EXISTS {stage}")
+            except Error as e:
+                logger.error(f"Could not drop {stage}: {e}")
 
+    def _execute_ddl(self, *statements: str) -> None:
         conn = None
         cursor = None
         try:
             conn = self._conn_manager.get_connection()
             cursor = conn.cursor()
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            if cursor: cursor.close()
+            if conn and conn.is_connected():
+                conn.close()
 
-            logger.info(f"Executing LOAD DATA for {csv_path.name}")
-            cursor.execute(formatted_sql)
-            affected_rows = cursor.rowcount
+    def _merge_stage(self, stage: str) -> None:
+        """Applies the staging table to operators in one transaction: changed and new rows, then deletions
+        of the operators missing from the stage that no accounting row references."""
+        start_time = time.time()
+        conn = None
+        cursor = None
+        try:
+            conn = self._conn_manager.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"UPDATE {stage} SET row_hash = {OPERATOR_ROW_HASH_SQL}")
+            changed_filter = f"""
+                FROM {stage} s
+                LEFT JOIN {self._table} o ON o.Registro_ANS = s.Registro_ANS
+                WHERE o.Registro_ANS IS NULL OR o.row_hash IS NULL OR o.row_hash <> s.row_hash
+            """
+            cursor.execute(f"SELECT COUNT(*), COUNT(*) - COUNT(o.Registro_ANS) {changed_filter}")
+            changed, new = (int(value) for value in cursor.fetchone())
+            if changed:
+                updated = [*OPERATOR_DATA_COLUMNS, 'row_hash']
+                columns = ['Registro_ANS', *updated]
+                # The derived table's alias names the incoming row (VALUES() is deprecated since MySQL 8.0.20)
+                cursor.execute(
+                    f"INSERT INTO {self._table} ({', '.join(columns)}) "
+                    f"SELECT * FROM (SELECT {', '.join(f's.{column}' for column in columns)} {changed_filter}) AS new "
+                    f"ON DUPLICATE KEY UPDATE {', '.join(f'{column} = new.{column}' for column in updated)}"
+                )
+            vanished_filter = f"""
+                FROM {self._table} o
+                LEFT JOIN {stage} s ON s.Registro_ANS = o.Registro_ANS
+                WHERE s.Registro_ANS IS NULL
+            """
+            # accounting has no foreign key (it is partitioned), so the history is checked here instead
+            cursor.execute(f"""
+                DELETE o {vanished_filter}
+                AND NOT EXISTS (SELECT 1 FROM {self._accounting_table} a WHERE a.reg_ans = o.Registro_ANS)
+            """)
+            deleted = cursor.rowcount
+            cursor.execute(f"SELECT COUNT(*) {vanished_filter}")
+            kept = int(cursor.fetchone()[0])
             conn.commit()
+            logger.info(
+                f"Operators upserted in {time.time() - start_time:.2f}s: {new} new, {changed - new} changed, "
+                f"{deleted} removed, the rest unchanged"
+            )
+            if kept:
+                logger.warning(f"Kept {kept} operators missing from the CSV: accounting rows still reference them")
+
+        except Error as e:
+            logger.error(f"Database error merging {stage} into {self._table}: {e}")
+            if conn: conn.rollback()
+            raise RuntimeError("Failed to upsert operators") from e
+        finally:
+            if cursor: cursor.close()
+            if conn and conn.is_connected():
+                conn.close()
+
+    def _load(self, csv_path: Path, table_name: str) -> int:
+        if self._audit_repo is not None:
+            return self._audit_repo.audit_load(
+                'operators', csv_path, csv_path.name, None,
+                lambda path, verify: self._load_file(path, verify, table_name)
+            )
+        return self._load_file(csv_path, table_name=table_name)[0]
 
-            logger.info(f"Loaded {affected_rows} rows in {time.time()-start_time:.2f}s")
-            
-            if affected_rows == 0:
-                self._log_load_data_warnings(cursor, "operators")
+    def _load_file(
+        self,
+        csv_path: Path,
+        verify_source: Optional[Callable[[], None]] = None,
+        table_name: Optional[str] = None
+    ) -> Tuple[int, int]:
+        """LOAD DATA of the operators file; returns (rows inserted, LOAD DATA warning count)."""
+        table_name = table_name or self._table
+        logger.info(f"Loading operators from: {csv_path.name}")
+        start_time = time.time()
+
+        normalized_path = None
+        try:
+            # Normalize before taking a pooled connection; the normalized copy is what LOAD DATA reads
+            normalized_path = self._normalizer.normalize_operators(csv_path) if self._normalizer else None
+            if normalized_path and verify_source:
+                verify_source()  # The normalizer consumed the stream
+
+            # Prepare path with proper escaping for MySQL
+            abs_csv_path = (normalized_path or csv_path).resolve()
+            escaped_csv_path = str(abs_csv_path).replace('\\', '\\\\')
+
+            formatted_sql = self._load_sql.format(
+                csv_path=escaped_csv_path,
+                table_name=table_name,
+                encoding=MYSQL_CSV_ENCODING
+            )
 
-            return affected_rows
+            # Bulk session: checks skipped and buffers raised; rolled back and restored if the load fails
+            with self._conn_manager.bulk_session() as conn, closing(conn.cursor()) as cursor:
+                logger.info(f"Executing LOAD DATA for {csv_path.name}")
+                cursor.execute(formatted_sql)
+                affected_rows = cursor.rowcount
+                warning_count = cursor.warning_count
+                if verify_source:
+                    verify_source()  # A stream that broke off must not be committed as a short file
+                conn.commit()
+
+                logger.info(f"Loaded {affected_rows} rows in {time.time()-start_time:.2f}s")
+
+                if affected_rows == 0:
+                    self._log_load_data_warnings(cursor, table_name)
+
+            return affected_rows, warning_count
 
         except Error as err:
             logger.error(f"Database error loading operators: {err}")
-            if conn: conn.rollback()
             raise RuntimeError(f"Failed to load {csv_path.name}") from err
         finally:
-            if cursor: cursor.close()
-            if conn and conn.is_connected():
-                conn.close()
-                logger.debug("Connection returned to pool")
+            if normalized_path:
+                normalized_path.unlink(missing_ok=True)
 
     def _log_load_data_warnings(self, cursor, table_name: str):
         """Logs MySQL warnings when LOAD DATA completes with issues."""
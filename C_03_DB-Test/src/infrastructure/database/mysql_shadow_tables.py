@@ -0,0 +1,140 @@
+import logging
+import time
+from mysql.connector import Error
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from src.application.ports.shadow_tables import ShadowTables
+if TYPE_CHECKING:
+    from .mysql_connection_manager import MySQLConnectionManager
+    from .mysql_operator_repository import MySqlOperatorRepository
+    from .mysql_accounting_repository import MySqlAccountingRepository
+
+logger = logging.getLogger(__name__)
+
+SHADOW_SUFFIX = '_new'   # operators_new, accounting_new, ... receive the reload
+RETIRED_SUFFIX = '_old'  # The replaced live tables, dropped right after the swap
+# Tables replaced together; the summary is derived from accounting, so it moves with it
+SWAPPED_TABLES = ('operators', 'accounting', 'accounting_expense_summary')
+VALIDATED_TABLES = ('operators', 'accounting')  # Loaded from the source files, so checked before the swap
+
+class MySqlShadowTables(ShadowTables):
+    """Blue/green reloads on MySQL: the repositories load into `<table>_new` copies created LIKE
+    the live tables (same indexes and partitions), and one RENAME TABLE statement swaps all of
+    them in. RENAME TABLE is atomic across tables, so readers see either the old data or the new
+    data, never empty or half-loaded tables; it only waits for queries already running on them."""
+
+    def __init__(
+        self,
+        connection_manager: 'MySQLConnectionManager',
+        operator_repo: 'MySqlOperatorRepository',
+        accounting_repo: 'MySqlAccountingRepository',
+        min_row_ratio: float = 0.5,  # A shadow table smaller than this fraction of the live one is not published
+    ):
+        self._conn_manager = connection_manager
+        self._repositories = (operator_repo, accounting_repo)
+        self._min_row_ratio = min_row_ratio
+
+    def _execute(self, statements: List[str], action: str) -> None:
+        """Runs DDL statements (each commits implicitly) on a pooled connection."""
+        conn = None
+        cursor = None
+        try:
+            conn = self._conn_manager.get_connection()
+            cursor = conn.cursor()
+            for statement in statements:
+                cursor.execute(statement)
+        except Error as e:
+            logger.error(f"Database error while trying to {action}: {e}")
+            raise RuntimeError(f"Failed to {action}") from e
+        finally:
+            if cursor: cursor.close()
+            if conn and conn.is_connected():
+                conn.close()
+
+    def _redirect_writes(self, suffix: str) -> None:
+        for repository in self._repositories:
+            repository.set_table_suffix(suffix)
+
+    def begin(self) -> None:
+        """Creates empty `<table>_new` copies (dropping leftovers of an interrupted reload) and
+        points the repositories at them."""
+        leftovers = [table + suffix for table in SWAPPED_TABLES for suffix in (SHADOW_SUFFIX, RETIRED_SUFFIX)]
+        statements = [f"DROP TABLE IF EXISTS {', '.join(leftovers)}"]
+        statements += [f"CREATE TABLE {table}{SHADOW_SUFFIX} LIKE {table}" for table in SWAPPED_TABLES]
+        self._execute(statements, "create the shadow tables")
+        self._redirect_writes(SHADOW_SUFFIX)
+        logger.info(f"Loading into shadow tables: {', '.join(table + SHADOW_SUFFIX for table in SWAPPED_TABLES)}")
+
+    def _row_counts(self) -> Dict[str, Tuple[int, int]]:
+        """{table: (live rows, shadow rows)} of the validated tables."""
+        conn = None
+        cursor = None
+        try:
+            conn = self._conn_manager.get_connection()
+            cursor = conn.cursor()
+            counts = {}
+            for table in VALIDATED_TABLES:
+                cursor.execute(f"SELECT (SELECT COUNT(*) FROM {table}), (SELECT COUNT(*) FROM {table}{SHADOW_SUFFIX})")
+                live_rows, shadow_rows = cursor.fetchone()
+                counts[table] = (int(live_rows), int(shadow_rows))
+            return counts
+        except Error as e:
+            logger.error(f"Database error counting the shadow tables: {e}")
+            raise RuntimeError("Failed to validate the shadow tables") from e
+        finally:
+            if cursor: cursor.close()
+            if conn and conn.is_connected():
+                conn.close()
+
+    @staticmethod
+    def find_problem(row_counts: Dict[str, Tuple[int, int]], min_row_ratio: float) -> Optional[str]:
+        """Describes why the shadow tables must not replace the live ones, or None if they may"""
+        problems = []
+        for table, (live_rows, shadow_rows) in row_counts.items():
+            if shadow_rows == 0:
+                problems.append(f"{table}{SHADOW_SUFFIX} is empty")
+            elif shadow_rows < live_rows * min_row_ratio:
+                problems.append(
+                    f"{table}{SHADOW_SUFFIX} has {shadow_rows} rows, under {min_row_ratio:.0%} of the {live_rows} live rows"
+                )
+        return "; ".join(problems) or None
+
+    def publish(self) -> None:
+        """Checks that every validated shadow table holds data and is not much smaller than the
+        live table, then swaps all shadow tables in with one RENAME TABLE and drops the old ones.
+
+        Raises:
+            RuntimeError: If validation or the swap fails (the live tables are left as they were)
+        """
+        row_counts = self._row_counts()
+        problem = self.find_problem(row_counts, self._min_row_ratio)
+        if problem:
+            logger.error(f"Shadow tables not published: {problem}")
+            raise RuntimeError(f"Shadow tables failed validation: {problem}")
+
+        start_time = time.time()
+        renames = []
+        for table in SWAPPED_TABLES:
+            renames += [f"{table} TO {table}{RETIRED_SUFFIX}", f"{table}{SHADOW_SUFFIX} TO {table}"]
+        self._execute([f"RENAME TABLE {', '.join(renames)}"], "swap in the shadow tables")
+        self._redirect_writes('')
+        logger.info(
+            f"Published shadow tables in {time.time() - start_time:.2f}s: "
+            + ", ".join(f"{table} {live} -> {shadow} rows" for table, (live, shadow) in row_counts.items())
+        )
+        try:
+            self._execute(
+                [f"DROP TABLE {', '.join(table + RETIRED_SUFFIX for table in SWAPPED_TABLES)}"],
+                "drop the replaced tables"
+            )
+        except RuntimeError:
+            pass  # Logged by _execute(); the next begin() drops them
+
+    def discard(self) -> None:
+        """Drops the shadow tables; the live tables were never touched."""
+        self._redirect_writes('')
+        self._execute(
+            [f"DROP TABLE IF EXISTS {', '.join(table + SHADOW_SUFFIX for table in SWAPPED_TABLES)}"],
+            "drop the shadow tables"
+        )
+        logger.warning("Discarded the shadow tables; the live tables keep the previous data")
@@ -1,3 +1,5 @@
 from .os_file_system import OsFileSystem
+from .json_download_manifest import JsonDownloadManifest
+from .fifo_stream import FileTap
 
-__all__ = ["OsFileSystem"]
\ No newline at end of file
+__all__ = ["OsFileSystem", "JsonDownloadManifest", "FileTap"]
\ No newline at end of file
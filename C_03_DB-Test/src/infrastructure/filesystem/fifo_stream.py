@@ -0,0 +1,170 @@
+import errno
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable, ContextManager, Optional
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 1024 * 1024  # Bytes read and written per write() call
+
+class FifoStream:
+    """Exposes a byte source as a readable path, fed through a named pipe (FIFO).
+
+    A writer thread copies the source into the FIFO while the reader (LOAD DATA LOCAL INFILE,
+    the pre-normalizer) consumes it; `observer`, if given, sees every chunk on the way. Where
+    os.mkfifo is unavailable the source is copied to a temporary file instead. Either way the
+    temporary directory is removed on exit. Readers must call raise_if_failed() before
+    committing what they read: a source error ends the stream early, which looks like a short file.
+    Subclasses implement _open_source() and _describe().
+    """
+
+    _temp_prefix = 'fifo_stream'  # Name prefix of the temporary directory holding the FIFO
+
+    def __init__(
+        self,
+        file_name: str,
+        work_dir: Optional[Path] = None,
+        use_fifo: Optional[bool] = None,
+        observer: Optional[Callable[[bytes], None]] = None,
+    ):
+        self._file_name = file_name
+        self._work_dir = work_dir
+        self._use_fifo = hasattr(os, 'mkfifo') if use_fifo is None else use_fifo
+        self._observer = observer
+        self._temp_dir: Optional[Path] = None
+        self._path: Optional[Path] = None
+        self._writer: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self.streamed_bytes = 0
+
+    def _open_source(self) -> ContextManager[BinaryIO]:
+        """Opens the source for sequential binary reads"""
+        raise NotImplementedError
+
+    def _describe(self) -> str:
+        raise NotImplementedError
+
+    def __enter__(self) -> Path:
+        if self._work_dir is not None:
+            self._work_dir.mkdir(parents=True, exist_ok=True)
+        self._temp_dir = Path(tempfile.mkdtemp(prefix=f'{self._temp_prefix}_', dir=self._work_dir))
+        # Keep the source's file name: readers infer the format from the extension
+        self._path = self._temp_dir / self._file_name
+        try:
+            if self._use_fifo:
+                os.mkfifo(self._path, 0o600)
+                self._writer = threading.Thread(
+                    target=self._write_to_fifo, name=f'fifo-stream-{self._path.name}', daemon=True
+                )
+                self._writer.start()
+            else:
+                self._path = self._materialize(self._path)
+        except Exception as e:
+            self._cleanup()
+            raise RuntimeError(f"Failed to stream {self._describe()}") from e
+        return self._path
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self._stop.set()  # Releases a writer still waiting for a reader that never came
+        if self._writer is not None:
+            self._writer.join()
+        self._cleanup()
+
+    def raise_if_failed(self) -> None:
+        """Raises RuntimeError if the source could not be streamed completely"""
+        if self._writer is not None:
+            self._writer.join()  # The reader saw EOF, so the writer is finishing
+        if self._error is not None:
+            raise RuntimeError(f"Streaming {self._describe()} failed: {self._error}") from self._error
+
+    def _copy(self, source: BinaryIO, target: BinaryIO) -> None:
+        while chunk := source.read(STREAM_CHUNK_SIZE):
+            target.write(chunk)
+            self.streamed_bytes += len(chunk)
+            if self._observer is not None:
+                self._observer(chunk)
+
+    def _materialize(self, target_path: Path) -> Path:
+        """Fallback without named pipes: copies the source to `target_path` and returns the path to read"""
+        with self._open_source() as source, open(target_path, 'wb') as target:
+            self._copy(source, target)
+        return target_path
+
+    def _open_fifo_for_writing(self) -> Optional[int]:
+        """Waits for a reader without blocking forever: returns None if the stream is closed first"""
+        while not self._stop.is_set():
+            try:
+                fd = os.open(self._path, os.O_WRONLY | os.O_NONBLOCK)
+            except OSError as e:
+                if e.errno != errno.ENXIO:  # ENXIO: no reader yet
+                    raise
+                self._stop.wait(0.01)
+                continue
+            os.set_blocking(fd, True)
+            return fd
+        return None
+
+    def _write_to_fifo(self) -> None:
+        start_time = time.perf_counter()
+        try:
+            fd = self._open_fifo_for_writing()
+            if fd is None:
+                return
+            # Closing the FIFO (even after an error) gives the reader EOF
+            with os.fdopen(fd, 'wb') as target, self._open_source() as source:
+                self._copy(source, target)
+        except Exception as e:
+            logger.error(f"Error streaming {self._describe()}: {e}")
+            self._error = e
+            return
+        elapsed = time.perf_counter() - start_time
+        logger.debug(f"Streamed {self.streamed_bytes} bytes of {self._describe()} in {elapsed:.2f}s")
+
+    def _cleanup(self) -> None:
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+class FileTap(FifoStream):
+    """Passes a file (or another stream's path) to its reader through a FIFO so `observer` sees
+    the bytes as they are read, without reading the file a second time.
+
+        tap = FileTap(csv_path, observer=auditor.feed)
+        with tap as tapped_path:
+            ... LOAD DATA LOCAL INFILE tapped_path ...
+            tap.raise_if_failed()
+
+    Without named pipes the file is read once for the observer and then handed to the reader as is.
+    """
+
+    _temp_prefix = 'file_tap'
+
+    def __init__(
+        self,
+        source_path: Path,
+        work_dir: Optional[Path] = None,
+        use_fifo: Optional[bool] = None,
+        observer: Optional[Callable[[bytes], None]] = None,
+    ):
+        super().__init__(source_path.name, work_dir=work_dir, use_fifo=use_fifo, observer=observer)
+        self._source_path = source_path
+
+    def _open_source(self) -> ContextManager[BinaryIO]:
+        return open(self._source_path, 'rb')
+
+    def _describe(self) -> str:
+        return self._source_path.name
+
+    def _materialize(self, target_path: Path) -> Path:
+        with self._open_source() as source:
+            while chunk := source.read(STREAM_CHUNK_SIZE):
+                self.streamed_bytes += len(chunk)
+                if self._observer is not None:
+                    self._observer(chunk)
+        return self._source_path
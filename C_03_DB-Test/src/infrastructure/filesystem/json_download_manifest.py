@@ -0,0 +1,62 @@
+import os
+import json
+import logging
+import threading
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.application.dto import ManifestEntry
+from src.application.ports.download_manifest import DownloadManifest
+
+logger = logging.getLogger(__name__)
+
+class JsonDownloadManifest(DownloadManifest):
+    """Download manifest kept in a JSON file ({url: entry}), loaded once and rewritten on save."""
+
+    def __init__(self, manifest_path: Path):
+        self._path = manifest_path
+        self._lock = threading.Lock()  # Downloads record their entries from several threads
+        self._entries: Dict[str, ManifestEntry] = self._read()
+
+    def _read(self) -> Dict[str, ManifestEntry]:
+        """Reads the manifest file; a missing or unreadable file means nothing is known yet."""
+        if not self._path.exists():
+            logger.info(f"No download manifest at {self._path} - every file will be downloaded")
+            return {}
+        try:
+            with open(self._path, 'r', encoding='utf-8') as f:
+                raw_entries = json.load(f)
+            # Keys no longer in ManifestEntry (e.g. extracted_hashes from older versions) are ignored
+            known = {f.name for f in fields(ManifestEntry)}
+            entries = {
+                url: ManifestEntry(**{key: value for key, value in data.items() if key in known})
+                for url, data in raw_entries.items()
+            }
+            logger.info(f"Loaded download manifest with {len(entries)} entries from {self._path}")
+            return entries
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable download manifest {self._path}: {e}")
+            return {}
+
+    def get(self, url: str) -> Optional[ManifestEntry]:
+        with self._lock:
+            return self._entries.get(url)
+
+    def put(self, url: str, entry: ManifestEntry) -> None:
+        with self._lock:
+            self._entries[url] = entry
+
+    def save(self) -> None:
+        """Writes to a temporary file and renames it, so a crash never leaves half a manifest."""
+        with self._lock:
+            data = {url: asdict(entry) for url, entry in sorted(self._entries.items())}
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self._path.with_name(self._path.name + '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_path, self._path)
+            logger.info(f"Download manifest saved ({len(data)} entries): {self._path}")
+        except OSError as e:
+            logger.error(f"Could not save download manifest {self._path}: {e}")
@@ -1,4 +1,5 @@
 import os
+import hashlib
 import logging
 from pathlib import Path
 from typing import List
@@ -43,4 +44,16 @@ class OsFileSystem(FileSystem):
 
     def get_filename(self, path: Path) -> str:
         """Extracts the filename component from a path."""
-        return path.name
\ No newline at end of file
+        return path.name
+
+    def get_file_size(self, path: Path) -> int:
+        """Returns the file size in bytes."""
+        return path.stat().st_size
+
+    def compute_sha256(self, path: Path) -> str:
+        """Hashes the file in 1MB chunks so large files never sit in memory."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
@@ -1,4 +1,5 @@
 from .requests_downloader import RequestsDownloader
 from .bs4_html_parser import Bs4HtmlParser
+from .http_session import create_pooled_session
 
-__all__ = ["RequestsDownloader", "Bs4HtmlParser"]
\ No newline at end of file
+__all__ = ["RequestsDownloader", "Bs4HtmlParser", "create_pooled_session"]
\ No newline at end of file
@@ -0,0 +1,16 @@
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+def create_pooled_session(pool_size: int) -> requests.Session:
+    """Creates a requests Session whose connection pool can serve `pool_size` threads at once.
+    Reusing it keeps TCP/TLS connections to the ANS server alive between listings and downloads."""
+    pool_size = max(1, pool_size)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    logger.info(f"HTTP session created (pool size: {pool_size})")
+    return session
@@ -1,6 +1,10 @@
 import logging
+import threading
 import requests
 from pathlib import Path
+from typing import Dict, Optional
+
+from src.application.dto import RemoteFileInfo
 
 from src.application.ports.file_downloader import FileDownloader
 
@@ -9,16 +13,26 @@ logger = logging.getLogger(__name__)
 class RequestsDownloader(FileDownloader):
     """File downloader implementation using the requests library."""
 
+    def __init__(self, session: Optional[requests.Session] = None):
+        # Shared pooled session (keeps connections alive across downloads); None = one-off requests.get
+        self._session = session
+        # Headers of each URL's last saved download, so its metadata needs no second request
+        self._downloaded: Dict[str, RemoteFileInfo] = {}
+        self._downloaded_lock = threading.Lock()  # Downloads run concurrently
+
     def download(self, url: str, save_path: Path, timeout: int = 60) -> bool:
         """Downloads a file from URL and saves it locally."""
         try:
             logger.info(f"Starting download: {url}")
+            with self._downloaded_lock:
+                self._downloaded.pop(url, None)
             
             # Ensure parent directory exists
             save_path.parent.mkdir(parents=True, exist_ok=True)
 
             # Stream download to handle large files efficiently
-            response = requests.get(url, timeout=timeout, stream=True)
+            http_get = self._session.get if self._session is not None else requests.get
+            response = http_get(url, timeout=timeout, stream=True)
             response.raise_for_status()  # Raise HTTP errors
 
             # Write file in chunks to prevent memory issues
@@ -27,6 +41,8 @@ class RequestsDownloader(FileDownloader):
                     if chunk:  # Filter out keep-alive chunks
                         f.write(chunk)
 
+            with self._downloaded_lock:
+                self._downloaded[url] = self._info_from_headers(response.headers)
             logger.info(f"Download completed: {save_path}")
             return True
 
@@ -44,4 +60,32 @@ class RequestsDownloader(FileDownloader):
             return False
         except Exception as e:
             logger.error(f"Unexpected error downloading {url}: {e}", exc_info=True)
-            return False
\ No newline at end of file
+            return False
+
+    def fetch_info(self, url: str, timeout: int = 30) -> Optional[RemoteFileInfo]:
+        """Sends a HEAD request and returns the file's size, ETag and Last-Modified.
+        Returns None if the request fails."""
+        try:
+            http_head = self._session.head if self._session is not None else requests.head
+            response = http_head(url, timeout=timeout, allow_redirects=True)
+            response.raise_for_status()
+            return self._info_from_headers(response.headers)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"HEAD request failed for {url}: {e}")
+            return None
+
+    def downloaded_info(self, url: str) -> Optional[RemoteFileInfo]:
+        """Returns the size, ETag and Last-Modified of the GET response whose body the last
+        download of `url` saved. The metadata then describes exactly the bytes on disk, which a
+        later HEAD request cannot promise if the file changes in between."""
+        with self._downloaded_lock:
+            return self._downloaded.get(url)
+
+    @staticmethod
+    def _info_from_headers(headers) -> RemoteFileInfo:
+        content_length = headers.get('Content-Length')
+        return RemoteFileInfo(
+            size=int(content_length) if content_length and content_length.isdigit() else None,
+            etag=headers.get('ETag'),
+            last_modified=headers.get('Last-Modified'),
+        )
@@ -19,17 +19,24 @@ try:
     # Infrastructure Layer
     from src.infrastructure import (
         OsFileSystem,
+        JsonDownloadManifest,
         RequestsDownloader,
+        create_pooled_session,
         Bs4HtmlParser,
         ZipfileExtractor,
         MySQLConnectionManager,
         MySqlOperatorRepository,
         MySqlAccountingRepository,
+        MySqlLoadStateRepository,
+        MySqlLoadAuditRepository,
+        MySqlShadowTables,
+        CsvPreNormalizer,
     )
     # Application Layer
     from src.application import (
         DownloadAnsDataUseCase,
         LoadAnsDataUseCase,
+        PipelinedAnsDataUseCase,
     )
 except ImportError as e:
     logging.exception("Critical component import failed")
@@ -48,17 +55,48 @@ def run():
     try:
         # Core file operations
         file_system = OsFileSystem()
-        file_downloader = RequestsDownloader()
+        # One pooled session keeps connections alive across concurrent listings and downloads
+        http_session = create_pooled_session(pool_size=config.MAX_CONCURRENT_DOWNLOADS)
+        file_downloader = RequestsDownloader(session=http_session)
         html_parser = Bs4HtmlParser()
-        zip_extractor = ZipfileExtractor()
+        # Only the CSVs are extracted; EXTRACT_WORKERS > 1 decompresses members in worker processes
+        zip_extractor = ZipfileExtractor(
+            member_pattern=config.EXTRACT_MEMBER_PATTERN, max_workers=config.EXTRACT_WORKERS
+        )
+        # Remembers what was downloaded so unchanged quarters are skipped on the next run
+        download_manifest = (
+            JsonDownloadManifest(config.DOWNLOAD_MANIFEST_PATH) if config.SKIP_UNCHANGED_DOWNLOADS else None
+        )
         
         # Database components
         db_connection_manager = MySQLConnectionManager(
             db_config=config.DB_CONFIG,
-            pool_size=config.DB_CONFIG['pool_size']  # Uses configured pool size
+            pool_size=config.DB_CONFIG['pool_size'],  # Uses configured pool size
+            bulk_session=config.DB_BULK_SESSION,
+            skip_binlog=config.DB_BULK_SKIP_BINLOG,
+            checkout_timeout=config.DB_POOL_CHECKOUT_TIMEOUT,  # Wait for a free connection instead of failing
+        )
+        # Optional: clean the CSVs in worker processes so LOAD DATA only maps columns
+        csv_normalizer = (
+            CsvPreNormalizer(max_workers=config.CSV_PRENORMALIZE_WORKERS, work_dir=config.NORMALIZED_CSVS_DIR)
+            if config.CSV_PRENORMALIZE else None
+        )
+        # Optional: profile every CSV while LOAD DATA reads it and record the comparison in load_audit
+        load_audit_repo = MySqlLoadAuditRepository(db_connection_manager) if config.LOAD_AUDIT else None
+        operator_repo = MySqlOperatorRepository(
+            db_connection_manager, normalizer=csv_normalizer, audit_repo=load_audit_repo
+        )
+        accounting_repo = MySqlAccountingRepository(
+            db_connection_manager, normalizer=csv_normalizer, audit_repo=load_audit_repo
+        )
+        load_state_repo = MySqlLoadStateRepository(db_connection_manager)
+        # Optional: full reloads go to shadow tables that replace the live ones in one RENAME TABLE
+        shadow_tables = (
+            MySqlShadowTables(
+                db_connection_manager, operator_repo, accounting_repo, min_row_ratio=config.SHADOW_MIN_ROW_RATIO
+            )
+            if config.LOAD_SHADOW_TABLES else None
         )
-        operator_repo = MySqlOperatorRepository(db_connection_manager)
-        accounting_repo = MySqlAccountingRepository(db_connection_manager)
         
         logger.info("Infrastructure ready")
     except Exception as e:
@@ -74,30 +112,63 @@ def run():
         file_downloader=file_downloader,
         html_parser=html_parser,
         zip_extractor=zip_extractor,
+        http_session=http_session,
+        download_manifest=download_manifest,
     )
     load_use_case = LoadAnsDataUseCase(
         operator_repo=operator_repo,
         accounting_repo=accounting_repo,
         file_system=file_system,
+        load_state_repo=load_state_repo,
+        zip_extractor=zip_extractor,
+        shadow_tables=shadow_tables,
     )
     logger.info("Use cases initialized")
 
     # --------------------------
     # Execution Flow
     # --------------------------
-    # Phase 1: Data Download
-    logger.info("--- Starting Data Download ---")
-    download_successful = download_use_case.execute(config.DOWNLOAD_CONFIG)
+    try:
+        if config.PIPELINE_MODE == 'pipelined':
+            # Download, extraction and loading overlap per ZIP
+            logger.info("--- Starting Pipelined Download and Load ---")
+            pipelined_use_case = PipelinedAnsDataUseCase(
+                file_system=file_system,
+                file_downloader=file_downloader,
+                html_parser=html_parser,
+                zip_extractor=zip_extractor,
+                operator_repo=operator_repo,
+                accounting_repo=accounting_repo,
+                queue_size=config.PIPELINE_QUEUE_SIZE,
+                http_session=http_session,
+                download_manifest=download_manifest,
+                load_state_repo=load_state_repo,
+                shadow_tables=shadow_tables,
+            )
+            pipeline_successful = pipelined_use_case.execute(config.DOWNLOAD_CONFIG, config.LOAD_CONFIG)
+            logger.info(f"Pipelined process {'succeeded' if pipeline_successful else 'failed'}")
+            logger.info("=== Processing Completed ===")
+            return
+
+        # Phase 1: Data Download
+        logger.info("--- Starting Data Download ---")
+        download_successful = download_use_case.execute(config.DOWNLOAD_CONFIG)
     
-    # Phase 2: Data Loading (only if download succeeded)
-    if download_successful:
-        logger.info("--- Starting Data Loading ---")
-        load_successful = load_use_case.execute(config.LOAD_CONFIG)
-        logger.info(f"Load process {'succeeded' if load_successful else 'failed'}")
-    else:
-        logger.error("Download failed - skipping load phase")
+        # Phase 2: Data Loading (only if download succeeded)
+        if download_successful:
+            logger.info("--- Starting Data Loading ---")
+            load_successful = load_use_case.execute(config.LOAD_CONFIG)
+            logger.info(f"Load process {'succeeded' if load_successful else 'failed'}")
+        else:
+            logger.error("Download failed - skipping load phase")
 
-    logger.info("=== Processing Completed ===")
+        logger.info("=== Processing Completed ===")
+    finally:
+        if csv_normalizer is not None:
+            csv_normalizer.close()  # Stops the normalization worker processes
+        zip_extractor.close()  # Stops the extraction worker processes
+        db_connection_manager.log_metrics()  # Checkout waits and peak usage, for sizing DB_POOL_SIZE
+        db_connection_manager.close_pool()
 
 if __name__ == "__main__":
     # Ensure project root is in Python path
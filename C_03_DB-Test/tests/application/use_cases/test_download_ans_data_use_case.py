@@ -1,11 +1,12 @@
 import pytest
 from unittest.mock import MagicMock, call, patch
+from dataclasses import replace
 from pathlib import Path
 import requests
 
 from src.application.use_cases import DownloadAnsDataUseCase
-from src.application.dto import DownloadConfig
-from src.application.ports import FileSystem, FileDownloader, HtmlParser, ZipExtractor
+from src.application.dto import DownloadConfig, ManifestEntry, RemoteFileInfo
+from src.application.ports import FileSystem, FileDownloader, HtmlParser, ZipExtractor, DownloadManifest
 
 @pytest.fixture
 def mock_fs(mocker):
@@ -212,4 +213,168 @@ def test_execute_no_zip_links_found(
     mock_downloader.download.assert_called_once_with( # Only operator download happened
         download_config.operators_csv_url, download_config.operators_csv_path
     )
-    assert mock_parser.find_links_ending_with.call_count == 2 # Parser was called for both years
\ No newline at end of file
+    assert mock_parser.find_links_ending_with.call_count == 2 # Parser was called for both years
+
+def test_execute_concurrent_downloads_use_session(
+    download_config, mock_fs, mock_downloader, mock_parser, mock_extractor
+):
+    """Tests concurrent listings/downloads through a shared session, with results kept per URL."""
+    # Arrange
+    config = DownloadConfig(**{**download_config.__dict__, 'max_concurrent_downloads': 4})
+    mock_session = MagicMock(spec=requests.Session)
+    mock_response = MagicMock()
+    mock_response.text = "<html></html>"
+    mock_session.get.return_value = mock_response
+    # Listings finish in any order, so links are chosen by URL rather than by call order
+    mock_parser.find_links_ending_with.side_effect = lambda base_url, html, ext: [
+        f"{base_url}1T.zip", f"{base_url}2T.zip"
+    ]
+    # The 2024 1T download fails; everything else succeeds
+    mock_downloader.download.side_effect = lambda url, path: not url.endswith("2024/1T.zip")
+    mock_extractor.extract.return_value = True
+    use_case = DownloadAnsDataUseCase(
+        file_system=mock_fs,
+        file_downloader=mock_downloader,
+        html_parser=mock_parser,
+        zip_extractor=mock_extractor,
+        http_session=mock_session,
+    )
+
+    # Act
+    with patch('requests.get') as mock_requests_get:
+        result = use_case.execute(config)
+
+    # Assert
+    assert result is True
+    mock_requests_get.assert_not_called()  # Listings go through the session
+    mock_session.get.assert_has_calls([
+        call("http://fake-ans.gov/acc/2023/", timeout=30),
+        call("http://fake-ans.gov/acc/2024/", timeout=30),
+    ], any_order=True)
+    assert mock_downloader.download.call_count == 5  # Operator + 4 ZIPs
+    assert mock_extractor.extract.call_count == 3  # Failed download is not extracted
+
+
+ZIP_URL_2024 = "http://fake-ans.gov/acc/2024/1T2024.zip"
+
+@pytest.fixture
+def manifest_setup(mocker, download_config, mock_fs, mock_downloader, mock_parser, mock_extractor):
+    """Use case with a manifest that already knows 1T2024.zip, whose CSV is still on disk."""
+    manifest = mocker.MagicMock(spec=DownloadManifest)
+    entry = ManifestEntry(
+        size=100, etag='"v1"', last_modified=None, sha256="zip-hash",
+        extracted_sizes={"1T2024.csv": 50},
+    )
+    manifest.get.side_effect = lambda url: entry if url == ZIP_URL_2024 else None
+    mock_fs.path_exists.return_value = True
+    mock_fs.get_file_size.return_value = 50
+    mock_parser.find_links_ending_with.side_effect = lambda base_url, html, ext: (
+        [ZIP_URL_2024] if base_url.endswith("2024/") else []
+    )
+    mock_downloader.fetch_info.return_value = RemoteFileInfo(size=100, etag='"v1"', last_modified=None)
+    use_case = DownloadAnsDataUseCase(
+        file_system=mock_fs,
+        file_downloader=mock_downloader,
+        html_parser=mock_parser,
+        zip_extractor=mock_extractor,
+        download_manifest=manifest,
+    )
+    return use_case, manifest
+
+
+@patch('requests.get')
+def test_execute_skips_unchanged_zip(mock_requests_get, manifest_setup, download_config, mock_downloader, mock_extractor):
+    """Tests that a ZIP whose HEAD metadata matches the manifest is neither downloaded nor extracted."""
+    # Arrange
+    use_case, manifest = manifest_setup
+    mock_downloader.download.return_value = True
+
+    # Act
+    result = use_case.execute(download_config)
+
+    # Assert
+    assert result is True  # Unchanged data on disk is still usable
+    mock_downloader.download.assert_called_once_with(  # Only the operators CSV
+        download_config.operators_csv_url, download_config.operators_csv_path
+    )
+    mock_extractor.extract.assert_not_called()
+    manifest.save.assert_called_once()
+
+
+@patch('requests.get')
+def test_execute_changed_etag_same_bytes_skips_extraction(
+    mock_requests_get, manifest_setup, download_config, mock_fs, mock_downloader, mock_extractor
+):
+    """Tests that a re-downloaded ZIP with the recorded hash is not extracted again."""
+    # Arrange
+    use_case, manifest = manifest_setup
+    mock_downloader.download.return_value = True
+    mock_downloader.fetch_info.return_value = RemoteFileInfo(size=100, etag='"v2"', last_modified=None)
+    mock_downloader.downloaded_info.return_value = RemoteFileInfo(size=100, etag='"v2"', last_modified=None)
+    mock_fs.compute_sha256.return_value = "zip-hash"
+
+    # Act
+    result = use_case.execute(download_config)
+
+    # Assert
+    assert result is True
+    mock_downloader.download.assert_any_call(ZIP_URL_2024, download_config.zips_dir / "1T2024.zip")
+    mock_extractor.extract.assert_not_called()
+    # The new ETag is recorded so the next run skips the download as well
+    assert manifest.put.call_args[0][1].etag == '"v2"'
+
+
+@patch('requests.get')
+def test_execute_changed_zip_is_extracted_and_recorded(
+    mock_requests_get, manifest_setup, download_config, mock_fs, mock_downloader, mock_extractor
+):
+    """Tests that a changed ZIP is downloaded, extracted and written to the manifest."""
+    # Arrange
+    use_case, manifest = manifest_setup
+    mock_downloader.download.return_value = True
+    mock_downloader.fetch_info.return_value = RemoteFileInfo(size=120, etag='"v2"', last_modified=None)
+    mock_downloader.downloaded_info.return_value = RemoteFileInfo(size=120, etag='"v2"', last_modified=None)
+    mock_fs.compute_sha256.side_effect = lambda path: f"hash-of-{path.name}"
+    mock_extractor.extract.return_value = True
+    mock_extractor.list_members.return_value = ["1T2024.csv"]
+
+    # Act
+    result = use_case.execute(download_config)
+
+    # Assert
+    assert result is True
+    mock_extractor.extract.assert_called_once_with(download_config.zips_dir / "1T2024.zip", download_config.csvs_dir)
+    url, entry = manifest.put.call_args[0]
+    assert url == ZIP_URL_2024
+    assert entry.size == 120 and entry.etag == '"v2"'
+    assert entry.sha256 == "hash-of-1T2024.zip"
+    assert entry.extracted_sizes == {"1T2024.csv": 50}
+    assert {c.args[0] for c in mock_fs.compute_sha256.call_args_list} == {download_config.zips_dir / "1T2024.zip"}  # CSVs are not hashed
+    mock_downloader.fetch_info.assert_called_once_with(ZIP_URL_2024)  # The skip check; the entry uses the GET's headers
+    mock_downloader.downloaded_info.assert_called_with(ZIP_URL_2024)
+    manifest.save.assert_called_once()
+
+
+@patch('requests.get')
+def test_execute_streaming_mode_downloads_without_extracting(
+    mock_requests_get, manifest_setup, download_config, mock_fs, mock_downloader, mock_extractor
+):
+    """Tests that with extraction off ZIPs are downloaded and recorded but never extracted."""
+    # Arrange
+    use_case, manifest = manifest_setup
+    streaming_config = replace(download_config, extract_zips=False)
+    mock_downloader.download.return_value = True
+    mock_downloader.fetch_info.return_value = RemoteFileInfo(size=120, etag='"v2"', last_modified=None)
+    mock_downloader.downloaded_info.return_value = RemoteFileInfo(size=120, etag='"v2"', last_modified=None)
+    mock_fs.compute_sha256.side_effect = lambda path: f"hash-of-{path.name}"
+
+    # Act
+    result = use_case.execute(streaming_config)
+
+    # Assert
+    assert result is True
+    mock_downloader.download.assert_any_call(ZIP_URL_2024, download_config.zips_dir / "1T2024.zip")
+    mock_extractor.extract.assert_not_called()
+    url, entry = manifest.put.call_args[0]
+    assert entry.sha256 == "hash-of-1T2024.zip"
+    assert entry.extracted_sizes == {}  # Nothing lands in csvs_dir
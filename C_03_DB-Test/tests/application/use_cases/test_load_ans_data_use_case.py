@@ -5,7 +5,9 @@ from datetime import date
 
 from src.application.use_cases import LoadAnsDataUseCase
 from src.application.dto import LoadConfig
-from src.application.ports import OperatorRepository, AccountingRepository, FileSystem
+from src.application.ports import (
+    OperatorRepository, AccountingRepository, FileSystem, LoadStateRepository, ZipExtractor, ShadowTables
+)
 
 @pytest.fixture
 def mock_op_repo(mocker):
@@ -78,6 +80,126 @@ def test_execute_success(
     assert mock_acc_repo.load_from_csv.call_count == 2
 
 
+def test_execute_operators_upsert_keeps_operators_table(
+    load_use_case, load_config, mock_op_repo, mock_acc_repo, mock_fs
+):
+    """Upsert mode merges the operators CSV instead of truncating and reloading the table."""
+    config = LoadConfig(
+        operators_csv_path=load_config.operators_csv_path,
+        accounting_csvs_dir=load_config.accounting_csvs_dir,
+        operators_upsert=True,
+    )
+    mock_fs.path_exists.return_value = True
+    mock_op_repo.upsert_from_csv.return_value = 10
+    mock_fs.list_files.return_value = []
+
+    result = load_use_case.execute(config)
+
+    assert result is True
+    mock_acc_repo.clear_all.assert_called_once()
+    mock_op_repo.clear_all.assert_not_called()
+    mock_op_repo.upsert_from_csv.assert_called_once_with(config.operators_csv_path)
+    mock_op_repo.load_from_csv.assert_not_called()
+
+
+@pytest.fixture
+def shadow_use_case(mock_op_repo, mock_acc_repo, mock_fs, mocker):
+    """Use case with a ShadowTables adapter and a load-state repository."""
+    shadow = mocker.MagicMock(spec=ShadowTables)
+    load_state = mocker.MagicMock(spec=LoadStateRepository)
+    load_state.get_loaded_quarters.return_value = {}
+    use_case = LoadAnsDataUseCase(
+        operator_repo=mock_op_repo,
+        accounting_repo=mock_acc_repo,
+        file_system=mock_fs,
+        load_state_repo=load_state,
+        shadow_tables=shadow,
+    )
+    return use_case, shadow, load_state
+
+@pytest.fixture
+def shadow_config(load_config):
+    return LoadConfig(
+        operators_csv_path=load_config.operators_csv_path,
+        accounting_csvs_dir=load_config.accounting_csvs_dir,
+        shadow_tables=True,
+    )
+
+def test_execute_shadow_tables_publishes_without_clearing(
+    shadow_use_case, shadow_config, mock_op_repo, mock_acc_repo, mock_fs
+):
+    """A blue/green reload loads into the shadow tables and publishes them instead of truncating the live ones."""
+    use_case, shadow, load_state = shadow_use_case
+    mock_fs.path_exists.return_value = True
+    mock_op_repo.load_from_csv.return_value = 10
+    mock_fs.list_files.return_value = [shadow_config.accounting_csvs_dir / "1T2023.csv"]
+    mock_fs.get_filename.return_value = "1T2023.csv"
+    mock_fs.compute_sha256.return_value = "hash"
+    mock_acc_repo.load_from_csv.return_value = 100
+
+    assert use_case.execute(shadow_config) is True
+
+    shadow.begin.assert_called_once()
+    mock_op_repo.clear_all.assert_not_called()
+    mock_acc_repo.clear_all.assert_not_called()
+    load_state.clear_all.assert_called_once()
+    mock_acc_repo.load_from_csv.assert_called_once()
+    shadow.publish.assert_called_once()
+    shadow.discard.assert_not_called()
+
+def test_execute_shadow_tables_failed_publish_discards(
+    shadow_use_case, shadow_config, mock_op_repo, mock_acc_repo, mock_fs
+):
+    """A reload that fails validation is discarded and reported as failed; the live tables stay untouched."""
+    use_case, shadow, load_state = shadow_use_case
+    mock_fs.path_exists.return_value = True
+    mock_op_repo.load_from_csv.return_value = 10
+    mock_fs.list_files.return_value = []
+    shadow.publish.side_effect = RuntimeError("accounting_new is empty")
+
+    assert use_case.execute(shadow_config) is False
+
+    shadow.discard.assert_called_once()
+    assert load_state.clear_all.call_count == 2  # At the start, and again for the discarded quarters
+
+def test_execute_shadow_tables_partial_load_is_not_published(
+    shadow_use_case, shadow_config, mock_op_repo, mock_acc_repo, mock_fs
+):
+    """A reload in which any quarter failed to load is discarded, even if the rest would pass validation."""
+    use_case, shadow, load_state = shadow_use_case
+    mock_fs.path_exists.return_value = True
+    mock_op_repo.load_from_csv.return_value = 10
+    filenames = ["1T2023.csv", "2T2023.csv"]
+    mock_fs.list_files.return_value = [shadow_config.accounting_csvs_dir / name for name in filenames]
+    mock_fs.get_filename.side_effect = filenames
+    mock_fs.compute_sha256.side_effect = lambda path: f"hash-{path.name}"
+
+    def load(path, reference_date):
+        if path.name == "2T2023.csv":
+            raise RuntimeError("Failed to load 2T2023.csv")
+        return 100
+    mock_acc_repo.load_from_csv.side_effect = load
+
+    assert use_case.execute(shadow_config) is False
+
+    shadow.publish.assert_not_called()
+    shadow.discard.assert_called_once()
+    assert load_state.clear_all.call_count == 2  # The quarter recorded in the shadow run is forgotten
+
+def test_execute_shadow_tables_operator_failure_discards(
+    shadow_use_case, shadow_config, mock_op_repo, mock_acc_repo, mock_fs
+):
+    """An aborted reload never publishes its shadow tables."""
+    use_case, shadow, _ = shadow_use_case
+    mock_fs.path_exists.return_value = True
+    mock_op_repo.load_from_csv.return_value = -1
+
+    assert use_case.execute(shadow_config) is False
+
+    shadow.publish.assert_not_called()
+    shadow.discard.assert_called_once()
+    mock_acc_repo.load_from_csv.assert_not_called()
+
 def test_execute_operator_load_fails_returns_negative(
     load_use_case, load_config, mock_op_repo, mock_acc_repo, mock_fs
 ):
@@ -206,4 +328,288 @@ def test_parse_reference_date_from_filename_valid(load_use_case, filename, expec
 ])
 def test_parse_reference_date_from_filename_invalid(load_use_case, filename):
     """Tests invalid filename parsing based on current implementation."""
-    assert load_use_case._parse_reference_date_from_filename(filename) is None
\ No newline at end of file
+    assert load_use_case._parse_reference_date_from_filename(filename) is None
+
+def test_execute_parallel_load_isolates_failures(
+    load_use_case, mock_op_repo, mock_acc_repo, mock_fs
+):
+    """Tests that parallel mode loads every file and one failure doesn't stop the rest."""
+    base = Path("/fake/data")
+    config = LoadConfig(
+        operators_csv_path=base / "operators" / "operators.csv",
+        accounting_csvs_dir=base / "accounting" / "csvs",
+        parallel_workers=3,
+    )
+    mock_op_repo.load_from_csv.return_value = 10
+    mock_fs.path_exists.return_value = True
+    filenames = ["1T2023.csv", "2T2023.csv", "3T2023.csv", "4T2023.csv"]
+    files = [config.accounting_csvs_dir / name for name in filenames]
+    mock_fs.list_files.return_value = files
+    mock_fs.get_filename.side_effect = filenames
+
+    def load(path, reference_date):
+        if path.name == "2T2023.csv":
+            raise RuntimeError("Failed to load 2T2023.csv")
+        return 100
+    mock_acc_repo.load_from_csv.side_effect = load
+
+    assert load_use_case._load_accounting_statements(config) == (300, ["2T2023.csv"])
+    assert mock_acc_repo.load_from_csv.call_count == 4
+    mock_acc_repo.load_from_csv.assert_has_calls([
+        call(files[0], date(2023, 3, 31)),
+        call(files[1], date(2023, 6, 30)),
+        call(files[2], date(2023, 9, 30)),
+        call(files[3], date(2023, 12, 31)),
+    ], any_order=True)
+
+
+@pytest.fixture
+def mock_load_state(mocker):
+    """Mock for LoadStateRepository port."""
+    return mocker.MagicMock(spec=LoadStateRepository)
+
+@pytest.fixture
+def incremental_setup(mock_op_repo, mock_acc_repo, mock_fs, mock_load_state):
+    """Use case with a load state where 1T2023 is loaded from 'hash-1T2023.csv' and 2T2023 from an old file."""
+    base = Path("/fake/data")
+    config = LoadConfig(
+        operators_csv_path=base / "operators" / "operators.csv",
+        accounting_csvs_dir=base / "accounting" / "csvs",
+        incremental=True,
+    )
+    mock_op_repo.load_from_csv.return_value = 10
+    mock_fs.path_exists.return_value = True
+    filenames = ["1T2023.csv", "2T2023.csv", "3T2023.csv"]
+    mock_fs.list_files.return_value = [config.accounting_csvs_dir / name for name in filenames]
+    mock_fs.get_filename.side_effect = filenames
+    mock_fs.compute_sha256.side_effect = lambda path: f"hash-{path.name}"
+    mock_load_state.get_loaded_quarters.return_value = {
+        date(2023, 3, 31): "hash-1T2023.csv",  # Unchanged
+        date(2023, 6, 30): "old-hash",         # Source changed
+    }                                          # 3T2023 is new
+    mock_acc_repo.load_from_csv.return_value = 100
+    use_case = LoadAnsDataUseCase(
+        operator_repo=mock_op_repo,
+        accounting_repo=mock_acc_repo,
+        file_system=mock_fs,
+        load_state_repo=mock_load_state,
+    )
+    return use_case, config
+
+
+def test_execute_incremental_reloads_only_changed_quarters(
+    incremental_setup, mock_op_repo, mock_acc_repo, mock_load_state
+):
+    """Tests that incremental mode keeps the history and reloads only changed or new quarters."""
+    use_case, config = incremental_setup
+
+    result = use_case.execute(config)
+
+    assert result is True
+    mock_acc_repo.clear_all.assert_not_called()    # History is kept
+    mock_load_state.clear_all.assert_not_called()
+    mock_op_repo.clear_all.assert_called_once()    # Operators are always reloaded
+    # The reloaded quarters replace their rows when their files are in, without deleting them first
+    mock_acc_repo.begin_quarter_load.assert_has_calls([
+        call(date(2023, 6, 30), replace=True), call(date(2023, 9, 30), replace=True),
+    ])
+    assert mock_acc_repo.begin_quarter_load.call_count == 2
+    mock_acc_repo.delete_quarter.assert_not_called()
+    mock_acc_repo.load_from_csv.assert_has_calls([
+        call(config.accounting_csvs_dir / "2T2023.csv", date(2023, 6, 30)),
+        call(config.accounting_csvs_dir / "3T2023.csv", date(2023, 9, 30)),
+    ])
+    assert mock_acc_repo.load_from_csv.call_count == 2
+    mock_load_state.mark_loaded.assert_has_calls([
+        call(date(2023, 6, 30), "2T2023.csv", "hash-2T2023.csv", 100),
+        call(date(2023, 9, 30), "3T2023.csv", "hash-3T2023.csv", 100),
+    ])
+
+
+def test_execute_incremental_failed_quarter_is_not_marked(
+    incremental_setup, mock_acc_repo, mock_load_state
+):
+    """Tests that a quarter whose load fails stays forgotten, so the next run retries it."""
+    use_case, config = incremental_setup
+
+    def load(path, reference_date):
+        if path.name == "2T2023.csv":
+            raise RuntimeError("Failed to load 2T2023.csv")
+        return 100
+    mock_acc_repo.load_from_csv.side_effect = load
+
+    result = use_case.execute(config)
+
+    assert result is True
+    mock_load_state.forget_quarter.assert_has_calls([call(date(2023, 6, 30)), call(date(2023, 9, 30))])
+    mock_load_state.mark_loaded.assert_called_once_with(date(2023, 9, 30), "3T2023.csv", "hash-3T2023.csv", 100)
+
+
+def test_execute_incremental_failed_reload_keeps_old_rows(
+    incremental_setup, mock_acc_repo, mock_load_state
+):
+    """Tests that a changed quarter whose new file fails to load is never deleted, only its staged load aborted."""
+    use_case, config = incremental_setup
+    mock_acc_repo.load_from_csv.side_effect = RuntimeError("Failed to load")
+
+    use_case.execute(config)
+
+    mock_acc_repo.delete_quarter.assert_not_called()
+    mock_acc_repo.end_quarter_load.assert_not_called()
+    mock_acc_repo.abort_quarter_load.assert_has_calls([call(date(2023, 6, 30)), call(date(2023, 9, 30))])
+    mock_acc_repo.refresh_quarter_summary.assert_not_called()  # The old totals still match the old rows
+
+
+def test_execute_full_mode_resets_load_state(
+    incremental_setup, mock_acc_repo, mock_load_state
+):
+    """Tests that a full reload truncates accounting, clears the load state and records every quarter."""
+    use_case, config = incremental_setup
+    full_config = LoadConfig(
+        operators_csv_path=config.operators_csv_path,
+        accounting_csvs_dir=config.accounting_csvs_dir,
+    )
+
+    result = use_case.execute(full_config)
+
+    assert result is True
+    mock_acc_repo.clear_all.assert_called_once()
+    mock_load_state.clear_all.assert_called_once()
+    mock_load_state.get_loaded_quarters.assert_not_called()
+    assert mock_acc_repo.load_from_csv.call_count == 3
+    assert mock_load_state.mark_loaded.call_count == 3
+
+
+def test_execute_full_load_defers_index_build(load_use_case, load_config, mock_op_repo, mock_acc_repo, mock_fs):
+    """Tests that a full reload wraps the accounting loads in begin/end_bulk_load."""
+    mock_op_repo.load_from_csv.return_value = 10
+    mock_fs.path_exists.return_value = True
+    mock_fs.list_files.return_value = [load_config.accounting_csvs_dir / "1T2023.csv"]
+    mock_fs.get_filename.side_effect = ["1T2023.csv"]
+    mock_acc_repo.load_from_csv.side_effect = RuntimeError("LOAD DATA failed")
+
+    assert load_use_case.execute(load_config) is True
+
+    mock_acc_repo.begin_bulk_load.assert_called_once()
+    mock_acc_repo.end_bulk_load.assert_called_once()  # Indexes are rebuilt even when a file fails
+
+
+def test_execute_incremental_keeps_indexes(incremental_setup, mock_acc_repo):
+    """Tests that incremental mode never drops the indexes of the kept history."""
+    use_case, config = incremental_setup
+
+    assert use_case.execute(config) is True
+
+    mock_acc_repo.begin_bulk_load.assert_not_called()
+    mock_acc_repo.end_bulk_load.assert_not_called()
+
+
+def test_execute_refreshes_expense_summary_per_quarter(
+    load_use_case, load_config, mock_op_repo, mock_acc_repo, mock_fs
+):
+    """Tests that each loaded quarter gets its expense totals refreshed once, after all its files."""
+    mock_op_repo.load_from_csv.return_value = 10
+    mock_fs.path_exists.return_value = True
+    filenames = ["2T2023.csv", "1T2023.csv", "1T2023_extra.csv"]
+    mock_fs.list_files.return_value = [load_config.accounting_csvs_dir / name for name in filenames]
+    mock_fs.get_filename.side_effect = filenames
+    mock_acc_repo.load_from_csv.return_value = 100
+    mock_acc_repo.refresh_quarter_summary.side_effect = [RuntimeError("summary failed"), 5]
+
+    assert load_use_case.execute(load_config) is True  # A failed refresh does not fail the load
+
+    mock_acc_repo.refresh_quarter_summary.assert_has_calls([call(date(2023, 3, 31)), call(date(2023, 6, 30))])
+    assert mock_acc_repo.refresh_quarter_summary.call_count == 2
+
+
+def test_execute_incremental_refreshes_summary_before_marking(
+    incremental_setup, mock_acc_repo, mock_load_state
+):
+    """Tests that a reloaded quarter is only marked loaded after its expense totals are refreshed."""
+    use_case, config = incremental_setup
+
+    def refresh(reference_date):
+        if reference_date == date(2023, 6, 30):
+            raise RuntimeError("Failed to refresh expense summary")
+        return 5
+    mock_acc_repo.refresh_quarter_summary.side_effect = refresh
+
+    assert use_case.execute(config) is True
+
+    mock_acc_repo.refresh_quarter_summary.assert_has_calls([call(date(2023, 6, 30)), call(date(2023, 9, 30))])
+    mock_load_state.mark_loaded.assert_called_once_with(date(2023, 9, 30), "3T2023.csv", "hash-3T2023.csv", 100)
+
+
+def test_execute_streams_csvs_from_zips(mocker, mock_op_repo, mock_acc_repo, mock_fs, load_config):
+    """Tests that with a ZIP directory every CSV member is loaded straight from its ZIP."""
+    zips_dir = Path("/fake/data/accounting/zips")
+    streaming_config = LoadConfig(
+        operators_csv_path=load_config.operators_csv_path,
+        accounting_csvs_dir=load_config.accounting_csvs_dir,
+        accounting_zips_dir=zips_dir,
+    )
+    extractor = mocker.MagicMock(spec=ZipExtractor)
+    extractor.list_members.side_effect = lambda zip_path: [f"{zip_path.stem}.csv", "leiame.txt"]
+    mock_op_repo.load_from_csv.return_value = 10
+    mock_fs.path_exists.return_value = True
+    mock_fs.list_files.return_value = [zips_dir / "1T2023.zip", zips_dir / "2T2023.zip"]
+    mock_acc_repo.load_from_zip_member.return_value = 100
+    use_case = LoadAnsDataUseCase(
+        operator_repo=mock_op_repo,
+        accounting_repo=mock_acc_repo,
+        file_system=mock_fs,
+        zip_extractor=extractor,
+    )
+
+    assert use_case.execute(streaming_config) is True
+
+    mock_fs.list_files.assert_called_once_with(zips_dir, '*.zip')
+    mock_acc_repo.load_from_zip_member.assert_has_calls([
+        call(zips_dir / "1T2023.zip", "1T2023.csv", date(2023, 3, 31)),
+        call(zips_dir / "2T2023.zip", "2T2023.csv", date(2023, 6, 30)),
+    ])
+    assert mock_acc_repo.load_from_zip_member.call_count == 2  # leiame.txt is not loaded
+    mock_acc_repo.load_from_csv.assert_not_called()
+
+
+def test_execute_loads_each_quarter_as_one_unit(
+    load_use_case, load_config, mock_op_repo, mock_acc_repo, mock_fs
+):
+    """Tests that a quarter's files share one quarter load, and a failing file aborts it."""
+    mock_op_repo.load_from_csv.return_value = 10
+    mock_fs.path_exists.return_value = True
+    filenames = ["1T2023.csv", "1T2023_extra.csv", "2T2023.csv"]
+    mock_fs.list_files.return_value = [load_config.accounting_csvs_dir / name for name in filenames]
+    mock_fs.get_filename.side_effect = filenames
+
+    def load(path, reference_date):
+        if path.name == "2T2023.csv":
+            raise RuntimeError("Failed to load 2T2023.csv")
+        return 100
+    mock_acc_repo.load_from_csv.side_effect = load
+
+    assert load_use_case.execute(load_config) is True
+
+    mock_acc_repo.begin_quarter_load.assert_has_calls([
+        call(date(2023, 3, 31), replace=False), call(date(2023, 6, 30), replace=False),
+    ])
+    assert mock_acc_repo.begin_quarter_load.call_count == 2
+    mock_acc_repo.end_quarter_load.assert_called_once_with(date(2023, 3, 31))
+    mock_acc_repo.abort_quarter_load.assert_called_once_with(date(2023, 6, 30))
+
+
+def test_execute_reports_orphaned_statements(
+    load_use_case, load_config, mock_op_repo, mock_acc_repo, mock_fs, caplog
+):
+    """Tests that accounting rows without an operator are reported after the load, without failing it."""
+    mock_op_repo.load_from_csv.return_value = 10
+    mock_fs.path_exists.return_value = True
+    mock_fs.list_files.return_value = [load_config.accounting_csvs_dir / "1T2023.csv"]
+    mock_fs.get_filename.side_effect = ["1T2023.csv"]
+    mock_acc_repo.load_from_csv.return_value = 100
+    mock_acc_repo.count_orphaned_statements.return_value = 7
+
+    assert load_use_case.execute(load_config) is True
+
+    mock_acc_repo.count_orphaned_statements.assert_called_once()
+    assert "7 accounting rows reference operators missing from the operators table" in caplog.text
@@ -0,0 +1,225 @@
+import threading
+import pytest
+from pathlib import Path
+from datetime import date
+from dataclasses import replace
+from unittest.mock import call
+
+from src.application.use_cases import PipelinedAnsDataUseCase
+from src.application.dto import DownloadConfig, LoadConfig, ManifestEntry
+from src.application.ports import (
+    FileSystem, FileDownloader, HtmlParser, ZipExtractor, OperatorRepository, AccountingRepository,
+    DownloadManifest, LoadStateRepository, ShadowTables
+)
+
+ZIP_URLS = [
+    "http://fake-ans.gov/acc/2023/1T2023.zip",
+    "http://fake-ans.gov/acc/2023/2T2023.zip",
+    "http://fake-ans.gov/acc/2023/3T2023.zip",
+]
+
+@pytest.fixture
+def ports(mocker):
+    """Mocks for every port the pipelined use case needs."""
+    return {
+        "file_system": mocker.MagicMock(spec=FileSystem),
+        "file_downloader": mocker.MagicMock(spec=FileDownloader),
+        "html_parser": mocker.MagicMock(spec=HtmlParser),
+        "zip_extractor": mocker.MagicMock(spec=ZipExtractor),
+        "operator_repo": mocker.MagicMock(spec=OperatorRepository),
+        "accounting_repo": mocker.MagicMock(spec=AccountingRepository),
+    }
+
+@pytest.fixture
+def configs():
+    """Provides sample DownloadConfig and LoadConfig DTOs."""
+    base = Path("/fake/data")
+    download_config = DownloadConfig(
+        base_accounting_url="http://fake-ans.gov/acc/",
+        operators_csv_url="http://fake-ans.gov/ops.csv",
+        years_to_download=["2023"],
+        data_dir=base,
+        accounting_dir=base / "accounting",
+        zips_dir=base / "accounting" / "zips",
+        csvs_dir=base / "accounting" / "csvs",
+        operators_dir=base / "operators",
+        operators_csv_path=base / "operators" / "operators.csv",
+    )
+    load_config = LoadConfig(
+        operators_csv_path=base / "operators" / "operators.csv",
+        accounting_csvs_dir=base / "accounting" / "csvs",
+        parallel_workers=2,
+    )
+    return download_config, load_config
+
+@pytest.fixture
+def use_case(ports, mocker):
+    """Provides the use case with mocked ports, queue size 1 and fixed ZIP URLs."""
+    ports["file_downloader"].download.return_value = True
+    ports["file_system"].path_exists.return_value = True
+    ports["operator_repo"].load_from_csv.return_value = 10
+    ports["zip_extractor"].extract.return_value = True
+    ports["zip_extractor"].list_members.side_effect = lambda zip_path: [zip_path.stem + ".csv", "leiame.txt"]
+    ports["accounting_repo"].load_from_csv.return_value = 100
+    instance = PipelinedAnsDataUseCase(**ports, queue_size=1)
+    mocker.patch.object(instance._download, "get_accounting_zip_urls", return_value=ZIP_URLS)
+    return instance
+
+def test_execute_success(use_case, ports, configs):
+    """Tests that every downloaded ZIP is extracted and its CSV loaded."""
+    download_config, load_config = configs
+
+    assert use_case.execute(download_config, load_config) is True
+
+    ports["accounting_repo"].clear_all.assert_called_once()
+    ports["operator_repo"].load_from_csv.assert_called_once_with(load_config.operators_csv_path)
+    csvs_dir = download_config.csvs_dir
+    ports["accounting_repo"].load_from_csv.assert_has_calls([
+        call(csvs_dir / "1T2023.csv", date(2023, 3, 31)),
+        call(csvs_dir / "2T2023.csv", date(2023, 6, 30)),
+        call(csvs_dir / "3T2023.csv", date(2023, 9, 30)),
+    ], any_order=True)
+    assert ports["accounting_repo"].load_from_csv.call_count == 3  # leiame.txt is not loaded
+    # Expense totals are refreshed once per loaded quarter, after the stages finish
+    ports["accounting_repo"].refresh_quarter_summary.assert_has_calls([
+        call(date(2023, 3, 31)), call(date(2023, 6, 30)), call(date(2023, 9, 30)),
+    ])
+
+def test_stages_overlap(use_case, ports, configs):
+    """Tests that the first file is loading before the last ZIP has been downloaded."""
+    first_load_started = threading.Event()
+    overlapped = []
+
+    def download(url, save_path):
+        if url == ZIP_URLS[-1]:
+            overlapped.append(first_load_started.wait(timeout=5))
+        return True
+
+    def load(csv_path, reference_date):
+        first_load_started.set()
+        return 100
+
+    ports["file_downloader"].download.side_effect = download
+    ports["accounting_repo"].load_from_csv.side_effect = load
+
+    assert use_case.execute(*configs) is True
+    assert overlapped == [True]
+
+def test_failures_are_isolated(use_case, ports, configs):
+    """Tests that failed downloads, extractions and loads don't stop the other ZIPs."""
+    ports["file_downloader"].download.side_effect = lambda url, path: not url.endswith("1T2023.zip")
+    ports["zip_extractor"].extract.side_effect = lambda zip_path, extract_dir: zip_path.name != "2T2023.zip"
+
+    assert use_case.execute(*configs) is True
+    ports["accounting_repo"].load_from_csv.assert_called_once_with(
+        configs[0].csvs_dir / "3T2023.csv", date(2023, 9, 30)
+    )
+
+def test_failed_zip_falls_back_to_previous_csvs(ports, configs, mocker):
+    """Tests that a ZIP that fails to download is replaced by the intact CSVs a previous run extracted from it."""
+    download_config, load_config = configs
+    manifest = mocker.MagicMock(spec=DownloadManifest)
+    manifest.get.side_effect = lambda url: ManifestEntry(
+        size=None, etag=None, last_modified=None, sha256="old", extracted_sizes={"1T2023.csv": 42}
+    ) if url.endswith("1T2023.zip") else None
+    ports["file_downloader"].download.side_effect = lambda url, path: not url.endswith("1T2023.zip")
+    ports["file_downloader"].fetch_info.return_value = None  # Nothing to compare: 1T2023.zip is downloaded again
+    ports["file_system"].path_exists.return_value = True
+    ports["file_system"].get_file_size.return_value = 42
+    ports["operator_repo"].load_from_csv.return_value = 10
+    ports["zip_extractor"].extract.return_value = True
+    ports["zip_extractor"].list_members.side_effect = lambda zip_path: [zip_path.stem + ".csv"]
+    ports["accounting_repo"].load_from_csv.return_value = 100
+    shadow = mocker.MagicMock(spec=ShadowTables)
+    use_case = PipelinedAnsDataUseCase(**ports, queue_size=1, download_manifest=manifest, shadow_tables=shadow)
+    mocker.patch.object(use_case._download, "get_accounting_zip_urls", return_value=ZIP_URLS)
+
+    assert use_case.execute(download_config, replace(load_config, shadow_tables=True)) is True
+
+    ports["accounting_repo"].load_from_csv.assert_any_call(download_config.csvs_dir / "1T2023.csv", date(2023, 3, 31))
+    assert ports["accounting_repo"].load_from_csv.call_count == 3
+    shadow.publish.assert_called_once()  # Every quarter made it in
+
+def test_loaded_quarters_are_recorded(use_case, ports, configs, mocker):
+    """Tests that the full reload leaves a load state a later incremental run can rely on."""
+    load_state = mocker.MagicMock(spec=LoadStateRepository)
+    use_case = PipelinedAnsDataUseCase(**ports, queue_size=1, load_state_repo=load_state)
+    mocker.patch.object(use_case._download, "get_accounting_zip_urls", return_value=ZIP_URLS)
+    ports["file_system"].compute_sha256.side_effect = lambda path: f"hash-{path.name}"
+    csvs_dir = configs[0].csvs_dir
+
+    assert use_case.execute(*configs) is True
+
+    load_state.clear_all.assert_called_once()
+    load_state.mark_loaded.assert_has_calls([
+        call(date(2023, 3, 31), "1T2023.csv", "hash-1T2023.csv", 100),
+        call(date(2023, 6, 30), "2T2023.csv", "hash-2T2023.csv", 100),
+        call(date(2023, 9, 30), "3T2023.csv", "hash-3T2023.csv", 100),
+    ], any_order=True)
+    ports["file_system"].compute_sha256.assert_any_call(csvs_dir / "1T2023.csv")
+
+def test_all_loads_failing_returns_false(use_case, ports, configs):
+    """Tests that the run fails when no accounting file could be loaded."""
+    ports["accounting_repo"].load_from_csv.side_effect = RuntimeError("LOAD DATA failed")
+
+    assert use_case.execute(*configs) is False
+    assert ports["accounting_repo"].load_from_csv.call_count == 3
+
+def test_operator_load_failure_aborts(use_case, ports, configs):
+    """Tests that no ZIP is processed when operators can't be loaded."""
+    ports["operator_repo"].load_from_csv.return_value = -1
+
+    assert use_case.execute(*configs) is False
+    ports["file_downloader"].download.assert_called_once()  # Operators CSV only
+    ports["accounting_repo"].load_from_csv.assert_not_called()
+
+def test_streaming_mode_loads_from_zips(use_case, ports, configs):
+    """Tests that with extraction off each CSV member is streamed from its ZIP by the load stage."""
+    download_config, load_config = configs
+    ports["accounting_repo"].load_from_zip_member.return_value = 100
+
+    assert use_case.execute(replace(download_config, extract_zips=False), load_config) is True
+
+    ports["zip_extractor"].extract.assert_not_called()
+    zips_dir = download_config.zips_dir
+    ports["accounting_repo"].load_from_zip_member.assert_has_calls([
+        call(zips_dir / "1T2023.zip", "1T2023.csv", date(2023, 3, 31)),
+        call(zips_dir / "2T2023.zip", "2T2023.csv", date(2023, 6, 30)),
+        call(zips_dir / "3T2023.zip", "3T2023.csv", date(2023, 9, 30)),
+    ], any_order=True)
+    ports["accounting_repo"].load_from_csv.assert_not_called()
+
+@pytest.fixture
+def shadow_use_case(ports, mocker):
+    """Pipelined use case that reloads into shadow tables."""
+    shadow = mocker.MagicMock(spec=ShadowTables)
+    ports["file_downloader"].download.return_value = True
+    ports["file_system"].path_exists.return_value = True
+    ports["operator_repo"].load_from_csv.return_value = 10
+    ports["zip_extractor"].extract.return_value = True
+    ports["zip_extractor"].list_members.side_effect = lambda zip_path: [zip_path.stem + ".csv"]
+    ports["accounting_repo"].load_from_csv.return_value = 100
+    instance = PipelinedAnsDataUseCase(**ports, queue_size=1, shadow_tables=shadow)
+    mocker.patch.object(instance._download, "get_accounting_zip_urls", return_value=ZIP_URLS)
+    return instance, shadow
+
+def test_shadow_tables_published_after_complete_reload(shadow_use_case, ports, configs):
+    """Tests that a reload in which every ZIP made it through is swapped in."""
+    use_case, shadow = shadow_use_case
+    download_config, load_config = configs
+
+    assert use_case.execute(download_config, replace(load_config, shadow_tables=True)) is True
+
+    shadow.publish.assert_called_once()
+    ports["accounting_repo"].clear_all.assert_not_called()
+
+def test_shadow_tables_partial_reload_is_discarded(shadow_use_case, ports, configs):
+    """Tests that a failed download keeps the live tables instead of publishing a reload without that quarter."""
+    use_case, shadow = shadow_use_case
+    download_config, load_config = configs
+    ports["file_downloader"].download.side_effect = lambda url, path: not url.endswith("2T2023.zip")
+
+    assert use_case.execute(download_config, replace(load_config, shadow_tables=True)) is False
+
+    shadow.publish.assert_not_called()
+    shadow.discard.assert_called_once()
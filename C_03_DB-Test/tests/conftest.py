@@ -98,6 +98,12 @@ def setup_test_database(request):
             cursor.execute("TRUNCATE TABLE accounting;")
             logger.debug("Truncating 'operators' table...")
             cursor.execute("TRUNCATE TABLE operators;")
+            logger.debug("Truncating 'load_state' table...")
+            cursor.execute("TRUNCATE TABLE load_state;")
+            logger.debug("Truncating 'accounting_expense_summary' table...")
+            cursor.execute("TRUNCATE TABLE accounting_expense_summary;")
+            logger.debug("Truncating 'load_audit' table...")
+            cursor.execute("TRUNCATE TABLE load_audit;")
             # Re-enable FK checks
             logger.debug("Re-enabling foreign key checks.")
             cursor.execute("SET SESSION foreign_key_checks = 1;")
@@ -0,0 +1,61 @@
+import os
+import pytest
+import zipfile
+
+from src.infrastructure.archive import ZipMemberStream
+
+CSV_CONTENT = b"DATA;REG_ANS\n" + b"31/03/2024;99999\n" * 100_000
+needs_fifo = pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="Named pipes are not available on this platform")
+
+@pytest.fixture
+def csv_zip(tmp_path):
+    """ZIP holding one CSV inside a subdirectory."""
+    zip_path = tmp_path / "1T2024.zip"
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("dados/1T2024.csv", CSV_CONTENT)
+    return zip_path
+
+@pytest.mark.parametrize("use_fifo", [
+    pytest.param(True, id="fifo", marks=needs_fifo),
+    pytest.param(False, id="temp_file"),
+])
+def test_stream_reads_member_and_cleans_up(csv_zip, tmp_path, use_fifo):
+    """Tests that the member can be read through the path and nothing is left behind."""
+    work_dir = tmp_path / "streams"
+    stream = ZipMemberStream(csv_zip, "dados/1T2024.csv", work_dir=work_dir, use_fifo=use_fifo)
+
+    with stream as path:
+        assert path.name == "1T2024.csv"  # Readers keep seeing the member's file name
+        assert path.read_bytes() == CSV_CONTENT
+        stream.raise_if_failed()
+
+    assert stream.streamed_bytes == len(CSV_CONTENT)
+    assert list(work_dir.iterdir()) == []
+
+@needs_fifo
+def test_unread_fifo_does_not_block_exit(csv_zip, tmp_path):
+    """Tests that leaving the block without reading (e.g. a failed load) releases the writer."""
+    stream = ZipMemberStream(csv_zip, "dados/1T2024.csv", work_dir=tmp_path, use_fifo=True)
+
+    with stream:
+        pass
+
+    stream.raise_if_failed()  # Nothing was streamed, nothing failed
+    assert stream.streamed_bytes == 0
+
+@needs_fifo
+def test_missing_member_is_reported(csv_zip, tmp_path):
+    """Tests that a stream that could not be produced fails raise_if_failed, not silently."""
+    stream = ZipMemberStream(csv_zip, "2T2024.csv", work_dir=tmp_path, use_fifo=True)
+
+    with stream as path:
+        assert path.read_bytes() == b""  # The reader only sees an empty file
+        with pytest.raises(RuntimeError, match="Streaming 2T2024.csv from 1T2024.zip failed"):
+            stream.raise_if_failed()
+
+def test_missing_member_without_fifo_raises_on_enter(csv_zip, tmp_path):
+    """Tests that the temporary-file fallback fails immediately for a missing member."""
+    with pytest.raises(RuntimeError, match="Failed to stream 2T2024.csv from 1T2024.zip"):
+        with ZipMemberStream(csv_zip, "2T2024.csv", work_dir=tmp_path, use_fifo=False):
+            pass
+    assert list(tmp_path.glob("zip_stream_*")) == []
@@ -77,4 +77,62 @@ def test_extract_not_a_zip_file(zip_extractor, tmp_path):
     result = zip_extractor.extract(not_a_zip_path, extract_dir)
 
     # Assert
-    assert result is False
\ No newline at end of file
+    assert result is False
+
+def test_list_members(zip_extractor, create_test_zip):
+    """Tests that member file names are listed without extracting."""
+    zip_info = create_test_zip
+
+    members = zip_extractor.list_members(zip_info["zip_path"])
+
+    assert members == ["file1.txt", str(zip_info["file2_path"])]
+    assert not zip_info["extract_dir"].exists()
+
+def test_list_members_not_a_zip_file(zip_extractor, tmp_path):
+    """Tests that an unreadable archive lists no members."""
+    not_a_zip_path = tmp_path / "fake.zip"
+    not_a_zip_path.write_text("This is not zip content")
+
+    assert zip_extractor.list_members(not_a_zip_path) == []
+
+def test_extract_only_matching_members(tmp_path):
+    """Tests that only members matching the pattern (case-insensitively) are extracted and listed."""
+    zip_path = tmp_path / "quarter.zip"
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("1T2024.CSV", b"a;b\n")
+        zf.writestr("leiame.pdf", b"%PDF")
+    extractor = ZipfileExtractor(member_pattern="*.csv")
+
+    assert extractor.extract(zip_path, tmp_path / "extracted") is True
+
+    assert (tmp_path / "extracted" / "1T2024.CSV").exists()
+    assert not (tmp_path / "extracted" / "leiame.pdf").exists()
+    assert extractor.list_members(zip_path) == ["1T2024.CSV"]
+
+def test_extract_skips_unchanged_members(zip_extractor, create_test_zip):
+    """Tests that a member matching the extracted file's size and CRC is not rewritten, while a changed one is."""
+    zip_info = create_test_zip
+    extract_dir = zip_info["extract_dir"]
+    zip_extractor.extract(zip_info["zip_path"], extract_dir)
+    unchanged = extract_dir / zip_info["file1_path"]
+    changed = extract_dir / zip_info["file2_path"]
+    changed.write_bytes(b"This is file TWO in a subdir.")  # Same size, different CRC
+    unchanged_mtime = unchanged.stat().st_mtime_ns
+
+    assert zip_extractor.extract(zip_info["zip_path"], extract_dir) is True
+
+    assert unchanged.stat().st_mtime_ns == unchanged_mtime
+    assert changed.read_bytes() == zip_info["file2_content"]
+
+def test_extract_with_worker_processes(create_test_zip):
+    """Tests extraction with members decompressed in a process pool."""
+    zip_info = create_test_zip
+    extractor = ZipfileExtractor(max_workers=2)
+    try:
+        result = extractor.extract(zip_info["zip_path"], zip_info["extract_dir"])
+    finally:
+        extractor.close()
+
+    assert result is True
+    assert (zip_info["extract_dir"] / zip_info["file1_path"]).read_bytes() == zip_info["file1_content"]
+    assert (zip_info["extract_dir"] / zip_info["file2_path"]).read_bytes() == zip_info["file2_content"]
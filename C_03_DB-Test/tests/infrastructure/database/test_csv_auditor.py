@@ -0,0 +1,49 @@
+import pytest
+
+from src.infrastructure.database.csv_auditor import CsvAuditor
+
+CSV_CONTENT = (
+    'DATA;REG_ANS;DESCRICAO\n'
+    '31/03/2024;1;"Conta com\nquebra de linha"\n'
+    '31/03/2024;2;"Aspas ""internas"" e ; separador"\n'
+    '31/03/2024;3\n'
+    '31/03/2024;4;Ação\n'
+).encode('utf-8')
+
+def profile_of(content: bytes, chunk_size: int):
+    auditor = CsvAuditor()
+    for start in range(0, len(content), chunk_size):
+        auditor.feed(content[start:start + chunk_size])
+    return auditor.profile()
+
+def test_counts_records_not_lines():
+    """Tests that quoted newlines stay inside their record and the header is not counted."""
+    profile = profile_of(CSV_CONTENT, len(CSV_CONTENT))
+
+    assert profile.rows == 4
+    assert profile.bytes == len(CSV_CONTENT)
+    assert list(profile.column_checksums) == ["DATA", "REG_ANS", "DESCRICAO"]
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 64])
+def test_profile_does_not_depend_on_chunking(chunk_size):
+    """Tests that records, multi-byte characters and quotes split across chunks give the same profile."""
+    assert profile_of(CSV_CONTENT, chunk_size) == profile_of(CSV_CONTENT, len(CSV_CONTENT))
+
+def test_checksums_detect_changed_values():
+    """Tests that a changed value changes only its column's checksum."""
+    original = profile_of(CSV_CONTENT, 1024)
+    changed = profile_of(CSV_CONTENT.replace(b'31/03/2024;4', b'31/03/2024;5'), 1024)
+
+    assert changed.column_checksums["REG_ANS"] != original.column_checksums["REG_ANS"]
+    assert changed.column_checksums["DATA"] == original.column_checksums["DATA"]
+    assert changed.column_checksums["DESCRICAO"] == original.column_checksums["DESCRICAO"]
+
+def test_last_record_without_newline_is_counted():
+    """Tests that a file not ending in a newline still counts its last record."""
+    assert profile_of(b'A;B\n1;2\n3;4', 3).rows == 2
+
+def test_empty_source():
+    """Tests that an empty stream profiles as zero rows and no columns."""
+    profile = CsvAuditor().profile()
+
+    assert (profile.rows, profile.bytes, profile.column_checksums) == (0, 0, {})
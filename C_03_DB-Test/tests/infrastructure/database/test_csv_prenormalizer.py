@@ -0,0 +1,100 @@
+import csv
+import pytest
+from datetime import date
+from pathlib import Path
+
+from src.infrastructure.database import CsvPreNormalizer
+from src.infrastructure.database.csv_prenormalizer import (
+    normalize_accounting_csv,
+    normalize_operators_csv,
+    OPERATOR_COLUMNS,
+)
+
+def write_csv(path: Path, header, rows):
+    """Writes a raw ANS-style CSV (';' separated, every field quoted)."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=';', quoting=csv.QUOTE_ALL)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return path
+
+def read_lines(path: Path):
+    return path.read_text(encoding='utf-8').splitlines()
+
+@pytest.fixture
+def accounting_csv(tmp_path):
+    """Accounting CSV with Brazilian decimals, padded text and invalid values."""
+    return write_csv(
+        tmp_path / "1T2024.csv",
+        ["DATA", "REG_ANS", "CD_CONTA_CONTABIL", "DESCRICAO", "VL_SALDO_INICIAL", "VL_SALDO_FINAL"],
+        [
+            ["31/03/2024", "99999", " 411111 ", 'Conta "A" \\ B ', "1.000,50", "-2.500,75"],
+            ["31/03/2024", "99999", "311", "Patrimonio", "", "abc"],
+            ["31/03/2024", "99999", "121", "X" * 600, "1,2,3", "100000,00"],
+        ],
+    )
+
+def test_normalize_accounting_csv(accounting_csv, tmp_path):
+    """Tests that decimals are converted, text trimmed and cut, and invalid values become \\N."""
+    target = tmp_path / "out.csv"
+
+    assert normalize_accounting_csv(accounting_csv, target, date(2024, 3, 31)) == 3
+
+    lines = read_lines(target)
+    assert lines[0] == "trimestre_referencia,reg_ans,cd_conta_contabil,descricao,vl_saldo_inicial,vl_saldo_final"
+    assert lines[1] == '2024-03-31,99999,411111,"Conta ""A"" \\\\ B",1000.50,-2500.75'
+    assert lines[2] == "2024-03-31,99999,311,Patrimonio,\\N,\\N"
+    assert lines[3] == f"2024-03-31,99999,121,{'X' * 500},\\N,100000.00"
+
+def test_normalize_accounting_csv_small_chunks(accounting_csv, tmp_path):
+    """Tests that chunked processing writes one header and every row."""
+    whole, chunked = tmp_path / "whole.csv", tmp_path / "chunked.csv"
+    normalize_accounting_csv(accounting_csv, whole, date(2024, 3, 31))
+
+    assert normalize_accounting_csv(accounting_csv, chunked, date(2024, 3, 31), chunk_rows=1) == 3
+    assert read_lines(chunked) == read_lines(whole)
+
+def test_normalize_operators_csv(tmp_path):
+    """Tests that '.0' suffixes are stripped and only valid registration dates are kept."""
+    base = ["1", "2", "Op", "", "M", "L", "1", "", "B", "C", "SP"]
+    source = write_csv(tmp_path / "operators.csv", OPERATOR_COLUMNS, [
+        ["100"] + base[1:] + ["12345678.0", "11.0", "5555.0", "", "e", "r", "c", "4.0", "2020-01-05"],
+        ["101"] + base[1:] + ["12345678", "11", "5555", "", "e", "r", "c", "", "0000-00-00"],
+        ["102"] + base[1:] + ["1", "1", "1", "", "e", "r", "c", "", "NULL"],
+    ])
+    target = tmp_path / "out.csv"
+
+    assert normalize_operators_csv(source, target) == 3
+
+    lines = read_lines(target)
+    assert lines[1] == "100,2,Op,,M,L,1,,B,C,SP,12345678,11,5555,,e,r,c,4,2020-01-05"
+    assert lines[2].endswith(",12345678,11,5555,,e,r,c,,\\N")
+    assert lines[3].endswith(",\\N")
+
+def test_normalizer_in_process_writes_temp_copy(accounting_csv, tmp_path):
+    """Tests that the normalizer returns a normalized copy in its work directory."""
+    work_dir = tmp_path / "normalized"
+    normalizer = CsvPreNormalizer(max_workers=0, work_dir=work_dir)
+
+    normalized = normalizer.normalize_accounting(accounting_csv, date(2024, 3, 31))
+
+    assert normalized.parent == work_dir
+    assert read_lines(normalized)[1].startswith("2024-03-31,99999,411111,")
+
+def test_normalizer_failure_raises_and_cleans_up(tmp_path):
+    """Tests that a failed normalization raises RuntimeError and leaves no temp file."""
+    work_dir = tmp_path / "normalized"
+    normalizer = CsvPreNormalizer(max_workers=0, work_dir=work_dir)
+
+    with pytest.raises(RuntimeError, match="Failed to pre-normalize missing.csv"):
+        normalizer.normalize_operators(tmp_path / "missing.csv")
+    assert list(work_dir.iterdir()) == []
+
+def test_normalizer_uses_worker_process(accounting_csv, tmp_path):
+    """Tests normalization through the process pool."""
+    normalizer = CsvPreNormalizer(max_workers=1, work_dir=tmp_path / "normalized")
+    try:
+        normalized = normalizer.normalize_accounting(accounting_csv, date(2024, 3, 31))
+    finally:
+        normalizer.close()
+    assert len(read_lines(normalized)) == 4
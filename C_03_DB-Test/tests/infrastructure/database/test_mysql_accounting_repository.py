@@ -0,0 +1,134 @@
+import threading
+import pytest
+from datetime import date
+
+from src.infrastructure.database import MySQLConnectionManager, MySqlAccountingRepository
+
+QUARTER = date(2024, 3, 31)
+
+@pytest.fixture
+def executed():
+    return []
+
+@pytest.fixture
+def cursor(mocker, executed):
+    """Cursor of a partitioned `accounting` whose quarter partition already exists and holds rows."""
+    cursor = mocker.MagicMock()
+    cursor.execute.side_effect = lambda sql, params=None: executed.append(' '.join(sql.split()))
+    cursor.fetchone.side_effect = lambda: ('LIST',) if 'PARTITION_METHOD' in executed[-1] else (1,)
+    cursor.fetchall.return_value = []
+    cursor.rowcount = 10
+    cursor.warning_count = 0
+    return cursor
+
+@pytest.fixture
+def conn_manager(mocker, cursor):
+    conn_manager = mocker.MagicMock(spec=MySQLConnectionManager)
+    conn_manager.get_connection.return_value.cursor.return_value = cursor
+    conn_manager.bulk_session.return_value.__enter__.return_value.cursor.return_value = cursor
+    return conn_manager
+
+@pytest.fixture
+def repo(conn_manager):
+    return MySqlAccountingRepository(conn_manager)
+
+def staging_tables(executed):
+    return {sql.split()[2] for sql in executed if sql.startswith("CREATE TABLE accounting_stage_")}
+
+def test_quarter_load_exchanges_once(repo, executed, tmp_path):
+    """Tests that all files of a quarter share one staging table, swapped in with a single exchange."""
+    files = [tmp_path / "1T2024_a.csv", tmp_path / "1T2024_b.csv"]
+
+    repo.begin_quarter_load(QUARTER)
+    loaded = sum(repo.load_from_csv(path, QUARTER) for path in files)
+    repo.end_quarter_load(QUARTER)
+
+    assert loaded == 20
+    [staging] = staging_tables(executed)
+    assert sum(sql.startswith("LOAD DATA") and f"INTO TABLE {staging}" in sql for sql in executed) == 2
+    assert sum("EXCHANGE PARTITION" in sql for sql in executed) == 1
+    # The partition's existing rows are copied once, not once per file
+    assert sum(sql.startswith(f"INSERT INTO {staging}") for sql in executed) == 1
+    assert executed[-1] == f"DROP TABLE IF EXISTS {staging}"
+
+def test_aborted_quarter_load_drops_staging_without_exchange(repo, executed, tmp_path):
+    """Tests that an aborted quarter load leaves the partition alone and frees the quarter."""
+    repo.begin_quarter_load(QUARTER)
+    repo.load_from_csv(tmp_path / "1T2024_a.csv", QUARTER)
+    repo.abort_quarter_load(QUARTER)
+
+    [staging] = staging_tables(executed)
+    assert not any("EXCHANGE PARTITION" in sql for sql in executed)
+    assert executed[-1] == f"DROP TABLE IF EXISTS {staging}"
+    repo.load_from_csv(tmp_path / "1T2024_b.csv", QUARTER)  # The quarter lock was released
+
+def test_concurrent_loads_of_a_quarter_are_serialized(repo, executed, tmp_path):
+    """Tests that another thread's load of the same quarter waits, and uses its own staging table."""
+    repo.begin_quarter_load(QUARTER)
+    other = threading.Thread(target=repo.load_from_csv, args=(tmp_path / "1T2024_b.csv", QUARTER))
+    other.start()
+    other.join(timeout=0.2)
+    assert other.is_alive()  # Blocked until this thread's quarter load is swapped in
+    assert len(staging_tables(executed)) == 1
+
+    repo.end_quarter_load(QUARTER)
+    other.join(timeout=5)
+
+    assert not other.is_alive()
+    assert len(staging_tables(executed)) == 2
+    assert sum("EXCHANGE PARTITION" in sql for sql in executed) == 2
+
+def test_replace_load_exchanges_without_copying_old_rows(repo, executed, tmp_path):
+    """Tests that a replacing quarter load swaps in only the new rows, leaving the partition in place until then."""
+    repo.begin_quarter_load(QUARTER, replace=True)
+    repo.load_from_csv(tmp_path / "1T2024.csv", QUARTER)
+    repo.end_quarter_load(QUARTER)
+
+    [staging] = staging_tables(executed)
+    assert not any(sql.startswith(f"INSERT INTO {staging}") for sql in executed)
+    assert not any("DROP PARTITION" in sql for sql in executed)
+    assert sum("EXCHANGE PARTITION" in sql for sql in executed) == 1
+
+def test_failed_replace_load_keeps_old_rows(repo, executed, tmp_path):
+    """Tests that a replacing quarter load whose file fails never touches the quarter's partition."""
+    repo.begin_quarter_load(QUARTER, replace=True)
+    repo.abort_quarter_load(QUARTER)
+
+    assert not any("DROP PARTITION" in sql or "EXCHANGE PARTITION" in sql for sql in executed)
+    assert not any(sql.startswith("DELETE") for sql in executed)
+
+def test_replace_load_on_unpartitioned_table_swaps_in_one_transaction(repo, conn_manager, cursor, executed, tmp_path):
+    """Tests that without partitions the quarter is still staged, then deleted and copied in one commit."""
+    cursor.fetchone.side_effect = lambda: None if 'PARTITION_METHOD' in executed[-1] else (1,)
+    connection = conn_manager.bulk_session.return_value.__enter__.return_value
+
+    repo.begin_quarter_load(QUARTER, replace=True)
+    repo.load_from_csv(tmp_path / "1T2024.csv", QUARTER)
+    connection.commit.reset_mock()
+    repo.end_quarter_load(QUARTER)
+
+    [staging] = staging_tables(executed)
+    assert not any("PARTITION" in sql for sql in executed if not sql.startswith("SELECT"))
+    swap = executed[executed.index("DELETE FROM accounting WHERE trimestre_referencia = %s"):]
+    assert swap[1].startswith("INSERT INTO accounting (") and swap[1].endswith(f"FROM {staging}")
+    connection.commit.assert_called_once()  # Readers see the old rows until the new ones are in
+    assert executed[-1] == f"DROP TABLE IF EXISTS {staging}"
+
+def test_broken_stream_removes_normalized_copy(mocker, conn_manager, executed, tmp_path):
+    """Tests that the normalized temp file is deleted when the stream check fails right after normalizing."""
+    source = tmp_path / "1T2024.csv"
+    normalized = tmp_path / "1T2024.normalized.csv"
+    normalized.write_text("rows")
+    normalizer = mocker.MagicMock()
+    normalizer.normalize_accounting.return_value = normalized
+    stream_cls = mocker.patch('src.infrastructure.database.mysql_accounting_repository.ZipMemberStream')
+    stream = stream_cls.return_value
+    stream.__enter__.return_value = source
+    stream.raise_if_failed.side_effect = RuntimeError("stream broke off")
+    repo = MySqlAccountingRepository(conn_manager, normalizer=normalizer)
+
+    with pytest.raises(RuntimeError, match="stream broke off"):
+        repo.load_from_zip_member(tmp_path / "1T2024.zip", "1T2024.csv", QUARTER)
+
+    assert not normalized.exists()
+    assert not any(sql.startswith("LOAD DATA") for sql in executed)
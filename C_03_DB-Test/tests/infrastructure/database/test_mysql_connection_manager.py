@@ -0,0 +1,182 @@
+import threading
+
+import pytest
+from mysql.connector import Error, InterfaceError, OperationalError, PoolError
+
+from src.infrastructure.database import MySQLConnectionManager
+from src.infrastructure.database.mysql_connection_manager import BULK_SESSION_SETTINGS
+
+@pytest.fixture
+def connection(mocker):
+    """Pooled connection whose session starts with every bulk variable at 1."""
+    conn = mocker.MagicMock()
+    cursor = conn.cursor.return_value
+    cursor.fetchone.side_effect = lambda: tuple(1 for _ in executed_selects(cursor)[-1].split(','))
+    return conn
+
+def executed_selects(cursor):
+    return [call[0][0] for call in cursor.execute.call_args_list if call[0][0].startswith("SELECT")]
+
+def executed_sets(cursor):
+    return [(call[0][0], call[0][1]) for call in cursor.execute.call_args_list if call[0][0].startswith("SET")]
+
+@pytest.fixture
+def make_manager(mocker, connection):
+    pool_class = mocker.patch('mysql.connector.pooling.MySQLConnectionPool')
+    pool_class.return_value.get_connection.return_value = connection
+
+    def make(**kwargs):
+        manager = MySQLConnectionManager({'pool_name': 'test'}, **kwargs)
+        connection.reset_mock()
+        return manager
+    return make
+
+def test_bulk_session_sets_and_restores_original_values(make_manager, connection):
+    """Tests that the original values are read, the bulk values set, and the originals restored in reverse."""
+    manager = make_manager()
+    cursor = connection.cursor.return_value
+
+    with manager.bulk_session() as conn:
+        conn.commit()
+        applied = executed_sets(cursor)
+
+    assert applied == [(f"SET SESSION {name} = %s", (value,)) for name, value in BULK_SESSION_SETTINGS.items()]
+    restored = executed_sets(cursor)[len(applied):]
+    assert restored == [(f"SET SESSION {name} = %s", (1,)) for name in reversed(list(BULK_SESSION_SETTINGS))]
+    connection.commit.assert_called_once()
+    connection.rollback.assert_not_called()
+    connection.close.assert_called_once()
+
+def test_bulk_session_rolls_back_and_restores_on_error(make_manager, connection):
+    """Tests that a failing block is rolled back before the settings are restored and the connection released."""
+    manager = make_manager()
+    cursor = connection.cursor.return_value
+
+    with pytest.raises(RuntimeError):
+        with manager.bulk_session({'foreign_key_checks': 0}):
+            raise RuntimeError("LOAD DATA failed")
+
+    connection.rollback.assert_called_once()
+    assert executed_sets(cursor)[-1] == ("SET SESSION foreign_key_checks = %s", (1,))
+    connection.close.assert_called_once()
+
+def test_bulk_session_skips_refused_variables(make_manager, connection):
+    """Tests that a variable the server refuses is neither applied nor restored."""
+    manager = make_manager(skip_binlog=True)
+    cursor = connection.cursor.return_value
+
+    def execute(sql, params=None):
+        if sql.startswith("SET SESSION sql_log_bin"):
+            raise Error(msg="Access denied; you need the SYSTEM_VARIABLES_ADMIN privilege", errno=1227)
+    cursor.execute.side_effect = execute
+
+    with manager.bulk_session():
+        pass
+
+    restored = [sql for sql, _ in executed_sets(cursor) if "sql_log_bin" in sql]
+    assert restored == ["SET SESSION sql_log_bin = %s"]  # Only the refused attempt, never a restore
+
+def test_bulk_session_disabled_uses_default_session(make_manager, connection):
+    """Tests that bulk_session=False hands out the connection untouched."""
+    manager = make_manager(bulk_session=False)
+
+    with manager.bulk_session() as conn:
+        conn.commit()
+
+    connection.commit.assert_called_once()
+    connection.cursor.assert_not_called()
+    connection.close.assert_called_once()
+
+@pytest.fixture
+def make_pool_manager(mocker):
+    """Manager over a mocked pool handing out a fresh connection per checkout."""
+    pool_class = mocker.patch('mysql.connector.pooling.MySQLConnectionPool')
+    pool = pool_class.return_value
+    pool.get_connection.side_effect = lambda: mocker.MagicMock()
+
+    def make(**kwargs):
+        return MySQLConnectionManager({'pool_name': 'test'}, **kwargs), pool
+    return make
+
+def test_checkout_waits_for_a_released_connection(make_pool_manager):
+    """Tests that a checkout on an exhausted pool waits for a connection to be closed instead of failing."""
+    manager, _ = make_pool_manager(pool_size=1, checkout_timeout=5)
+    first = manager.get_connection()
+    threading.Timer(0.1, first.close).start()
+
+    second = manager.get_connection()
+    second.close()
+
+    metrics = manager.metrics()
+    assert metrics.checkouts == 3  # Including the pool test in the constructor
+    assert metrics.failed_checkouts == 0
+    assert metrics.max_wait_ms >= 50
+    assert (metrics.in_use, metrics.peak_in_use) == (0, 1)
+
+def test_checkout_times_out_when_pool_stays_exhausted(make_pool_manager):
+    """Tests that a checkout fails after the timeout and is counted as failed."""
+    manager, _ = make_pool_manager(pool_size=1, checkout_timeout=0.05)
+    held = manager.get_connection()
+
+    with pytest.raises(ConnectionError, match="Timed out"):
+        manager.get_connection()
+
+    assert manager.metrics().failed_checkouts == 1
+    assert manager.metrics().in_use == 1
+    held.close()
+    held.close()  # A second close does not free a second slot
+    assert manager.metrics().in_use == 0
+
+def test_stale_connection_is_retried_once(make_pool_manager, mocker):
+    """Tests that a connection the connector could not reconnect is replaced by another one."""
+    manager, pool = make_pool_manager(pool_size=2)
+    replacement = mocker.MagicMock()
+    pool.get_connection.side_effect = [InterfaceError("Lost connection"), replacement]
+
+    conn = manager.get_connection()
+    conn.commit()
+
+    replacement.commit.assert_called_once()
+
+@pytest.mark.parametrize("error", [
+    OperationalError("MySQL server has gone away", errno=2006),
+    OperationalError("Lost connection to MySQL server during query", errno=2013),
+])
+def test_stale_connection_errors_are_retried(make_pool_manager, mocker, error):
+    """Tests that a server that went away or dropped the connection gets the same single retry as a failed reconnect."""
+    manager, pool = make_pool_manager(pool_size=2)
+    replacement = mocker.MagicMock()
+    pool.get_connection.side_effect = [error, replacement]
+
+    manager.get_connection().commit()
+
+    replacement.commit.assert_called_once()
+
+def test_other_operational_errors_are_not_retried(make_pool_manager):
+    """Tests that an OperationalError unrelated to a stale connection fails the checkout."""
+    manager, pool = make_pool_manager(pool_size=2)
+    pool.get_connection.side_effect = [OperationalError("Too many connections", errno=1040)]
+
+    with pytest.raises(ConnectionError):
+        manager.get_connection()
+
+    assert pool.get_connection.call_count == 2  # Constructor test + the failed checkout
+    assert manager.metrics().in_use == 0
+
+def test_close_pool_disconnects_and_refuses_checkouts(make_pool_manager, mocker):
+    """Tests that close_pool disconnects idle connections, then the ones released later, and blocks new checkouts."""
+    manager, pool = make_pool_manager(pool_size=2)
+    in_use_raw, idle_raw = mocker.MagicMock(), mocker.MagicMock()
+    pool.get_connection.side_effect = [in_use_raw, idle_raw, PoolError("Failed getting connection; pool exhausted")]
+    in_use = manager.get_connection()
+
+    manager.close_pool()
+    idle_raw.disconnect.assert_called_once()
+    idle_raw.close.assert_not_called()  # Not handed back to the pool
+    with pytest.raises(ConnectionError):
+        manager.get_connection()
+
+    in_use.close()
+    in_use_raw.disconnect.assert_called_once()
+    in_use_raw.close.assert_not_called()
+    assert manager.metrics().in_use == 0
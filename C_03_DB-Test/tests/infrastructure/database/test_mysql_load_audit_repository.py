@@ -0,0 +1,65 @@
+import json
+import pytest
+from datetime import date
+
+from src.infrastructure.database import MySQLConnectionManager, MySqlLoadAuditRepository
+
+CSV_CONTENT = "DATA;REG_ANS\n31/03/2024;1\n31/03/2024;2\n31/03/2024;3\n"
+
+@pytest.fixture
+def cursor(mocker):
+    return mocker.MagicMock()
+
+@pytest.fixture
+def audit_repo(mocker, cursor):
+    conn_manager = mocker.MagicMock(spec=MySQLConnectionManager)
+    conn_manager.get_connection.return_value.cursor.return_value = cursor
+    return MySqlLoadAuditRepository(conn_manager)
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "1T2024.csv"
+    path.write_text(CSV_CONTENT, encoding='utf-8')
+    return path
+
+def inserted_values(cursor):
+    sql, params = cursor.execute.call_args[0]
+    assert "INSERT INTO load_audit" in sql
+    return params
+
+def test_audit_load_records_matching_load(audit_repo, cursor, csv_path):
+    """Tests that the load reads the file through the tap and a matching load records no discrepancy."""
+    def load(path, verify):
+        assert path.read_text(encoding='utf-8') == CSV_CONTENT
+        verify()
+        return 3, 0
+
+    assert audit_repo.audit_load('accounting', csv_path, csv_path.name, date(2024, 3, 31), load) == 3
+
+    table, source, quarter, source_rows, source_bytes, loaded_rows, warnings, checksums, discrepancy = inserted_values(cursor)
+    assert (table, source, quarter) == ('accounting', '1T2024.csv', date(2024, 3, 31))
+    assert (source_rows, source_bytes, loaded_rows, warnings) == (3, len(CSV_CONTENT), 3, 0)
+    assert set(json.loads(checksums)) == {"DATA", "REG_ANS"}
+    assert discrepancy is None
+
+def test_audit_load_flags_short_load(audit_repo, cursor, csv_path):
+    """Tests that fewer inserted rows than source records, or warnings, are recorded as a discrepancy."""
+    def load(path, verify):
+        path.read_bytes()
+        verify()
+        return 2, 1
+
+    assert audit_repo.audit_load('accounting', csv_path, csv_path.name, None, load) == 2
+
+    discrepancy = inserted_values(cursor)[-1]
+    assert "source has 3 rows, LOAD DATA inserted 2" in discrepancy
+    assert "1 warnings" in discrepancy
+
+def test_audit_load_failure_does_not_record(audit_repo, cursor, csv_path):
+    """Tests that a failed load propagates and leaves no audit row."""
+    def load(path, verify):
+        raise RuntimeError("Failed to load 1T2024.csv")
+
+    with pytest.raises(RuntimeError, match="Failed to load"):
+        audit_repo.audit_load('accounting', csv_path, csv_path.name, None, load)
+    cursor.execute.assert_not_called()
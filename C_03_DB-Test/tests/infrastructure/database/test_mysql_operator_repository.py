@@ -0,0 +1,45 @@
+import pytest
+
+from src.infrastructure.database import MySQLConnectionManager, MySqlOperatorRepository
+
+@pytest.fixture
+def executed():
+    return []
+
+@pytest.fixture
+def cursor(mocker, executed):
+    """Cursor of an upsert whose CSV stages 3 operators, 1 of them new, while 2 current operators vanished."""
+    cursor = mocker.MagicMock()
+    cursor.execute.side_effect = lambda sql, params=None: executed.append(' '.join(sql.split()))
+    cursor.fetchone.side_effect = lambda: (1, 1) if executed[-1].startswith("SELECT COUNT(*), COUNT(*)") else (2,)
+    cursor.rowcount = 3
+    cursor.warning_count = 0
+    return cursor
+
+@pytest.fixture
+def repo(mocker, cursor):
+    conn_manager = mocker.MagicMock(spec=MySQLConnectionManager)
+    conn_manager.get_connection.return_value.cursor.return_value = cursor
+    conn_manager.bulk_session.return_value.__enter__.return_value.cursor.return_value = cursor
+    return MySqlOperatorRepository(conn_manager)
+
+def test_upsert_keeps_vanished_operators_still_referenced(repo, executed, tmp_path, caplog):
+    """Tests that operators missing from the CSV are only deleted when no accounting row references them."""
+    assert repo.upsert_from_csv(tmp_path / "operators.csv") == 3
+
+    [delete] = [sql for sql in executed if sql.startswith("DELETE o")]
+    assert "NOT EXISTS (SELECT 1 FROM accounting a WHERE a.reg_ans = o.Registro_ANS)" in delete
+    assert "Kept 2 operators missing from the CSV" in caplog.text
+
+def test_upsert_uses_a_stage_of_its_own(repo, executed, tmp_path):
+    """Tests that each upsert creates and drops its own uniquely named stage, and merges without VALUES()."""
+    repo.upsert_from_csv(tmp_path / "operators.csv")
+    repo.upsert_from_csv(tmp_path / "operators.csv")
+
+    created = [sql.split()[2] for sql in executed if sql.startswith("CREATE TABLE")]
+    assert len(set(created)) == 2 and all(name.startswith("operators_stage_") for name in created)
+    assert [f"DROP TABLE IF EXISTS {name}" for name in created] == [
+        sql for sql in executed if sql.startswith("DROP TABLE")
+    ]
+    for insert in (sql for sql in executed if sql.startswith("INSERT INTO operators")):
+        assert "VALUES(" not in insert and "Razao_Social = new.Razao_Social" in insert
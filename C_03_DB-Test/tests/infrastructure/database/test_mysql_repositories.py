@@ -2,11 +2,16 @@ import pytest
 from datetime import date
 import csv 
 import decimal 
+import zipfile
 
 from src.infrastructure.database import (
     MySQLConnectionManager,
     MySqlOperatorRepository,
     MySqlAccountingRepository,
+    MySqlLoadStateRepository,
+    MySqlLoadAuditRepository,
+    MySqlShadowTables,
+    CsvPreNormalizer,
 )
 
 @pytest.fixture(scope="module") # Pool can be shared across tests in this module
@@ -149,9 +154,98 @@ class TestMySqlRepositories:
         finally:
             cursor.close()
 
+    def test_operator_upsert_from_csv_writes_only_changes(self, operator_repo, temp_data_dir, db_connection):
+        """Tests that the upsert adds new operators, updates changed ones and deletes vanished ones."""
+        csv_path = temp_data_dir["operators_csv"]
+        header = ["Registro_ANS", "CNPJ", "Razao_Social", "Cidade"]
+
+        def write_operators(rows):
+            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f, delimiter=';')
+                writer.writerow(header)
+                writer.writerows(rows)
+
+        write_operators([
+            ["1", "11.111.111/0001-11", "Kept Op", "City A"],
+            ["2", "22.222.222/0001-22", "Changed Op", "City B"],
+            ["3", "33.333.333/0001-33", "Vanished Op", "City C"],
+        ])
+        assert operator_repo.upsert_from_csv(csv_path) == 3
+        cursor = db_connection.cursor()
+        try:
+            cursor.execute("SELECT row_hash FROM operators WHERE Registro_ANS = 1")
+            kept_hash = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+        assert kept_hash is not None
+
+        write_operators([
+            ["1", "11.111.111/0001-11", "Kept Op", "City A"],
+            ["2", "22.222.222/0001-22", "Changed Op", "City Z"],
+            ["4", "44.444.444/0001-44", "New Op", "City D"],
+        ])
+        assert operator_repo.upsert_from_csv(csv_path) == 3
+
+        db_connection.commit()  # Start a fresh snapshot
+        cursor = db_connection.cursor()
+        try:
+            cursor.execute("SELECT Registro_ANS, Cidade, row_hash FROM operators ORDER BY Registro_ANS")
+            rows = cursor.fetchall()
+            cursor.execute("SHOW TABLES LIKE 'operators\\_stage%'")
+            assert cursor.fetchone() is None
+        finally:
+            cursor.close()
+        assert [(reg, city) for reg, city, _ in rows] == [(1, "City A"), (2, "City Z"), (4, "City D")]
+        assert rows[0][2] == kept_hash
+
+    def test_operator_upsert_keeps_operators_referenced_by_accounting(self, operator_repo, temp_data_dir, db_connection):
+        """Tests that an operator missing from the CSV is kept while accounting rows still reference it."""
+        csv_path = temp_data_dir["operators_csv"]
+
+        def write_operators(rows):
+            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f, delimiter=';').writerows([["Registro_ANS", "CNPJ", "Razao_Social"], *rows])
+
+        write_operators([["6", "666", "Referenced Op"], ["7", "777", "Unreferenced Op"], ["8", "888", "Current Op"]])
+        operator_repo.upsert_from_csv(csv_path)
+        cursor = db_connection.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO accounting (trimestre_referencia, reg_ans, cd_conta_contabil, descricao)
+                VALUES ('2023-03-31', 6, '1.1', 'History')
+            """)
+            db_connection.commit()
+        finally:
+            cursor.close()
+
+        write_operators([["8", "888", "Current Op"]])
+        operator_repo.upsert_from_csv(csv_path)
+
+        db_connection.commit()
+        cursor = db_connection.cursor()
+        try:
+            cursor.execute("SELECT Registro_ANS FROM operators ORDER BY Registro_ANS")
+            assert [row[0] for row in cursor.fetchall()] == [6, 8]
+        finally:
+            cursor.close()
+
+    def test_operator_upsert_from_empty_csv_keeps_operators(self, operator_repo, temp_data_dir, db_connection):
+        """Tests that an empty CSV is refused instead of deleting every operator."""
+        csv_path = temp_data_dir["operators_csv"]
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f, delimiter=';').writerows([["Registro_ANS", "CNPJ", "Razao_Social"], ["5", "555", "Op"]])
+        operator_repo.upsert_from_csv(csv_path)
+        csv_path.write_text("Registro_ANS;CNPJ;Razao_Social\n", encoding='utf-8')
+
+        with pytest.raises(RuntimeError):
+            operator_repo.upsert_from_csv(csv_path)
+
+        db_connection.commit()
+        assert count_rows(db_connection, "operators") == 1
+
     def test_accounting_load_from_csv_success(self, accounting_repo, temp_data_dir, db_connection, operator_repo):
         """Tests successful loading of accounting data from CSV."""
-        # Arrange: Need a valid operator first for FK constraint
+        # Arrange: Load the operator the rows reference so none are reported as orphaned
         op_csv_path = temp_data_dir["operators_csv"]
         op_header = ["Registro_ANS", "CNPJ", "Razao_Social"]
         op_rows = [["99999", "99.999.999/0001-99", "FK Operator"]]
@@ -215,4 +309,232 @@ class TestMySqlRepositories:
             assert results[4]["vl_saldo_inicial"] is None # Invalid string became NULL
             assert results[4]["vl_saldo_final"] is None # Invalid string became NULL
         finally:
-            cursor.close()
\ No newline at end of file
+            cursor.close()
+
+    def test_accounting_delete_quarter(self, accounting_repo, db_connection):
+        """Tests that delete_quarter removes only the given quarter, across several batches."""
+        cursor = db_connection.cursor()
+        try:
+            cursor.execute("INSERT IGNORE INTO operators (Registro_ANS, CNPJ, Razao_Social) VALUES (555, '555', 'Quarter Op')")
+            rows = [(date(2023, 3, 31), 555, f'1.{i}', 'Q1') for i in range(5)]
+            rows += [(date(2023, 6, 30), 555, f'2.{i}', 'Q2') for i in range(3)]
+            cursor.executemany("""
+                INSERT INTO accounting (trimestre_referencia, reg_ans, cd_conta_contabil, descricao)
+                VALUES (%s, %s, %s, %s)
+            """, rows)
+            db_connection.commit()
+        finally:
+            cursor.close()
+
+        deleted = accounting_repo.delete_quarter(date(2023, 3, 31), batch_size=2)
+
+        assert deleted == 5
+        assert count_rows(db_connection, "accounting") == 3
+
+    def test_accounting_refresh_quarter_summary(self, accounting_repo, db_connection):
+        """Tests that the expense summary totals one quarter per operator and account prefix."""
+        cursor = db_connection.cursor()
+        try:
+            rows = [
+                (date(2023, 3, 31), 555, '411111', 10.50),
+                (date(2023, 3, 31), 555, '411211', 4.50),
+                (date(2023, 3, 31), 555, '311111', 7.00),
+                (date(2023, 3, 31), 555, '411311', None),  # NULL balances are not totalled
+                (date(2023, 6, 30), 555, '411111', 99.00),  # Other quarter
+            ]
+            cursor.executemany("""
+                INSERT INTO accounting (trimestre_referencia, reg_ans, cd_conta_contabil, vl_saldo_final)
+                VALUES (%s, %s, %s, %s)
+            """, rows)
+            db_connection.commit()
+        finally:
+            cursor.close()
+
+        assert accounting_repo.refresh_quarter_summary(date(2023, 3, 31)) == 2
+        assert accounting_repo.refresh_quarter_summary(date(2023, 3, 31)) == 2  # Refresh replaces, never adds
+
+        cursor = db_connection.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT prefixo_conta, vl_saldo_final_total, qtd_registros FROM accounting_expense_summary
+                WHERE trimestre_referencia = '2023-03-31' ORDER BY prefixo_conta
+            """)
+            results = cursor.fetchall()
+        finally:
+            cursor.close()
+        assert [(r["prefixo_conta"], float(r["vl_saldo_final_total"]), r["qtd_registros"]) for r in results] == [
+            ("311", 7.00, 1), ("411", 15.00, 2),
+        ]
+
+        accounting_repo.delete_quarter(date(2023, 3, 31))
+        assert count_rows(db_connection, "accounting_expense_summary") == 0
+
+    def test_accounting_count_orphaned_statements(self, accounting_repo, db_connection):
+        """Tests that rows whose reg_ans has no operator are counted (no foreign key rejects them)."""
+        cursor = db_connection.cursor()
+        try:
+            cursor.execute("INSERT IGNORE INTO operators (Registro_ANS, CNPJ, Razao_Social) VALUES (555, '555', 'Known Op')")
+            cursor.executemany("""
+                INSERT INTO accounting (trimestre_referencia, reg_ans, cd_conta_contabil, descricao)
+                VALUES (%s, %s, %s, %s)
+            """, [(date(2023, 3, 31), 555, '1.1', 'Known'), (date(2023, 3, 31), 777, '1.1', 'Unknown')])
+            db_connection.commit()
+        finally:
+            cursor.close()
+
+        assert accounting_repo.count_orphaned_statements() == 1
+
+    def test_accounting_prenormalized_load_matches_raw_load(self, db_conn_manager, temp_data_dir, db_connection):
+        """Tests that loading through CsvPreNormalizer stores the same values as the raw SQL template."""
+        acc_csv_path = temp_data_dir["csvs"] / "1T2024.csv"
+        header = ["DATA", "REG_ANS", "CD_CONTA_CONTABIL", "DESCRICAO", "VL_SALDO_INICIAL", "VL_SALDO_FINAL"]
+        rows = [
+            ["31/03/2024", "99999", " 1.1.1 ", "Caixa", "1.000,50", "2.500,75"],
+            ["31/03/2024", "99999", "3.1.1", "Patrimonio", "", "100000,00"],
+            ["31/03/2024", "99999", "4.1.1", "Receitas", "abc", "-300,00"],
+        ]
+        with open(acc_csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, delimiter=';')
+            writer.writerow(header)
+            writer.writerows(rows)
+
+        def loaded_values():
+            cursor = db_connection.cursor()
+            try:
+                cursor.execute("""
+                    SELECT trimestre_referencia, reg_ans, cd_conta_contabil, descricao, vl_saldo_inicial, vl_saldo_final
+                    FROM accounting ORDER BY cd_conta_contabil
+                """)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+        raw_repo = MySqlAccountingRepository(db_conn_manager)
+        assert raw_repo.load_from_csv(acc_csv_path, date(2024, 3, 31)) == 3
+        raw_values = loaded_values()
+        raw_repo.clear_all()
+
+        normalizer = CsvPreNormalizer(max_workers=0, work_dir=temp_data_dir["csvs"] / "normalized")
+        normalized_repo = MySqlAccountingRepository(db_conn_manager, normalizer=normalizer)
+        assert normalized_repo.load_from_csv(acc_csv_path, date(2024, 3, 31)) == 3
+        assert loaded_values() == raw_values
+        assert list((temp_data_dir["csvs"] / "normalized").iterdir()) == []  # Temporary copy removed
+
+    def test_accounting_load_from_zip_member(self, accounting_repo, temp_data_dir, db_connection):
+        """Tests that a CSV is loaded straight from its ZIP and never extracted next to it."""
+        zip_path = temp_data_dir["zips"] / "1T2024.zip"
+        content = "DATA;REG_ANS;CD_CONTA_CONTABIL;DESCRICAO;VL_SALDO_INICIAL;VL_SALDO_FINAL\n"
+        content += "".join(f"31/03/2024;99999;1.1.{i};Conta;1,00;2,50\n" for i in range(50))
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("1T2024.csv", content)
+
+        assert accounting_repo.load_from_zip_member(zip_path, "1T2024.csv", date(2024, 3, 31)) == 50
+        assert count_rows(db_connection, "accounting") == 50
+        assert list(temp_data_dir["csvs"].iterdir()) == []
+
+    def test_accounting_load_records_audit(self, db_conn_manager, temp_data_dir, db_connection):
+        """Tests that an audited load records the source profile and flags a mismatch with the server's counts."""
+        acc_csv_path = temp_data_dir["csvs"] / "1T2024.csv"
+        content = "DATA;REG_ANS;CD_CONTA_CONTABIL;DESCRICAO;VL_SALDO_INICIAL;VL_SALDO_FINAL\n"
+        content += "".join(f"31/03/2024;99999;1.1.{i};Conta;1,00;2,50\n" for i in range(20))
+        content += "31/03/2024;99999;9.9.9\n"  # Short row: loaded with warnings
+        acc_csv_path.write_text(content, encoding='utf-8')
+        audited_repo = MySqlAccountingRepository(db_conn_manager, audit_repo=MySqlLoadAuditRepository(db_conn_manager))
+
+        assert audited_repo.load_from_csv(acc_csv_path, date(2024, 3, 31)) == 21
+
+        cursor = db_connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT table_name, source_name, trimestre_referencia, source_rows, source_bytes,
+                       loaded_rows, warning_count, discrepancy
+                FROM load_audit
+            """)
+            audits = cursor.fetchall()
+        finally:
+            cursor.close()
+        assert len(audits) == 1
+        table_name, source_name, quarter, source_rows, source_bytes, loaded_rows, warnings, discrepancy = audits[0]
+        assert (table_name, source_name, quarter) == ("accounting", "1T2024.csv", date(2024, 3, 31))
+        assert (source_rows, source_bytes, loaded_rows) == (21, len(content.encode('utf-8')), 21)
+        assert warnings > 0
+        assert "warnings" in discrepancy
+
+    def test_shadow_tables_swap_in_reload(self, db_conn_manager, operator_repo, accounting_repo, temp_data_dir, db_connection):
+        """Tests that a blue/green reload leaves the live tables readable until publish() swaps the new data in."""
+        cursor = db_connection.cursor()
+        try:
+            cursor.execute("INSERT INTO operators (Registro_ANS, CNPJ, Razao_Social) VALUES (1, '111', 'Old Op')")
+            db_connection.commit()
+        finally:
+            cursor.close()
+        op_csv_path = temp_data_dir["operators_csv"]
+        op_csv_path.write_text("Registro_ANS;CNPJ;Razao_Social\n2;222;New Op\n3;333;Newer Op\n", encoding='utf-8')
+        acc_csv_path = temp_data_dir["csvs"] / "1T2024.csv"
+        acc_csv_path.write_text(
+            "DATA;REG_ANS;CD_CONTA_CONTABIL;DESCRICAO;VL_SALDO_INICIAL;VL_SALDO_FINAL\n"
+            "31/03/2024;2;411;Despesa;1,00;2,50\n",
+            encoding='utf-8'
+        )
+        shadow = MySqlShadowTables(db_conn_manager, operator_repo, accounting_repo)
+
+        shadow.begin()
+        try:
+            assert operator_repo.load_from_csv(op_csv_path) == 2
+            assert accounting_repo.load_from_csv(acc_csv_path, date(2024, 3, 31)) == 1
+            accounting_repo.refresh_quarter_summary(date(2024, 3, 31))
+            db_connection.commit()  # Start a fresh snapshot
+            assert count_rows(db_connection, "operators") == 1  # Readers still see the old data
+            shadow.publish()
+        finally:
+            shadow.discard()  # No-op after a successful publish
+
+        db_connection.commit()
+        assert count_rows(db_connection, "operators") == 2
+        assert count_rows(db_connection, "accounting") == 1
+        assert count_rows(db_connection, "accounting_expense_summary") == 1
+
+    def test_load_state_round_trip(self, db_conn_manager, db_connection):
+        """Tests recording, replacing, forgetting and clearing quarters in load_state."""
+        load_state_repo = MySqlLoadStateRepository(db_conn_manager)
+        q1, q2 = date(2023, 3, 31), date(2023, 6, 30)
+
+        load_state_repo.mark_loaded(q1, "1T2023.csv", "a" * 64, 10)
+        load_state_repo.mark_loaded(q2, "2T2023.csv", "b" * 64, 20)
+        load_state_repo.mark_loaded(q2, "2T2023.csv", "c" * 64, 25)  # Reload replaces the record
+        assert load_state_repo.get_loaded_quarters() == {q1: "a" * 64, q2: "c" * 64}
+
+        load_state_repo.forget_quarter(q1)
+        assert load_state_repo.get_loaded_quarters() == {q2: "c" * 64}
+
+        load_state_repo.clear_all()
+        assert count_rows(db_connection, "load_state") == 0
+
+    def test_accounting_quarter_loads_by_partition_exchange(self, accounting_repo, temp_data_dir, db_connection):
+        """Tests that loading two files of one quarter keeps both and that delete_quarter drops the partition."""
+        cursor = db_connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT PARTITION_METHOD FROM information_schema.PARTITIONS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'accounting' LIMIT 1
+            """)
+            row = cursor.fetchone()
+            if not (row and row[0]):
+                pytest.skip("'accounting' is not partitioned in this database")
+        finally:
+            cursor.close()
+
+        ref_date = date(2024, 3, 31)
+        header = ["DATA", "REG_ANS", "CD_CONTA_CONTABIL", "DESCRICAO", "VL_SALDO_INICIAL", "VL_SALDO_FINAL"]
+        for name, account in [("1T2024_a.csv", "1.1.1"), ("1T2024_b.csv", "1.1.2")]:
+            with open(temp_data_dir["csvs"] / name, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f, delimiter=';')
+                writer.writerow(header)
+                writer.writerow(["31/03/2024", "99999", account, "Conta", "1,00", "2,00"])
+
+        assert accounting_repo.load_from_csv(temp_data_dir["csvs"] / "1T2024_a.csv", ref_date) == 1
+        assert accounting_repo.load_from_csv(temp_data_dir["csvs"] / "1T2024_b.csv", ref_date) == 1
+        assert count_rows(db_connection, "accounting PARTITION (p20240331)") == 2
+
+        assert accounting_repo.delete_quarter(ref_date) == 2
+        assert count_rows(db_connection, "accounting") == 0
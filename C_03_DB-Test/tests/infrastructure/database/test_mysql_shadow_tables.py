@@ -0,0 +1,81 @@
+import pytest
+
+from src.infrastructure.database import (
+    MySQLConnectionManager, MySqlOperatorRepository, MySqlAccountingRepository, MySqlShadowTables
+)
+
+@pytest.fixture
+def cursor(mocker):
+    return mocker.MagicMock()
+
+@pytest.fixture
+def repos(mocker):
+    return mocker.MagicMock(spec=MySqlOperatorRepository), mocker.MagicMock(spec=MySqlAccountingRepository)
+
+@pytest.fixture
+def shadow_tables(mocker, cursor, repos):
+    conn_manager = mocker.MagicMock(spec=MySQLConnectionManager)
+    conn_manager.get_connection.return_value.cursor.return_value = cursor
+    return MySqlShadowTables(conn_manager, *repos, min_row_ratio=0.5)
+
+def executed(cursor):
+    return [call.args[0] for call in cursor.execute.call_args_list]
+
+def test_begin_creates_shadow_tables_and_redirects_writes(shadow_tables, cursor, repos):
+    """Tests that begin() recreates every shadow table LIKE the live one and points the repositories at it."""
+    shadow_tables.begin()
+
+    statements = executed(cursor)
+    assert statements[0].startswith("DROP TABLE IF EXISTS") and "accounting_new" in statements[0]
+    assert statements[1:] == [
+        "CREATE TABLE operators_new LIKE operators",
+        "CREATE TABLE accounting_new LIKE accounting",
+        "CREATE TABLE accounting_expense_summary_new LIKE accounting_expense_summary",
+    ]
+    for repo in repos:
+        repo.set_table_suffix.assert_called_once_with('_new')
+
+def test_publish_swaps_all_tables_in_one_rename(shadow_tables, cursor, repos):
+    """Tests that valid shadow tables replace the live ones with a single RENAME TABLE."""
+    cursor.fetchone.side_effect = [(10, 12), (1000, 900)]
+
+    shadow_tables.publish()
+
+    renames = [sql for sql in executed(cursor) if sql.startswith("RENAME TABLE")]
+    assert renames == [
+        "RENAME TABLE operators TO operators_old, operators_new TO operators, "
+        "accounting TO accounting_old, accounting_new TO accounting, "
+        "accounting_expense_summary TO accounting_expense_summary_old, "
+        "accounting_expense_summary_new TO accounting_expense_summary"
+    ]
+    assert executed(cursor)[-1].startswith("DROP TABLE operators_old")
+    for repo in repos:
+        repo.set_table_suffix.assert_called_once_with('')
+
+def test_publish_refuses_short_shadow_table(shadow_tables, cursor, repos):
+    """Tests that a shadow table much smaller than the live one is not swapped in."""
+    cursor.fetchone.side_effect = [(10, 10), (1000, 100)]
+
+    with pytest.raises(RuntimeError, match="accounting_new has 100 rows"):
+        shadow_tables.publish()
+
+    assert not any(sql.startswith("RENAME TABLE") for sql in executed(cursor))
+    for repo in repos:
+        repo.set_table_suffix.assert_not_called()
+
+def test_find_problem():
+    """Tests the validation rules: shadow tables must hold rows, and enough of them."""
+    assert MySqlShadowTables.find_problem({'operators': (0, 5), 'accounting': (0, 100)}, 0.5) is None
+    assert MySqlShadowTables.find_problem({'accounting': (100, 50)}, 0.5) is None
+    assert MySqlShadowTables.find_problem({'operators': (0, 0)}, 0.5) == "operators_new is empty"
+    assert "under 50%" in MySqlShadowTables.find_problem({'accounting': (100, 49)}, 0.5)
+
+def test_discard_drops_shadow_tables(shadow_tables, cursor, repos):
+    """Tests that discard() points the repositories back at the live tables and drops the shadows."""
+    shadow_tables.discard()
+
+    assert executed(cursor) == [
+        "DROP TABLE IF EXISTS operators_new, accounting_new, accounting_expense_summary_new"
+    ]
+    for repo in repos:
+        repo.set_table_suffix.assert_called_once_with('')
@@ -0,0 +1,38 @@
+import os
+import pytest
+
+from src.infrastructure.filesystem import FileTap
+
+CSV_CONTENT = b"DATA;REG_ANS\n" + b"31/03/2024;99999\n" * 100_000
+needs_fifo = pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="Named pipes are not available on this platform")
+
+@pytest.mark.parametrize("use_fifo", [
+    pytest.param(True, id="fifo", marks=needs_fifo),
+    pytest.param(False, id="in_place"),
+])
+def test_tap_passes_file_through_and_observes_it(tmp_path, use_fifo):
+    """Tests that the reader sees the file unchanged while the observer sees every byte once."""
+    source = tmp_path / "1T2024.csv"
+    source.write_bytes(CSV_CONTENT)
+    observed = []
+    tap = FileTap(source, work_dir=tmp_path / "taps", use_fifo=use_fifo, observer=observed.append)
+
+    with tap as path:
+        assert path.name == "1T2024.csv"
+        assert path.read_bytes() == CSV_CONTENT
+        tap.raise_if_failed()
+
+    assert b"".join(observed) == CSV_CONTENT
+    assert tap.streamed_bytes == len(CSV_CONTENT)
+    assert list((tmp_path / "taps").iterdir()) == []
+    assert source.read_bytes() == CSV_CONTENT  # The source itself is left alone
+
+@needs_fifo
+def test_missing_file_is_reported(tmp_path):
+    """Tests that a source that cannot be read fails raise_if_failed instead of looking empty."""
+    tap = FileTap(tmp_path / "missing.csv", work_dir=tmp_path, use_fifo=True)
+
+    with tap as path:
+        assert path.read_bytes() == b""
+        with pytest.raises(RuntimeError, match="Streaming missing.csv failed"):
+            tap.raise_if_failed()
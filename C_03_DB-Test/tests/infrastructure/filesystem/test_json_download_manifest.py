@@ -0,0 +1,69 @@
+import json
+import pytest
+from dataclasses import asdict
+from pathlib import Path
+
+from src.application.dto import ManifestEntry
+from src.infrastructure.filesystem import JsonDownloadManifest
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    """Path for a manifest file that does not exist yet."""
+    return tmp_path / "data" / "download_manifest.json"
+
+@pytest.fixture
+def sample_entry():
+    """Provides a fully populated ManifestEntry."""
+    return ManifestEntry(
+        size=1024,
+        etag='"abc123"',
+        last_modified="Wed, 01 May 2024 10:00:00 GMT",
+        sha256="f" * 64,
+        extracted_sizes={"1T2024.csv": 4096},
+    )
+
+def test_missing_manifest_is_empty(manifest_path):
+    """Tests that a manifest without a file knows nothing."""
+    manifest = JsonDownloadManifest(manifest_path)
+    assert manifest.get("http://fake-ans.gov/acc/2024/1T2024.zip") is None
+
+def test_save_and_reload(manifest_path, sample_entry):
+    """Tests that saved entries are read back by a new instance."""
+    # Arrange
+    url = "http://fake-ans.gov/acc/2024/1T2024.zip"
+    manifest = JsonDownloadManifest(manifest_path)
+    manifest.put(url, sample_entry)
+
+    # Act
+    manifest.save()
+    reloaded = JsonDownloadManifest(manifest_path)
+
+    # Assert
+    assert manifest_path.exists()
+    assert not manifest_path.with_name(manifest_path.name + ".tmp").exists()
+    assert reloaded.get(url) == sample_entry
+
+def test_corrupted_manifest_is_ignored(manifest_path):
+    """Tests that an unreadable manifest is treated as empty instead of failing the run."""
+    # Arrange
+    manifest_path.parent.mkdir(parents=True)
+    manifest_path.write_text("{not json", encoding="utf-8")
+
+    # Act
+    manifest = JsonDownloadManifest(manifest_path)
+
+    # Assert
+    assert manifest.get("http://fake-ans.gov/acc/2024/1T2024.zip") is None
+
+def test_manifest_with_retired_keys_still_loads(manifest_path, sample_entry):
+    """Tests that entries written by an older version (with extracted_hashes) are still read."""
+    # Arrange
+    url = "http://fake-ans.gov/acc/2024/1T2024.zip"
+    manifest_path.parent.mkdir(parents=True)
+    manifest_path.write_text(json.dumps({url: {**asdict(sample_entry), "extracted_hashes": {"1T2024.csv": "e" * 64}}}), encoding="utf-8")
+
+    # Act
+    manifest = JsonDownloadManifest(manifest_path)
+
+    # Assert
+    assert manifest.get(url) == sample_entry
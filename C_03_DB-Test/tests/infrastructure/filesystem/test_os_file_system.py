@@ -108,4 +108,14 @@ def test_get_filename(fs, tmp_path):
     assert fs.get_filename(p2) == "another_file.zip"
     assert fs.get_filename(p3) == "doc.pdf"
     assert fs.get_filename(p4) == tmp_path.name
-    assert fs.get_filename(p5) == "just_a_file.csv"
\ No newline at end of file
+    assert fs.get_filename(p5) == "just_a_file.csv"
+
+def test_get_file_size_and_sha256(fs, tmp_path):
+    """Tests file size and SHA-256 digest."""
+    # Arrange
+    file_path = tmp_path / "hash_me.csv"
+    file_path.write_bytes(b"abc")
+
+    # Act & Assert
+    assert fs.get_file_size(file_path) == 3
+    assert fs.compute_sha256(file_path) == "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
@@ -134,4 +134,79 @@ def test_download_os_error_on_save(downloader, mock_path_mkdir, mock_builtin_ope
     mock_path_mkdir.assert_called_once()
     mock_requests_get.assert_called_once_with(url, timeout=60, stream=True)
     # Check that open was called, even though write failed
-    mock_builtin_open.assert_called_once_with(save_path, 'wb')
\ No newline at end of file
+    mock_builtin_open.assert_called_once_with(save_path, 'wb')
+
+def test_download_uses_shared_session(mock_path_mkdir, mock_builtin_open, mocker):
+    """Tests that a downloader built with a session downloads through it."""
+    # Arrange
+    url = "http://example.com/file.dat"
+    save_path = Path("/tmp/file.dat")
+    mock_session = MagicMock(spec=requests.Session)
+    mock_session.get.return_value.iter_content.return_value = [b"data"]
+    mock_requests_get = mocker.patch('requests.get')
+
+    # Act
+    result = RequestsDownloader(session=mock_session).download(url, save_path)
+
+    # Assert
+    assert result is True
+    mock_session.get.assert_called_once_with(url, timeout=60, stream=True)
+    mock_requests_get.assert_not_called()
+
+
+def test_fetch_info_reads_headers(downloader, mocker):
+    """Tests that fetch_info returns size, ETag and Last-Modified from a HEAD request."""
+    # Arrange
+    url = "http://example.com/1T2024.zip"
+    mock_response = MagicMock()
+    mock_response.headers = {
+        'Content-Length': '2048',
+        'ETag': '"abc123"',
+        'Last-Modified': 'Wed, 01 May 2024 10:00:00 GMT',
+    }
+    mock_requests_head = mocker.patch('requests.head', return_value=mock_response)
+
+    # Act
+    info = downloader.fetch_info(url)
+
+    # Assert
+    mock_requests_head.assert_called_once_with(url, timeout=30, allow_redirects=True)
+    assert info.size == 2048
+    assert info.etag == '"abc123"'
+    assert info.last_modified == 'Wed, 01 May 2024 10:00:00 GMT'
+
+
+def test_fetch_info_request_fails(downloader, mocker):
+    """Tests that fetch_info returns None when the HEAD request fails."""
+    mocker.patch('requests.head', side_effect=requests.exceptions.ConnectionError("refused"))
+    assert downloader.fetch_info("http://example.com/1T2024.zip") is None
+
+
+def test_downloaded_info_comes_from_the_get_response(downloader, mock_path_mkdir, mock_builtin_open, mocker):
+    """Tests that a download records the GET's size, ETag and Last-Modified, so no HEAD request is needed."""
+    url = "http://example.com/1T2024.zip"
+    mock_response = MagicMock()
+    mock_response.iter_content.return_value = [b"zip"]
+    mock_response.headers = {'Content-Length': '3', 'ETag': '"v1"', 'Last-Modified': 'Wed, 01 May 2024 10:00:00 GMT'}
+    mocker.patch('requests.get', return_value=mock_response)
+    mock_requests_head = mocker.patch('requests.head')
+
+    assert downloader.download(url, Path("/tmp/1T2024.zip")) is True
+    info = downloader.downloaded_info(url)
+
+    assert (info.size, info.etag, info.last_modified) == (3, '"v1"', 'Wed, 01 May 2024 10:00:00 GMT')
+    mock_requests_head.assert_not_called()
+
+
+def test_downloaded_info_forgets_a_failed_download(downloader, mock_path_mkdir, mock_builtin_open, mocker):
+    """Tests that a failed download does not keep the metadata of the previous one."""
+    url = "http://example.com/1T2024.zip"
+    mock_response = MagicMock()
+    mock_response.iter_content.return_value = [b"zip"]
+    mock_response.headers = {'ETag': '"v1"'}
+    mocker.patch('requests.get', side_effect=[mock_response, requests.exceptions.ConnectionError("reset")])
+
+    assert downloader.download(url, Path("/tmp/1T2024.zip")) is True
+    assert downloader.download(url, Path("/tmp/1T2024.zip")) is False
+
+    assert downloader.downloaded_info(url) is None